@@ -1,14 +1,45 @@
+import hashlib
 import json
+import os
 import re
+import sqlite3
 import time
 import asyncio
 import websockets
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+import torch
 from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
 
+# Inference settings, overridable with environment variables
+# Maximum number of questions answered by a single `generate` call
+MAX_BATCH_SIZE = int(os.environ.get("TEXT2SQL_MAX_BATCH_SIZE", 8))
+# How long to wait for other questions before running a batch that isn't full
+BATCH_TIMEOUT = float(os.environ.get("TEXT2SQL_BATCH_TIMEOUT_MS", 20)) / 1000
+# Number of batches generated at the same time
+INFERENCE_WORKERS = int(os.environ.get("TEXT2SQL_INFERENCE_WORKERS", 1))
+# Maximum number of questions waiting for a batch, clients wait for a free slot
+MAX_PENDING_QUESTIONS = int(os.environ.get("TEXT2SQL_MAX_PENDING_QUESTIONS", 64))
+# Number of threads used by torch for each `generate` call (0 keeps the default)
+TORCH_THREADS = int(os.environ.get("TEXT2SQL_TORCH_THREADS", 0))
+# Number of schemas whose tokens are kept in memory
+SCHEMA_CACHE_SIZE = int(os.environ.get("TEXT2SQL_SCHEMA_CACHE_SIZE", 256))
+# Number of generated SQL queries kept in memory, and for how many seconds (0 disables
+# the cache)
+RESULT_CACHE_SIZE = int(os.environ.get("TEXT2SQL_RESULT_CACHE_SIZE", 1024))
+RESULT_CACHE_TTL = float(os.environ.get("TEXT2SQL_RESULT_CACHE_TTL", 3600))
+# Optional SQLite file where the generated SQL queries are persisted across restarts
+RESULT_CACHE_PATH = os.environ.get("TEXT2SQL_RESULT_CACHE_PATH")
+
+if TORCH_THREADS:
+    torch.set_num_threads(TORCH_THREADS)
+
 # Load the model and tokenizer
 model_path = 'gaussalgo/T5-LM-Large-text2sql-spider'
 model = AutoModelForSeq2SeqLM.from_pretrained(model_path)
+model.eval()
 tokenizer = AutoTokenizer.from_pretrained(model_path)
 
 # Database schema (for use with text-to-SQL model)
@@ -59,6 +90,36 @@ column_names = [
   "Selection_Month",
 ]  # Column names in the schema'''
 
+# Build the identifier rewriter of a schema once: a single regex matching all of its
+# table and column names, and their quoted replacements
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def get_identifier_rewriter(table_names, column_names):
+    """
+    Compile the regex and replacements used to quote the identifiers of a schema.
+    :param table_names: Tuple of table names
+    :param column_names: Tuple of column names
+    :return: The compiled regex (None if there are no identifiers) and the mapping of
+        lowercase identifiers to their replacement
+    """
+    # Table names take precedence over column names with the same name
+    replacements = {col.lower(): f'"{col}"' for col in column_names}
+    replacements.update({table.lower(): f'public."{table}"' for table in table_names})
+
+    # Only whole words are replaced, so names with other characters never match
+    names = sorted(
+        (name for name in replacements if re.fullmatch(r'\w+', name)),
+        key=len,
+        reverse=True,
+    )
+    if not names:
+        return None, replacements
+
+    pattern = re.compile(
+        r'\b(?:' + '|'.join(re.escape(name) for name in names) + r')\b',
+        re.IGNORECASE,
+    )
+    return pattern, replacements
+
 # Function to add double quotations to table and column names in the SQL query
 def add_double_quotations(sql_query, table_names, column_names):
     """
@@ -68,62 +129,209 @@ def add_double_quotations(sql_query, table_names, column_names):
     :param column_names: List of column names
     :return: Formatted SQL query
     """
-    # Create a mapping for tables and columns
-    table_map = {table.lower(): f'public."{table}"' for table in table_names}
-    column_map = {col.lower(): f'"{col}"' for col in column_names}
-
-    # Define a regex pattern to identify table and column names
-    identifier_pattern = r'\b\w+\b'
-
-    # Replace table and column names using the maps
-    def replace_identifiers(match):
-        identifier = match.group(0)
-        if identifier.lower() in table_map:
-            return table_map[identifier.lower()]
-        elif identifier.lower() in column_map:
-            return column_map[identifier.lower()]
-        return identifier  # Return the original if not found
-
-    # Apply the regex pattern to the SQL query
-    formatted_query = re.sub(identifier_pattern, replace_identifiers, sql_query)
-    return formatted_query
-
-# Function to generate SQL query from the question using the transformer model
-def generate_sql_query(question, schema, table_names, column_names):
-    # Combine question with schema
-    input_text = " ".join(["Question: ", question, "Schema:", schema])
+    pattern, replacements = get_identifier_rewriter(tuple(table_names), tuple(column_names))
+    if pattern is None:
+        return sql_query
 
-    try:
-        # Start the timer
-        start_time = time.time()
+    # Replace table and column names, returning the original if not found
+    return pattern.sub(
+        lambda match: replacements.get(match.group(0).lower(), match.group(0)),
+        sql_query,
+    )
+
+# Cache of the generated SQL queries, so that repeated questions about the same
+# schema are answered without running the model
+class ResultCache:
+    """
+    LRU cache of SQL queries with a time to live, optionally persisted to SQLite.
+    """
 
-        # Tokenize the input and generate the output
-        model_inputs = tokenizer(input_text, return_tensors="pt")
+    def __init__(self, max_size, ttl, path=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.db = None
+        if path and max_size and ttl:
+            self.db = sqlite3.connect(path)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(key TEXT PRIMARY KEY, sql TEXT, created REAL)"
+            )
+            self.db.execute(
+                "DELETE FROM results WHERE created < ?", (time.time() - ttl,)
+            )
+            self.db.commit()
+            rows = self.db.execute(
+                "SELECT key, sql, created FROM results ORDER BY created DESC LIMIT ?",
+                (max_size,),
+            ).fetchall()
+            for key, sql, created in reversed(rows):
+                self.entries[key] = (sql, created)
+            logging.info(f"Loaded {len(rows)} cached queries from {path}")
+
+    @staticmethod
+    def get_key(question, schema_hash):
+        # Questions differing only by whitespace get the same SQL query
+        return f"{schema_hash}:{' '.join(question.split())}"
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None and time.time() - entry[1] > self.ttl:
+            del self.entries[key]
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key, sql):
+        if not self.max_size or not self.ttl:
+            return
+
+        created = time.time()
+        self.entries[key] = (sql, created)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            evicted, _ = self.entries.popitem(last=False)
+            if self.db:
+                self.db.execute("DELETE FROM results WHERE key = ?", (evicted,))
+
+        if self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO results (key, sql, created) VALUES (?, ?, ?)",
+                (key, sql, created),
+            )
+            self.db.commit()
+
+# Build the schema in the format expected by the model, and tokenize it once for
+# all the questions about the same table and columns
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def get_schema(table_name, columns, primary_key):
+    """
+    Build and tokenize the schema of a table.
+    :param table_name: Table name
+    :param columns: Tuple of (name, type) pairs
+    :param primary_key: Whether the table has a primary key
+    :return: The schema, its hash, its token ids and the column names
+    """
+    # Start building the schema in the expected format
+    schema = f'schema = """\n"{table_name}"\n'
+
+    # Add columns to schema
+    for name, col_type in columns:
+        col_type = col_type.replace("LONGINTEGER", "INTEGER")  # Adjust LONGINTEGER to INTEGER
+        schema += f'  "{name}" {col_type},\n'
+    # Handle foreign keys (if any)
+    schema += f'  foreign_key: \n'
+
+    # Handle primary key
+    if primary_key:
+        schema += f'  primary key: \n'
+
+    # Close the schema string
+    schema += '"""\n'
+    logging.info(f"Schema: {schema}")
+
+    # The schema comes last in the model input, so its tokens (including the end of
+    # sequence token) can be appended to the tokens of each question
+    schema_ids = tokenizer(" ".join(["Schema:", schema]))["input_ids"]
+    schema_hash = hashlib.sha256(f"{table_name}\n{schema}".encode()).hexdigest()
+    return schema, schema_hash, schema_ids, [name for name, _ in columns]
+
+
+# Generate the SQL queries of a batch of questions using the transformer model
+def generate_sql_queries(batch):
+    """
+    Run a single `generate` call for a batch of questions, padding their inputs.
+    :param batch: List of (question, schema_ids) pairs
+    :return: List of generated SQL queries, in the same order
+    """
+    input_ids = [
+        tokenizer(" ".join(["Question: ", question]), add_special_tokens=False)["input_ids"]
+        + schema_ids
+        for question, schema_ids in batch
+    ]
+    model_inputs = tokenizer.pad({"input_ids": input_ids}, return_tensors="pt")
+
+    # Start the timer
+    start_time = time.time()
+
+    with torch.inference_mode():
         outputs = model.generate(**model_inputs, max_length=512)
 
-        # Stop the timer
-        end_time = time.time()
+    # Stop the timer
+    end_time = time.time()
+    log_metrics(
+        "text2sql.batch",
+        batch_size=len(batch),
+        generate_ms=round((end_time - start_time) * 1000, 1),
+    )
 
-        # Decode and return the SQL query
-        output_text = tokenizer.batch_decode(outputs, skip_special_tokens=True)
-        generated_sql = output_text[0]
-        logging.info(f"Generated SQL: {generated_sql}")
-        logging.info("\n\n\n\n\n\n\n\n")
+    # Decode and return the SQL queries
+    return tokenizer.batch_decode(outputs, skip_special_tokens=True)
 
-        # Add double quotations to table and column names
-        formatted_sql = add_double_quotations(generated_sql, table_names, column_names)
 
-        # Print the time taken (for logging)
-        print(f"Time taken: {end_time - start_time:.2f} seconds\n")
-        return formatted_sql
-    except Exception as e:
-        return f"An error occurred: {e}"
+# Group the questions waiting in the queue into batches, and run them on the pool
+async def batch_worker(queue, executor):
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + BATCH_TIMEOUT
+        while len(batch) < MAX_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        try:
+            generated = await loop.run_in_executor(
+                executor,
+                generate_sql_queries,
+                [(question, schema_ids) for question, schema_ids, _ in batch],
+            )
+            for (_, _, future), generated_sql in zip(batch, generated):
+                if not future.done():
+                    future.set_result(generated_sql)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            for _ in batch:
+                queue.task_done()
+
+
+# Function to generate SQL query from the question, waiting for its batch
+async def generate_sql_query(queue, question, schema_ids, table_names, column_names):
+    future = asyncio.get_running_loop().create_future()
+    # Blocks while the queue is full, so that clients are slowed down instead of
+    # piling up questions in memory
+    await queue.put((question, schema_ids, future))
+
+    generated_sql = await future
+    logging.info(f"Generated SQL: {generated_sql}")
+
+    # Add double quotations to table and column names
+    return add_double_quotations(generated_sql, table_names, column_names)
+
+# Log metrics as JSON, so that they can be parsed by log processors
+def log_metrics(event, **metrics):
+    logging.info(json.dumps({"event": event, **metrics}))
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 
 # WebSocket handler that processes questions and returns SQL
-async def echo(websocket):
+async def echo(websocket, queue, cache):
     logging.info(f"New connection from {websocket.remote_address}")
     try:
         async for message in websocket:
@@ -137,42 +345,55 @@ async def echo(websocket):
             foreign_keys = data.get("foreignKeys", [])
             query = data.get("query", "")
             logging.info(f"Received data: {columns}")
-            # Start building the schema in the expected format
-            schema = f'schema = """\n"{table_name[0]}"\n'
-            
-            # Add columns to schema
-            for col in columns:
-                col_type = col["type"].replace("LONGINTEGER", "INTEGER")  # Adjust LONGINTEGER to INTEGER
-                schema += f'  "{col["name"]}" {col_type},\n'
-            logging.info(f"Schema: {schema}")
-            # Handle foreign keys (if any)
-            schema += f'  foreign_key: \n'
-
-            # Handle primary key
-            if primary_key:
-                schema += f'  primary key: \n'
-
-            # Close the schema string
-            schema += '"""\n'
-            logging.info(f"Schema: {schema}")
-            # Create the formatted input (schema + query)
-            formatted_input = f"{schema}"
-
-            column_names = [col["name"] for col in columns]
-
-            sql_query = generate_sql_query(query, formatted_input, table_name, column_names)
+
+            start_time = time.time()
+            _, schema_hash, schema_ids, column_names = get_schema(
+                table_name[0],
+                tuple((col["name"], col["type"]) for col in columns),
+                bool(primary_key),
+            )
+
+            key = ResultCache.get_key(query, schema_hash)
+            sql_query = cache.get(key)
+            cache_hit = sql_query is not None
+            if not cache_hit:
+                try:
+                    sql_query = await generate_sql_query(queue, query, schema_ids, table_name, column_names)
+                    cache.set(key, sql_query)
+                except Exception as e:
+                    sql_query = f"An error occurred: {e}"
+
             await websocket.send(sql_query)
+            log_metrics(
+                "text2sql.request",
+                latency_ms=round((time.time() - start_time) * 1000, 1),
+                cache_hit=cache_hit,
+                cache_hits=cache.hits,
+                cache_misses=cache.misses,
+            )
     except websockets.exceptions.ConnectionClosed as e:
         logging.error(f"Connection closed: {e}")
 
 # WebSocket server function
 async def main():
+    # Questions waiting to be batched, and the pool running the model
+    queue = asyncio.Queue(maxsize=MAX_PENDING_QUESTIONS)
+    cache = ResultCache(RESULT_CACHE_SIZE, RESULT_CACHE_TTL, RESULT_CACHE_PATH)
+    executor = ThreadPoolExecutor(max_workers=INFERENCE_WORKERS)
+    workers = [
+        asyncio.create_task(batch_worker(queue, executor))
+        for _ in range(INFERENCE_WORKERS)
+    ]
+
     # Create the WebSocket server
-    server = await websockets.serve(echo, "0.0.0.0", 8765)
+    server = await websockets.serve(partial(echo, queue=queue, cache=cache), "0.0.0.0", 8765)
     logging.info("WebSocket Server running on ws://0.0.0.0:8765")
 
     # Keep the server running indefinitely
     await server.wait_closed()
+    for worker in workers:
+        worker.cancel()
+    executor.shutdown()
 
 if __name__ == "__main__":
     # Run the WebSocket server
@@ -0,0 +1,168 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Micro-benchmark for the boxplot and histogram post processing operations.
+
+Compares the previous operations, which aggregated each group with Python functions,
+with the current ones, which sort the values of all the groups at once. The results
+are checked to be equal. With ``--sample-size``, the quantiles are also estimated as
+with ``BOXPLOT_QUANTILE_SAMPLE_SIZE``, and their largest error is reported.
+
+    python scripts/benchmark_boxplot_histogram.py --rows 1000000 --groups 1000
+"""
+
+import gc
+import time
+from typing import Any, Callable, Optional
+
+import click
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from superset.app import create_app
+from superset.utils.core import PostProcessingBoxplotWhiskerType
+from superset.utils.pandas_postprocessing import aggregate, boxplot, histogram
+
+
+def previous_boxplot(df: pd.DataFrame, groupby: list[str], metric: str) -> Any:
+    def quartile1(series: pd.Series) -> float:
+        return np.nanpercentile(series, 25, method="midpoint")
+
+    def quartile3(series: pd.Series) -> float:
+        return np.nanpercentile(series, 75, method="midpoint")
+
+    def whisker_high(series: pd.Series) -> float:
+        upper_outer_lim = quartile3(series) + 1.5 * (
+            quartile3(series) - quartile1(series)
+        )
+        return series[series <= upper_outer_lim].max()
+
+    def whisker_low(series: pd.Series) -> float:
+        lower_outer_lim = quartile1(series) - 1.5 * (
+            quartile3(series) - quartile1(series)
+        )
+        return series[series >= lower_outer_lim].min()
+
+    def outliers(series: pd.Series) -> list[float]:
+        above = series[series > whisker_high(series)]
+        below = series[series < whisker_low(series)]
+        return above.tolist() + below.tolist()
+
+    operators: dict[str, Callable[[Any], Any]] = {
+        "mean": np.mean,
+        "median": np.median,
+        "max": whisker_high,
+        "min": whisker_low,
+        "q1": quartile1,
+        "q3": quartile3,
+        "count": np.ma.count,
+        "outliers": outliers,
+    }
+    return aggregate(
+        df,
+        groupby=groupby,
+        aggregates={
+            f"{metric}__{name}": {"column": metric, "operator": operator}
+            for name, operator in operators.items()
+        },
+    )
+
+
+def previous_histogram(
+    df: pd.DataFrame, column: str, groupby: list[str], bins: int
+) -> pd.DataFrame:
+    bin_edges = np.histogram_bin_edges(df[column], bins=bins)
+    bin_edges_str = [
+        f"{int(bin_edges[i])} - {int(bin_edges[i+1])}"
+        for i in range(len(bin_edges) - 1)
+    ]
+    histogram_df = (
+        df.groupby(groupby)[column]
+        .apply(lambda x: pd.Series(np.histogram(x.dropna(), bins=bin_edges)[0]))
+        .unstack(fill_value=0)
+    )
+    histogram_df.columns = bin_edges_str
+    return histogram_df.reset_index().loc[:, groupby + bin_edges_str]
+
+
+def timed(func: Callable[[], Any]) -> tuple[float, Any]:
+    gc.collect()
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+@click.command()
+@click.option("--rows", default=1000000, help="Number of rows of the frame.")
+@click.option("--groups", default=1000, help="Number of groups.")
+@click.option("--bins", default=20, help="Number of bins of the histogram.")
+@click.option("--sample-size", type=int, help="Size of the sampled quantiles.")
+def main(rows: int, groups: int, bins: int, sample_size: Optional[int]) -> None:
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame(
+        {
+            "group": rng.integers(0, groups, rows),
+            "value": np.where(
+                rng.random(rows) < 0.01, np.nan, rng.lognormal(size=rows) * 100
+            ),
+        }
+    )
+    app = create_app()
+
+    print(f"{'operation':<24}{'previous':>12}{'current':>12}{'speedup':>10}")
+    with app.app_context():
+        before, expected = timed(lambda: previous_boxplot(df, ["group"], "value"))
+        after, exact = timed(
+            lambda: boxplot(
+                df,
+                groupby=["group"],
+                metrics=["value"],
+                whisker_type=PostProcessingBoxplotWhiskerType.TUKEY,
+            )
+        )
+        assert_frame_equal(expected, exact, check_exact=True)
+        print(f"{'boxplot':<24}{before:>11.3f}s{after:>11.3f}s{before / after:>9.1f}x")
+
+        before, expected = timed(
+            lambda: previous_histogram(df.dropna(), "value", ["group"], bins)
+        )
+        after, result = timed(lambda: histogram(df.dropna(), "value", ["group"], bins))
+        assert_frame_equal(expected, result, check_exact=True)
+        print(
+            f"{'histogram':<24}{before:>11.3f}s{after:>11.3f}s{before / after:>9.1f}x"
+        )
+
+        if sample_size:
+            app.config["BOXPLOT_QUANTILE_SAMPLE_SIZE"] = sample_size
+            after, sampled = timed(
+                lambda: boxplot(
+                    df,
+                    groupby=["group"],
+                    metrics=["value"],
+                    whisker_type=PostProcessingBoxplotWhiskerType.TUKEY,
+                )
+            )
+            print(f"{'boxplot (sampled)':<24}{'':>12}{after:>11.3f}s")
+            for statistic in ("median", "q1", "q3"):
+                column = f"value__{statistic}"
+                error = ((sampled[column] - exact[column]) / exact[column]).abs()
+                print(f"  {statistic} relative error: max {error.max():.2%}")
+
+
+if __name__ == "__main__":
+    main()
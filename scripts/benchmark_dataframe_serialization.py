@@ -0,0 +1,99 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Micro-benchmark for the serialization of query results to JSON records.
+
+Compares the previous ``df_to_records`` (``DataFrame.to_dict`` followed by a check of
+every value for big integers) with the column-wise ``df_to_records``, and with
+``df_to_json``, which writes the JSON without building the records. The frames mix
+integers (some over ``JS_MAX_INTEGER``), floats with NaN, booleans, strings and
+timestamps.
+
+    python scripts/benchmark_dataframe_serialization.py --rows 100000 --columns 50
+"""
+
+import gc
+import time
+from typing import Any, Callable
+
+import click
+import numpy as np
+import pandas as pd
+
+from superset.dataframe import _convert_big_integers, df_to_json, df_to_records
+from superset.utils import json
+
+
+def make_frame(rows: int, columns: int) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    makers: list[Callable[[], Any]] = [
+        lambda: rng.integers(0, 1000, rows),
+        lambda: np.where(
+            rng.random(rows) < 0.01, 2**60, rng.integers(-(2**40), 2**40, rows)
+        ),
+        lambda: np.where(rng.random(rows) < 0.1, np.nan, rng.random(rows) * 1000),
+        lambda: rng.random(rows) < 0.5,
+        lambda: np.array([f"value {i % 1000}" for i in range(rows)], dtype=object),
+        lambda: pd.date_range("2020-01-01", periods=rows, freq="min"),
+    ]
+    return pd.DataFrame({f"col_{i}": makers[i % len(makers)]() for i in range(columns)})
+
+
+def previous_df_to_records(df: pd.DataFrame) -> list[dict[str, Any]]:
+    records = df.to_dict(orient="records")
+    for record in records:
+        for key in record:
+            record[key] = _convert_big_integers(record[key])
+    return records
+
+
+def dumps(records: list[dict[str, Any]]) -> str:
+    return json.dumps(records, default=json.json_iso_dttm_ser, ignore_nan=True)
+
+
+def timed(func: Callable[[], Any]) -> float:
+    gc.collect()
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+@click.command()
+@click.option("--rows", default=100000, help="Number of rows of the frame.")
+@click.option("--columns", default=50, help="Number of columns of the frame.")
+def main(rows: int, columns: int) -> None:
+    df = make_frame(rows, columns)
+    assert dumps(previous_df_to_records(df)) == dumps(df_to_records(df))
+    assert dumps(df_to_records(df)) == df_to_json(df)
+
+    print(f"{'step':<24}{'previous':>12}{'current':>12}{'speedup':>10}")
+    results = {
+        "records": (
+            timed(lambda: previous_df_to_records(df)),
+            timed(lambda: df_to_records(df)),
+        ),
+        "records + JSON": (
+            timed(lambda: dumps(previous_df_to_records(df))),
+            timed(lambda: df_to_json(df)),
+        ),
+    }
+    for name, (before, after) in results.items():
+        print(f"{name:<24}{before:>11.3f}s{after:>11.3f}s{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Micro-benchmark for the string conversion fallback of ``SupersetResultSet``.
+
+Compares converting typical cursor payloads one cell at a time (the previous
+behavior, still used for values of unknown types) with the bulk conversion done by
+``stringify_values``.
+
+    python scripts/benchmark_result_set.py --rows 500000
+"""
+
+import datetime
+import time
+import uuid
+from decimal import Decimal
+from typing import Any, Callable
+
+import click
+from numpy.typing import NDArray
+
+from superset.result_set import stringify_value, stringify_values, to_object_array
+
+
+def cell_by_cell(array: NDArray[Any]) -> NDArray[Any]:
+    return to_object_array(
+        [None if value is None else stringify_value(value) for value in array]
+    )
+
+
+PAYLOADS: dict[str, Callable[[int], Any]] = {
+    "json objects": lambda i: {"id": i, "tags": ["a", "b"], "active": i % 2 == 0},
+    "json arrays": lambda i: [i, i + 1, None, {"nested": str(i)}],
+    "decimals": lambda i: Decimal(i) / 100,
+    "uuids": lambda i: uuid.UUID(int=i),
+    "mixed scalars": lambda i: [i, str(i), i / 3, None, datetime.date(2020, 1, 1)][
+        i % 5
+    ],
+}
+
+
+def timed(func: Callable[[NDArray[Any]], NDArray[Any]], array: NDArray[Any]) -> float:
+    start = time.perf_counter()
+    func(array)
+    return time.perf_counter() - start
+
+
+@click.command()
+@click.option("--rows", default=100000, help="Number of rows in each payload.")
+def main(rows: int) -> None:
+    print(f"{'payload':<16}{'cell by cell':>16}{'bulk':>12}{'speedup':>10}")
+    for name, factory in PAYLOADS.items():
+        array = to_object_array([factory(i) for i in range(rows)])
+        assert list(cell_by_cell(array)) == list(stringify_values(array))
+
+        before = timed(cell_by_cell, array)
+        after = timed(stringify_values, array)
+        print(f"{name:<16}{before:>15.3f}s{after:>11.3f}s{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Micro-benchmark for the parsing done by SQL Lab before running a statement.
+
+Compares parsing the SQL at each step (the previous behavior: splitting the script,
+checking for DML, checking for a ``SELECT`` and applying the limit) with splitting the
+script and then parsing each statement once with sqlglot, as ``execute_sql_statement``
+does. The parse caches are cleared before each script.
+
+The corpus holds the SQL of the example datasets, along with generated reporting
+queries of increasing size.
+
+    python scripts/benchmark_sql_lab_parsing.py --repeat 5
+"""
+
+import gc
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import click
+import sqlglot
+import sqlparse
+import yaml
+from sqlparse.tokens import Keyword
+
+from superset.sql.parse import parse_with_sqlglot, SQLGLOT_DIALECTS, SQLStatement
+from superset.sql_parse import (
+    _extract_limit_from_query,
+    format_without_comments,
+    parse_with_sqlparse,
+    ParsedQuery,
+)
+
+ENGINE = "postgresql"
+LIMIT = 1001
+EXAMPLES = Path(__file__).parent.parent / "superset/examples/configs/datasets/examples"
+
+Result = list[tuple[bool, bool, str]]
+
+
+def generate_query(columns: int) -> str:
+    """
+    A reporting query as generated by BI tools: a CTE, a large ``CASE`` expression per
+    column, joins, comments and a limit.
+    """
+    cases = ",\n".join(
+        f"""  -- bucket of metric {i}
+  CASE
+    WHEN f.metric_{i} < 10 THEN 'low'
+    WHEN f.metric_{i} BETWEEN 10 AND 100 THEN 'medium'
+    WHEN f.metric_{i} > 100 AND d.region IN ('EMEA', 'APAC') THEN 'high'
+    ELSE 'other'
+  END AS metric_{i}_bucket,
+  SUM(COALESCE(f.metric_{i}, 0)) AS metric_{i}_total"""
+        for i in range(columns)
+    )
+    return f"""
+WITH filtered AS (
+  SELECT *
+  FROM sales.fact_orders
+  WHERE order_date >= '2024-01-01' AND status <> 'cancelled'
+)
+SELECT
+  d.region,
+  d.country,
+{cases}
+FROM filtered AS f
+JOIN sales.dim_customer AS d ON d.id = f.customer_id
+LEFT JOIN sales.dim_product AS p ON p.id = f.product_id
+GROUP BY 1, 2
+ORDER BY 1
+LIMIT 100000
+"""
+
+
+def load_corpus() -> dict[str, str]:
+    examples = []
+    for path in sorted(EXAMPLES.glob("*.yaml")):
+        with open(path) as config:
+            if sql := yaml.safe_load(config).get("sql"):
+                examples.append(sql)
+
+    corpus = {"example datasets": ";\n".join(examples)}
+    for columns in (5, 20, 80):
+        query = generate_query(columns)
+        corpus[f"report {len(query) // 1000}KB"] = query
+    corpus["script of 3 reports"] = ";\n".join(
+        generate_query(columns) for columns in (5, 10, 20)
+    )
+    return corpus
+
+
+def set_limit(statement: Any, new_limit: int) -> str:
+    """
+    The previous limit rewrite, modifying the parsed statement.
+    """
+    if not _extract_limit_from_query(statement):
+        sql = str(statement).strip(" \t\r\n;")
+        return f"{sql}\nLIMIT {new_limit}"
+    limit_pos = None
+    for pos, item in enumerate(statement.tokens):
+        if item.ttype in Keyword and item.value.lower() == "limit":
+            limit_pos = pos
+            break
+    _, limit = statement.token_next(idx=limit_pos)
+    if limit.ttype == sqlparse.tokens.Literal.Number.Integer and new_limit < int(
+        limit.value
+    ):
+        limit.value = new_limit
+    elif limit.is_group:
+        limit.value = f"{next(limit.get_identifiers())}, {new_limit}"
+    return "".join(str(token.value) for token in statement.tokens)
+
+
+def parse_each_step(script: str) -> Result:
+    results = []
+    for parsed in sqlparse.parse(script.strip(" \t\r\n;")):
+        statement = str(parsed).strip(" \n;\t")
+        if not statement:
+            continue
+        sql = statement.strip(" \t\r\n;")
+        sqlparse.parse(sql)
+        mutating = SQLStatement(
+            statement,
+            ENGINE,
+            ast=sqlglot.parse(statement, dialect=SQLGLOT_DIALECTS.get(ENGINE))[0],
+        ).is_mutating()
+        is_select = any(
+            parsed.get_type() == "SELECT"
+            for parsed in sqlparse.parse(sqlparse.format(sql, strip_comments=True))
+        )
+        if is_select:
+            sql = set_limit(sqlparse.parse(sql)[0], LIMIT)
+        results.append((mutating, is_select, sql))
+    return results
+
+
+def parse_once(script: str) -> Result:
+    parse_with_sqlparse.cache_clear()
+    format_without_comments.cache_clear()
+    parse_with_sqlglot.cache_clear()
+
+    results = []
+    for statement in ParsedQuery(script, engine=ENGINE).get_statements():
+        parsed_statement = SQLStatement(statement, engine=ENGINE)
+        mutating = parsed_statement.is_mutating()
+        is_select = parsed_statement.is_select()
+        if is_select:
+            parsed_statement.set_limit_value(LIMIT)
+        results.append((mutating, is_select, parsed_statement.sql))
+    return results
+
+
+def timed(func: Callable[[str], Result], script: str, repeat: int) -> float:
+    gc.collect()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(script)
+    return (time.perf_counter() - start) / repeat
+
+
+@click.command()
+@click.option("--repeat", default=3, help="Number of runs for each script.")
+def main(repeat: int) -> None:
+    print(f"{'script':<24}{'each step':>12}{'once':>12}{'speedup':>10}")
+    for name, script in load_corpus().items():
+        # a limit lower than the existing one is written by sqlglot, so only the
+        # checks are compared
+        assert [result[:2] for result in parse_each_step(script)] == [
+            result[:2] for result in parse_once(script)
+        ]
+
+        before = timed(parse_each_step, script, repeat)
+        after = timed(parse_once, script, repeat)
+        print(f"{name:<24}{before:>11.3f}s{after:>11.3f}s{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
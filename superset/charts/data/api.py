@@ -18,9 +18,18 @@ from __future__ import annotations
 
 import contextlib
 import logging
+import math
+from collections.abc import Iterator
 from typing import Any, TYPE_CHECKING
 
-from flask import current_app, g, make_response, request, Response
+from flask import (
+    current_app,
+    g,
+    make_response,
+    request,
+    Response,
+    stream_with_context,
+)
 from flask_appbuilder.api import expose, protect
 from flask_babel import gettext as _
 from marshmallow import ValidationError
@@ -31,6 +40,9 @@ from superset.charts.api import ChartRestApi
 from superset.charts.data.query_context_cache_loader import QueryContextCacheLoader
 from superset.charts.post_processing import apply_post_process
 from superset.charts.schemas import ChartDataQueryContextSchema
+from superset.commands.chart.data.batch_get_data_command import (
+    ChartDataBatchCommand,
+)
 from superset.commands.chart.data.create_async_job_command import (
     CreateAsyncChartDataJobCommand,
 )
@@ -42,7 +54,11 @@ from superset.commands.chart.exceptions import (
 from superset.common.chart_data import ChartDataResultFormat, ChartDataResultType
 from superset.connectors.sqla.models import BaseDatasource
 from superset.daos.exceptions import DatasourceNotFound
-from superset.exceptions import QueryObjectValidationError
+from superset.exceptions import (
+    QueryObjectValidationError,
+    SupersetException,
+    SupersetSecurityException,
+)
 from superset.extensions import event_logger
 from superset.models.sql_lab import Query
 from superset.utils import json
@@ -57,12 +73,54 @@ from superset.views.base_api import statsd_metrics
 
 if TYPE_CHECKING:
     from superset.common.query_context import QueryContext
+    from superset.common.query_object import QueryObject
 
 logger = logging.getLogger(__name__)
 
 
+def _is_forecast(query: QueryObject) -> bool:
+    return any(op.get("operation") == "prophet" for op in query.post_processing or [])
+
+
+def _count_forecast_series(query_context: QueryContext) -> float:
+    """
+    Estimate the number of series forecast by the queries of a chart, from their
+    metrics and series limit. It's unbounded for grouped series without a limit.
+    """
+    count = 0.0
+    for query in query_context.queries:
+        if not _is_forecast(query):
+            continue
+        operations = query.post_processing or []
+        grouped = any(
+            op.get("operation") == "pivot" and (op.get("options") or {}).get("columns")
+            for op in operations
+        )
+        series = (query.series_limit or math.inf) if grouped else 1
+        count += len(query.metrics or []) * series
+    return count
+
+
+def _should_run_async(query_context: QueryContext) -> bool:
+    if not (
+        is_feature_enabled("GLOBAL_ASYNC_QUERIES")
+        and query_context.result_format == ChartDataResultFormat.JSON
+        and query_context.result_type == ChartDataResultType.FULL
+    ):
+        return False
+
+    # the threshold only applies to forecasts, other charts are always async
+    min_series = current_app.config["PROPHET_ASYNC_MIN_SERIES"]
+    if min_series is None or not any(
+        _is_forecast(query) for query in query_context.queries
+    ):
+        return True
+
+    return _count_forecast_series(query_context) >= min_series
+
+
 class ChartDataRestApi(ChartRestApi):
-    include_route_methods = {"get_data", "data", "data_from_cache"}
+    include_route_methods = {"get_data", "data", "data_batch", "data_from_cache"}
 
     @expose("/<int:pk>/data/", methods=("GET",))
     @protect()
@@ -161,11 +219,7 @@ class ChartDataRestApi(ChartRestApi):
             )
 
         # TODO: support CSV, SQL query and other non-JSON types
-        if (
-            is_feature_enabled("GLOBAL_ASYNC_QUERIES")
-            and query_context.result_format == ChartDataResultFormat.JSON
-            and query_context.result_type == ChartDataResultType.FULL
-        ):
+        if _should_run_async(query_context):
             return self._run_async(json_body, command)
 
         try:
@@ -249,11 +303,7 @@ class ChartDataRestApi(ChartRestApi):
             )
 
         # TODO: support CSV, SQL query and other non-JSON types
-        if (
-            is_feature_enabled("GLOBAL_ASYNC_QUERIES")
-            and query_context.result_format == ChartDataResultFormat.JSON
-            and query_context.result_type == ChartDataResultType.FULL
-        ):
+        if _should_run_async(query_context):
             return self._run_async(json_body, command)
 
         form_data = json_body.get("form_data")
@@ -261,6 +311,128 @@ class ChartDataRestApi(ChartRestApi):
             command, form_data=form_data, datasource=query_context.datasource
         )
 
+    @expose("/data/batch", methods=("POST",))
+    @protect()
+    @statsd_metrics
+    @event_logger.log_this_with_context(
+        action=lambda self, *args, **kwargs: f"{self.__class__.__name__}.data_batch",
+        log_to_statsd=False,
+    )
+    def data_batch(self) -> Response:
+        """
+        Take several query contexts, e.g. of all the charts of a dashboard, and
+        stream the payload data response of each of them as it is ready
+        ---
+        post:
+          summary: Return payload data responses for several queries
+          description: >-
+            Takes a list of query contexts constructed in the client and streams the
+            payload data response of each of them as newline delimited JSON, in
+            the order in which they complete. Each line holds the `index` of the
+            query context in the request and its `status`, along with the `result`
+            or an error `message`. Queries shared by several query contexts are only
+            run once. Only the JSON result format is supported.
+          requestBody:
+            required: true
+            content:
+              application/json:
+                schema:
+                  type: object
+                  properties:
+                    query_contexts:
+                      type: array
+                      items:
+                        $ref: "#/components/schemas/ChartDataQueryContextSchema"
+          responses:
+            200:
+              description: Query results, as newline delimited JSON
+              content:
+                application/x-ndjson:
+                  schema:
+                    type: string
+            400:
+              $ref: '#/components/responses/400'
+            401:
+              $ref: '#/components/responses/401'
+            500:
+              $ref: '#/components/responses/500'
+        """
+        json_body = request.json if request.is_json else None
+        if not isinstance(json_body, dict) or not isinstance(
+            json_body.get("query_contexts"), list
+        ):
+            return self.response_400(message=_("Request is not JSON"))
+
+        errors: list[tuple[int, int, str]] = []
+        indexes: list[int] = []
+        query_contexts: list[QueryContext] = []
+        for index, form_data in enumerate(json_body["query_contexts"]):
+            try:
+                query_context = self._create_query_context_from_form(form_data)
+                ChartDataCommand(query_context).validate()
+            except DatasourceNotFound:
+                errors.append((index, 404, _("Not found")))
+            except QueryObjectValidationError as error:
+                errors.append((index, 400, error.message))
+            except SupersetSecurityException as error:
+                errors.append((index, error.status, error.message))
+            except ValidationError as error:
+                message = _(
+                    "Request is incorrect: %(error)s", error=error.normalized_messages()
+                )
+                errors.append((index, 400, message))
+            else:
+                if query_context.result_format != ChartDataResultFormat.JSON or (
+                    query_context.result_type == ChartDataResultType.POST_PROCESSED
+                ):
+                    message = _(
+                        "Unsupported result_format: %(result_format)s",
+                        result_format=query_context.result_format,
+                    )
+                    errors.append((index, 400, message))
+                    continue
+                indexes.append(index)
+                query_contexts.append(query_context)
+
+        command = ChartDataBatchCommand(query_contexts)
+
+        def stream() -> Iterator[str]:
+            for index, status, message in errors:
+                yield self._get_batch_line(index, status, message=message)
+            for position, result in command.run():
+                index = indexes[position]
+                if isinstance(result, ChartDataCacheLoadError):
+                    yield self._get_batch_line(index, 422, message=result.message)
+                elif isinstance(result, ChartDataQueryFailedError):
+                    yield self._get_batch_line(index, 400, message=result.message)
+                elif isinstance(result, SupersetException):
+                    yield self._get_batch_line(
+                        index, result.status, message=result.message
+                    )
+                elif isinstance(result, Exception):
+                    yield self._get_batch_line(index, 500, message=str(result))
+                else:
+                    queries = result["queries"]
+                    if security_manager.is_guest_user():
+                        for query in queries:
+                            with contextlib.suppress(KeyError):
+                                del query["query"]
+                    yield self._get_batch_line(index, 200, result=queries)
+
+        return Response(
+            stream_with_context(stream()),
+            mimetype="application/x-ndjson",
+        )
+
+    @staticmethod
+    def _get_batch_line(index: int, status: int, **kwargs: Any) -> str:
+        line = json.dumps(
+            {"index": index, "status": status, **kwargs},
+            default=json.json_int_dttm_ser,
+            ignore_nan=True,
+        )
+        return f"{line}\n"
+
     @expose("/data/<cache_key>", methods=("GET",))
     @protect()
     @statsd_metrics
@@ -1463,6 +1463,13 @@ class ChartDataResponseResult(Schema):
         metadata={"description": "Amount of rows in result set"},
         allow_none=False,
     )
+    post_processing_stats = fields.Dict(
+        metadata={
+            "description": "The duration of each post processing step and the peak "
+            "memory allocated, when enabled by POST_PROCESSING_STATS"
+        },
+        allow_none=True,
+    )
     data = fields.List(fields.Dict(), metadata={"description": "A list with results"})
     colnames = fields.List(
         fields.String(), metadata={"description": "A list of column names"}
@@ -0,0 +1,251 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import copy
+import logging
+from collections import defaultdict, deque
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any, Callable, Optional, Union
+
+from flask import current_app, g
+
+from superset.commands.base import BaseCommand
+from superset.commands.chart.data.get_data_command import ChartDataCommand
+from superset.commands.chart.exceptions import (
+    ChartDataCacheLoadError,
+    ChartDataQueryFailedError,
+)
+from superset.common.chart_data import ChartDataResultType
+from superset.common.query_context import QueryContext
+from superset.common.query_object import QueryObject
+from superset.common.utils.query_cache_manager import QueryCacheManager
+from superset.constants import CacheRegion
+from superset.utils.decorators import copy_current_context, load_in_thread
+
+logger = logging.getLogger(__name__)
+
+# result types whose payload is the df payload of the query object, the other result
+# types are computed when building the result of each query context
+SHARED_RESULT_TYPES = {
+    ChartDataResultType.FULL,
+    ChartDataResultType.RESULTS,
+}
+
+BatchResult = tuple[int, Union[dict[str, Any], Exception]]
+
+
+@contextmanager
+def form_data_context(query_context: QueryContext) -> Iterator[None]:
+    """
+    Expose the form data of a query context to Jinja templates through ``g``, as for
+    async queries, since the body of a batch request holds several query contexts.
+    """
+    previous = g.pop("form_data", None)
+    g.form_data = {"form_data": query_context.form_data, **query_context.cache_values}
+    try:
+        yield
+    finally:
+        g.pop("form_data", None)
+        if previous is not None:
+            g.form_data = previous
+
+
+def copy_query(
+    query_context: QueryContext,
+    query_obj: QueryObject,
+) -> Callable[[], tuple[QueryContext, QueryObject]]:
+    """
+    Return a function copying a query context and a query object, with their
+    datasource and chart loaded again in the session of the thread calling it.
+
+    Their ORM objects belong to the session of the request, which can't be used by
+    the workers running the queries.
+    """
+    load_datasource = load_in_thread(query_context.datasource)
+    load_slice = load_in_thread(query_context.slice_)
+
+    def copy_() -> tuple[QueryContext, QueryObject]:
+        datasource = load_datasource()
+        query_context_copy = QueryContext(
+            datasource=datasource,
+            queries=query_context.queries,
+            slice_=load_slice(),
+            form_data=query_context.form_data,
+            result_type=query_context.result_type,
+            result_format=query_context.result_format,
+            force=query_context.force,
+            custom_cache_timeout=query_context.custom_cache_timeout,
+            cache_values=query_context.cache_values,
+        )
+        query_context_copy.df_payloads = query_context.df_payloads
+        query_obj_copy = copy.copy(query_obj)
+        query_obj_copy.datasource = datasource
+        return query_context_copy, query_obj_copy
+
+    return copy_
+
+
+def get_df_payload(
+    copy_query_: Callable[[], tuple[QueryContext, QueryObject]],
+) -> None:
+    query_context, query_obj = copy_query_()
+    with form_data_context(query_context):
+        query_context.get_df_payload(query_obj)
+
+
+class ChartDataBatchCommand(BaseCommand):
+    """
+    Return the data of several query contexts at once, e.g. all the charts of a
+    dashboard.
+
+    Query objects with the same cache key are only run once, and the data cache is
+    read with a single round trip. The remaining queries run concurrently, with a limit
+    on the number of queries running against each database. The result of a query
+    context is yielded as soon as all of its queries are done, along with its position
+    in the batch.
+
+    Access to each query context must be checked beforehand, with
+    ``ChartDataCommand.validate``.
+    """
+
+    def __init__(self, query_contexts: list[QueryContext]) -> None:
+        self._query_contexts = query_contexts
+        # the cache keys of the query objects of each query context
+        self._cache_keys: dict[int, set[str]] = {}
+        # the query context and query object computing the payload of each cache key
+        self._queries: dict[str, tuple[QueryContext, QueryObject]] = {}
+        self._errors: dict[str, Exception] = {}
+        self._pending: dict[int, set[str]] = {}
+
+    def run(self) -> Iterator[BatchResult]:
+        shared_payloads: dict[str, dict[str, Any]] = {}
+        forced_keys = set()
+        for index, query_context in enumerate(self._query_contexts):
+            query_context.df_payloads = shared_payloads
+            try:
+                with form_data_context(query_context):
+                    cache_keys = self._get_cache_keys(query_context)
+            except Exception as ex:  # pylint: disable=broad-except
+                logger.exception("Unable to compute the cache keys of a query context")
+                yield index, ex
+                continue
+
+            self._cache_keys[index] = cache_keys
+            self._pending[index] = set(cache_keys)
+            if query_context.force or query_context.get_cache_timeout() == -1:
+                forced_keys.update(cache_keys)
+
+        cached = QueryCacheManager.get_many(
+            [key for key in self._queries if key not in forced_keys],
+            region=CacheRegion.DATA,
+        )
+        for cache_key, query_cache in cached.items():
+            query_context, query_obj = self._queries.pop(cache_key)
+            with form_data_context(query_context):
+                query_context.get_df_payload(query_obj, query_cache=query_cache)
+
+        yield from self._complete(set(cached))
+        yield from self._run_queries()
+
+    def validate(self) -> None:
+        for query_context in self._query_contexts:
+            ChartDataCommand(query_context).validate()
+
+    def _get_cache_keys(self, query_context: QueryContext) -> set[str]:
+        cache_keys = set()
+        for query_obj in query_context.queries:
+            result_type = query_obj.result_type or query_context.result_type
+            if result_type not in SHARED_RESULT_TYPES:
+                continue
+            if cache_key := query_context.query_cache_key(query_obj):
+                cache_keys.add(cache_key)
+                if cache_key not in self._queries or query_context.force:
+                    self._queries[cache_key] = (query_context, query_obj)
+        return cache_keys
+
+    def _run_queries(self) -> Iterator[BatchResult]:
+        """
+        Run the queries not found in the cache, yielding the results of the query
+        contexts as their queries complete.
+        """
+        if not self._queries:
+            return
+
+        queued: dict[Optional[int], deque[str]] = defaultdict(deque)
+        for cache_key, (query_context, _) in self._queries.items():
+            database_id = getattr(query_context.datasource, "database_id", None)
+            queued[database_id].append(cache_key)
+
+        max_workers = current_app.config["CHART_DATA_BATCH_MAX_WORKERS"]
+        max_queries = current_app.config["CHART_DATA_BATCH_MAX_QUERIES_PER_DATABASE"]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            running: dict[Future[Any], tuple[str, Optional[int]]] = {}
+
+            def submit(database_id: Optional[int]) -> None:
+                cache_key = queued[database_id].popleft()
+                query_context, query_obj = self._queries[cache_key]
+                future = executor.submit(
+                    copy_current_context(get_df_payload),
+                    copy_query(query_context, query_obj),
+                )
+                running[future] = (cache_key, database_id)
+
+            for database_id, cache_keys in queued.items():
+                for _ in range(min(max_queries, len(cache_keys))):
+                    submit(database_id)
+
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                completed = set()
+                for future in done:
+                    cache_key, database_id = running.pop(future)
+                    if ex := future.exception():
+                        logger.exception(ex)
+                        self._errors[cache_key] = ex
+                    if queued[database_id]:
+                        submit(database_id)
+                    completed.add(cache_key)
+                yield from self._complete(completed)
+
+    def _complete(self, cache_keys: set[str]) -> Iterator[BatchResult]:
+        """
+        Yield the results of the query contexts that are not waiting for any other
+        query.
+        """
+        for index, pending in list(self._pending.items()):
+            pending -= cache_keys
+            if not pending:
+                del self._pending[index]
+                yield index, self._get_result(index)
+
+    def _get_result(self, index: int) -> dict[str, Any] | Exception:
+        for cache_key in self._cache_keys[index]:
+            if ex := self._errors.get(cache_key):
+                return ex
+
+        query_context = self._query_contexts[index]
+        try:
+            with form_data_context(query_context):
+                return ChartDataCommand(query_context).run()
+        except (ChartDataCacheLoadError, ChartDataQueryFailedError) as ex:
+            return ex
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.exception(ex)
+            return ex
@@ -20,6 +20,7 @@ from __future__ import annotations
 import logging
 from typing import Any, cast
 
+from flask import current_app
 from sqlalchemy.orm import lazyload, load_only
 
 from superset.commands.base import BaseCommand
@@ -29,6 +30,7 @@ from superset.commands.database.exceptions import (
 )
 from superset.connectors.sqla.models import SqlaTable
 from superset.daos.database import DatabaseDAO
+from superset.daos.metadata_catalog import MetadataCatalogDAO
 from superset.exceptions import SupersetException
 from superset.extensions import db, security_manager
 from superset.models.core import Database
@@ -39,21 +41,33 @@ logger = logging.getLogger(__name__)
 class TablesDatabaseCommand(BaseCommand):
     _model: Database
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         db_id: int,
         catalog_name: str | None,
         schema_name: str,
         force: bool,
+        search: str | None = None,
+        search_mode: str = "prefix",
+        page: int | None = None,
+        page_size: int | None = None,
     ):
         self._db_id = db_id
         self._catalog_name = catalog_name
         self._schema_name = schema_name
         self._force = force
+        self._search = search
+        self._search_mode = search_mode
+        self._page = page
+        self._page_size = page_size
 
     def run(self) -> dict[str, Any]:
         self.validate()
         try:
+            if current_app.config["METADATA_CATALOG_INDEX"] and not self._force:
+                if (payload := self._get_indexed_tables()) is not None:
+                    return payload
+
             tables = security_manager.get_datasources_accessible_by_user(
                 database=self._model,
                 catalog=self._catalog_name,
@@ -84,27 +98,7 @@ class TablesDatabaseCommand(BaseCommand):
                 ),
             )
 
-            extra_dict_by_name = {
-                table.name: table.extra_dict
-                for table in (
-                    db.session.query(SqlaTable)
-                    .filter(
-                        SqlaTable.database_id == self._model.id,
-                        SqlaTable.catalog == self._catalog_name,
-                        SqlaTable.schema == self._schema_name,
-                    )
-                    .options(
-                        load_only(
-                            SqlaTable.catalog,
-                            SqlaTable.schema,
-                            SqlaTable.table_name,
-                            SqlaTable.extra,
-                        ),
-                        lazyload(SqlaTable.columns),
-                        lazyload(SqlaTable.metrics),
-                    )
-                ).all()
-            }
+            extra_dict_by_name = self._get_extra_dict_by_name()
 
             options = sorted(
                 [
@@ -125,13 +119,100 @@ class TablesDatabaseCommand(BaseCommand):
                 key=lambda item: item["value"],
             )
 
-            payload = {"count": len(tables) + len(views), "result": options}
+            if self._search:
+                search = self._search.lower()
+                options = [
+                    option
+                    for option in options
+                    if (
+                        search in option["value"].lower()
+                        if self._search_mode == "contains"
+                        else option["value"].lower().startswith(search)
+                    )
+                ]
+
+            payload = {"count": len(options), "result": self._paginate(options)}
             return payload
         except SupersetException:
             raise
         except Exception as ex:
             raise DatabaseTablesUnexpectedError(str(ex)) from ex
 
+    def _get_indexed_tables(self) -> dict[str, Any] | None:
+        """
+        Return the tables and views from the metadata catalog, if they're indexed.
+        """
+        indexed = MetadataCatalogDAO.find_tables(
+            self._model,
+            self._catalog_name,
+            self._schema_name,
+            search=self._search,
+            search_mode=self._search_mode,
+            page=self._page,
+            page_size=self._page_size,
+        )
+        if indexed is None:
+            return None
+
+        count, entries = indexed
+        extra_dict_by_name = self._get_extra_dict_by_name(
+            [entry.name for entry in entries if entry.type == "table"]
+        )
+        return {
+            "count": count,
+            "result": [
+                {
+                    "value": entry.name,
+                    "type": "table",
+                    "extra": extra_dict_by_name.get(entry.name),
+                }
+                if entry.type == "table"
+                else {"value": entry.name, "type": "view"}
+                for entry in entries
+            ],
+        }
+
+    def _get_extra_dict_by_name(
+        self,
+        names: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Return the extra metadata of the datasets of the schema, by table name.
+        """
+        filters = [
+            SqlaTable.database_id == self._model.id,
+            SqlaTable.catalog == self._catalog_name,
+            SqlaTable.schema == self._schema_name,
+        ]
+        if names is not None:
+            if not names:
+                return {}
+            filters.append(SqlaTable.table_name.in_(names))
+
+        return {
+            table.name: table.extra_dict
+            for table in (
+                db.session.query(SqlaTable)
+                .filter(*filters)
+                .options(
+                    load_only(
+                        SqlaTable.catalog,
+                        SqlaTable.schema,
+                        SqlaTable.table_name,
+                        SqlaTable.extra,
+                    ),
+                    lazyload(SqlaTable.columns),
+                    lazyload(SqlaTable.metrics),
+                )
+            ).all()
+        }
+
+    def _paginate(self, options: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        if self._page_size is None:
+            return options
+        start = (self._page or 0) * self._page_size
+        return options[start : start + self._page_size]
+
     def validate(self) -> None:
         self._model = cast(Database, DatabaseDAO.find_by_id(self._db_id))
         if not self._model:
@@ -18,12 +18,14 @@
 import logging
 from datetime import datetime, timedelta
 from functools import partial
+from typing import Any, Optional, Union
 
 from flask import current_app
 from sqlalchemy.exc import SQLAlchemyError
 
 from superset.commands.distributed_lock.base import BaseDistributedLockCommand
 from superset.daos.key_value import KeyValueDAO
+from superset.distributed_lock.types import LockValue
 from superset.exceptions import CreateKeyValueDistributedLockFailedException
 from superset.key_value.exceptions import (
     KeyValueCodecEncodeException,
@@ -39,6 +41,19 @@ stats_logger = current_app.config["STATS_LOGGER"]
 class CreateDistributedLock(BaseDistributedLockCommand):
     lock_expiration = timedelta(seconds=30)
 
+    def __init__(
+        self,
+        namespace: str,
+        params: Union[dict[str, Any], None] = None,
+        *,
+        owner: str,
+        lock_expiration: Optional[timedelta] = None,
+    ):
+        super().__init__(namespace, params)
+        self.owner = owner
+        if lock_expiration is not None:
+            self.lock_expiration = lock_expiration
+
     def validate(self) -> None:
         pass
 
@@ -55,9 +70,10 @@ class CreateDistributedLock(BaseDistributedLockCommand):
     )
     def run(self) -> None:
         KeyValueDAO.delete_expired_entries(self.resource)
+        value: LockValue = {"value": True, "owner": self.owner}
         KeyValueDAO.create_entry(
             resource=KeyValueResource.LOCK,
-            value={"value": True},
+            value=value,
             codec=self.codec,
             key=self.key,
             expires_on=datetime.now() + self.lock_expiration,
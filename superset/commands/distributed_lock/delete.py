@@ -17,6 +17,7 @@
 
 import logging
 from functools import partial
+from typing import Any, Optional, Union
 
 from flask import current_app
 from sqlalchemy.exc import SQLAlchemyError
@@ -32,6 +33,16 @@ stats_logger = current_app.config["STATS_LOGGER"]
 
 
 class DeleteDistributedLock(BaseDistributedLockCommand):
+    def __init__(
+        self,
+        namespace: str,
+        params: Union[dict[str, Any], None] = None,
+        *,
+        owner: Optional[str] = None,
+    ):
+        super().__init__(namespace, params)
+        self.owner = owner
+
     def validate(self) -> None:
         pass
 
@@ -46,4 +57,10 @@ class DeleteDistributedLock(BaseDistributedLockCommand):
         ),
     )
     def run(self) -> None:
+        if self.owner is not None:
+            # the lock may have expired, and been taken by another owner since
+            value = KeyValueDAO.get_value(self.resource, self.key, self.codec)
+            if not value or value.get("owner") != self.owner:
+                return
+
         KeyValueDAO.delete_entry(self.resource, self.key)
@@ -17,22 +17,34 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Iterator
+from itertools import chain
 from typing import Any, cast, TypedDict
 
 import pandas as pd
+import pyarrow as pa
 from flask_babel import gettext as __
 
 from superset import app, db, results_backend, results_backend_use_msgpack
 from superset.commands.base import BaseCommand
+from superset.dataframe import df_to_records
+from superset.db_engine_specs.lib import has_custom_method
 from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
 from superset.exceptions import SupersetErrorException, SupersetSecurityException
 from superset.models.sql_lab import Query
+from superset.result_set import SupersetResultSet
 from superset.sql_parse import ParsedQuery
 from superset.sqllab.limiting_factor import LimitingFactor
+from superset.sqllab.results_format import ArrowResultsReader, is_arrow_results
 from superset.utils import core as utils, csv
-from superset.views.utils import _deserialize_results_payload
+from superset.utils.dates import now_as_float
+from superset.views.utils import (
+    _deserialize_arrow_results,
+    _deserialize_results_payload,
+)
 
 config = app.config
+stats_logger = config["STATS_LOGGER"]
 
 logger = logging.getLogger(__name__)
 
@@ -43,9 +55,15 @@ class SqlExportResult(TypedDict):
     data: list[Any]
 
 
+class SqlExportStream(TypedDict):
+    query: Query
+    data: Iterator[str]
+
+
 class SqlResultExportCommand(BaseCommand):
     _client_id: str
     _query: Query
+    count: int
 
     def __init__(
         self,
@@ -86,20 +104,84 @@ class SqlResultExportCommand(BaseCommand):
         self,
     ) -> SqlExportResult:
         self.validate()
+        data = "".join(self.stream())
+
+        return {
+            "query": self._query,
+            "count": self.count,
+            "data": data,
+        }
+
+    def stream_result(self) -> SqlExportStream:
+        """
+        Validate and start the export, returning the CSV as an iterator of chunks.
+
+        The first chunk is produced upfront, so that errors reading the results are
+        raised before a response is sent.
+        """
+        self.validate()
+        chunks = self.stream()
+        first_chunk = next(chunks, "")
+
+        return {
+            "query": self._query,
+            "data": chain([first_chunk], chunks),
+        }
+
+    def stream(self) -> Iterator[str]:
+        """
+        Yield the results as CSV, one chunk of rows at a time, updating ``count`` as
+        rows are exported. ``validate`` must be called first.
+        """
+        start = now_as_float()
+        self.count = 0
+        max_rows = config["SQLLAB_CSV_EXPORT_MAX_ROWS"]
+
+        def capped(dfs: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+            for df in dfs:
+                if max_rows is not None:
+                    df = df[: max_rows - self.count]
+                self.count += len(df.index)
+                stats_logger.incr("sqllab.export_csv.chunk")
+                yield df
+
+                if max_rows is not None and self.count >= max_rows:
+                    logger.info("CSV export reached the limit of %i rows", max_rows)
+                    return
+
+        yield from csv.df_to_escaped_csv_chunks(
+            capped(self._iter_dataframes(max_rows)),
+            index=False,
+            **config["CSV_EXPORT"],
+        )
+
+        stats_logger.timing("sqllab.export_csv.time", now_as_float() - start)
+        stats_logger.gauge("sqllab.export_csv.rows", self.count)
+
+    def _iter_dataframes(self, max_rows: int | None) -> Iterator[pd.DataFrame]:
         blob = None
         if results_backend and self._query.results_key:
             logger.info(
                 "Fetching CSV from results backend [%s]", self._query.results_key
             )
             blob = results_backend.get(self._query.results_key)
-        if blob:
-            logger.info("Decompressing")
-            payload = utils.zlib_decompress(
-                blob, decode=not results_backend_use_msgpack
-            )
-            obj = _deserialize_results_payload(
-                payload, self._query, cast(bool, results_backend_use_msgpack)
-            )
+
+        if is_arrow_results(blob) and not has_custom_method(
+            self._query.database.db_engine_spec, "expand_data"
+        ):
+            logger.info("Converting results to CSV one batch at a time")
+            yield from self._iter_arrow_results(ArrowResultsReader(blob))
+        elif blob:
+            if is_arrow_results(blob):
+                obj = _deserialize_arrow_results(ArrowResultsReader(blob), self._query)
+            else:
+                logger.info("Decompressing")
+                payload = utils.zlib_decompress(
+                    blob, decode=not results_backend_use_msgpack
+                )
+                obj = _deserialize_results_payload(
+                    payload, self._query, cast(bool, results_backend_use_msgpack)
+                )
 
             df = pd.DataFrame(
                 data=obj["data"],
@@ -108,6 +190,9 @@ class SqlResultExportCommand(BaseCommand):
             )
 
             logger.info("Using pandas to convert to CSV")
+            chunk_size = config["RESULT_SET_FETCH_BATCH_SIZE"]
+            for offset in range(0, max(len(df.index), 1), chunk_size):
+                yield df[offset : offset + chunk_size]
         else:
             logger.info("Running a query to turn into CSV")
             if self._query.select_sql:
@@ -126,16 +211,33 @@ class SqlResultExportCommand(BaseCommand):
             }:
                 # remove extra row from `increased_limit`
                 limit -= 1
-            df = self._query.database.get_df(
+            if max_rows is not None:
+                limit = max_rows if limit is None else min(limit, max_rows)
+
+            for df in self._query.database.iter_df(
                 sql,
                 self._query.catalog,
                 self._query.schema,
-            )[:limit]
-
-        csv_data = csv.df_to_escaped_csv(df, index=False, **config["CSV_EXPORT"])
-
-        return {
-            "query": self._query,
-            "count": len(df.index),
-            "data": csv_data,
-        }
+                limit,
+            ):
+                # the dates-only format pandas picks for datetime columns depends on
+                # the values of each chunk, render timestamps the same way throughout
+                yield df.astype(
+                    {
+                        name: object
+                        for name, dtype in df.dtypes.items()
+                        if pd.api.types.is_datetime64_any_dtype(dtype)
+                    }
+                )
+
+    @staticmethod
+    def _iter_arrow_results(reader: ArrowResultsReader) -> Iterator[pd.DataFrame]:
+        columns = [column["name"] for column in reader.payload["columns"]]
+        empty = True
+        for batch in reader.iter_batches():
+            df = SupersetResultSet.convert_table_to_df(pa.Table.from_batches([batch]))
+            yield pd.DataFrame(data=df_to_records(df), dtype=object, columns=columns)
+            empty = False
+
+        if empty:
+            yield pd.DataFrame(columns=columns)
@@ -26,10 +26,14 @@ from superset.commands.base import BaseCommand
 from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
 from superset.exceptions import SerializationError, SupersetErrorException
 from superset.models.sql_lab import Query
+from superset.sqllab.results_format import ArrowResultsReader, is_arrow_results
 from superset.sqllab.utils import apply_display_max_row_configuration_if_require
 from superset.utils import core as utils
 from superset.utils.dates import now_as_float
-from superset.views.utils import _deserialize_results_payload
+from superset.views.utils import (
+    _deserialize_arrow_results,
+    _deserialize_results_payload,
+)
 
 config = app.config
 SQLLAB_QUERY_COST_ESTIMATE_TIMEOUT = config["SQLLAB_QUERY_COST_ESTIMATE_TIMEOUT"]
@@ -103,13 +107,19 @@ class SqlExecutionResultsCommand(BaseCommand):
     ) -> dict[str, Any]:
         """Runs arbitrary sql and returns data as json"""
         self.validate()
-        payload = utils.zlib_decompress(
-            self._blob, decode=not results_backend_use_msgpack
-        )
         try:
-            obj = _deserialize_results_payload(
-                payload, self._query, cast(bool, results_backend_use_msgpack)
-            )
+            if is_arrow_results(self._blob):
+                # only decode the record batches needed for the displayed rows
+                obj = _deserialize_arrow_results(
+                    ArrowResultsReader(self._blob), self._query, self._rows
+                )
+            else:
+                payload = utils.zlib_decompress(
+                    self._blob, decode=not results_backend_use_msgpack
+                )
+                obj = _deserialize_results_payload(
+                    payload, self._query, cast(bool, results_backend_use_msgpack)
+                )
         except SerializationError as ex:
             raise SupersetErrorException(
                 SupersetError(
@@ -31,6 +31,7 @@ from superset.models.slice import Slice
 from superset.utils.core import GenericDataType
 
 if TYPE_CHECKING:
+    from superset.common.utils.query_cache_manager import QueryCacheManager
     from superset.connectors.sqla.models import BaseDatasource
     from superset.models.helpers import QueryResult
 
@@ -58,6 +59,10 @@ class QueryContext:
 
     cache_values: dict[str, Any]
 
+    # the df payloads by cache key, when shared with other query contexts so that
+    # identical query objects are only run once, see ``ChartDataBatchCommand``
+    df_payloads: dict[str, dict[str, Any]] | None = None
+
     _processor: QueryContextProcessor
 
     # TODO: Type datasource and query_object dictionary with TypedDict when it becomes
@@ -119,10 +124,12 @@ class QueryContext:
         self,
         query_obj: QueryObject,
         force_cached: bool | None = False,
+        query_cache: QueryCacheManager | None = None,
     ) -> dict[str, Any]:
         return self._processor.get_df_payload(
             query_obj=query_obj,
             force_cached=force_cached,
+            query_cache=query_cache,
         )
 
     def get_query_result(self, query_object: QueryObject) -> QueryResult:
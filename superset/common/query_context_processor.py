@@ -19,7 +19,9 @@ from __future__ import annotations
 import copy
 import logging
 import re
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from typing import Any, cast, ClassVar, TYPE_CHECKING, TypedDict
 
 import numpy as np
@@ -67,6 +69,8 @@ from superset.utils.core import (
     TIME_COMPARISON,
 )
 from superset.utils.date_parser import get_past_or_future, normalize_time_delta
+from superset.utils.decorators import copy_current_context, load_in_thread
+from superset.utils.pandas_postprocessing.pipeline import PostProcessingPipeline
 from superset.utils.pandas_postprocessing.utils import unescape_separator
 from superset.views.utils import get_viz
 from superset.viz import viz_types
@@ -108,6 +112,20 @@ class CachedTimeOffset(TypedDict):
     cache_keys: list[str | None]
 
 
+@dataclass
+class PendingTimeOffset:
+    """
+    A time offset query that was not found in the cache.
+    """
+
+    offset: str
+    original_offset: str
+    query_object: QueryObject
+    query_object_dct: dict[str, Any]
+    cache: QueryCacheManager
+    cache_key: str
+
+
 class QueryContextProcessor:
     """
     The query context contains the query object and additional fields necessary
@@ -125,51 +143,73 @@ class QueryContextProcessor:
     enforce_numerical_metrics: ClassVar[bool] = True
 
     def get_df_payload(
-        self, query_obj: QueryObject, force_cached: bool | None = False
+        self,
+        query_obj: QueryObject,
+        force_cached: bool | None = False,
+        query_cache: QueryCacheManager | None = None,
     ) -> dict[str, Any]:
-        """Handles caching around the df payload retrieval"""
+        """
+        Handles caching around the df payload retrieval
+
+        :param query_obj: The query object
+        :param force_cached: Raise an error if the results are not in the cache
+        :param query_cache: The results already read from the cache, if any
+        """
         cache_key = self.query_cache_key(query_obj)
+        shared_payloads = self._query_context.df_payloads
+        if (
+            shared_payloads is not None
+            and cache_key
+            and (payload := shared_payloads.get(cache_key)) is not None
+        ):
+            return self._copy_df_payload(payload)
+
         timeout = self.get_cache_timeout()
         force_query = self._query_context.force or timeout == -1
-        cache = QueryCacheManager.get(
+        cache = query_cache or QueryCacheManager.get(
             key=cache_key,
             region=CacheRegion.DATA,
             force_query=force_query,
             force_cached=force_cached,
         )
+        if cache_key and not force_query:
+            stats_logger.incr(
+                f"query_cache.payloads.{'hit' if cache.is_loaded else 'miss'}"
+            )
 
-        if query_obj and cache_key and not cache.is_loaded:
-            try:
-                if invalid_columns := [
-                    col
-                    for col in get_column_names_from_columns(query_obj.columns)
-                    + get_column_names_from_metrics(query_obj.metrics or [])
-                    if (
-                        col not in self._qc_datasource.column_names
-                        and col != DTTM_ALIAS
-                    )
-                ]:
-                    raise QueryObjectValidationError(
-                        _(
-                            "Columns missing in dataset: %(invalid_columns)s",
-                            invalid_columns=invalid_columns,
+        with cache.single_flight(cache_key, CacheRegion.DATA, force_query):
+            if query_obj and cache_key and (not cache.is_loaded or cache.is_stale):
+                try:
+                    if invalid_columns := [
+                        col
+                        for col in get_column_names_from_columns(query_obj.columns)
+                        + get_column_names_from_metrics(query_obj.metrics or [])
+                        if (
+                            col not in self._qc_datasource.column_names
+                            and col != DTTM_ALIAS
+                        )
+                    ]:
+                        raise QueryObjectValidationError(
+                            _(
+                                "Columns missing in dataset: %(invalid_columns)s",
+                                invalid_columns=invalid_columns,
+                            )
                         )
-                    )
 
-                query_result = self.get_query_result(query_obj)
-                annotation_data = self.get_annotation_data(query_obj)
-                cache.set_query_result(
-                    key=cache_key,
-                    query_result=query_result,
-                    annotation_data=annotation_data,
-                    force_query=force_query,
-                    timeout=self.get_cache_timeout(),
-                    datasource_uid=self._qc_datasource.uid,
-                    region=CacheRegion.DATA,
-                )
-            except QueryObjectValidationError as ex:
-                cache.error_message = str(ex)
-                cache.status = QueryStatus.FAILED
+                    query_result = self.get_query_result(query_obj)
+                    annotation_data = self.get_annotation_data(query_obj)
+                    cache.set_query_result(
+                        key=cache_key,
+                        query_result=query_result,
+                        annotation_data=annotation_data,
+                        force_query=force_query,
+                        timeout=self.get_cache_timeout(),
+                        datasource_uid=self._qc_datasource.uid,
+                        region=CacheRegion.DATA,
+                    )
+                except QueryObjectValidationError as ex:
+                    cache.error_message = str(ex)
+                    cache.status = QueryStatus.FAILED
 
         # the N-dimensional DataFrame has converted into flat DataFrame
         # by `flatten operator`, "comma" in the column is escaped by `escape_separator`
@@ -182,7 +222,7 @@ class QueryContextProcessor:
         }
         cache.df.columns = [unescape_separator(col) for col in cache.df.columns.values]
 
-        return {
+        payload = {
             "cache_key": cache_key,
             "cached_dttm": cache.cache_dttm,
             "cache_timeout": self.get_cache_timeout(),
@@ -198,10 +238,26 @@ class QueryContextProcessor:
             "stacktrace": cache.stacktrace,
             "rowcount": len(cache.df.index),
             "sql_rowcount": cache.sql_rowcount,
+            "post_processing_stats": cache.post_processing_stats,
             "from_dttm": query_obj.from_dttm,
             "to_dttm": query_obj.to_dttm,
             "label_map": label_map,
         }
+        if shared_payloads is not None and cache_key:
+            shared_payloads[cache_key] = payload
+            return self._copy_df_payload(payload)
+        return payload
+
+    def _copy_df_payload(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """
+        Copy a payload shared with other query contexts, so that it can be modified
+        by the caller without affecting the other query contexts.
+        """
+        return {
+            **payload,
+            "df": payload["df"].copy(deep=False),
+            "cache_timeout": self.get_cache_timeout(),
+        }
 
     def query_cache_key(self, query_obj: QueryObject, **kwargs: Any) -> str | None:
         """
@@ -223,6 +279,68 @@ class QueryContextProcessor:
         )
         return cache_key
 
+    def raw_result_cache_key(self, query_obj: QueryObject) -> str:
+        """
+        Returns the cache key of the raw results of a query object, see
+        ``QUERY_CACHE_RAW_RESULTS``
+        """
+        datasource = self._qc_datasource
+        return query_obj.raw_result_cache_key(
+            datasource=datasource.uid,
+            extra_cache_keys=datasource.get_extra_cache_keys(query_obj.to_dict()),
+            rls=security_manager.get_rls_cache_key(datasource),
+            changed_on=datasource.changed_on,
+        )
+
+    def get_raw_query_result(self, query_object: QueryObject) -> QueryResult:
+        """
+        Returns the results of the query object as returned by the datasource, before
+        the time comparisons and the post-processing. They're cached on their own when
+        ``QUERY_CACHE_RAW_RESULTS`` is enabled, so that query objects with the same
+        query but a different post-processing don't run it again.
+        """
+        datasource = self._qc_datasource
+        if not app.config["QUERY_CACHE_RAW_RESULTS"]:
+            return datasource.query(query_object.to_dict())
+
+        cache_key = self.raw_result_cache_key(query_object)
+        timeout = self.get_cache_timeout()
+        force_query = self._query_context.force or timeout == -1
+        cache = QueryCacheManager.get(
+            key=cache_key,
+            region=CacheRegion.DATA,
+            force_query=force_query,
+        )
+        if cache.is_loaded and not cache.is_stale:
+            stats_logger.incr("query_cache.raw_results.hit")
+            return QueryResult(
+                df=cache.df,
+                query=cache.query,
+                duration=timedelta(0),
+                applied_template_filters=cache.applied_template_filters,
+                applied_filter_columns=cache.applied_filter_columns,
+                rejected_filter_columns=cache.rejected_filter_columns,
+            )
+
+        stats_logger.incr("query_cache.raw_results.miss")
+        result = datasource.query(query_object.to_dict())
+        if result.status != QueryStatus.FAILED:
+            QueryCacheManager.set(
+                key=cache_key,
+                value={
+                    "df": result.df,
+                    "query": result.query,
+                    "applied_template_filters": result.applied_template_filters,
+                    "applied_filter_columns": result.applied_filter_columns,
+                    "rejected_filter_columns": result.rejected_filter_columns,
+                    "sql_rowcount": result.sql_rowcount,
+                },
+                timeout=app.config["QUERY_CACHE_RAW_RESULTS_TIMEOUT"] or timeout,
+                datasource_uid=datasource.uid,
+                region=CacheRegion.DATA,
+            )
+        return result
+
     def get_query_result(self, query_object: QueryObject) -> QueryResult:
         """Returns a pandas dataframe based on the query object"""
         query_context = self._query_context
@@ -235,7 +353,7 @@ class QueryContextProcessor:
             # todo(hugh): add logic to manage all sip68 models here
             result = query_context.datasource.exc_query(query_object.to_dict())
         else:
-            result = query_context.datasource.query(query_object.to_dict())
+            result = self.get_raw_query_result(query_object)
             query = result.query + ";\n\n"
 
         df = result.df
@@ -257,9 +375,11 @@ class QueryContextProcessor:
 
             # Re-raising QueryObjectValidationError
             try:
-                df = query_object.exec_post_processing(df)
+                pipeline = PostProcessingPipeline(query_object.post_processing)
+                df = pipeline.run(df)
             except InvalidPostProcessingError as ex:
                 raise QueryObjectValidationError(ex.message) from ex
+            result.post_processing_stats = pipeline.stats
 
         result.df = df
         result.query = query
@@ -408,11 +528,13 @@ class QueryContextProcessor:
         query_object: QueryObject,
     ) -> CachedTimeOffset:
         query_context = self._query_context
-        # ensure query_object is immutable
-        query_object_clone = copy.copy(query_object)
         queries: list[str] = []
         cache_keys: list[str | None] = []
         offset_dfs: dict[str, pd.DataFrame] = {}
+        # offsets that are not cached, keyed by their position in `time_offsets`
+        pending: dict[int, PendingTimeOffset] = {}
+        # position of the last offset stored under each key of `offset_dfs`
+        owners: dict[str, int] = {}
 
         outer_from_dttm, outer_to_dttm = get_since_until_from_query_object(query_object)
         if not outer_from_dttm or not outer_to_dttm:
@@ -430,7 +552,11 @@ class QueryContextProcessor:
         # use columns that are not metrics as join keys
         join_keys = [col for col in df.columns if col not in metric_names]
 
-        for offset in query_object.time_offsets:
+        for position, offset in enumerate(query_object.time_offsets):
+            # ensure query_object is immutable, each offset query is built on its own
+            # copy since they run concurrently
+            query_object_clone = copy.copy(query_object)
+            query_object_clone.filter = copy.deepcopy(query_object.filter)
             try:
                 # pylint: disable=line-too-long
                 # Since the x-axis is also a column name for the time filter, x_axis_label will be set as granularity
@@ -512,18 +638,14 @@ class QueryContextProcessor:
                 cache_key, CacheRegion.DATA, query_context.force
             )
             # whether hit on the cache
-            if cache.is_loaded:
+            owners[offset] = position
+            if cache.is_loaded and not cache.is_stale:
                 offset_dfs[offset] = cache.df
                 queries.append(cache.query)
                 cache_keys.append(cache_key)
                 continue
 
             query_object_clone_dct = query_object_clone.to_dict()
-            # rename metrics: SUM(value) => SUM(value) 1 year ago
-            metrics_mapping = {
-                metric: TIME_COMPARISON.join([metric, original_offset])
-                for metric in metric_names
-            }
 
             # When the original query has limit or offset we wont apply those
             # to the subquery so we prevent data inconsistency due to missing records
@@ -532,14 +654,36 @@ class QueryContextProcessor:
                 query_object_clone_dct["row_limit"] = config["ROW_LIMIT"]
                 query_object_clone_dct["row_offset"] = 0
 
-            if isinstance(self._qc_datasource, Query):
-                result = self._qc_datasource.exc_query(query_object_clone_dct)
-            else:
-                result = self._qc_datasource.query(query_object_clone_dct)
-
-            queries.append(result.query)
+            pending[position] = PendingTimeOffset(
+                offset=offset,
+                original_offset=original_offset,
+                query_object=query_object_clone,
+                query_object_dct=query_object_clone_dct,
+                cache=cache,
+                cache_key=cache_key,
+            )
+            # placeholders, filled once the query has run
+            offset_dfs.setdefault(offset, pd.DataFrame())
+            queries.append("")
             cache_keys.append(None)
 
+        results = self._run_time_offset_queries(
+            [item.query_object_dct for item in pending.values()]
+        )
+        errors = []
+        for (position, item), result in zip(pending.items(), results):
+            if isinstance(result, Exception):
+                errors.append(result)
+                continue
+
+            queries[position] = result.query
+
+            # rename metrics: SUM(value) => SUM(value) 1 year ago
+            metrics_mapping = {
+                metric: TIME_COMPARISON.join([metric, item.original_offset])
+                for metric in metric_names
+            }
+
             offset_metrics_df = result.df
             if offset_metrics_df.empty:
                 offset_metrics_df = pd.DataFrame(
@@ -551,7 +695,7 @@ class QueryContextProcessor:
             else:
                 # 1. normalize df, set dttm column
                 offset_metrics_df = self.normalize_df(
-                    offset_metrics_df, query_object_clone
+                    offset_metrics_df, item.query_object
                 )
 
                 # 2. rename extra query columns
@@ -562,14 +706,19 @@ class QueryContextProcessor:
                 "df": offset_metrics_df,
                 "query": result.query,
             }
-            cache.set(
-                key=cache_key,
+            item.cache.set(
+                key=item.cache_key,
                 value=value,
                 timeout=self.get_cache_timeout(),
                 datasource_uid=query_context.datasource.uid,
                 region=CacheRegion.DATA,
             )
-            offset_dfs[offset] = offset_metrics_df
+            if owners[item.offset] == position:
+                offset_dfs[item.offset] = offset_metrics_df
+
+        # the offsets that succeeded are cached, so they are not queried again
+        if errors:
+            raise errors[0]
 
         if offset_dfs:
             df = self.join_offset_dfs(
@@ -581,6 +730,47 @@ class QueryContextProcessor:
 
         return CachedTimeOffset(df=df, queries=queries, cache_keys=cache_keys)
 
+    def _run_time_offset_queries(
+        self, query_object_dcts: list[dict[str, Any]]
+    ) -> list[QueryResult | Exception]:
+        """
+        Run the time offset queries on a bounded thread pool, returning the result or
+        the exception raised by each query, in order.
+        """
+
+        def run(
+            datasource: BaseDatasource | Query,
+            query_object_dct: dict[str, Any],
+        ) -> QueryResult | Exception:
+            try:
+                if isinstance(datasource, Query):
+                    return datasource.exc_query(query_object_dct)
+                return datasource.query(query_object_dct)
+            except Exception as ex:  # pylint: disable=broad-except
+                return ex
+
+        max_workers = min(
+            config["TIME_OFFSET_QUERY_MAX_WORKERS"],
+            len(query_object_dcts),
+        )
+        if max_workers <= 1:
+            return [
+                run(self._qc_datasource, query_object_dct)
+                for query_object_dct in query_object_dcts
+            ]
+
+        # the datasource belongs to the session of the request, each worker loads it
+        # again in its own session
+        load_datasource = load_in_thread(self._qc_datasource)
+
+        def run_in_worker(query_object_dct: dict[str, Any]) -> QueryResult | Exception:
+            return run(load_datasource(), query_object_dct)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(
+                executor.map(copy_current_context(run_in_worker), query_object_dcts)
+            )
+
     def join_offset_dfs(
         self,
         df: pd.DataFrame,
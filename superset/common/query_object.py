@@ -29,13 +29,12 @@ from pandas import DataFrame
 from superset import feature_flag_manager
 from superset.common.chart_data import ChartDataResultType
 from superset.exceptions import (
-    InvalidPostProcessingError,
     QueryClauseValidationException,
     QueryObjectValidationError,
 )
 from superset.sql_parse import sanitize_clause
 from superset.superset_typing import Column, Metric, OrderBy
-from superset.utils import json, pandas_postprocessing
+from superset.utils import json
 from superset.utils.core import (
     DTTM_ALIAS,
     find_duplicates,
@@ -46,6 +45,7 @@ from superset.utils.core import (
 )
 from superset.utils.hashing import md5_sha_from_dict
 from superset.utils.json import json_int_dttm_ser
+from superset.utils.pandas_postprocessing.pipeline import PostProcessingPipeline
 
 if TYPE_CHECKING:
     from superset.connectors.sqla.models import BaseDatasource
@@ -354,28 +354,14 @@ class QueryObject:  # pylint: disable=too-many-instance-attributes
         the use-provided inputs to bounds, which may be time-relative (as in
         "5 days ago" or "now").
         """
-        cache_dict = self.to_dict()
-        cache_dict.update(extra)
-
-        # TODO: the below KVs can all be cleaned up and moved to `to_dict()` at some
-        #  predetermined point in time when orgs are aware that the previously
-        #  cached results will be invalidated.
-        if not self.apply_fetch_values_predicate:
-            del cache_dict["apply_fetch_values_predicate"]
-        if self.datasource:
-            cache_dict["datasource"] = self.datasource.uid
+        cache_dict = self._get_cache_dict(**extra)
         if self.result_type:
             cache_dict["result_type"] = self.result_type
-        if self.time_range:
-            cache_dict["time_range"] = self.time_range
         if self.post_processing:
             cache_dict["post_processing"] = self.post_processing
         if self.time_offsets:
             cache_dict["time_offsets"] = self.time_offsets
 
-        for k in ["from_dttm", "to_dttm"]:
-            del cache_dict[k]
-
         annotation_fields = [
             "annotationType",
             "descriptionColumns",
@@ -395,6 +381,36 @@ class QueryObject:  # pylint: disable=too-many-instance-attributes
         if annotation_layers:
             cache_dict["annotation_layers"] = annotation_layers
 
+        return md5_sha_from_dict(cache_dict, default=json_int_dttm_ser, ignore_nan=True)
+
+    def raw_result_cache_key(self, **extra: Any) -> str:
+        """
+        The cache key of the results of the query, before the time comparisons and
+        the post-processing. It only depends on the SQL of the query, so it's shared by
+        the query objects that differ in their result type, post-processing or
+        annotations.
+        """
+        cache_dict = self._get_cache_dict(**extra)
+        cache_dict["raw_result"] = True
+        return md5_sha_from_dict(cache_dict, default=json_int_dttm_ser, ignore_nan=True)
+
+    def _get_cache_dict(self, **extra: Any) -> dict[str, Any]:
+        cache_dict = self.to_dict()
+        cache_dict.update(extra)
+
+        # TODO: the below KVs can all be cleaned up and moved to `to_dict()` at some
+        #  predetermined point in time when orgs are aware that the previously
+        #  cached results will be invalidated.
+        if not self.apply_fetch_values_predicate:
+            del cache_dict["apply_fetch_values_predicate"]
+        if self.datasource:
+            cache_dict["datasource"] = self.datasource.uid
+        if self.time_range:
+            cache_dict["time_range"] = self.time_range
+
+        for k in ["from_dttm", "to_dttm"]:
+            del cache_dict[k]
+
         # Add an impersonation key to cache if impersonation is enabled on the db
         # or if the CACHE_QUERY_BY_USER flag is on
         try:
@@ -415,7 +431,7 @@ class QueryObject:  # pylint: disable=too-many-instance-attributes
             # datasource or database do not exist
             pass
 
-        return md5_sha_from_dict(cache_dict, default=json_int_dttm_ser, ignore_nan=True)
+        return cache_dict
 
     def exec_post_processing(self, df: DataFrame) -> DataFrame:
         """
@@ -428,19 +444,4 @@ class QueryObject:  # pylint: disable=too-many-instance-attributes
                  is incorrect
         """
         logger.debug("post_processing: \n %s", pformat(self.post_processing))
-        for post_process in self.post_processing:
-            operation = post_process.get("operation")
-            if not operation:
-                raise InvalidPostProcessingError(
-                    _("`operation` property of post processing object undefined")
-                )
-            if not hasattr(pandas_postprocessing, operation):
-                raise InvalidPostProcessingError(
-                    _(
-                        "Unsupported post processing operation: %(operation)s",
-                        type=operation,
-                    )
-                )
-            options = post_process.get("options", {})
-            df = getattr(pandas_postprocessing, operation)(df, **options)
-        return df
+        return PostProcessingPipeline(self.post_processing).run(df)
@@ -21,6 +21,7 @@ from typing import Any, TYPE_CHECKING
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 
 if TYPE_CHECKING:
     from superset.common.query_object import QueryObject
@@ -70,3 +71,38 @@ def is_datetime_series(series: Any) -> bool:
     return pd.api.types.is_datetime64_any_dtype(series) or (
         series.apply(lambda x: isinstance(x, datetime.date) or x is None).all()
     )
+
+
+def dataframe_to_arrow(df: pd.DataFrame, compression: str) -> bytes | None:
+    """
+    Serialize a dataframe as an Arrow IPC stream, compressing its record batches with
+    ``lz4`` or ``zstd``.
+
+    Returns ``None`` when the dataframe would not survive the round trip: when a column
+    name is not a string, or when a column holds nested values (lists, dicts), which
+    Arrow converts to arrays and structs.
+    """
+    if not all(isinstance(column, str) for column in df.columns):
+        return None
+    try:
+        table = pa.Table.from_pandas(df)
+    except (pa.ArrowException, TypeError, ValueError):
+        return None
+    if any(pa.types.is_nested(field.type) for field in table.schema):
+        return None
+
+    sink = pa.BufferOutputStream()
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def dataframe_from_arrow(blob: bytes) -> pd.DataFrame:
+    """
+    Deserialize a dataframe written by ``dataframe_to_arrow``.
+
+    The record batches are read from the blob without copying it, only their
+    decompression and the conversion to pandas allocate memory.
+    """
+    return pa.ipc.open_stream(pa.py_buffer(blob)).read_all().to_pandas()
@@ -17,20 +17,35 @@
 from __future__ import annotations
 
 import logging
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager, ExitStack
+from datetime import timedelta
 from typing import Any
 
+import pyarrow as pa
 from flask_caching import Cache
+from flask_caching.backends import NullCache
 from pandas import DataFrame
 
 from superset import app
 from superset.common.db_query_status import QueryStatus
+from superset.common.utils.dataframe_utils import (
+    dataframe_from_arrow,
+    dataframe_to_arrow,
+)
 from superset.constants import CacheRegion
-from superset.exceptions import CacheLoadError
+from superset.distributed_lock import KeyValueDistributedLock
+from superset.exceptions import (
+    CacheLoadError,
+    CreateKeyValueDistributedLockFailedException,
+)
 from superset.extensions import cache_manager
 from superset.models.helpers import QueryResult
 from superset.stats_logger import BaseStatsLogger
 from superset.superset_typing import Column
-from superset.utils.cache import set_and_log_cache
+from superset.utils.cache import LocalCache, set_and_log_cache
 from superset.utils.core import error_msg_from_exception, get_stacktrace
 
 config = app.config
@@ -42,6 +57,97 @@ _cache: dict[CacheRegion, Cache] = {
     CacheRegion.DATA: cache_manager.data_cache,
 }
 
+# values of the cache backend kept in process, see ``QUERY_CACHE_LOCAL_MAX_SIZE``
+_local_cache = LocalCache()
+
+
+class CacheTierStats:
+    """
+    Report the hits and misses of a cache tier, and its hit ratio in the current
+    process.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            hit_ratio = self.hits / (self.hits + self.misses)
+
+        stats_logger.incr(f"query_cache.{self.name}.{'hit' if hit else 'miss'}")
+        stats_logger.gauge(f"query_cache.{self.name}.hit_ratio", hit_ratio)
+
+
+local_stats = CacheTierStats("local")
+backend_stats = CacheTierStats("backend")
+
+
+def get_local_value(key: str, region: CacheRegion) -> dict[str, Any] | None:
+    if not app.config["QUERY_CACHE_LOCAL_MAX_SIZE"]:
+        return None
+
+    cache_value = _local_cache.get((region, key))
+    local_stats.record(cache_value is not None)
+    return cache_value
+
+
+def set_local_value(
+    key: str,
+    region: CacheRegion,
+    cache_value: dict[str, Any],
+    timeout: int | None = None,
+) -> None:
+    """
+    Keep a value of the cache backend in process. Only values with an Arrow dataframe
+    are kept, since it's decoded into a new dataframe on each read.
+    """
+    max_size = app.config["QUERY_CACHE_LOCAL_MAX_SIZE"]
+    df = cache_value.get("df")
+    if not max_size or not isinstance(df, bytes):
+        return
+
+    local_timeout = app.config["QUERY_CACHE_LOCAL_TIMEOUT"]
+    if timeout and timeout > 0:
+        local_timeout = min(local_timeout, timeout)
+    if (expires_on := cache_value.get("expires_on")) is not None:
+        # stale values are read from the backend, where they can be refreshed
+        local_timeout = min(local_timeout, expires_on - time.time())
+    if local_timeout <= 0:
+        return
+
+    _local_cache.set(
+        (region, key),
+        cache_value,
+        size=len(df),
+        max_size=max_size,
+        timeout=local_timeout,
+    )
+    stats_logger.gauge("query_cache.local.size", _local_cache.size)
+
+
+def get_backend_value(key: str, region: CacheRegion) -> dict[str, Any] | None:
+    cache_value = _cache[region].get(key)
+    backend_stats.record(bool(cache_value))
+    if cache_value:
+        set_local_value(key, region, cache_value)
+    return cache_value
+
+
+def get_cache_value(key: str, region: CacheRegion) -> dict[str, Any] | None:
+    """
+    Read a value from the in-process cache, or from the cache backend.
+    """
+    if (cache_value := get_local_value(key, region)) is not None:
+        return cache_value
+    return get_backend_value(key, region)
+
 
 class QueryCacheManager:
     """
@@ -65,6 +171,7 @@ class QueryCacheManager:
         cache_dttm: str | None = None,
         cache_value: dict[str, Any] | None = None,
         sql_rowcount: int | None = None,
+        post_processing_stats: dict[str, Any] | None = None,
     ) -> None:
         self.df = df
         self.query = query
@@ -81,6 +188,10 @@ class QueryCacheManager:
         self.cache_dttm = cache_dttm
         self.cache_value = cache_value
         self.sql_rowcount = sql_rowcount
+        self.post_processing_stats = post_processing_stats
+        # the value read from the cache is past its timeout, and kept in the cache to
+        # be served while it's refreshed, see ``QUERY_CACHE_STALE_TIMEOUT``
+        self.is_stale = False
 
     # pylint: disable=too-many-arguments
     def set_query_result(
@@ -96,6 +207,12 @@ class QueryCacheManager:
         """
         Set dataframe of query-result to specific cache region
         """
+        if self.is_stale:
+            self.is_stale = False
+            self.is_loaded = False
+            self.is_cached = None
+            self.cache_dttm = None
+
         try:
             self.status = query_result.status
             self.query = query_result.query
@@ -105,6 +222,7 @@ class QueryCacheManager:
             self.error_message = query_result.error_message
             self.df = query_result.df
             self.sql_rowcount = query_result.sql_rowcount
+            self.post_processing_stats = query_result.post_processing_stats
             self.annotation_data = {} if annotation_data is None else annotation_data
 
             if self.status != QueryStatus.FAILED:
@@ -121,6 +239,7 @@ class QueryCacheManager:
                 "rejected_filter_columns": self.rejected_filter_columns,
                 "annotation_data": self.annotation_data,
                 "sql_rowcount": self.sql_rowcount,
+                "post_processing_stats": self.post_processing_stats,
             }
             if self.is_loaded and key and self.status != QueryStatus.FAILED:
                 self.set(
@@ -152,39 +271,8 @@ class QueryCacheManager:
         if not key or not _cache[region] or force_query:
             return query_cache
 
-        if cache_value := _cache[region].get(key):
-            logger.debug("Cache key: %s", key)
-            stats_logger.incr("loading_from_cache")
-            try:
-                query_cache.df = cache_value["df"]
-                query_cache.query = cache_value["query"]
-                query_cache.annotation_data = cache_value.get("annotation_data", {})
-                query_cache.applied_template_filters = cache_value.get(
-                    "applied_template_filters", []
-                )
-                query_cache.applied_filter_columns = cache_value.get(
-                    "applied_filter_columns", []
-                )
-                query_cache.rejected_filter_columns = cache_value.get(
-                    "rejected_filter_columns", []
-                )
-                query_cache.status = QueryStatus.SUCCESS
-                query_cache.is_loaded = True
-                query_cache.is_cached = cache_value is not None
-                query_cache.sql_rowcount = cache_value.get("sql_rowcount", None)
-                query_cache.cache_dttm = (
-                    cache_value["dttm"] if cache_value is not None else None
-                )
-                query_cache.cache_value = cache_value
-                stats_logger.incr("loaded_from_cache")
-            except KeyError as ex:
-                logger.exception(ex)
-                logger.error(
-                    "Error reading cache: %s",
-                    error_msg_from_exception(ex),
-                    exc_info=True,
-                )
-            logger.debug("Serving from cache")
+        if cache_value := get_cache_value(key, region):
+            query_cache.load_cache_value(key, cache_value)
 
         if force_cached and not query_cache.is_loaded:
             logger.warning(
@@ -193,6 +281,82 @@ class QueryCacheManager:
             raise CacheLoadError("Error loading data from cache")
         return query_cache
 
+    @classmethod
+    def get_many(
+        cls,
+        keys: list[str],
+        region: CacheRegion = CacheRegion.DEFAULT,
+    ) -> dict[str, QueryCacheManager]:
+        """
+        Initialize a QueryCacheManager for each of the given keys found in the cache,
+        fetching them in a single round trip to the cache backend
+        """
+        if not keys or not _cache[region]:
+            return {}
+
+        cache_values = {}
+        missing_keys = []
+        for key in keys:
+            if (cache_value := get_local_value(key, region)) is not None:
+                cache_values[key] = cache_value
+            else:
+                missing_keys.append(key)
+
+        if missing_keys:
+            for key, cache_value in zip(
+                missing_keys,
+                _cache[region].get_many(*missing_keys),
+            ):
+                backend_stats.record(bool(cache_value))
+                if cache_value:
+                    set_local_value(key, region, cache_value)
+                    cache_values[key] = cache_value
+
+        query_caches = {}
+        for key, cache_value in cache_values.items():
+            query_cache = cls()
+            query_cache.load_cache_value(key, cache_value)
+            if query_cache.is_loaded:
+                query_caches[key] = query_cache
+        return query_caches
+
+    def load_cache_value(self, key: str, cache_value: dict[str, Any]) -> None:
+        """
+        Load the dataframe and its metadata from a value read from the cache
+        """
+        logger.debug("Cache key: %s", key)
+        stats_logger.incr("loading_from_cache")
+        try:
+            df = cache_value["df"]
+            self.df = dataframe_from_arrow(df) if isinstance(df, bytes) else df
+            self.query = cache_value["query"]
+            self.annotation_data = cache_value.get("annotation_data", {})
+            self.applied_template_filters = cache_value.get(
+                "applied_template_filters", []
+            )
+            self.applied_filter_columns = cache_value.get("applied_filter_columns", [])
+            self.rejected_filter_columns = cache_value.get(
+                "rejected_filter_columns", []
+            )
+            self.status = QueryStatus.SUCCESS
+            self.is_loaded = True
+            self.is_cached = True
+            self.sql_rowcount = cache_value.get("sql_rowcount", None)
+            self.post_processing_stats = cache_value.get("post_processing_stats")
+            self.cache_dttm = cache_value["dttm"]
+            self.cache_value = cache_value
+            expires_on = cache_value.get("expires_on")
+            self.is_stale = expires_on is not None and time.time() > expires_on
+            stats_logger.incr("loaded_from_cache")
+        except (KeyError, pa.ArrowException) as ex:
+            logger.exception(ex)
+            logger.error(
+                "Error reading cache: %s",
+                error_msg_from_exception(ex),
+                exc_info=True,
+            )
+        logger.debug("Serving from cache")
+
     @staticmethod
     def set(
         key: str | None,
@@ -204,8 +368,97 @@ class QueryCacheManager:
         """
         set value to specify cache region, proxy for `set_and_log_cache`
         """
-        if key:
-            set_and_log_cache(_cache[region], key, value, timeout, datasource_uid)
+        if not key:
+            return
+
+        compression = app.config["QUERY_CACHE_ARROW_COMPRESSION"]
+        if compression and isinstance(value.get("df"), DataFrame):
+            if (blob := dataframe_to_arrow(value["df"], compression)) is not None:
+                value = {**value, "df": blob}
+                stats_logger.gauge("query_cache.backend.value_size", len(blob))
+
+        stale_timeout = app.config["QUERY_CACHE_STALE_TIMEOUT"]
+        if region == CacheRegion.DATA and stale_timeout and timeout and timeout > 0:
+            # keep the value after its timeout, so that it can be served while
+            # it's being refreshed
+            value = {**value, "expires_on": time.time() + timeout}
+            timeout += stale_timeout
+
+        cache_value = set_and_log_cache(
+            _cache[region],
+            key,
+            value,
+            timeout,
+            datasource_uid,
+        )
+        if cache_value is not None:
+            set_local_value(key, region, cache_value, timeout)
+
+    @contextmanager
+    def single_flight(
+        self,
+        key: str | None,
+        region: CacheRegion = CacheRegion.DEFAULT,
+        force_query: bool | None = False,
+    ) -> Iterator[None]:
+        """
+        Make sure that only one worker runs the query of a key missing from the
+        cache, or stale, when several workers request it at the same time.
+
+        Within the context, the query still needs to run if the value isn't loaded
+        or is stale. The first worker holds a distributed lock while it runs the
+        query, the other ones serve the stale value if any, or wait for the query
+        to be cached. They run the query themselves after
+        ``QUERY_CACHE_SINGLE_FLIGHT_TIMEOUT`` seconds, when the lock expires.
+        """
+        if (
+            not app.config["QUERY_CACHE_SINGLE_FLIGHT"]
+            or not key
+            or force_query
+            or (self.is_loaded and not self.is_stale)
+            or isinstance(_cache[region].cache, NullCache)
+        ):
+            yield
+            return
+
+        timeout = app.config["QUERY_CACHE_SINGLE_FLIGHT_TIMEOUT"]
+        deadline = time.monotonic() + timeout
+        with ExitStack() as stack:
+            while True:
+                try:
+                    stack.enter_context(
+                        KeyValueDistributedLock(
+                            namespace="query_cache",
+                            lock_expiration=timedelta(seconds=timeout),
+                            key=key,
+                        )
+                    )
+                except CreateKeyValueDistributedLockFailedException:
+                    pass
+                else:
+                    # the query might have been cached while acquiring the lock
+                    if cache_value := get_backend_value(key, region):
+                        self.load_cache_value(key, cache_value)
+                    break
+
+                if self.is_stale:
+                    # another worker is refreshing the value
+                    stats_logger.incr("query_cache.single_flight.stale")
+                    self.is_stale = False
+                    break
+
+                if time.monotonic() >= deadline:
+                    stats_logger.incr("query_cache.single_flight.timeout")
+                    break
+
+                time.sleep(app.config["QUERY_CACHE_SINGLE_FLIGHT_POLL_INTERVAL"])
+                if cache_value := get_backend_value(key, region):
+                    self.load_cache_value(key, cache_value)
+                    if self.is_loaded and not self.is_stale:
+                        stats_logger.incr("query_cache.single_flight.wait")
+                        break
+
+            yield
 
     @staticmethod
     def delete(
@@ -213,6 +466,7 @@ class QueryCacheManager:
         region: CacheRegion = CacheRegion.DEFAULT,
     ) -> None:
         if key:
+            _local_cache.delete((region, key))
             _cache[region].delete(key)
 
     @staticmethod
@@ -220,4 +474,4 @@ class QueryCacheManager:
         key: str | None,
         region: CacheRegion = CacheRegion.DEFAULT,
     ) -> bool:
-        return bool(_cache[region].get(key)) if key else False
+        return bool(get_cache_value(key, region)) if key else False
@@ -80,6 +80,9 @@ STATS_LOGGER = DummyStatsLogger()
 
 # By default will log events to the metadata database with `DBEventLogger`
 # Note that you can use `StdOutEventLogger` for debugging
+# Note that you can use `BufferedDBEventLogger` to insert the logs in batches from a
+# background thread, instead of during each request, e.g.
+# EVENT_LOGGER = BufferedDBEventLogger(batch_size=500, flush_interval=5)
 # Note that you can write your own event logger by extending `AbstractEventLogger`
 # https://github.com/apache/superset/blob/master/superset/utils/log.py
 EVENT_LOGGER = DBEventLogger()
@@ -760,6 +763,21 @@ SCREENSHOT_PLAYWRIGHT_WAIT_EVENT = "load"
 SCREENSHOT_PLAYWRIGHT_DEFAULT_TIMEOUT = int(
     timedelta(seconds=30).total_seconds() * 1000
 )
+# Keep a headless browser running in each worker for Playwright screenshots, instead
+# of launching one per screenshot. The browser contexts, logged in as the user taking
+# the screenshots, are reused for SCREENSHOT_PLAYWRIGHT_CONTEXT_TIMEOUT seconds, and
+# the browser is relaunched after SCREENSHOT_PLAYWRIGHT_BROWSER_MAX_USES uses.
+SCREENSHOT_PLAYWRIGHT_BROWSER_POOL = False
+SCREENSHOT_PLAYWRIGHT_BROWSER_MAX_USES = 100
+SCREENSHOT_PLAYWRIGHT_CONTEXT_TIMEOUT = int(timedelta(minutes=10).total_seconds())
+# Max number of pages loaded at once by Playwright, e.g. the tabs of a dashboard report
+SCREENSHOT_PLAYWRIGHT_MAX_PAGES = 4
+# Instead of sleeping SCREENSHOT_SELENIUM_HEADSTART and
+# SCREENSHOT_SELENIUM_ANIMATION_WAIT seconds, take Playwright screenshots once the
+# charts are loaded and the page hasn't changed for
+# SCREENSHOT_PLAYWRIGHT_RENDER_QUIET_PERIOD milliseconds.
+SCREENSHOT_PLAYWRIGHT_WAIT_FOR_RENDER = False
+SCREENSHOT_PLAYWRIGHT_RENDER_QUIET_PERIOD = 1000
 
 # ---------------------------------------------------
 # Image and file configuration
@@ -817,6 +835,83 @@ EXPLORE_FORM_DATA_CACHE_CONFIG: CacheConfig = {
 # store cache keys by datasource UID (via CacheKey) for custom processing/invalidation
 STORE_CACHE_KEYS_IN_METADATA_DB = False
 
+# When several requests miss the same chart query in the data cache at once, e.g. when
+# the cache of a popular dashboard expires, only run the query once: the first
+# request holds a lock in the metadata database while it runs the query, and the
+# other ones wait for the result to be cached, polling the cache every
+# QUERY_CACHE_SINGLE_FLIGHT_POLL_INTERVAL seconds. They run the query themselves
+# after QUERY_CACHE_SINGLE_FLIGHT_TIMEOUT seconds, when the lock expires. Forced
+# queries are not coordinated.
+QUERY_CACHE_SINGLE_FLIGHT = False
+QUERY_CACHE_SINGLE_FLIGHT_TIMEOUT = 60
+QUERY_CACHE_SINGLE_FLIGHT_POLL_INTERVAL = 0.5
+
+# Number of seconds chart query results are kept in the data cache after their
+# timeout. While a request refreshes an expired result, the other requests are served
+# the stale one instead of waiting. Requires QUERY_CACHE_SINGLE_FLIGHT.
+QUERY_CACHE_STALE_TIMEOUT = 0
+
+# Store the dataframes of chart query results in the cache as Arrow IPC streams
+# compressed with "lz4" or "zstd", instead of pickled dataframes, which are larger and
+# slower to decode. Dataframes that Arrow can't represent exactly (column names that
+# aren't strings, nested values) are still pickled, and cached values in the previous
+# format remain readable.
+QUERY_CACHE_ARROW_COMPRESSION: Literal["lz4", "zstd"] | None = None
+
+# Maximum size in bytes of an in-process cache in front of the cache backend, serving
+# the results of the hottest chart queries without a round trip to the backend. Only
+# results stored as Arrow are kept, see QUERY_CACHE_ARROW_COMPRESSION. 0 disables it.
+QUERY_CACHE_LOCAL_MAX_SIZE = 0
+# Maximum number of seconds a result is kept in the in-process cache. Results
+# refreshed by other processes, e.g. when forcing a refresh, can be served from the
+# in-process cache for that long.
+QUERY_CACHE_LOCAL_TIMEOUT = 60
+
+# Also cache the results of chart queries as returned by the database, before their
+# time comparisons and post-processing (rolling windows, pivots, contributions...),
+# keyed on the query only. Charts of different types over the same query, or changes
+# to the post-processing options in Explore, then reuse these results instead of
+# running the query again. They're kept QUERY_CACHE_RAW_RESULTS_TIMEOUT seconds, or
+# as long as the chart results when None.
+QUERY_CACHE_RAW_RESULTS = False
+QUERY_CACHE_RAW_RESULTS_TIMEOUT: int | None = None
+
+# Cache the datasets, charts and tabs loaded when rendering a dashboard in CACHE_CONFIG,
+# until the dashboard, its charts or their datasets change. The responses carry an
+# ETag, so browsers revalidate them instead of downloading them again.
+DASHBOARD_PAYLOAD_CACHE = False
+
+# Forecasts (the predictive analytics of the timeseries charts) fit a Prophet model per
+# series. With more than one worker, the series of a chart are fitted concurrently on
+# a pool of processes, shared by the requests of each web server process. Celery
+# prefork workers can't start processes, and fit the series one after the other.
+PROPHET_MAX_WORKERS = 1
+# Forecasts are kept in DATA_CACHE_CONFIG, keyed on the data of the series and the
+# parameters of the model, so that reloading a chart doesn't fit the models again.
+# They're kept PROPHET_CACHE_TIMEOUT seconds, or the default timeout when None.
+PROPHET_CACHE_TIMEOUT: int | None = None
+# With the GLOBAL_ASYNC_QUERIES feature flag, all chart data requests are loaded by
+# Celery workers, where forecasts report the progress of the fitting. When set,
+# forecasts of fewer series than this are loaded synchronously instead; other charts
+# are not affected. The number of series is estimated from the metrics and the series
+# limit of the query.
+PROPHET_ASYNC_MIN_SERIES: int | None = None
+
+# Run the post processing operations of the chart data API in the copy-on-write mode
+# of pandas: the intermediate DataFrames are modified in place rather than copied. The
+# mode is global to the process, it's enabled when the app starts.
+POST_PROCESSING_COPY_ON_WRITE = False
+# Report the duration of each post processing step, and the peak memory allocated
+# while post processing, in the `post_processing_stats` of the chart data responses.
+# Memory is traced with tracemalloc, which slows down allocations and includes the
+# allocations of the other threads of the process.
+POST_PROCESSING_STATS = False
+# The quantiles of the box plots (median, quartiles, percentile whiskers) are read
+# from the sorted values of each box. When set, boxes with more values than this are
+# estimated from a random sample of about this many values instead, while the counts,
+# means, Tukey and min/max whiskers and outliers still use all the values.
+BOXPLOT_QUANTILE_SAMPLE_SIZE: int | None = None
+
 # CORS Options
 ENABLE_CORS = False
 CORS_OPTIONS: dict[Any, Any] = {}
@@ -864,6 +959,11 @@ CSV_UPLOAD_MAX_SIZE = None
 # note: index option should not be overridden
 CSV_EXPORT = {"encoding": "utf-8"}
 
+# Maximum number of rows in a CSV exported from SQL Lab. The export is streamed to the
+# client one chunk of rows at a time, so this only bounds the size of the download and
+# the time spent producing it, not the memory used by the server.
+SQLLAB_CSV_EXPORT_MAX_ROWS: int | None = None
+
 # Excel Options: key/value pairs that will be passed as argument to DataFrame.to_excel
 # method.
 # note: index option should not be overridden
@@ -905,6 +1005,18 @@ TIME_GRAIN_ADDON_EXPRESSIONS: dict[str, dict[str, str]] = {}
 # TIME_GRAIN_JOIN_COLUMN_PRODUCERS = {"P1F": join_producer}
 TIME_GRAIN_JOIN_COLUMN_PRODUCERS: dict[str, Callable[[Series, int], str]] = {}
 
+# Maximum number of time comparison ("time offset") queries of a chart that run
+# concurrently against the database, once the main query has returned. Offsets found
+# in the cache are not queried. Set to 1 to run them one after the other.
+TIME_OFFSET_QUERY_MAX_WORKERS = 4
+
+# Size of the thread pool running the queries of a batch chart data request
+# (``/api/v1/chart/data/batch``), e.g. all the charts of a dashboard, and maximum
+# number of those queries running concurrently against the same database. Queries
+# found in the cache, or shared by several charts, are not counted.
+CHART_DATA_BATCH_MAX_WORKERS = 8
+CHART_DATA_BATCH_MAX_QUERIES_PER_DATABASE = 4
+
 # ---------------------------------------------------
 # List of viz_types not allowed in your environment
 # For example: Disable pivot table and treemap:
@@ -972,6 +1084,11 @@ SQL_MAX_ROW = 100000
 # exported CSVs
 DISPLAY_MAX_ROW = 10000
 
+# Number of rows fetched from the cursor at a time when reading query results. Each
+# batch is converted to Arrow before the next one is fetched, which bounds the memory
+# used by intermediate Python objects for large results.
+RESULT_SET_FETCH_BATCH_SIZE = 10000
+
 # Default row limit for SQL Lab queries. Is overridden by setting a new limit in
 # the SQL Lab UI
 DEFAULT_SQLLAB_LIMIT = 1000
@@ -1018,6 +1135,7 @@ class CeleryConfig:  # pylint: disable=too-few-public-methods
         "superset.tasks.scheduler",
         "superset.tasks.thumbnails",
         "superset.tasks.cache",
+        "superset.tasks.metadata_catalog",
     )
     result_backend = "db+sqlite:///celery_results.sqlite"
     worker_prefetch_multiplier = 1
@@ -1043,6 +1161,11 @@ class CeleryConfig:  # pylint: disable=too-few-public-methods
         #     "schedule": crontab(minute=0, hour=0, day_of_month=1),
         #     "options": {"retention_period_days": 180},
         # },
+        # Uncomment to crawl the metadata catalog, see `METADATA_CATALOG_INDEX`
+        # "metadata_catalog.crawl": {
+        #     "task": "metadata_catalog.crawl",
+        #     "schedule": crontab(minute=0, hour="*/6"),
+        # },
     }
 
 
@@ -1051,6 +1174,23 @@ CELERY_CONFIG: type[CeleryConfig] = CeleryConfig
 # Set celery config to None to disable all the above configuration
 # CELERY_CONFIG = None
 
+# Serve the schemas, tables, views and table metadata of SQL Lab from an index
+# persisted in the metadata database, instead of inspecting the databases on each
+# request. The index is refreshed incrementally by the `metadata_catalog.crawl`
+# Celery task, which should be scheduled in `beat_schedule` more often than
+# `METADATA_CATALOG_MAX_AGE`: older entries are ignored, and the databases are
+# inspected instead.
+METADATA_CATALOG_INDEX = False
+METADATA_CATALOG_MAX_AGE = timedelta(days=1)
+# Maximum number of crawling tasks inspecting a database at the same time
+METADATA_CATALOG_CONCURRENCY = 2
+# Maximum number of tables and views whose metadata is fetched by a crawling task,
+# the next tasks fetch the rest
+METADATA_CATALOG_METADATA_BATCH_SIZE = 500
+# Time limit of a crawling task, in seconds. The distributed lock held by a task to
+# inspect a database expires when the task is killed, shortly after
+METADATA_CATALOG_TASK_TIMEOUT = int(timedelta(minutes=30).total_seconds())
+
 # Additional static HTTP headers to be served by your Superset server. Note
 # Flask-Talisman applies the relevant security HTTP headers.
 #
@@ -1151,6 +1291,14 @@ RESULTS_BACKEND: BaseCache | None = None
 # in order to disable should breaking issues be discovered.
 RESULTS_BACKEND_USE_MSGPACK = True
 
+# Store async query results as an Arrow IPC file where each record batch is compressed
+# on its own ("lz4" or "zstd"), instead of a single zlib compressed payload. This lets
+# SQL Lab read only the rows it displays and export CSVs one batch at a time, without
+# decoding the whole result. Results stored in the previous format remain readable.
+RESULTS_BACKEND_ARROW_COMPRESSION: Literal["lz4", "zstd"] | None = None
+# Maximum number of rows in each record batch of the format above
+RESULTS_BACKEND_ARROW_BATCH_SIZE = 10000
+
 # The S3 bucket where you want to store your external hive tables created
 # from CSV files. For example, 'companyname-superset'
 CSV_TO_HIVE_UPLOAD_S3_BUCKET = None
@@ -1211,6 +1359,10 @@ JINJA_CONTEXT_ADDONS: dict[str, Callable[..., Any]] = {}
 # basis. Example value = `{"presto": CustomPrestoTemplateProcessor}`
 CUSTOM_TEMPLATE_PROCESSORS: dict[str, type[BaseTemplateProcessor]] = {}
 
+# The maximum number of compiled Jinja templates kept in memory by each process, so
+# that the same SQL and metric expressions are not compiled for every query
+JINJA_TEMPLATE_CACHE_MAX_SIZE = 1000
+
 # Roles that are controlled by the API / Superset and should not be changed
 # by humans.
 ROBOT_PERMISSION_ROLES = ["Public", "Gamma", "Alpha", "Admin", "sql_lab"]
@@ -1253,10 +1405,27 @@ TROUBLESHOOTING_LINK = ""
 # CSRF token timeout, set to None for a token that never expires
 WTF_CSRF_TIME_LIMIT = int(timedelta(weeks=1).total_seconds())
 
+# The row level security rules are memoized in each process until they change.
+# Changes made by other processes are only seen through a cache shared by all the
+# processes (CACHE_CONFIG), without one the rules are loaded once per request. In any
+# case, memoized rules are reloaded after this number of seconds.
+RLS_RULES_MEMO_TIMEOUT = 60
+
 # This link should lead to a page with instructions on how to gain access to a
 # Datasource. It will be placed at the bottom of permissions errors.
 PERMISSION_INSTRUCTIONS_LINK = ""
 
+# The permissions of the roles of the users are compiled into snapshots, which are
+# kept in memory and stored in the cache for the other processes. Snapshots are
+# invalidated when the roles or the permissions change, this timeout only bounds
+# the lifetime of the snapshots of the roles no longer used.
+PERMISSION_SNAPSHOT_CACHE_TIMEOUT = int(timedelta(days=1).total_seconds())
+# Snapshots memoized in a process only see the changes made by other processes
+# through a cache shared by all of them, without one the snapshots are compiled once
+# per request. In any case, memoized snapshots are compiled again after this number
+# of seconds.
+PERMISSION_SNAPSHOT_MEMO_TIMEOUT = 60
+
 # Integrate external Blueprints to the app by passing them to your
 # configuration. These blueprints will get integrated in the app
 BLUEPRINTS: list[Blueprint] = []
@@ -1315,6 +1484,22 @@ def engine_context_manager(  # pylint: disable=unused-argument
 
 ENGINE_CONTEXT_MANAGER = engine_context_manager
 
+# Reuse SQLAlchemy engines, and their connection pools, across requests when
+# querying analytical databases. When disabled a new engine with a ``NullPool`` is
+# created every time a connection is needed. The pool settings below are defaults;
+# they can be overridden per database by setting ``pool_size``, ``max_overflow``,
+# ``pool_recycle`` or ``pool_timeout`` in the ``engine_params`` of the database extra.
+# Connections through SSH tunnels are never pooled.
+DB_ENGINE_POOL_ENABLED = False
+DB_ENGINE_POOL_SIZE = 5
+DB_ENGINE_POOL_MAX_OVERFLOW = 10
+DB_ENGINE_POOL_RECYCLE = 3600
+DB_ENGINE_POOL_TIMEOUT = 30
+# Maximum number of engines kept per process. Each combination of database, catalog,
+# schema and effective user gets its own engine; the least recently used ones are
+# disposed when this limit is reached.
+DB_ENGINE_POOL_MAX_ENGINES = 100
+
 # A callable that allows altering the database connection URL and params
 # on the fly, at runtime. This allows for things like impersonation or
 # arbitrary logic. For instance you can wire different users to
@@ -62,6 +62,7 @@ from sqlalchemy.orm import (
     reconstructor,
     relationship,
     RelationshipProperty,
+    Session,
 )
 from sqlalchemy.orm.mapper import Mapper
 from sqlalchemy.schema import UniqueConstraint
@@ -104,6 +105,7 @@ from superset.models.helpers import (
     QueryResult,
 )
 from superset.models.slice import Slice
+from superset.security import rls
 from superset.sql_parse import Table
 from superset.superset_typing import (
     AdhocColumn,
@@ -2120,3 +2122,8 @@ class RowLevelSecurityFilter(Model, AuditMixinNullable):
         backref="row_level_security_filters",
     )
     clause = Column(utils.MediumText(), nullable=False)
+
+
+sa.event.listen(Session, "after_flush", rls.rls_rules_cache.after_flush)
+sa.event.listen(Session, "after_commit", rls.rls_rules_cache.after_commit)
+sa.event.listen(Session, "after_rollback", rls.rls_rules_cache.after_rollback)
@@ -31,6 +31,7 @@ from superset.commands.dashboard.exceptions import (
     DashboardUpdateFailedError,
 )
 from superset.daos.base import BaseDAO
+from superset.dashboards.cache import get_payloads_changed_on
 from superset.dashboards.filters import DashboardAccessFilter, is_uuid
 from superset.exceptions import SupersetSecurityException
 from superset.extensions import db
@@ -159,6 +160,34 @@ class DashboardDAO(BaseDAO[Dashboard]):
         # drop microseconds in datetime to match with last_modified header
         return max(dashboard_changed_on, datasources_changed_on).replace(microsecond=0)
 
+    @staticmethod
+    def get_dashboard_payload_changed_on(  # pylint: disable=invalid-name
+        id_or_slug_or_dashboard: str | Dashboard,
+    ) -> datetime:
+        """
+        Get latest changed datetime of the payloads used to render a dashboard: its
+        tabs, its charts and their datasets.
+
+        Changes that don't update any ``changed_on``, like editing the columns of a
+        dataset, are tracked by ``superset.dashboards.cache``.
+
+        :param id_or_slug_or_dashboard: A dashboard or the ID or slug of the dashboard.
+        :returns: The datetime the payloads of the dashboard last changed.
+        """
+
+        dashboard = (
+            DashboardDAO.get_by_id_or_slug(id_or_slug_or_dashboard)
+            if isinstance(id_or_slug_or_dashboard, str)
+            else id_or_slug_or_dashboard
+        )
+        changed_on = max(
+            DashboardDAO.get_dashboard_and_slices_changed_on(dashboard),
+            DashboardDAO.get_dashboard_and_datasets_changed_on(dashboard),
+        )
+        if payloads_changed_on := get_payloads_changed_on():
+            changed_on = max(changed_on, payloads_changed_on)
+        return changed_on
+
     @staticmethod
     def validate_slug_uniqueness(slug: str) -> bool:
         if not slug:
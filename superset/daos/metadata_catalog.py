@@ -0,0 +1,327 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
+
+from flask import current_app
+from sqlalchemy.orm import Query
+
+from superset.daos.base import BaseDAO
+from superset.extensions import db, security_manager
+from superset.models.core import Database
+from superset.models.metadata_catalog import (
+    MetadataCatalogEntry,
+    MetadataCatalogEntryType,
+)
+from superset.utils import json
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class MetadataCatalogDAO(BaseDAO[MetadataCatalogEntry]):
+    """
+    Read and refresh the index of the catalogs, schemas, tables and views of the
+    databases.
+
+    An entry is only served while it's younger than `METADATA_CATALOG_MAX_AGE`, so
+    that callers fall back to the database when the crawler is late.
+    """
+
+    @staticmethod
+    def get_catalog(database: Database, catalog: str | None) -> str | None:
+        """
+        Return the catalog under which the entries of a database are indexed.
+        """
+        if not database.db_engine_spec.supports_catalog:
+            return None
+        return catalog or database.get_default_catalog()
+
+    @staticmethod
+    def _query(
+        database: Database,
+        type_: MetadataCatalogEntryType | Iterable[MetadataCatalogEntryType],
+        catalog: str | None,
+        schema: str | None,
+    ) -> Query:
+        types = [
+            MetadataCatalogEntryType(value).value
+            for value in ([type_] if isinstance(type_, str) else type_)
+        ]
+        return db.session.query(MetadataCatalogEntry).filter(
+            MetadataCatalogEntry.database_id == database.id,
+            MetadataCatalogEntry.type.in_(types),
+            MetadataCatalogEntry.catalog == catalog,
+            MetadataCatalogEntry.schema == schema,
+        )
+
+    @staticmethod
+    def _find_parent(
+        database: Database,
+        catalog: str | None,
+        schema: str | None,
+    ) -> MetadataCatalogEntry | None:
+        """
+        Return the entry listing the children of a database, catalog or schema, if
+        it's fresh.
+
+        The entries of the databases are stored as catalogs without names.
+        """
+        if schema is not None:
+            query = MetadataCatalogDAO._query(
+                database, MetadataCatalogEntryType.SCHEMA, catalog, None
+            ).filter(MetadataCatalogEntry.name == schema)
+        else:
+            query = MetadataCatalogDAO._query(
+                database, MetadataCatalogEntryType.CATALOG, None, None
+            ).filter(MetadataCatalogEntry.name == (catalog or ""))
+
+        oldest = datetime.now() - current_app.config["METADATA_CATALOG_MAX_AGE"]
+        return query.filter(
+            MetadataCatalogEntry.children_refreshed_on >= oldest
+        ).first()
+
+    @staticmethod
+    def find_schemas(database: Database, catalog: str | None) -> set[str] | None:
+        """
+        Return the indexed schemas of a catalog, or None if they're not indexed.
+        """
+        catalog = MetadataCatalogDAO.get_catalog(database, catalog)
+        if MetadataCatalogDAO._find_parent(database, catalog, None) is None:
+            return None
+
+        return {
+            name
+            for (name,) in MetadataCatalogDAO._query(
+                database, MetadataCatalogEntryType.SCHEMA, catalog, None
+            ).with_entities(MetadataCatalogEntry.name)
+        }
+
+    @staticmethod
+    def find_tables(  # pylint: disable=too-many-arguments
+        database: Database,
+        catalog: str | None,
+        schema: str,
+        search: str | None = None,
+        search_mode: str = "prefix",
+        page: int | None = None,
+        page_size: int | None = None,
+    ) -> tuple[int, list[MetadataCatalogEntry]] | None:
+        """
+        Return the indexed tables and views of a schema accessible by the user, or
+        None if they're not indexed.
+
+        :param database: The database
+        :param catalog: The catalog, the default one if not specified
+        :param schema: The schema
+        :param search: Only keep the tables whose name contains this text, case
+            insensitively
+        :param search_mode: Whether the names start with (`prefix`) or contain
+            (`contains`) the searched text
+        :param page: The page of the tables, starting from 0
+        :param page_size: The number of tables per page
+        :return: The number of tables and the tables of the page, sorted by name
+        """
+        index_catalog = MetadataCatalogDAO.get_catalog(database, catalog)
+        if MetadataCatalogDAO._find_parent(database, index_catalog, schema) is None:
+            return None
+
+        query = MetadataCatalogDAO._query(
+            database,
+            [MetadataCatalogEntryType.TABLE, MetadataCatalogEntryType.VIEW],
+            index_catalog,
+            schema,
+        )
+        if search:
+            pattern = _escape_like(search.lower()) + "%"
+            if search_mode == "contains":
+                pattern = "%" + pattern
+            query = query.filter(
+                MetadataCatalogEntry.search_name.like(pattern, escape="\\")
+            )
+
+        # permissions are granted on the catalog requested by the user, which can be
+        # missing from the datasets when it's the default one
+        if (
+            access_filter := security_manager.get_datasources_accessible_by_user_filter(
+                database=database,
+                name_column=MetadataCatalogEntry.name,
+                catalog=catalog,
+                schema=schema,
+            )
+        ) is not None:
+            query = query.filter(access_filter)
+
+        count = query.count()
+        query = query.order_by(MetadataCatalogEntry.name, MetadataCatalogEntry.type)
+        if page_size is not None:
+            query = query.offset((page or 0) * page_size).limit(page_size)
+
+        return count, query.all()
+
+    @staticmethod
+    def get_table_metadata(
+        database: Database,
+        catalog: str | None,
+        schema: str | None,
+        name: str,
+    ) -> dict[str, Any] | None:
+        """
+        Return the indexed metadata of a table or view, or None if it's not indexed.
+        """
+        if schema is None:
+            return None
+
+        catalog = MetadataCatalogDAO.get_catalog(database, catalog)
+        oldest = datetime.now() - current_app.config["METADATA_CATALOG_MAX_AGE"]
+        entry = (
+            MetadataCatalogDAO._query(
+                database,
+                [MetadataCatalogEntryType.TABLE, MetadataCatalogEntryType.VIEW],
+                catalog,
+                schema,
+            )
+            .filter(
+                MetadataCatalogEntry.name == name,
+                MetadataCatalogEntry.metadata_refreshed_on >= oldest,
+            )
+            .first()
+        )
+        return entry.table_metadata_dict if entry else None
+
+    @staticmethod
+    def sync(
+        database: Database,
+        catalog: str | None,
+        schema: str | None,
+        entries: Iterable[tuple[str, MetadataCatalogEntryType]],
+    ) -> None:
+        """
+        Replace the children of a database, catalog or schema.
+
+        The refresh is incremental: new entries are added, missing entries are
+        deleted, and the metadata of the entries which are still present is kept.
+        The parent entry is refreshed as well, making the children visible.
+
+        :param database: The database
+        :param catalog: The catalog of the children, None for the catalogs
+        :param schema: The schema of the children, None for the catalogs and schemas
+        :param entries: The names and types of the children
+        """
+        now = datetime.now()
+        if schema is not None:
+            parent_type, parent_catalog, parent_name = (
+                MetadataCatalogEntryType.SCHEMA,
+                catalog,
+                schema,
+            )
+            types = [MetadataCatalogEntryType.TABLE, MetadataCatalogEntryType.VIEW]
+        else:
+            parent_type, parent_catalog, parent_name = (
+                MetadataCatalogEntryType.CATALOG,
+                None,
+                catalog or "",
+            )
+            types = (
+                [MetadataCatalogEntryType.CATALOG]
+                if catalog is None and database.db_engine_spec.supports_catalog
+                else [MetadataCatalogEntryType.SCHEMA]
+            )
+
+        wanted = {(name, type_.value) for name, type_ in entries}
+        existing = set()
+        for entry in (
+            MetadataCatalogDAO._query(database, types, catalog, schema)
+            .filter(MetadataCatalogEntry.name != "")
+            .all()
+        ):
+            if (entry.name, entry.type) in wanted:
+                existing.add((entry.name, entry.type))
+            else:
+                db.session.delete(entry)
+        db.session.bulk_save_objects(
+            [
+                MetadataCatalogEntry(
+                    database_id=database.id,
+                    type=type_,
+                    catalog=catalog,
+                    schema=schema,
+                    name=name,
+                    search_name=name.lower(),
+                    created_on=now,
+                )
+                for name, type_ in wanted - existing
+            ]
+        )
+
+        parent = (
+            MetadataCatalogDAO._query(database, parent_type, parent_catalog, None)
+            .filter(MetadataCatalogEntry.name == parent_name)
+            .first()
+        )
+        if parent is None:
+            parent = MetadataCatalogEntry(
+                database_id=database.id,
+                type=parent_type.value,
+                catalog=parent_catalog,
+                name=parent_name,
+                search_name=parent_name.lower(),
+                created_on=now,
+            )
+            db.session.add(parent)
+        parent.children_refreshed_on = now
+
+    @staticmethod
+    def find_stale_tables(
+        database: Database,
+        catalog: str | None,
+        schema: str,
+        limit: int,
+    ) -> list[MetadataCatalogEntry]:
+        """
+        Return the tables and views of a schema whose metadata is the oldest, missing
+        metadata first.
+        """
+        oldest = datetime.now() - current_app.config["METADATA_CATALOG_MAX_AGE"] / 2
+        return (
+            MetadataCatalogDAO._query(
+                database,
+                [MetadataCatalogEntryType.TABLE, MetadataCatalogEntryType.VIEW],
+                catalog,
+                schema,
+            )
+            .filter(
+                (MetadataCatalogEntry.metadata_refreshed_on.is_(None))
+                | (MetadataCatalogEntry.metadata_refreshed_on < oldest)
+            )
+            .order_by(MetadataCatalogEntry.metadata_refreshed_on.is_(None).desc())
+            .order_by(MetadataCatalogEntry.metadata_refreshed_on)
+            .limit(limit)
+            .all()
+        )
+
+    @staticmethod
+    def set_table_metadata(
+        entry: MetadataCatalogEntry,
+        table_metadata: dict[str, Any],
+    ) -> None:
+        entry.table_metadata = json.dumps(table_metadata)
+        entry.metadata_refreshed_on = datetime.now()
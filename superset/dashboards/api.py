@@ -32,7 +32,7 @@ from marshmallow import ValidationError
 from werkzeug.wrappers import Response as WerkzeugResponse
 from werkzeug.wsgi import FileWrapper
 
-from superset import db, is_feature_enabled, thumbnail_cache
+from superset import app, db, is_feature_enabled, security_manager, thumbnail_cache
 from superset.charts.schemas import ChartEntityResponseSchema
 from superset.commands.dashboard.copy import CopyDashboardCommand
 from superset.commands.dashboard.create import CreateDashboardCommand
@@ -108,6 +108,7 @@ from superset.tasks.thumbnails import (
 )
 from superset.tasks.utils import get_current_user
 from superset.utils import json
+from superset.utils.cache import etag_cache
 from superset.utils.pdf import build_pdf_from_screenshots
 from superset.utils.screenshots import (
     DashboardScreenshot,
@@ -153,6 +154,17 @@ def with_dashboard(
 
 
 # pylint: disable=too-many-public-methods
+def is_payload_cached() -> bool:
+    """
+    Whether the datasets, charts and tabs of dashboards are cached.
+
+    Guest users get trimmed datasets, so their payloads are never cached.
+    """
+    return (
+        app.config["DASHBOARD_PAYLOAD_CACHE"] and not security_manager.is_guest_user()
+    )
+
+
 class DashboardRestApi(BaseSupersetModelRestApi):
     datamodel = SQLAInterface(Dashboard)
 
@@ -386,6 +398,16 @@ class DashboardRestApi(BaseSupersetModelRestApi):
 
     @expose("/<id_or_slug>/datasets", methods=("GET",))
     @protect()
+    @etag_cache(
+        get_last_modified=lambda _self, id_or_slug: (
+            DashboardDAO.get_dashboard_payload_changed_on(id_or_slug)
+        ),
+        max_age=0,
+        raise_for_access=lambda _self, id_or_slug: DashboardDAO.get_by_id_or_slug(
+            id_or_slug
+        ),
+        skip=lambda _self, id_or_slug: not is_payload_cached(),
+    )
     @handle_api_exception
     @statsd_metrics
     @event_logger.log_this_with_context(
@@ -438,6 +460,16 @@ class DashboardRestApi(BaseSupersetModelRestApi):
 
     @expose("/<id_or_slug>/tabs", methods=("GET",))
     @protect()
+    @etag_cache(
+        get_last_modified=lambda _self, id_or_slug: (
+            DashboardDAO.get_dashboard_payload_changed_on(id_or_slug)
+        ),
+        max_age=0,
+        raise_for_access=lambda _self, id_or_slug: DashboardDAO.get_by_id_or_slug(
+            id_or_slug
+        ),
+        skip=lambda _self, id_or_slug: not is_payload_cached(),
+    )
     @safe
     @statsd_metrics
     @event_logger.log_this_with_context(
@@ -496,6 +528,16 @@ class DashboardRestApi(BaseSupersetModelRestApi):
 
     @expose("/<id_or_slug>/charts", methods=("GET",))
     @protect()
+    @etag_cache(
+        get_last_modified=lambda _self, id_or_slug: (
+            DashboardDAO.get_dashboard_payload_changed_on(id_or_slug)
+        ),
+        max_age=0,
+        raise_for_access=lambda _self, id_or_slug: DashboardDAO.get_by_id_or_slug(
+            id_or_slug
+        ),
+        skip=lambda _self, id_or_slug: not is_payload_cached(),
+    )
     @safe
     @statsd_metrics
     @event_logger.log_this_with_context(
@@ -0,0 +1,85 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Invalidation of the cached dashboard payloads.
+
+When ``DASHBOARD_PAYLOAD_CACHE`` is enabled the datasets, charts and tabs of a
+dashboard are cached by ``etag_cache`` until the dashboard changes, as reported by
+``DashboardDAO.get_dashboard_payload_changed_on``.
+
+Some changes don't update the ``changed_on`` of the dashboard, of its charts or of
+their datasets: adding a chart to a dashboard from Explore, or editing the columns and
+metrics of a dataset. These are detected with SQLAlchemy session events, and the commit
+stores its time in the cache, so that the payloads of all dashboards are considered
+changed.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from flask import has_app_context
+from sqlalchemy.orm import Session
+
+from superset.extensions import cache_manager
+
+CHANGED_ON_CACHE_KEY = "dashboard_payload_changed_on"
+
+
+def get_payloads_changed_on() -> Optional[datetime]:
+    """
+    Return the time of the last change to the payloads of all dashboards.
+    """
+    return cache_manager.cache.get(CHANGED_ON_CACHE_KEY)
+
+
+def is_payload_change(session: Session, instance: Any) -> bool:
+    """
+    Return whether a change to an instance may change the payload of a dashboard.
+    """
+    # pylint: disable=import-outside-toplevel
+    from superset.connectors.sqla.models import SqlaTable, SqlMetric, TableColumn
+    from superset.models.dashboard import Dashboard
+    from superset.models.slice import Slice
+
+    return isinstance(
+        instance, (Dashboard, Slice, SqlaTable, SqlMetric, TableColumn)
+    ) and (instance not in session.dirty or session.is_modified(instance))
+
+
+def after_flush(session: Session, flush_context: Any) -> None:
+    # pylint: disable=unused-argument
+    if any(
+        is_payload_change(session, instance)
+        for instance in (*session.new, *session.dirty, *session.deleted)
+    ):
+        session.info["dashboard_payload_changed"] = True
+
+
+def after_commit(session: Session) -> None:
+    if session.info.pop("dashboard_payload_changed", False) and has_app_context():
+        # the ``Last-Modified`` header has a precision of one second: move past the
+        # previous change, so that payloads cached during the same second are stale
+        changed_on = datetime.now().replace(microsecond=0) + timedelta(seconds=1)
+        if previous := get_payloads_changed_on():
+            changed_on = max(changed_on, previous + timedelta(seconds=1))
+        cache_manager.cache.set(CHANGED_ON_CACHE_KEY, changed_on, timeout=0)
+
+
+def after_rollback(session: Session) -> None:
+    session.info.pop("dashboard_payload_changed", None)
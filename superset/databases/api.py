@@ -68,6 +68,7 @@ from superset.commands.importers.exceptions import (
 from superset.commands.importers.v1.utils import get_contents_from_bundle
 from superset.constants import MODEL_API_RW_METHOD_PERMISSION_MAP, RouteMethod
 from superset.daos.database import DatabaseDAO, DatabaseUserOAuth2TokensDAO
+from superset.daos.metadata_catalog import MetadataCatalogDAO
 from superset.databases.decorators import check_table_access
 from superset.databases.filters import DatabaseFilter, DatabaseUploadEnabledFilter
 from superset.databases.schemas import (
@@ -732,12 +733,17 @@ class DatabaseRestApi(BaseSupersetModelRestApi):
             return self.response_404()
         try:
             catalog = kwargs["rison"].get("catalog")
-            schemas = database.get_all_schema_names(
-                catalog=catalog,
-                cache=database.schema_cache_enabled,
-                cache_timeout=database.schema_cache_timeout or None,
-                force=kwargs["rison"].get("force", False),
-            )
+            force = kwargs["rison"].get("force", False)
+            schemas = None
+            if app.config["METADATA_CATALOG_INDEX"] and not force:
+                schemas = MetadataCatalogDAO.find_schemas(database, catalog)
+            if schemas is None:
+                schemas = database.get_all_schema_names(
+                    catalog=catalog,
+                    cache=database.schema_cache_enabled,
+                    cache_timeout=database.schema_cache_timeout or None,
+                    force=force,
+                )
             schemas = security_manager.get_schemas_accessible_by_user(
                 database,
                 catalog,
@@ -810,7 +816,16 @@ class DatabaseRestApi(BaseSupersetModelRestApi):
         catalog_name = kwargs["rison"].get("catalog_name")
         schema_name = kwargs["rison"].get("schema_name", "")
 
-        command = TablesDatabaseCommand(pk, catalog_name, schema_name, force)
+        command = TablesDatabaseCommand(
+            pk,
+            catalog_name,
+            schema_name,
+            force,
+            search=kwargs["rison"].get("search"),
+            search_mode=kwargs["rison"].get("search_mode", "prefix"),
+            page=kwargs["rison"].get("page"),
+            page_size=kwargs["rison"].get("page_size"),
+        )
         payload = command.run()
         return self.response(200, **payload)
 
@@ -1018,7 +1033,16 @@ class DatabaseRestApi(BaseSupersetModelRestApi):
             # instead of raising 403, raise 404 to hide table existence
             raise TableNotFoundException("No such table") from ex
 
-        payload = database.db_engine_spec.get_table_metadata(database, table)
+        payload = None
+        if app.config["METADATA_CATALOG_INDEX"]:
+            payload = MetadataCatalogDAO.get_table_metadata(
+                database,
+                table.catalog,
+                table.schema,
+                table.table,
+            )
+        if payload is None:
+            payload = database.db_engine_spec.get_table_metadata(database, table)
 
         return self.response(200, **payload)
 
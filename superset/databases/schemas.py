@@ -79,6 +79,10 @@ database_tables_query_schema = {
         "force": {"type": "boolean"},
         "schema_name": {"type": "string"},
         "catalog_name": {"type": "string"},
+        "search": {"type": "string"},
+        "search_mode": {"type": "string", "enum": ["prefix", "contains"]},
+        "page": {"type": "integer", "minimum": 0},
+        "page_size": {"type": "integer", "minimum": 1},
     },
     "required": ["schema_name"],
 }
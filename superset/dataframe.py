@@ -17,10 +17,16 @@
 """Superset utilities for pandas.DataFrame."""
 
 import logging
-from typing import Any
+from typing import Any, Callable, Literal, Optional
 
+import numpy as np
 import pandas as pd
+import simplejson
+from pandas.api.types import infer_dtype, is_extension_array_dtype
+from pandas.core.dtypes.cast import maybe_box_native
+from simplejson.encoder import encode_basestring_ascii
 
+from superset.utils import json
 from superset.utils.core import JS_MAX_INTEGER
 
 logger = logging.getLogger(__name__)
@@ -37,6 +43,40 @@ def _convert_big_integers(val: Any) -> Any:
     return str(val) if isinstance(val, int) and abs(val) > JS_MAX_INTEGER else val
 
 
+def _get_big_integers(values: np.ndarray) -> np.ndarray:
+    """
+    Return the mask of the integers larger than ``JS_MAX_INTEGER`` in an array.
+    """
+    return (values > JS_MAX_INTEGER) | (values < -JS_MAX_INTEGER)
+
+
+def _column_to_list(column: pd.Series) -> list[Any]:
+    """
+    Convert a column to the values of its records, as ``DataFrame.to_dict`` does,
+    with integers larger than ``JS_MAX_INTEGER`` cast to strings.
+
+    Integer columns are checked with a mask, and object columns holding only strings
+    are returned as is, so that only the remaining columns are processed per value.
+    """
+    dtype = column.dtype
+    if is_extension_array_dtype(dtype):
+        return [_convert_big_integers(maybe_box_native(val)) for val in column]
+
+    values = column.to_numpy()
+    if dtype.kind in "iu":
+        records = values.tolist()
+        for i in np.flatnonzero(_get_big_integers(values)):
+            records[i] = str(records[i])
+        return records
+    if dtype.kind in "fb":
+        return values.tolist()
+    if dtype.kind == "O":
+        if infer_dtype(values, skipna=True) in {"string", "empty"}:
+            return values.tolist()
+        return [_convert_big_integers(maybe_box_native(val)) for val in values]
+    return list(column)
+
+
 def df_to_records(dframe: pd.DataFrame) -> list[dict[str, Any]]:
     """
     Convert a DataFrame to a set of records.
@@ -48,10 +88,161 @@ def df_to_records(dframe: pd.DataFrame) -> list[dict[str, Any]]:
         logger.warning(
             "DataFrame columns are not unique, some columns will be omitted."
         )
-    records = dframe.to_dict(orient="records")
+    columns = dframe.columns.tolist()
+    if not columns:
+        return [{} for _ in range(len(dframe))]
+
+    values = [_column_to_list(dframe.iloc[:, i]) for i in range(len(dframe.columns))]
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+def _encode_floats(values: np.ndarray) -> list[str]:
+    # ``repr`` of float64, as used by ``simplejson``
+    encoded = values.astype(np.float64).astype(str).astype(object)
+    encoded[~np.isfinite(values)] = "null"
+    return encoded.tolist()
+
+
+def _encode_iso_datetimes(values: np.ndarray) -> list[str]:
+    """
+    Encode ``datetime64[ns]`` values as ``Timestamp.isoformat``, with fractional
+    seconds only when they're not null.
+    """
+    encoded = np.datetime_as_string(values, unit="s").astype(object)
+    nanoseconds = values.view(np.int64) % 1_000_000_000
+    for unit, mask in (
+        ("us", (nanoseconds != 0) & (nanoseconds % 1000 == 0)),
+        ("ns", nanoseconds % 1000 != 0),
+    ):
+        if mask.any():
+            encoded[mask] = np.datetime_as_string(values[mask], unit=unit)
+    return ('"' + encoded + '"').tolist()
+
+
+def _encode_epoch_datetimes(values: np.ndarray) -> list[str]:
+    """
+    Encode ``datetime64[ns]`` values as milliseconds since the epoch, like
+    ``datetime_to_epoch``, which ignores nanoseconds.
+    """
+    epoch = values.view(np.int64) // 1000 / 1e6 * 1000
+    epoch[np.isnat(values)] = np.nan
+    return _encode_floats(epoch)
+
+
+# vectorized versions of the serializers of ``superset.utils.json`` for dates
+_DATETIME_ENCODERS: dict[Callable[[Any], Any], Callable[[np.ndarray], list[str]]] = {
+    json.json_iso_dttm_ser: _encode_iso_datetimes,
+    json.pessimistic_json_iso_dttm_ser: _encode_iso_datetimes,
+    json.json_int_dttm_ser: _encode_epoch_datetimes,
+}
+
+
+class _ValueEncoder:
+    """
+    Encode single values to JSON, as ``json.dumps`` does.
+    """
+
+    def __init__(self, default: Optional[Callable[[Any], Any]]) -> None:
+        self.default = default
+        self.encoder = simplejson.JSONEncoder(default=default, ignore_nan=True)
+        self.fallback = simplejson.JSONEncoder(
+            default=default, ignore_nan=True, encoding=None
+        )
+
+    def encode(self, value: Any) -> str:
+        try:
+            return self.encoder.encode(value)
+        except UnicodeDecodeError:
+            return self.fallback.encode(value)
+
+
+def _encode_column(column: pd.Series, encoder: _ValueEncoder) -> list[str]:
+    """
+    Encode each value of a column to JSON, as ``json.dumps`` would in a record.
+
+    Numbers and booleans are encoded with NumPy, strings with the encoder of
+    ``simplejson``; other values are encoded one at a time.
+    """
+    dtype = column.dtype
+    values = column.to_numpy()
+    if not is_extension_array_dtype(dtype):
+        if dtype.kind in "iu":
+            encoded = list(map(str, values.tolist()))
+            for i in np.flatnonzero(_get_big_integers(values)):
+                encoded[i] = f'"{encoded[i]}"'
+            return encoded
+        if dtype.kind == "f":
+            return _encode_floats(values)
+        if dtype.kind == "b":
+            return np.where(values, "true", "false").tolist()
+        if dtype == np.dtype("datetime64[ns]") and (
+            encode_datetimes := _DATETIME_ENCODERS.get(encoder.default)  # type: ignore
+        ):
+            return encode_datetimes(values)
+        if dtype.kind in "mM" and encoder.default is not None:
+            # dates are never JSON types, they're all converted by ``default``
+            converted = pd.Series(
+                [encoder.default(val) for val in column], dtype=object
+            )
+            return _encode_column(converted, encoder)
+        if dtype.kind == "O" and infer_dtype(values, skipna=True) == "string":
+            encoded = np.empty(len(values), dtype=object)
+            nulls = pd.isna(values)
+            encoded[~nulls] = [encode_basestring_ascii(val) for val in values[~nulls]]
+            encoded[nulls] = [encoder.encode(val) for val in values[nulls]]
+            return encoded.tolist()
+
+    return [encoder.encode(val) for val in _column_to_list(column)]
+
+
+def df_to_json(
+    dframe: pd.DataFrame,
+    orient: Literal["records", "columns"] = "records",
+    default: Optional[Callable[[Any], Any]] = json.json_iso_dttm_ser,
+) -> str:
+    """
+    Serialize a DataFrame to JSON, without building its records.
+
+    The output is the same as ``json.dumps(df_to_records(dframe), default=default)``
+    for the ``records`` layout, and maps each column to its list of values for the
+    ``columns`` layout. Each column is encoded at once, following the rules of
+    ``df_to_records`` for big integers and of ``json.dumps`` for NaN (``null``),
+    dates and bytes (``default``).
+
+    :param dframe: the DataFrame to serialize
+    :param orient: the layout of the JSON, a list of records or a mapping of columns
+    :param default: function returning a serializable version of other values
+    :returns: the JSON document
+    """
+    columns = dframe.columns.tolist()
+    if not dframe.columns.is_unique or not all(
+        isinstance(column, str) for column in columns
+    ):
+        records = df_to_records(dframe)
+        if orient == "columns":
+            return json.dumps(
+                {column: [record[column] for record in records] for column in columns},
+                default=default,
+                ignore_nan=True,
+            )
+        return json.dumps(records, default=default, ignore_nan=True)
+
+    encoder = _ValueEncoder(default)
+    keys = [encode_basestring_ascii(column) for column in columns]
+    encoded = [_encode_column(dframe.iloc[:, i], encoder) for i in range(len(columns))]
+
+    if orient == "columns":
+        return (
+            "{"
+            + ", ".join(
+                f"{key}: [{', '.join(values)}]" for key, values in zip(keys, encoded)
+            )
+            + "}"
+        )
 
-    for record in records:
-        for key in record:
-            record[key] = _convert_big_integers(record[key])
+    if not columns:
+        return "[" + ", ".join("{}" for _ in range(len(dframe))) + "]"
 
-    return records
+    # each row is formatted at once from the encoded values of its columns
+    template = "{" + ", ".join(f"{key.replace('%', '%%')}: %s" for key in keys) + "}"
+    return "[" + ", ".join([template % row for row in zip(*encoded)]) + "]"
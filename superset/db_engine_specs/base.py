@@ -28,6 +28,7 @@ from typing import (
     Callable,
     cast,
     ContextManager,
+    Iterator,
     NamedTuple,
     TYPE_CHECKING,
     TypedDict,
@@ -63,7 +64,7 @@ from superset.constants import QUERY_CANCEL_KEY, TimeGrain as TimeGrainConstants
 from superset.databases.utils import get_table_metadata, make_url_safe
 from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
 from superset.exceptions import DisallowedSQLFunction, OAuth2Error, OAuth2RedirectError
-from superset.sql.parse import BaseSQLStatement, SQLScript, Table
+from superset.sql.parse import BaseSQLStatement, SQLScript, SQLStatement, Table
 from superset.sql_parse import ParsedQuery
 from superset.superset_typing import (
     OAuth2ClientConfig,
@@ -394,6 +395,10 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
 
     force_column_alias_quotes = False
     arraysize = 0
+    # Whether results can be streamed with ``fetch_data_batches``. Engine specs that
+    # post-process the rows returned by ``fetch_data`` should disable this, so that
+    # the whole result is fetched through ``fetch_data`` in a single batch.
+    allows_fetch_data_batches = True
     max_column_name_length: int | None = None
     try_remove_schema_from_table_name = True  # pylint: disable=invalid-name
     run_multiple_statements_as_one = False
@@ -973,32 +978,94 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
             if cls.limit_method == LimitMethod.FETCH_MANY and limit:
                 return cursor.fetchmany(limit)
             data = cursor.fetchall()
-            description = cursor.description or []
-            # Create a mapping between column name and a mutator function to normalize
-            # values with. The first two items in the description row are
-            # the column name and type.
-            column_mutators = {
-                row[0]: func
-                for row in description
-                if (
-                    func := cls.column_type_mutators.get(
-                        type(cls.get_sqla_column_type(cls.get_datatype(row[1])))
-                    )
-                )
-            }
-            if column_mutators:
-                indexes = {row[0]: idx for idx, row in enumerate(description)}
-                for row_idx, row in enumerate(data):
-                    new_row = list(row)
-                    for col, func in column_mutators.items():
-                        col_idx = indexes[col]
-                        new_row[col_idx] = func(row[col_idx])
-                    data[row_idx] = tuple(new_row)
-
-            return data
+            return cls.mutate_rows(cursor, data)
         except Exception as ex:
             raise cls.get_dbapi_mapped_exception(ex) from ex
 
+    @classmethod
+    def fetch_data_batches(
+        cls,
+        cursor: Any,
+        batch_size: int,
+        limit: int | None = None,
+    ) -> Iterator[list[tuple[Any, ...]]]:
+        """
+        Fetch the results of a cursor in batches of at most ``batch_size`` rows.
+
+        This allows callers to process large results incrementally, instead of holding
+        all the rows in memory at once. Engine specs that don't allow fetching data in
+        batches return the whole result of ``fetch_data`` as a single batch.
+
+        :param cursor: Cursor instance
+        :param batch_size: Maximum number of rows in each batch
+        :param limit: Maximum number of rows to be returned by the cursor
+        :return: Iterator over batches of rows
+        """
+        if not cls.allows_fetch_data_batches:
+            yield cls.fetch_data(cursor, limit)
+            return
+
+        if cls.arraysize:
+            cursor.arraysize = cls.arraysize
+        remaining = limit
+        first = True
+        try:
+            while remaining is None or remaining > 0:
+                size = batch_size if remaining is None else min(batch_size, remaining)
+                try:
+                    data = cursor.fetchmany(size)
+                except Exception:  # pylint: disable=broad-except
+                    # some drivers only populate the cursor description after the
+                    # first fetch, which raises when the statement returns no rows
+                    if first and not cursor.description:
+                        return
+                    raise
+                first = False
+                if not data:
+                    return
+                if remaining is not None:
+                    remaining -= len(data)
+                yield cls.mutate_rows(cursor, list(data))
+        except Exception as ex:
+            raise cls.get_dbapi_mapped_exception(ex) from ex
+
+    @classmethod
+    def mutate_rows(
+        cls,
+        cursor: Any,
+        data: list[tuple[Any, ...]],
+    ) -> list[tuple[Any, ...]]:
+        """
+        Normalize values fetched from the cursor using ``column_type_mutators``.
+
+        :param cursor: Cursor instance
+        :param data: Rows fetched from the cursor, modified in place
+        :return: The mutated rows
+        """
+        description = cursor.description or []
+        # Create a mapping between column name and a mutator function to normalize
+        # values with. The first two items in the description row are
+        # the column name and type.
+        column_mutators = {
+            row[0]: func
+            for row in description
+            if (
+                func := cls.column_type_mutators.get(
+                    type(cls.get_sqla_column_type(cls.get_datatype(row[1])))
+                )
+            )
+        }
+        if column_mutators:
+            indexes = {row[0]: idx for idx, row in enumerate(description)}
+            for row_idx, row in enumerate(data):
+                new_row = list(row)
+                for col, func in column_mutators.items():
+                    col_idx = indexes[col]
+                    new_row[col_idx] = func(row[col_idx])
+                data[row_idx] = tuple(new_row)
+
+        return data
+
     @classmethod
     def expand_data(
         cls, columns: list[ResultSetColumnType], data: list[dict[Any, Any]]
@@ -1118,7 +1185,12 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
 
     @classmethod
     def apply_limit_to_sql(
-        cls, sql: str, limit: int, database: Database, force: bool = False
+        cls,
+        sql: str,
+        limit: int,
+        database: Database,
+        force: bool = False,
+        statement: SQLStatement | None = None,
     ) -> str:
         """
         Alters the SQL statement to apply a LIMIT clause
@@ -1126,6 +1198,7 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
         :param sql: SQL query
         :param limit: Maximum number of rows to be returned by the query
         :param database: Database instance
+        :param statement: The parsed SQL query, if available
         :return: SQL query with limit clause
         """
         # TODO: Fix circular import caused by importing Database
@@ -1139,6 +1212,10 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
             return database.compile_sqla_query(qry)
 
         if cls.limit_method == LimitMethod.FORCE_LIMIT:
+            if statement is not None:
+                statement.set_limit_value(limit, force=force)
+                return statement.sql
+
             parsed_query = sql_parse.ParsedQuery(sql, engine=cls.engine)
             sql = parsed_query.set_or_update_query_limit(limit, force=force)
 
@@ -2057,7 +2134,7 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
             raise
 
     @classmethod
-    def is_select_query(cls, parsed_query: ParsedQuery) -> bool:
+    def is_select_query(cls, parsed_query: ParsedQuery | SQLStatement) -> bool:
         """
         Determine if the statement should be considered as SELECT statement.
         Some query dialects do not contain "SELECT" word in queries (eg. Kusto)
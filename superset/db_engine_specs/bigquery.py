@@ -115,6 +115,8 @@ class BigQueryEngineSpec(BaseEngineSpec):  # pylint: disable=too-many-public-met
     engine_name = "Google BigQuery"
     max_column_name_length = 128
     disable_ssh_tunneling = True
+    # rows are post-processed in `fetch_data`
+    allows_fetch_data_batches = False
 
     parameters_schema = BigQueryParametersSchema()
     default_driver = "bigquery"
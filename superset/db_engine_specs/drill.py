@@ -35,6 +35,8 @@ class DrillEngineSpec(BaseEngineSpec):
     engine = "drill"
     engine_name = "Apache Drill"
     default_driver = "sadrill"
+    # `fetch_data` handles the error raised by the driver on empty results
+    allows_fetch_data_batches = False
 
     supports_dynamic_schema = True
 
@@ -93,6 +93,8 @@ class HiveEngineSpec(PrestoEngineSpec):
 
     engine = "hive"
     engine_name = "Apache Hive"
+    # `fetch_data` checks the state of the operation before fetching
+    allows_fetch_data_batches = False
     max_column_name_length = 767
     allows_alias_to_source_column = True
     allows_hidden_orderby_agg = False
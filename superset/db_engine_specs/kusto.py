@@ -16,7 +16,7 @@
 # under the License.
 import re
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
 from sqlalchemy import types
 from sqlalchemy.dialects.mssql.base import SMALLDATETIME
@@ -28,6 +28,7 @@ from superset.db_engine_specs.exceptions import (
     SupersetDBAPIOperationalError,
     SupersetDBAPIProgrammingError,
 )
+from superset.sql.parse import SQLStatement
 from superset.sql_parse import ParsedQuery
 from superset.utils.core import GenericDataType
 
@@ -154,7 +155,7 @@ class KustoKqlEngineSpec(BaseEngineSpec):  # pylint: disable=abstract-method
         return None
 
     @classmethod
-    def is_select_query(cls, parsed_query: ParsedQuery) -> bool:
+    def is_select_query(cls, parsed_query: Union[ParsedQuery, SQLStatement]) -> bool:
         return not parsed_query.sql.startswith(".")
 
     @classmethod
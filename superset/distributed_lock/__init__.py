@@ -38,6 +38,7 @@ RESOURCE = KeyValueResource.LOCK
 @contextmanager
 def KeyValueDistributedLock(  # pylint: disable=invalid-name
     namespace: str,
+    lock_expiration: timedelta = LOCK_EXPIRATION,
     **kwargs: Any,
 ) -> Iterator[uuid.UUID]:
     """
@@ -48,7 +49,12 @@ def KeyValueDistributedLock(  # pylint: disable=invalid-name
     lock that can be used within the context, and corresponds to the key in the KV
     store.
 
+    The lock expires after ``lock_expiration``, it must outlast the context. Once
+    expired, the lock may be taken by someone else, and it's not released when
+    exiting the context.
+
     :param namespace: The namespace for which the lock is to be acquired.
+    :param lock_expiration: The duration after which the lock expires.
     :param kwargs: Additional keyword arguments.
     :yields: A unique identifier (UUID) for the acquired lock (the KV key).
     :raises CreateKeyValueDistributedLockFailedException: If the lock is taken.
@@ -66,12 +72,20 @@ def KeyValueDistributedLock(  # pylint: disable=invalid-name
         raise CreateKeyValueDistributedLockFailedException("Lock already taken")
 
     logger.debug("Acquiring lock on namespace %s for key %s", namespace, key)
+    owner = uuid.uuid4().hex
     try:
-        CreateDistributedLock(namespace=namespace, params=kwargs).run()
+        CreateDistributedLock(
+            namespace=namespace,
+            params=kwargs,
+            owner=owner,
+            lock_expiration=lock_expiration,
+        ).run()
     except CreateKeyValueDistributedLockFailedException as ex:
         logger.debug("Lock on namespace %s for key %s already taken", namespace, key)
         raise CreateKeyValueDistributedLockFailedException("Lock already taken") from ex
 
-    yield key
-    DeleteDistributedLock(namespace=namespace, params=kwargs).run()
-    logger.debug("Removed lock on namespace %s for key %s", namespace, key)
+    try:
+        yield key
+    finally:
+        DeleteDistributedLock(namespace=namespace, params=kwargs, owner=owner).run()
+        logger.debug("Removed lock on namespace %s for key %s", namespace, key)
@@ -19,3 +19,5 @@ from typing import TypedDict
 
 class LockValue(TypedDict):
     value: bool
+    # identifies the holder of the lock, which is the only one releasing it
+    owner: str
@@ -0,0 +1,143 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, NamedTuple, Optional
+
+from flask import Flask
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from superset.stats_logger import BaseStatsLogger, DummyStatsLogger
+
+logger = logging.getLogger(__name__)
+
+# engine parameters that only make sense for pooled engines, and that SQLAlchemy
+# rejects when combined with ``NullPool``
+POOL_PARAMS = ("pool_size", "max_overflow", "pool_recycle", "pool_timeout")
+
+
+class EngineKey(NamedTuple):
+    database_id: Optional[int]
+    catalog: Optional[str]
+    schema: Optional[str]
+    effective_username: Optional[str]
+    # hash of the final URL and engine parameters, so that any change to the
+    # connection (password, extra, OAuth2 token, mutator output) maps to a new engine
+    uri_hash: str
+
+
+class EngineManager:
+    """
+    A per-process registry of SQLAlchemy engines for analytical databases.
+
+    Engines are reused across requests so that connections can be pooled, instead of
+    creating a new engine (and a new connection) every time a database is queried.
+    The registry is bounded; the least recently used engines are disposed when the
+    limit is reached.
+    """
+
+    def __init__(self) -> None:
+        self._engines: OrderedDict[EngineKey, Engine] = OrderedDict()
+        self._lock = threading.RLock()
+        self._stats_logger: BaseStatsLogger = DummyStatsLogger()
+        self.enabled = False
+        self.max_engines = 100
+        self.pool_defaults: dict[str, Any] = {}
+
+    def init_app(self, app: Flask) -> None:
+        self.dispose_all()
+        self.enabled = app.config["DB_ENGINE_POOL_ENABLED"]
+        self.max_engines = app.config["DB_ENGINE_POOL_MAX_ENGINES"]
+        self.pool_defaults = {
+            "pool_size": app.config["DB_ENGINE_POOL_SIZE"],
+            "max_overflow": app.config["DB_ENGINE_POOL_MAX_OVERFLOW"],
+            "pool_recycle": app.config["DB_ENGINE_POOL_RECYCLE"],
+            "pool_timeout": app.config["DB_ENGINE_POOL_TIMEOUT"],
+            "pool_pre_ping": True,
+        }
+        self._stats_logger = app.config["STATS_LOGGER"]
+
+    def apply_pool_defaults(self, params: dict[str, Any]) -> None:
+        """
+        Set the configured pool parameters, unless overridden per database in the
+        ``engine_params`` of the database extra.
+        """
+        for key, value in self.pool_defaults.items():
+            params.setdefault(key, value)
+
+    def get_engine(self, key: EngineKey, factory: Callable[[], Engine]) -> Engine:
+        """
+        Return the engine registered under ``key``, creating it if needed.
+        """
+        with self._lock:
+            if (engine := self._engines.get(key)) is not None:
+                self._engines.move_to_end(key)
+                self._stats_logger.incr("db_engine_pool.engine.hit")
+                return engine
+
+            engine = factory()
+            self._register_pool_listeners(engine)
+            self._engines[key] = engine
+            self._stats_logger.incr("db_engine_pool.engine.miss")
+
+            while len(self._engines) > self.max_engines:
+                _, evicted = self._engines.popitem(last=False)
+                evicted.dispose()
+                self._stats_logger.incr("db_engine_pool.engine.evicted")
+
+            self._stats_logger.gauge("db_engine_pool.engines", len(self._engines))
+            return engine
+
+    def invalidate(self, database_id: Optional[int]) -> None:
+        """
+        Dispose all engines of a given database.
+        """
+        with self._lock:
+            for key in [key for key in self._engines if key.database_id == database_id]:
+                self._engines.pop(key).dispose()
+            self._stats_logger.gauge("db_engine_pool.engines", len(self._engines))
+
+    def dispose_all(self) -> None:
+        with self._lock:
+            while self._engines:
+                _, engine = self._engines.popitem()
+                engine.dispose()
+
+    def database_after_change(  # pylint: disable=unused-argument
+        self,
+        mapper: Any,
+        connection: Any,
+        target: Any,
+    ) -> None:
+        """
+        Triggered by SQLAlchemy after_update/after_delete events on ``Database``.
+        """
+        self.invalidate(target.id)
+
+    def _register_pool_listeners(self, engine: Engine) -> None:
+        stats_logger = self._stats_logger
+
+        @event.listens_for(engine, "connect")
+        def on_connect(*args: Any) -> None:  # pylint: disable=unused-argument
+            stats_logger.incr("db_engine_pool.connect")
+
+        @event.listens_for(engine, "checkout")
+        def on_checkout(*args: Any) -> None:  # pylint: disable=unused-argument
+            stats_logger.incr("db_engine_pool.checkout")
@@ -24,6 +24,7 @@ from typing import Any, Callable, TYPE_CHECKING
 import requests
 import psycopg2
 
+import pandas as pd
 import wtforms_json
 from deprecation import deprecated
 from flask import Flask, redirect, jsonify, request
@@ -45,6 +46,7 @@ from superset.extensions import (
     csrf,
     db,
     encrypted_field_factory,
+    engine_manager,
     feature_flag_manager,
     machine_auth_provider_factory,
     manifest_processor,
@@ -419,6 +421,7 @@ class SupersetAppInitializer:  # pylint: disable=too-many-public-methods
         self.configure_async_queries()
         self.configure_ssh_manager()
         self.configure_stats_manager()
+        self.configure_engine_manager()
 
         # Hook that provides administrators a handle on the Flask APP
         # after initialization
@@ -488,6 +491,7 @@ class SupersetAppInitializer:  # pylint: disable=too-many-public-methods
         self.configure_cache()
         self.set_db_default_isolation()
         self.configure_sqlglot_dialects()
+        self.configure_pandas()
 
         with self.superset_app.app_context():
             self.init_app_in_ctx()
@@ -526,6 +530,9 @@ class SupersetAppInitializer:  # pylint: disable=too-many-public-methods
     def configure_stats_manager(self) -> None:
         stats_logger_manager.init_app(self.superset_app)
 
+    def configure_engine_manager(self) -> None:
+        engine_manager.init_app(self.superset_app)
+
     def setup_event_logger(self) -> None:
         _event_logger["event_logger"] = get_event_logger_from_cfg_value(
             self.superset_app.config.get("EVENT_LOGGER", DBEventLogger())
@@ -551,6 +558,12 @@ class SupersetAppInitializer:  # pylint: disable=too-many-public-methods
     def configure_sqlglot_dialects(self) -> None:
         SQLGLOT_DIALECTS.update(self.config["SQLGLOT_DIALECTS_EXTENSIONS"])
 
+    def configure_pandas(self) -> None:
+        # the options of pandas are global to the process, they can't be changed
+        # while other threads use them
+        if self.config["POST_PROCESSING_COPY_ON_WRITE"]:
+            pd.set_option("mode.copy_on_write", True)
+
     @transaction()
     def configure_fab(self) -> None:
         if self.config["SILENCE_FAB"]:
@@ -19,6 +19,9 @@
 from __future__ import annotations
 
 import re
+import threading
+from collections import OrderedDict
+from contextvars import ContextVar
 from dataclasses import dataclass
 from datetime import datetime
 from functools import lru_cache, partial
@@ -27,7 +30,7 @@ from typing import Any, Callable, cast, Optional, TYPE_CHECKING, TypedDict, Unio
 import dateutil
 from flask import current_app, g, has_request_context, request
 from flask_babel import gettext as _
-from jinja2 import DebugUndefined, Environment
+from jinja2 import DebugUndefined, Environment, Template
 from jinja2.sandbox import SandboxedEnvironment
 from sqlalchemy.engine.interfaces import Dialect
 from sqlalchemy.sql.expression import bindparam
@@ -37,7 +40,7 @@ from superset.commands.dataset.exceptions import DatasetNotFoundError
 from superset.common.utils.time_range_utils import get_since_until_from_time_range
 from superset.constants import LRU_CACHE_MAX_SIZE, NO_TIME_RANGE
 from superset.exceptions import SupersetTemplateException
-from superset.extensions import feature_flag_manager
+from superset.extensions import feature_flag_manager, stats_logger_manager
 from superset.sql_parse import Table
 from superset.utils import json
 from superset.utils.core import (
@@ -49,6 +52,7 @@ from superset.utils.core import (
     get_username,
     merge_extra_filters,
 )
+from superset.utils.dates import now_as_float
 
 if TYPE_CHECKING:
     from superset.connectors.sqla.models import SqlaTable
@@ -72,6 +76,10 @@ ALLOWED_TYPES = (
 )
 COLLECTION_TYPES = ("list", "dict", "tuple", "set")
 
+# Jinja delimiters, templates without any of them are rendered as is
+TEMPLATE_DELIMITERS = ("{{", "{%", "{#")
+NEWLINE_REGEX = re.compile(r"\r\n|\r|\n")
+
 
 @lru_cache(maxsize=LRU_CACHE_MAX_SIZE)
 def context_addons() -> dict[str, Any]:
@@ -550,6 +558,70 @@ class WhereInMacro:  # pylint: disable=too-few-public-methods
         return result
 
 
+# the ``where_in`` macro of the processor rendering a template in the current context,
+# since the Jinja environment is shared by all the processors of an engine
+where_in_macro: ContextVar[WhereInMacro] = ContextVar("where_in_macro")
+
+
+def where_in(values: list[Any], mark: Optional[str] = None) -> str:
+    return where_in_macro.get()(values, mark)
+
+
+def render_plain_text(sql: str) -> str:
+    """
+    Render a template without any Jinja delimiter, as Jinja would: newlines are
+    normalized and a single trailing newline is removed.
+    """
+    text = NEWLINE_REGEX.sub("\n", sql)
+    return text[:-1] if text.endswith("\n") else text
+
+
+class TemplateCache:
+    """
+    Process-wide cache of compiled templates.
+
+    Compiling a template (lexing, parsing and generating its Python code) is much more
+    expensive than rendering it, and the same virtual dataset SQL and metric
+    expressions are rendered for every chart query. Templates are keyed by their
+    processor class, which owns the Jinja environment, and their source. The cache is
+    bounded; the least recently used templates are evicted when
+    ``JINJA_TEMPLATE_CACHE_MAX_SIZE`` is reached.
+    """
+
+    def __init__(self) -> None:
+        self._templates: OrderedDict[tuple[type[Any], str], Template] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, processor: BaseTemplateProcessor, source: str) -> Template:
+        key = (type(processor), source)
+        with self._lock:
+            if (template := self._templates.get(key)) is not None:
+                self._templates.move_to_end(key)
+                stats_logger_manager.instance.incr("jinja.template_cache.hit")
+                return template
+
+        template = processor.env.from_string(source)
+        stats_logger_manager.instance.incr("jinja.template_cache.miss")
+
+        max_size = current_app.config["JINJA_TEMPLATE_CACHE_MAX_SIZE"]
+        with self._lock:
+            self._templates[key] = template
+            while len(self._templates) > max_size:
+                self._templates.popitem(last=False)
+        return template
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+
+
+template_cache = TemplateCache()
+
+# the Jinja environment of each template processor class
+_environments: dict[type[Any], Environment] = {}
+_environments_lock = threading.Lock()
+
+
 class BaseTemplateProcessor:
     """
     Base class for database-specific jinja context
@@ -580,16 +652,33 @@ class BaseTemplateProcessor:
         self._applied_filters = applied_filters
         self._removed_filters = removed_filters
         self._context: dict[str, Any] = {}
-        self.env: Environment = SandboxedEnvironment(undefined=DebugUndefined)
+        self._where_in = WhereInMacro(database.get_dialect())
+        self.env: Environment = self.get_environment()
         self.set_context(**kwargs)
 
-        # custom filters
-        self.env.filters["where_in"] = WhereInMacro(database.get_dialect())
+    @classmethod
+    def get_environment(cls) -> Environment:
+        """
+        Return the Jinja environment shared by the instances of the processor, the
+        context of each processor is passed when rendering templates.
+        """
+        with _environments_lock:
+            if (env := _environments.get(cls)) is None:
+                env = SandboxedEnvironment(undefined=DebugUndefined)
+                # custom filters
+                env.filters["where_in"] = where_in
+                _environments[cls] = env
+        return env
 
     def set_context(self, **kwargs: Any) -> None:
         self._context.update(kwargs)
         self._context.update(context_addons())
 
+    def get_context(self, **kwargs: Any) -> dict[str, Any]:
+        """Return the validated context to render a template with"""
+        kwargs.update(self._context)
+        return validate_template_context(self.engine, kwargs)
+
     def process_template(self, sql: str, **kwargs: Any) -> str:
         """Processes a sql template
 
@@ -597,11 +686,22 @@ class BaseTemplateProcessor:
         >>> process_template(sql)
         "SELECT '2017-01-01T00:00:00'"
         """
-        template = self.env.from_string(sql)
-        kwargs.update(self._context)
+        if not any(delimiter in sql for delimiter in TEMPLATE_DELIMITERS):
+            stats_logger_manager.instance.incr("jinja.render.plain_text")
+            return render_plain_text(sql)
 
-        context = validate_template_context(self.engine, kwargs)
-        return template.render(context)
+        template = template_cache.get(self, sql)
+        return self.render(template, self.get_context(**kwargs))
+
+    def render(self, template: Template, context: dict[str, Any]) -> str:
+        """Render a template of the environment of the processor"""
+        start = now_as_float()
+        token = where_in_macro.set(self._where_in)
+        try:
+            return template.render(context)
+        finally:
+            where_in_macro.reset(token)
+            stats_logger_manager.instance.timing("jinja.render", now_as_float() - start)
 
 
 class JinjaTemplateProcessor(BaseTemplateProcessor):
@@ -748,27 +848,23 @@ class HiveTemplateProcessor(PrestoTemplateProcessor):
 class SparkTemplateProcessor(HiveTemplateProcessor):
     engine = "spark"
 
-    def process_template(self, sql: str, **kwargs: Any) -> str:
-        template = self.env.from_string(sql)
-        kwargs.update(self._context)
+    def get_context(self, **kwargs: Any) -> dict[str, Any]:
+        context = super().get_context(**kwargs)
 
         # Backwards compatibility if migrating from Hive.
-        context = validate_template_context(self.engine, kwargs)
         context["hive"] = context["spark"]
-        return template.render(context)
+        return context
 
 
 class TrinoTemplateProcessor(PrestoTemplateProcessor):
     engine = "trino"
 
-    def process_template(self, sql: str, **kwargs: Any) -> str:
-        template = self.env.from_string(sql)
-        kwargs.update(self._context)
+    def get_context(self, **kwargs: Any) -> dict[str, Any]:
+        context = super().get_context(**kwargs)
 
         # Backwards compatibility if migrating from Presto.
-        context = validate_template_context(self.engine, kwargs)
         context["presto"] = context["trino"]
-        return template.render(context)
+        return context
 
 
 DEFAULT_PROCESSORS = {
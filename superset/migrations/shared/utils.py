@@ -351,7 +351,12 @@ def drop_columns(table_name: str, *columns: str) -> None:
             batch_op.drop_column(col)
 
 
-def create_index(table_name: str, index_name: str, *columns: str) -> None:
+def create_index(
+    table_name: str,
+    index_name: str,
+    *columns: str,
+    **kwargs: Any,
+) -> None:
     """
     Creates an index on specified columns of an existing database table.
 
@@ -361,6 +366,7 @@ def create_index(table_name: str, index_name: str, *columns: str) -> None:
     :param table_name: The name of the table on which the index will be created.
     :param index_name: The name of the index to be created.
     :param columns: A list column names where the index will be created
+    :param kwargs: Additional arguments of the index, eg, dialect specific options
     """
 
     if table_has_index(table=table_name, index=index_name):
@@ -373,7 +379,12 @@ def create_index(table_name: str, index_name: str, *columns: str) -> None:
         f"Creating index {GREEN}{index_name}{RESET} on table {GREEN}{table_name}{RESET}"
     )
 
-    op.create_index(table_name=table_name, index_name=index_name, columns=columns)
+    op.create_index(
+        table_name=table_name,
+        index_name=index_name,
+        columns=columns,
+        **kwargs,
+    )
 
 
 def drop_index(table_name: str, index_name: str) -> None:
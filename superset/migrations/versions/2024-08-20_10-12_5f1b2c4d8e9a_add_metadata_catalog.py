@@ -0,0 +1,69 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""add_metadata_catalog
+
+Revision ID: 5f1b2c4d8e9a
+Revises: 48cbb571fa3a
+Create Date: 2024-08-20 10:12:31.402817
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "5f1b2c4d8e9a"
+down_revision = "48cbb571fa3a"
+
+import sqlalchemy as sa  # noqa: E402
+
+from superset.migrations.shared.utils import (  # noqa: E402
+    create_index,
+    create_table,
+    drop_table,
+)
+from superset.utils.core import MediumText  # noqa: E402
+
+
+def upgrade():
+    create_table(
+        "metadata_catalog",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("database_id", sa.Integer(), nullable=False),
+        sa.Column("type", sa.String(length=16), nullable=False),
+        sa.Column("catalog", sa.String(length=256), nullable=True),
+        sa.Column("schema", sa.String(length=255), nullable=True),
+        sa.Column("name", sa.String(length=250), nullable=False),
+        sa.Column("search_name", sa.String(length=250), nullable=False),
+        sa.Column("table_metadata", MediumText(), nullable=True),
+        sa.Column("created_on", sa.DateTime(), nullable=False),
+        sa.Column("children_refreshed_on", sa.DateTime(), nullable=True),
+        sa.Column("metadata_refreshed_on", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["database_id"], ["dbs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    # the type is left out, to keep the index within the key size limit of MySQL
+    create_index(
+        "metadata_catalog",
+        "ix_metadata_catalog_search",
+        "database_id",
+        "catalog",
+        "schema",
+        "search_name",
+        postgresql_ops={"search_name": "varchar_pattern_ops"},
+    )
+
+
+def downgrade():
+    drop_table("metadata_catalog")
@@ -25,11 +25,13 @@ import builtins
 import logging
 import textwrap
 from ast import literal_eval
+from collections.abc import Iterator
 from contextlib import closing, contextmanager, nullcontext, suppress
 from copy import deepcopy
 from datetime import datetime
 from functools import lru_cache
 from inspect import signature
+from itertools import chain
 from typing import Any, Callable, cast, TYPE_CHECKING
 
 import numpy
@@ -68,10 +70,12 @@ from superset.db_engine_specs.base import MetricType, TimeGrain
 from superset.extensions import (
     cache_manager,
     encrypted_field_factory,
+    engine_manager,
     event_logger,
     security_manager,
     ssh_manager_factory,
 )
+from superset.extensions.engine_manager import EngineKey, POOL_PARAMS
 from superset.models.helpers import AuditMixinNullable, ImportExportMixin
 from superset.result_set import SupersetResultSet
 from superset.sql_parse import Table
@@ -83,6 +87,8 @@ from superset.superset_typing import (
 from superset.utils import cache as cache_util, core as utils, json
 from superset.utils.backports import StrEnum
 from superset.utils.core import DatasourceName, get_username
+from superset.utils.dates import now_as_float
+from superset.utils.hashing import md5_sha_from_dict
 from superset.utils.oauth2 import get_oauth2_access_token, OAuth2ClientConfigSchema
 
 config = app.config
@@ -95,6 +101,7 @@ logger = logging.getLogger(__name__)
 if TYPE_CHECKING:
     from superset.databases.ssh_tunnel.models import SSHTunnel
     from superset.models.sql_lab import Query
+    from superset.sql.parse import SQLStatement
 
 DB_CONNECTION_MUTATOR = config["DB_CONNECTION_MUTATOR"]
 
@@ -406,7 +413,7 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
         self,
         catalog: str | None = None,
         schema: str | None = None,
-        nullpool: bool = True,
+        nullpool: bool | None = None,
         source: utils.QuerySource | None = None,
         override_ssh_tunnel: SSHTunnel | None = None,
     ) -> Engine:
@@ -417,12 +424,17 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
         context manager (as opposed to the engine directly) is important because we need
         to potentially establish SSH tunnels before the connection is created, and clean
         them up once the engine is no longer used.
+
+        When ``nullpool`` is not specified the engine is pooled and reused across calls
+        if ``DB_ENGINE_POOL_ENABLED`` is set, otherwise a ``NullPool`` engine is created.
         """
         from superset.daos.database import (  # pylint: disable=import-outside-toplevel
             DatabaseDAO,
         )
 
         sqlalchemy_uri = self.sqlalchemy_uri_decrypted
+        if nullpool is None:
+            nullpool = not engine_manager.enabled
 
         ssh_tunnel = override_ssh_tunnel or DatabaseDAO.get_ssh_tunnel(self.id)
         ssh_context_manager = (
@@ -447,6 +459,9 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
                     sqlalchemy_uri,
                     ssh_context,
                 )
+                # the tunnel is closed when the context exits, so its connections
+                # can't outlive it in a pool
+                nullpool = True
 
             engine_context_manager = config["ENGINE_CONTEXT_MANAGER"]
             with engine_context_manager(self, catalog, schema):
@@ -475,6 +490,10 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
         params = extra.get("engine_params", {})
         if nullpool:
             params["poolclass"] = NullPool
+            for key in POOL_PARAMS:
+                params.pop(key, None)
+        elif engine_manager.enabled:
+            engine_manager.apply_pool_defaults(params)
         connect_args = params.get("connect_args", {})
 
         sqlalchemy_url, connect_args = self.db_engine_spec.adjust_engine_params(
@@ -546,7 +565,30 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
                 source,
             )
         try:
-            return create_engine(sqlalchemy_url, **params)
+            if nullpool or not engine_manager.enabled:
+                return create_engine(sqlalchemy_url, **params)
+
+            key = EngineKey(
+                database_id=self.id,
+                catalog=catalog,
+                schema=schema,
+                effective_username=effective_username,
+                uri_hash=md5_sha_from_dict(
+                    {
+                        "url": (
+                            sqlalchemy_url.render_as_string(hide_password=False)
+                            if isinstance(sqlalchemy_url, URL)
+                            else str(sqlalchemy_url)
+                        ),
+                        "params": params,
+                    },
+                    default=str,
+                ),
+            )
+            return engine_manager.get_engine(
+                key,
+                lambda: create_engine(sqlalchemy_url, **params),
+            )
         except Exception as ex:
             raise self.db_engine_spec.get_dbapi_mapped_exception(ex) from ex
 
@@ -573,7 +615,7 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
         self,
         catalog: str | None = None,
         schema: str | None = None,
-        nullpool: bool = True,
+        nullpool: bool | None = None,
         source: utils.QuerySource | None = None,
     ) -> Connection:
         with self.get_sqla_engine(
@@ -583,7 +625,13 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
             source=source,
         ) as engine:
             try:
-                with closing(engine.raw_connection()) as conn:
+                start = now_as_float()
+                raw_connection = engine.raw_connection()
+                stats_logger.timing(
+                    "db_engine_pool.checkout_time",
+                    now_as_float() - start,
+                )
+                with closing(raw_connection) as conn:
                     # pre-session queries are used to set the selected schema and, in the
                     # future, the selected catalog
                     for prequery in self.db_engine_spec.get_prequeries(
@@ -679,6 +727,64 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
         mutator: Callable[[pd.DataFrame], None] | None = None,
     ) -> pd.DataFrame:
         sqls = self.db_engine_spec.parse_sql(sql)
+        with self.get_raw_connection(catalog=catalog, schema=schema) as conn:
+            cursor = conn.cursor()
+            self._execute_statements(cursor, sqls, catalog, schema)
+            df = self.fetch_into_dataframe(cursor)
+
+            if mutator:
+                df = mutator(df)
+
+            return self.post_process_df(df)
+
+    def iter_df(
+        self,
+        sql: str,
+        catalog: str | None = None,
+        schema: str | None = None,
+        limit: int | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Run a query and yield its results as dataframes, one batch of rows at a time.
+
+        Unlike ``get_df`` the full result is never held in memory, which is useful to
+        stream large results. At least one dataframe is yielded, even when the query
+        returns no rows.
+        """
+        sqls = self.db_engine_spec.parse_sql(sql)
+        with self.get_raw_connection(catalog=catalog, schema=schema) as conn:
+            cursor = conn.cursor()
+            self._execute_statements(cursor, sqls, catalog, schema)
+
+            batches = self.db_engine_spec.fetch_data_batches(
+                cursor,
+                config["RESULT_SET_FETCH_BATCH_SIZE"],
+                limit,
+            )
+            # some drivers only populate the cursor description after the first fetch
+            first_batch = next(batches, [])
+            description = cursor.description
+            remaining = limit
+            for batch in chain([first_batch], batches):
+                if remaining is not None:
+                    # engines which don't fetch data in batches may return more rows
+                    batch = batch[:remaining]
+                    remaining -= len(batch)
+                result_set = SupersetResultSet(batch, description, self.db_engine_spec)
+                yield self.post_process_df(result_set.to_pandas_df())
+                if remaining == 0:
+                    break
+
+    def _execute_statements(
+        self,
+        cursor: Any,
+        sqls: list[str],
+        catalog: str | None,
+        schema: str | None,
+    ) -> None:
+        """
+        Execute the statements, leaving the results of the last one in the cursor.
+        """
         with self.get_sqla_engine(catalog=catalog, schema=schema) as engine:
             engine_url = engine.url
 
@@ -692,27 +798,18 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
                     security_manager,
                 )
 
-        with self.get_raw_connection(catalog=catalog, schema=schema) as conn:
-            cursor = conn.cursor()
-            df = None
-            for i, sql_ in enumerate(sqls):
-                sql_ = self.mutate_sql_based_on_config(sql_, is_split=True)
-                _log_query(sql_)
-                with event_logger.log_context(
-                    action="execute_sql",
-                    database=self,
-                    object_ref=__name__,
-                ):
-                    self.db_engine_spec.execute(cursor, sql_, self)
-
-                rows = self.fetch_rows(cursor, i == len(sqls) - 1)
-                if rows is not None:
-                    df = self.load_into_dataframe(cursor.description, rows)
-
-            if mutator:
-                df = mutator(df)
+        for i, sql_ in enumerate(sqls):
+            sql_ = self.mutate_sql_based_on_config(sql_, is_split=True)
+            _log_query(sql_)
+            with event_logger.log_context(
+                action="execute_sql",
+                database=self,
+                object_ref=__name__,
+            ):
+                self.db_engine_spec.execute(cursor, sql_, self)
 
-            return self.post_process_df(df)
+            if i < len(sqls) - 1:
+                self.fetch_rows(cursor, last=False)
 
     @event_logger.log_this
     def fetch_rows(self, cursor: Any, last: bool) -> list[tuple[Any, ...]] | None:
@@ -722,6 +819,27 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
 
         return self.db_engine_spec.fetch_data(cursor)
 
+    @event_logger.log_this
+    def fetch_into_dataframe(self, cursor: Any) -> pd.DataFrame:
+        """
+        Fetch the results of a cursor into a dataframe.
+
+        Rows are fetched in batches and converted to Arrow incrementally, so the full
+        result is never held in memory as a list of tuples.
+        """
+        batches = self.db_engine_spec.fetch_data_batches(
+            cursor,
+            config["RESULT_SET_FETCH_BATCH_SIZE"],
+        )
+        # some drivers only populate the cursor description after the first fetch
+        first_batch = next(batches, [])
+        result_set = SupersetResultSet.from_batches(
+            chain([first_batch], batches),
+            cursor.description,
+            self.db_engine_spec,
+        )
+        return result_set.to_pandas_df()
+
     @event_logger.log_this
     def load_into_dataframe(
         self,
@@ -773,10 +891,20 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
             )
 
     def apply_limit_to_sql(
-        self, sql: str, limit: int = 1000, force: bool = False
+        self,
+        sql: str,
+        limit: int = 1000,
+        force: bool = False,
+        statement: SQLStatement | None = None,
     ) -> str:
         if self.db_engine_spec.allow_limit_clause:
-            return self.db_engine_spec.apply_limit_to_sql(sql, limit, self, force=force)
+            return self.db_engine_spec.apply_limit_to_sql(
+                sql,
+                limit,
+                self,
+                force=force,
+                statement=statement,
+            )
         return self.db_engine_spec.apply_top_to_sql(sql, limit)
 
     def safe_sqlalchemy_uri(self) -> str:
@@ -1172,6 +1300,8 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
 sqla.event.listen(Database, "after_insert", security_manager.database_after_insert)
 sqla.event.listen(Database, "after_update", security_manager.database_after_update)
 sqla.event.listen(Database, "after_delete", security_manager.database_after_delete)
+sqla.event.listen(Database, "after_update", engine_manager.database_after_change)
+sqla.event.listen(Database, "after_delete", engine_manager.database_after_change)
 
 
 class DatabaseUserOAuth2Tokens(Model, AuditMixinNullable):
@@ -37,13 +37,14 @@ from sqlalchemy import (
     UniqueConstraint,
 )
 from sqlalchemy.engine.base import Connection
-from sqlalchemy.orm import relationship, subqueryload
+from sqlalchemy.orm import relationship, Session, subqueryload
 from sqlalchemy.orm.mapper import Mapper
 from sqlalchemy.sql.elements import BinaryExpression
 
 from superset import app, db, is_feature_enabled, security_manager
 from superset.connectors.sqla.models import BaseDatasource, SqlaTable
 from superset.daos.datasource import DatasourceDAO
+from superset.dashboards import cache as dashboard_cache
 from superset.models.helpers import AuditMixinNullable, ImportExportMixin
 from superset.models.slice import Slice
 from superset.models.user_attributes import UserAttribute
@@ -273,12 +274,22 @@ class Dashboard(AuditMixinNullable, ImportExportMixin, Model):
 
         result: list[dict[str, Any]] = []
 
-        for (cls_model, datasource_id), slices in slices_by_datasource.items():
-            datasource = (
-                db.session.query(cls_model).filter_by(id=datasource_id).one_or_none()
-            )
+        # load the datasources with one query per datasource type
+        datasource_ids_by_cls_model: dict[type[BaseDatasource], set[int]] = defaultdict(
+            set
+        )
+        for cls_model, datasource_id in slices_by_datasource:
+            datasource_ids_by_cls_model[cls_model].add(datasource_id)
+        datasources = {
+            (cls_model, datasource.id): datasource
+            for cls_model, datasource_ids in datasource_ids_by_cls_model.items()
+            for datasource in db.session.query(cls_model)
+            .filter(cls_model.id.in_(datasource_ids))
+            .all()
+        }
 
-            if datasource:
+        for key, slices in slices_by_datasource.items():
+            if datasource := datasources.get(key):
                 # Filter out unneeded fields from the datasource payload
                 result.append(datasource.data_for_slices(slices))
 
@@ -469,3 +480,7 @@ if is_feature_enabled("THUMBNAILS_SQLA_LISTENERS"):
     update_thumbnail: OnDashboardChange = lambda _, __, dash: dash.update_thumbnail()  # noqa: E731
     sqla.event.listen(Dashboard, "after_insert", update_thumbnail)
     sqla.event.listen(Dashboard, "after_update", update_thumbnail)
+
+sqla.event.listen(Session, "after_flush", dashboard_cache.after_flush)
+sqla.event.listen(Session, "after_commit", dashboard_cache.after_commit)
+sqla.event.listen(Session, "after_rollback", dashboard_cache.after_rollback)
@@ -590,6 +590,9 @@ class QueryResult:  # pylint: disable=too-few-public-methods
         self.from_dttm = from_dttm
         self.to_dttm = to_dttm
         self.sql_rowcount = len(self.df.index) if not self.df.empty else 0
+        # the durations and memory of the post processing, see
+        # ``POST_PROCESSING_STATS``
+        self.post_processing_stats: Optional[dict[str, Any]] = None
 
 
 class ExtraJSONMixin:
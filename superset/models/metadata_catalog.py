@@ -0,0 +1,87 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from typing import Any
+
+import sqlalchemy as sqla
+from flask_appbuilder import Model
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import relationship
+
+from superset.utils import core as utils, json
+from superset.utils.backports import StrEnum
+
+
+class MetadataCatalogEntryType(StrEnum):
+    CATALOG = "catalog"
+    SCHEMA = "schema"
+    TABLE = "table"
+    VIEW = "view"
+
+
+class MetadataCatalogEntry(Model):  # pylint: disable=too-few-public-methods
+    """
+    A catalog, schema, table or view of a database, as crawled by the metadata
+    catalog tasks.
+
+    Catalogs have no parent, schemas have a catalog (when the database supports
+    them), and tables and views have a catalog and a schema. The metadata of tables
+    and views, including their columns, is stored as returned by the
+    `table_metadata` endpoint.
+    """
+
+    __tablename__ = "metadata_catalog"
+    __table_args__ = (
+        # the type is left out, to keep the index within the key size limit of
+        # MySQL, and the pattern operator class allows prefix searches with
+        # non-C collations in Postgres
+        sqla.Index(
+            "ix_metadata_catalog_search",
+            "database_id",
+            "catalog",
+            "schema",
+            "search_name",
+            postgresql_ops={"search_name": "varchar_pattern_ops"},
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    database_id = Column(
+        Integer,
+        ForeignKey("dbs.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    database = relationship("Database", foreign_keys=[database_id])
+    type = Column(String(16), nullable=False)
+    catalog = Column(String(256), nullable=True)
+    schema = Column(String(255), nullable=True)
+    name = Column(String(250), nullable=False)
+    # lower case name, for case insensitive prefix searches using the index
+    search_name = Column(String(250), nullable=False)
+    table_metadata = Column(utils.MediumText(), nullable=True)
+    created_on = Column(DateTime, nullable=False)
+    # when the children of a catalog or schema were listed
+    children_refreshed_on = Column(DateTime, nullable=True)
+    # when the metadata of a table or view was fetched
+    metadata_refreshed_on = Column(DateTime, nullable=True)
+
+    @property
+    def table_metadata_dict(self) -> dict[str, Any] | None:
+        if self.table_metadata is None:
+            return None
+        return json.loads(self.table_metadata)
@@ -16,13 +16,18 @@
 # under the License.
 """Superset wrapper around pyarrow.Table."""
 
+from __future__ import annotations
+
 import datetime
+import decimal
 import logging
-from typing import Any, Optional
+import uuid
+from typing import Any, Callable, cast, Iterable, Optional, Union
 
 import numpy as np
 import pandas as pd
 import pyarrow as pa
+import simplejson
 from numpy.typing import NDArray
 
 from superset.db_engine_specs import BaseEngineSpec
@@ -63,25 +68,89 @@ def stringify(obj: Any) -> str:
     return json.dumps(obj, default=json.json_iso_dttm_ser)
 
 
+# types whose string representation is simply ``str(value)``
+STR_TYPES = {
+    bool,
+    datetime.date,
+    datetime.datetime,
+    datetime.time,
+    datetime.timedelta,
+    decimal.Decimal,
+    dict,
+    float,
+    frozenset,
+    int,
+    set,
+    uuid.UUID,
+}
+# types that are serialized as JSON arrays
+SEQUENCE_TYPES = {list, tuple}
+
+
 def stringify_values(array: NDArray[Any]) -> NDArray[Any]:
-    result = np.copy(array)
+    """
+    Convert all non-null values of an object array to strings.
 
-    with np.nditer(result, flags=["refs_ok"], op_flags=[["readwrite"]]) as it:
-        for obj in it:
-            if na_obj := pd.isna(obj):
-                # pandas <NA> type cannot be converted to string
-                obj[na_obj] = None
-            else:
-                try:
-                    # for simple string conversions
-                    # this handles odd character types better
-                    obj[...] = obj.astype(str)
-                except ValueError:
-                    obj[...] = stringify(obj)
+    Values are grouped by type, and each group is converted in bulk; only values of
+    unknown types are converted one at a time by ``stringify_value``.
+    """
+    result = np.copy(array)
+    flat = result.reshape(-1)
+    # pandas <NA> type cannot be converted to string
+    na_mask = pd.isna(flat)
+    flat[na_mask] = None
+
+    value_types = np.fromiter(map(type, flat), dtype=object, count=len(flat))
+    value_types[na_mask] = None
+    codes, uniques = pd.factorize(value_types)
+    for code, value_type in enumerate(uniques):
+        if value_type is str:
+            continue
+        mask = codes == code
+        if value_type in STR_TYPES:
+            converted = list(map(str, flat[mask]))
+        elif value_type in SEQUENCE_TYPES:
+            encoder = get_json_encoder()
+            converted = [encode_json(encoder, value) for value in flat[mask]]
+        else:
+            converted = [stringify_value(value) for value in flat[mask]]
+        flat[mask] = to_object_array(converted)
 
     return result
 
 
+def stringify_value(value: Any) -> Any:
+    """
+    Convert a single value to a string.
+    """
+    cell = to_object_array([value])
+    try:
+        # for simple string conversions
+        # this handles odd character types better
+        return str(cell.astype(str)[0])
+    except ValueError:
+        return stringify(value)
+
+
+def get_json_encoder() -> simplejson.JSONEncoder:
+    """
+    Build an encoder equivalent to ``stringify``, so it can be reused across values.
+    """
+    return simplejson.JSONEncoder(
+        default=json.json_iso_dttm_ser,
+        allow_nan=False,
+        ignore_nan=True,
+        encoding="utf-8",
+    )
+
+
+def encode_json(encoder: simplejson.JSONEncoder, value: Any) -> str:
+    try:
+        return encoder.encode(value)
+    except UnicodeDecodeError:
+        return stringify(value)
+
+
 def destringify(obj: str) -> Any:
     return json.loads(obj)
 
@@ -99,20 +168,142 @@ def convert_to_string(value: Any) -> str:
     return str(value)
 
 
+# errors raised by pyarrow when values can't be converted to an Arrow array
+ARROW_CONVERSION_ERRORS = (
+    pa.lib.ArrowInvalid,
+    pa.lib.ArrowTypeError,
+    pa.lib.ArrowNotImplementedError,
+    ValueError,
+    TypeError,  # this is super hackey,
+    # https://issues.apache.org/jira/browse/ARROW-7855
+)
+
+
+def to_object_array(values: list[Any]) -> NDArray[Any]:
+    """
+    Build a 1-dimensional object array, even when the values are sequences.
+    """
+    return np.array([(value,) for value in values], dtype=[("value", "object")])[
+        "value"
+    ]
+
+
+class ArrowColumnBuilder:
+    """
+    Incrementally converts batches of values from a single column to Arrow.
+
+    Each batch is converted on its own; when the type of a batch differs from the
+    type of the previous ones, the chunks are promoted to a common numeric type when
+    possible. Otherwise only this column is converted again, with all its values, so
+    that the result matches converting the whole column at once.
+    """
+
+    def __init__(
+        self,
+        convert: Callable[[NDArray[Any]], tuple[pa.Array, bool]],
+    ) -> None:
+        self.convert = convert
+        self.chunks: list[pa.Array] = []
+        # whether the values had to be serialized as strings
+        self.stringified = False
+
+    @property
+    def type(self) -> Optional[pa.DataType]:
+        return self.chunks[0].type if self.chunks else None
+
+    def append(self, values: NDArray[Any]) -> None:
+        if self.stringified:
+            self._add(pa.array(stringify_values(values).tolist()), values)
+            return
+
+        chunk, stringified = self.convert(values)
+        if not self.chunks:
+            self.chunks.append(chunk)
+            self.stringified = stringified
+        elif stringified:
+            self._reconvert(values.tolist())
+        else:
+            self._add(chunk, values)
+
+    def finish(self) -> Union[pa.Array, pa.ChunkedArray]:
+        if len(self.chunks) == 1:
+            return self.chunks[0]
+        return pa.chunked_array(self.chunks, type=self.type)
+
+    def _add(self, chunk: pa.Array, values: NDArray[Any]) -> None:
+        current = cast(pa.DataType, self.type)
+        if chunk.type == current:
+            self.chunks.append(chunk)
+        elif pa.types.is_null(chunk.type):
+            self.chunks.append(pa.nulls(len(chunk), current))
+        elif pa.types.is_null(current):
+            self.chunks = [pa.nulls(len(c), chunk.type) for c in self.chunks]
+            self.chunks.append(chunk)
+        elif is_numeric(current) and is_numeric(chunk.type):
+            # promote integers to floats, like pyarrow does when inferring the type of
+            # a column with both
+            try:
+                if pa.types.is_floating(current):
+                    self.chunks.append(chunk.cast(current))
+                else:
+                    self.chunks = [c.cast(chunk.type) for c in self.chunks]
+                    self.chunks.append(chunk)
+            except ARROW_CONVERSION_ERRORS:
+                self._reconvert(values.tolist())
+        else:
+            self._reconvert(values.tolist())
+
+    def _reconvert(self, values: list[Any]) -> None:
+        previous = [value for chunk in self.chunks for value in chunk.to_pylist()]
+        chunk, self.stringified = self.convert(to_object_array(previous + values))
+        self.chunks = [chunk]
+
+
+def is_numeric(pa_dtype: pa.DataType) -> bool:
+    return pa.types.is_integer(pa_dtype) or pa.types.is_floating(pa_dtype)
+
+
 class SupersetResultSet:
-    def __init__(  # pylint: disable=too-many-locals
+    def __init__(
         self,
         data: DbapiResult,
         cursor_description: DbapiDescription,
         db_engine_spec: type[BaseEngineSpec],
     ):
+        self._load([data] if data else [], cursor_description, db_engine_spec)
+
+    @classmethod
+    def from_batches(
+        cls,
+        batches: Iterable[DbapiResult],
+        cursor_description: DbapiDescription,
+        db_engine_spec: type[BaseEngineSpec],
+    ) -> SupersetResultSet:
+        """
+        Build a result set from batches of rows, eg, from `fetch_data_batches`.
+
+        Each batch is converted to Arrow as soon as it's read, so that only one batch
+        of rows is held in memory as Python objects at any given time.
+        """
+        result_set = cls.__new__(cls)
+        result_set._load(  # pylint: disable=protected-access
+            batches,
+            cursor_description,
+            db_engine_spec,
+        )
+        return result_set
+
+    def _load(
+        self,
+        batches: Iterable[DbapiResult],
+        cursor_description: DbapiDescription,
+        db_engine_spec: type[BaseEngineSpec],
+    ) -> None:
         self.db_engine_spec = db_engine_spec
-        data = data or []
         column_names: list[str] = []
-        pa_data: list[pa.Array] = []
+        pa_data: list[Union[pa.Array, pa.ChunkedArray]] = []
         deduped_cursor_desc: list[tuple[Any, ...]] = []
         numpy_dtype: list[tuple[str, ...]] = []
-        stringified_arr: NDArray[Any]
 
         if cursor_description:
             # get deduped list of column names
@@ -129,54 +320,21 @@ class SupersetResultSet:
             # generate numpy structured array dtype
             numpy_dtype = [(column_name, "object") for column_name in column_names]
 
-        # only do expensive recasting if datatype is not standard list of tuples
-        if data and (not isinstance(data, list) or not isinstance(data[0], tuple)):
-            data = [tuple(row) for row in data]
-        array = np.array(data, dtype=numpy_dtype)
-        if array.size > 0:
-            for column in column_names:
-                try:
-                    pa_data.append(pa.array(array[column].tolist()))
-                except (
-                    pa.lib.ArrowInvalid,
-                    pa.lib.ArrowTypeError,
-                    pa.lib.ArrowNotImplementedError,
-                    ValueError,
-                    TypeError,  # this is super hackey,
-                    # https://issues.apache.org/jira/browse/ARROW-7855
-                ):
-                    # attempt serialization of values as strings
-                    stringified_arr = stringify_values(array[column])
-                    pa_data.append(pa.array(stringified_arr.tolist()))
-
-        if pa_data:  # pylint: disable=too-many-nested-blocks
-            for i, column in enumerate(column_names):
-                if pa.types.is_nested(pa_data[i].type):
-                    # TODO: revisit nested column serialization once nested types
-                    #  are added as a natively supported column type in Superset
-                    #  (superset.utils.core.GenericDataType).
-                    stringified_arr = stringify_values(array[column])
-                    pa_data[i] = pa.array(stringified_arr.tolist())
-
-                elif pa.types.is_temporal(pa_data[i].type):
-                    # workaround for bug converting
-                    # `psycopg2.tz.FixedOffsetTimezone` tzinfo values.
-                    # related: https://issues.apache.org/jira/browse/ARROW-5248
-                    sample = self.first_nonempty(array[column])
-                    if sample and isinstance(sample, datetime.datetime):
-                        try:
-                            if sample.tzinfo:
-                                tz = sample.tzinfo
-                                series = pd.Series(array[column])
-                                series = pd.to_datetime(series)
-                                pa_data[i] = pa.Array.from_pandas(
-                                    series,
-                                    type=pa.timestamp("ns", tz=tz),
-                                )
-                        except Exception as ex:  # pylint: disable=broad-except
-                            logger.exception(ex)
-
-        if not pa_data:
+        builders = [ArrowColumnBuilder(self.convert_column) for _ in column_names]
+        for data in batches:
+            if not data:
+                continue
+            # only do expensive recasting if datatype is not standard list of tuples
+            if not isinstance(data, list) or not isinstance(data[0], tuple):
+                data = [tuple(row) for row in data]
+            array = np.array(data, dtype=numpy_dtype)
+            if array.size > 0:
+                for column, builder in zip(column_names, builders):
+                    builder.append(array[column])
+
+        if builders and builders[0].chunks:
+            pa_data = [builder.finish() for builder in builders]
+        else:
             column_names = []
 
         self.table = pa.Table.from_arrays(pa_data, names=column_names)
@@ -191,6 +349,48 @@ class SupersetResultSet:
         except Exception as ex:  # pylint: disable=broad-except
             logger.exception(ex)
 
+    def convert_column(self, values: NDArray[Any]) -> tuple[pa.Array, bool]:
+        """
+        Convert the values of a column to an Arrow array.
+
+        Values that can't be represented natively, as well as nested values, are
+        serialized as strings.
+
+        :param values: Object array with the values of the column
+        :return: The Arrow array, and whether the values were serialized as strings
+        """
+        try:
+            array = pa.array(values.tolist())
+        except ARROW_CONVERSION_ERRORS:
+            # attempt serialization of values as strings
+            return pa.array(stringify_values(values).tolist()), True
+
+        if pa.types.is_nested(array.type):
+            # TODO: revisit nested column serialization once nested types
+            #  are added as a natively supported column type in Superset
+            #  (superset.utils.core.GenericDataType).
+            return pa.array(stringify_values(values).tolist()), True
+
+        if pa.types.is_temporal(array.type):
+            # workaround for bug converting
+            # `psycopg2.tz.FixedOffsetTimezone` tzinfo values.
+            # related: https://issues.apache.org/jira/browse/ARROW-5248
+            sample = self.first_nonempty(values)
+            if sample and isinstance(sample, datetime.datetime):
+                try:
+                    if sample.tzinfo:
+                        tz = sample.tzinfo
+                        series = pd.Series(values)
+                        series = pd.to_datetime(series)
+                        array = pa.Array.from_pandas(
+                            series,
+                            type=pa.timestamp("ns", tz=tz),
+                        )
+                except Exception as ex:  # pylint: disable=broad-except
+                    logger.exception(ex)
+
+        return array, False
+
     @staticmethod
     def convert_pa_dtype(pa_dtype: pa.DataType) -> Optional[str]:
         if pa.types.is_boolean(pa_dtype):
@@ -247,6 +447,12 @@ class SupersetResultSet:
     def to_pandas_df(self) -> pd.DataFrame:
         return self.convert_table_to_df(self.table)
 
+    def truncate(self, num_rows: int) -> None:
+        """
+        Keep only the first ``num_rows`` rows, without copying the data.
+        """
+        self.table = self.table.slice(0, num_rows)
+
     @property
     def pa_table(self) -> pa.Table:
         return self.table
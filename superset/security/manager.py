@@ -28,7 +28,6 @@ from flask_appbuilder import Model
 from flask_appbuilder.security.sqla.manager import SecurityManager
 from flask_appbuilder.security.sqla.models import (
     assoc_permissionview_role,
-    assoc_user_role,
     Permission,
     PermissionView,
     Role,
@@ -46,11 +45,11 @@ from flask_appbuilder.widgets import ListWidget
 from flask_babel import lazy_gettext as _
 from flask_login import AnonymousUserMixin, LoginManager
 from jwt.api_jwt import _jwt_global_obj
-from sqlalchemy import and_, inspect, or_
+from sqlalchemy import event as sqla_event, exists, false, inspect, or_
 from sqlalchemy.engine.base import Connection
-from sqlalchemy.orm import eagerload
+from sqlalchemy.orm import eagerload, Session
 from sqlalchemy.orm.mapper import Mapper
-from sqlalchemy.orm.query import Query as SqlaQuery
+from sqlalchemy.sql.elements import ColumnElement
 
 from superset.constants import RouteMethod
 from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
@@ -66,6 +65,7 @@ from superset.security.guest_token import (
     GuestTokenUser,
     GuestUser,
 )
+from superset.security.permissions import permission_snapshots, PermissionSnapshot
 from superset.sql_parse import extract_tables_from_jinja_sql, Table
 from superset.tasks.utils import get_current_user
 from superset.utils import json
@@ -73,7 +73,6 @@ from superset.utils.core import (
     DatasourceName,
     DatasourceType,
     get_user_id,
-    RowLevelSecurityFilterType,
 )
 from superset.utils.filters import get_dataset_access_filters
 from superset.utils.urls import get_url_host
@@ -82,13 +81,13 @@ if TYPE_CHECKING:
     from superset.common.query_context import QueryContext
     from superset.connectors.sqla.models import (
         BaseDatasource,
-        RowLevelSecurityFilter,
         SqlaTable,
     )
     from superset.models.core import Database
     from superset.models.dashboard import Dashboard
     from superset.models.slice import Slice
     from superset.models.sql_lab import Query
+    from superset.security.rls import RLSFilter
     from superset.viz import BaseViz
 
 logger = logging.getLogger(__name__)
@@ -434,10 +433,32 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         :returns: Whether the user can access the FAB permission/view
         """
 
-        user = g.user
-        if user.is_anonymous:
-            return self.is_item_public(permission_name, view_name)
-        return self._has_view_access(user, permission_name, view_name)
+        builtin_roles, snapshot = self.get_permission_snapshot()
+        # builtin roles are statically configured, no database query is needed
+        return snapshot.can_access(permission_name, view_name) or any(
+            self._has_access_builtin_roles(role, permission_name, view_name)
+            for role in builtin_roles
+        )
+
+    def get_permission_snapshot(self) -> tuple[list[Role], PermissionSnapshot]:
+        """
+        Return the builtin roles of the user, and the snapshot of the permissions of
+        their other roles, see ``superset.security.permissions``.
+
+        Anonymous users have the permissions of the public role.
+
+        :returns: The builtin roles and the permission snapshot
+        """
+        builtin_roles = []
+        role_ids = []
+        for role in self.get_user_roles():
+            if role.name in self.builtin_roles:
+                builtin_roles.append(role)
+            else:
+                role_ids.append(role.id)
+        return builtin_roles, permission_snapshots.get(
+            self.get_session, frozenset(role_ids)
+        )
 
     def can_access_all_queries(self) -> bool:
         """
@@ -723,34 +744,14 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         return True
 
     def user_view_menu_names(self, permission_name: str) -> set[str]:
-        base_query = (
-            self.get_session.query(self.viewmenu_model.name)
-            .join(self.permissionview_model)
-            .join(self.permission_model)
-            .join(assoc_permissionview_role)
-            .join(self.role_model)
-        )
+        """
+        Return the view-menus granted to the user with a permission.
 
-        if not g.user.is_anonymous:
-            # filter by user id
-            view_menu_names = (
-                base_query.join(assoc_user_role)
-                .join(self.user_model)
-                .filter(self.user_model.id == get_user_id())
-                .filter(self.permission_model.name == permission_name)
-            ).all()
-            return {s.name for s in view_menu_names}
-
-        # Properly treat anonymous user
-        if public_role := self.get_public_role():
-            # filter by public role
-            view_menu_names = (
-                base_query.filter(self.role_model.id == public_role.id).filter(
-                    self.permission_model.name == permission_name
-                )
-            ).all()
-            return {s.name for s in view_menu_names}
-        return set()
+        :param permission_name: The FAB permission name
+        :returns: The FAB view-menu names
+        """
+        _, snapshot = self.get_permission_snapshot()
+        return set(snapshot.view_menu_names(permission_name))
 
     def get_accessible_databases(self) -> list[int]:
         """
@@ -918,24 +919,9 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         # pylint: disable=import-outside-toplevel
         from superset.connectors.sqla.models import SqlaTable
 
-        if self.can_access_database(database):
+        if self._can_access_all_datasources(database, catalog, schema):
             return datasource_names
 
-        catalog = catalog or database.get_default_catalog()
-        if catalog:
-            catalog_perm = self.get_catalog_perm(database.database_name, catalog)
-            if catalog_perm and self.can_access("catalog_access", catalog_perm):
-                return datasource_names
-
-        if schema:
-            schema_perm = self.get_schema_perm(
-                database.database_name,
-                catalog,
-                schema,
-            )
-            if schema_perm and self.can_access("schema_access", schema_perm):
-                return datasource_names
-
         user_perms = self.user_view_menu_names("datasource_access")
         catalog_perms = self.user_view_menu_names("catalog_access")
         schema_perms = self.user_view_menu_names("schema_access")
@@ -955,6 +941,86 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
             if datasource in user_datasources
         ]
 
+    def get_datasources_accessible_by_user_filter(  # pylint: disable=invalid-name
+        self,
+        database: "Database",
+        name_column: "ColumnElement[str]",
+        catalog: Optional[str] = None,
+        schema: Optional[str] = None,
+    ) -> Optional["ColumnElement[bool]"]:
+        """
+        Return a SQL filter keeping the tables accessible by the user.
+
+        This is the counterpart of `get_datasources_accessible_by_user` for table
+        names stored in the metadata database: the permissions of the datasets are
+        checked by a correlated subquery on their unique database, catalog, schema and
+        name, instead of filtering the names in Python.
+
+        :param database: The SQL database
+        :param name_column: The column of the table names to filter
+        :param catalog: The SQL catalog of the tables
+        :param schema: The SQL schema of the tables
+        :returns: The filter, or None if all the tables are accessible
+        """
+        # pylint: disable=import-outside-toplevel
+        from superset.connectors.sqla.models import SqlaTable
+
+        if self._can_access_all_datasources(database, catalog, schema):
+            return None
+
+        filters = [
+            method.in_(perms)
+            for method, perms in zip(
+                (SqlaTable.perm, SqlaTable.schema_perm, SqlaTable.catalog_perm),
+                (
+                    self.user_view_menu_names("datasource_access"),
+                    self.user_view_menu_names("schema_access"),
+                    self.user_view_menu_names("catalog_access"),
+                ),
+            )
+            if perms
+        ]
+        if not filters:
+            return false()
+
+        return exists().where(
+            SqlaTable.database_id == database.id,
+            SqlaTable.catalog == catalog,
+            SqlaTable.schema == schema,
+            SqlaTable.table_name == name_column,
+            or_(*filters),
+        )
+
+    def _can_access_all_datasources(
+        self,
+        database: "Database",
+        catalog: Optional[str],
+        schema: Optional[str],
+    ) -> bool:
+        """
+        Return whether the user can access all the datasources of a schema, through
+        the database, catalog or schema permissions.
+        """
+        if self.can_access_database(database):
+            return True
+
+        catalog = catalog or database.get_default_catalog()
+        if catalog:
+            catalog_perm = self.get_catalog_perm(database.database_name, catalog)
+            if catalog_perm and self.can_access("catalog_access", catalog_perm):
+                return True
+
+        if schema:
+            schema_perm = self.get_schema_perm(
+                database.database_name,
+                catalog,
+                schema,
+            )
+            if schema_perm and self.can_access("schema_access", schema_perm):
+                return True
+
+        return False
+
     def merge_perm(self, permission_name: str, view_menu_name: str) -> None:
         """
         Add the FAB permission/view-menu.
@@ -2047,6 +2113,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         :param connection: The DB-API connection
         :param target: The mapped instance being changed
         """
+        permission_snapshots.mark_changed(self.get_session)
 
     def on_view_menu_after_insert(
         self, mapper: Mapper, connection: Connection, target: ViewMenu
@@ -2079,6 +2146,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         :param connection: The DB-API connection
         :param target: The mapped instance being persisted
         """
+        permission_snapshots.mark_changed(self.get_session)
 
     def on_permission_after_insert(
         self, mapper: Mapper, connection: Connection, target: Permission
@@ -2111,6 +2179,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         :param connection: The DB-API connection
         :param target: The mapped instance being persisted
         """
+        permission_snapshots.mark_changed(self.get_session)
 
     def on_permission_view_after_delete(
         self, mapper: Mapper, connection: Connection, target: PermissionView
@@ -2127,6 +2196,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         :param connection: The DB-API connection
         :param target: The mapped instance being persisted
         """
+        permission_snapshots.mark_changed(self.get_session)
 
     @staticmethod
     def get_exclude_users_from_lists() -> list[str]:
@@ -2443,11 +2513,13 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
             ]
         return []
 
-    def get_rls_filters(self, table: "BaseDatasource") -> list[SqlaQuery]:
+    def get_rls_filters(self, table: "BaseDatasource") -> list["RLSFilter"]:
         """
         Retrieves the appropriate row level security filters for the current user and
         the passed table.
 
+        The rules are memoized in the current process, see ``superset.security.rls``.
+
         :param table: The table to check against
         :returns: A list of filters
         """
@@ -2456,57 +2528,13 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
             return []
 
         # pylint: disable=import-outside-toplevel
-        from superset.connectors.sqla.models import (
-            RLSFilterRoles,
-            RLSFilterTables,
-            RowLevelSecurityFilter,
-        )
+        from superset.security.rls import rls_rules_cache
 
         user_roles = [role.id for role in self.get_user_roles(g.user)]
-        regular_filter_roles = (
-            self.get_session.query(RLSFilterRoles.c.rls_filter_id)
-            .join(RowLevelSecurityFilter)
-            .filter(
-                RowLevelSecurityFilter.filter_type == RowLevelSecurityFilterType.REGULAR
-            )
-            .filter(RLSFilterRoles.c.role_id.in_(user_roles))
-        )
-        base_filter_roles = (
-            self.get_session.query(RLSFilterRoles.c.rls_filter_id)
-            .join(RowLevelSecurityFilter)
-            .filter(
-                RowLevelSecurityFilter.filter_type == RowLevelSecurityFilterType.BASE
-            )
-            .filter(RLSFilterRoles.c.role_id.in_(user_roles))
-        )
-        filter_tables = self.get_session.query(RLSFilterTables.c.rls_filter_id).filter(
-            RLSFilterTables.c.table_id == table.id
-        )
-        query = (
-            self.get_session.query(
-                RowLevelSecurityFilter.id,
-                RowLevelSecurityFilter.group_key,
-                RowLevelSecurityFilter.clause,
-            )
-            .filter(RowLevelSecurityFilter.id.in_(filter_tables))
-            .filter(
-                or_(
-                    and_(
-                        RowLevelSecurityFilter.filter_type
-                        == RowLevelSecurityFilterType.REGULAR,
-                        RowLevelSecurityFilter.id.in_(regular_filter_roles),
-                    ),
-                    and_(
-                        RowLevelSecurityFilter.filter_type
-                        == RowLevelSecurityFilterType.BASE,
-                        RowLevelSecurityFilter.id.notin_(base_filter_roles),
-                    ),
-                )
-            )
-        )
-        return query.all()
+        rules = rls_rules_cache.get(self.get_session)
+        return rules.get_filters(table.id, user_roles)
 
-    def get_rls_sorted(self, table: "BaseDatasource") -> list["RowLevelSecurityFilter"]:
+    def get_rls_sorted(self, table: "BaseDatasource") -> list["RLSFilter"]:
         """
         Retrieves a list RLS filters sorted by ID for
         the current user and the passed table.
@@ -2730,3 +2758,8 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         return current_app.config["AUTH_ROLE_ADMIN"] in [
             role.name for role in self.get_user_roles()
         ]
+
+
+sqla_event.listen(Session, "after_flush", permission_snapshots.after_flush)
+sqla_event.listen(Session, "after_commit", permission_snapshots.after_commit)
+sqla_event.listen(Session, "after_rollback", permission_snapshots.after_rollback)
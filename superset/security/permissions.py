@@ -0,0 +1,147 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Compiled snapshots of the permissions granted to the roles of the users.
+
+Access checks used to query the FAB permission tables for each permission, several
+times per request. Instead, the permission/view-menu pairs of a set of roles are
+loaded at once into a snapshot offering constant time lookups, which is memoized in
+the current process and stored in the cache for the other processes.
+
+Snapshots are keyed by the roles of the user, and invalidated by changes to the
+roles, permissions and view-menus, detected by the hooks of the security manager and
+by SQLAlchemy session events, see ``superset.utils.versioned_cache``.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Hashable, Iterable
+from typing import Any, cast, Optional
+
+from flask import current_app
+from sqlalchemy.orm import Session
+
+from superset.utils.versioned_cache import get_cache, VersionedCache
+
+# maximum number of snapshots memoized in the process
+MAX_SNAPSHOTS = 1024
+
+
+class PermissionSnapshot:
+    """
+    The permission/view-menu pairs granted to a set of roles.
+    """
+
+    def __init__(self, pairs: Iterable[tuple[str, str]]) -> None:
+        self.pairs = frozenset((permission, view) for permission, view in pairs)
+
+        view_menu_names: dict[str, set[str]] = defaultdict(set)
+        for permission_name, view_menu_name in self.pairs:
+            view_menu_names[permission_name].add(view_menu_name)
+        self._view_menu_names = {
+            permission_name: frozenset(names)
+            for permission_name, names in view_menu_names.items()
+        }
+
+    @classmethod
+    def load(cls, session: Session, role_ids: Iterable[int]) -> PermissionSnapshot:
+        # pylint: disable=import-outside-toplevel
+        from flask_appbuilder.security.sqla.models import assoc_permissionview_role
+
+        from superset import security_manager
+
+        role_ids = list(role_ids)
+        if not role_ids:
+            return cls([])
+
+        return cls(
+            session.query(
+                security_manager.permission_model.name,
+                security_manager.viewmenu_model.name,
+            )
+            .select_from(security_manager.permissionview_model)
+            .join(security_manager.permission_model)
+            .join(security_manager.viewmenu_model)
+            .join(assoc_permissionview_role)
+            .filter(assoc_permissionview_role.c.role_id.in_(role_ids))
+            .distinct()
+            .all()
+        )
+
+    def can_access(self, permission_name: str, view_name: str) -> bool:
+        return (permission_name, view_name) in self.pairs
+
+    def view_menu_names(self, permission_name: str) -> frozenset[str]:
+        """
+        Return the view-menus granted with a permission, eg, the databases granted
+        with `database_access`.
+        """
+        return self._view_menu_names.get(permission_name, frozenset())
+
+
+def is_permission_change(instance: Any, deleted: bool = False) -> bool:
+    """
+    Return whether a change to an instance may change the permissions of the roles.
+    """
+    # pylint: disable=import-outside-toplevel, unused-argument
+    from superset import security_manager
+
+    return isinstance(
+        instance,
+        (
+            security_manager.role_model,
+            security_manager.permissionview_model,
+            security_manager.permission_model,
+            security_manager.viewmenu_model,
+        ),
+    )
+
+
+def load_permission_snapshot(
+    session: Session,
+    key: Hashable,
+    version: Optional[str],
+) -> PermissionSnapshot:
+    role_ids = cast(frozenset[int], key)
+    if version is None:
+        return PermissionSnapshot.load(session, role_ids)
+
+    # the version is part of the key, older snapshots are never read
+    cache_key = "permission_snapshot_{version}_{role_ids}".format(
+        version=version,
+        role_ids=",".join(str(role_id) for role_id in sorted(role_ids)),
+    )
+    if (pairs := get_cache().get(cache_key)) is not None:
+        return PermissionSnapshot(pairs)
+
+    snapshot = PermissionSnapshot.load(session, role_ids)
+    get_cache().set(
+        cache_key,
+        sorted(snapshot.pairs),
+        timeout=current_app.config["PERMISSION_SNAPSHOT_CACHE_TIMEOUT"],
+    )
+    return snapshot
+
+
+permission_snapshots: VersionedCache[PermissionSnapshot] = VersionedCache(
+    "permission_snapshots",
+    load=load_permission_snapshot,
+    is_change=is_permission_change,
+    timeout_config_key="PERMISSION_SNAPSHOT_MEMO_TIMEOUT",
+    max_size=MAX_SNAPSHOTS,
+)
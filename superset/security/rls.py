@@ -0,0 +1,157 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+In-process cache of the row level security rules.
+
+The RLS filters of a table are looked up for every query object, both to compute its
+cache key and to build its SQL. Instead of querying the metadata database each time,
+all the rules are loaded at once into an index, which is memoized until a flush
+touches the filters, or their roles and tables, see ``superset.utils.versioned_cache``.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Hashable, Iterable
+from typing import Any, NamedTuple, Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from superset.utils.core import RowLevelSecurityFilterType
+from superset.utils.versioned_cache import VersionedCache
+
+
+class RLSFilter(NamedTuple):
+    id: int
+    group_key: Optional[str]
+    clause: str
+
+
+class RLSRules:
+    """
+    The row level security rules, indexed by role and table.
+    """
+
+    def __init__(
+        self,
+        filters: Iterable[tuple[int, Optional[str], Optional[str], Optional[str]]],
+        filter_roles: Iterable[tuple[int, int]],
+        filter_tables: Iterable[tuple[int, int]],
+    ) -> None:
+        roles: dict[int, set[int]] = defaultdict(set)
+        for filter_id, role_id in filter_roles:
+            roles[filter_id].add(role_id)
+
+        rules = {
+            filter_id: (filter_type, RLSFilter(filter_id, group_key, clause))
+            for filter_id, filter_type, group_key, clause in filters
+        }
+
+        # regular filters apply to the users with one of their roles, base filters to
+        # the users without any of their roles
+        self.regular: dict[int, dict[int, list[RLSFilter]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        self.base: dict[int, list[tuple[RLSFilter, frozenset[int]]]] = defaultdict(list)
+        for filter_id, table_id in filter_tables:
+            if filter_id not in rules:
+                continue
+            filter_type, rule = rules[filter_id]
+            if filter_type == RowLevelSecurityFilterType.REGULAR:
+                for role_id in roles[filter_id]:
+                    self.regular[role_id][table_id].append(rule)
+            elif filter_type == RowLevelSecurityFilterType.BASE:
+                self.base[table_id].append((rule, frozenset(roles[filter_id])))
+
+    @classmethod
+    def load(cls, session: Session) -> RLSRules:
+        # pylint: disable=import-outside-toplevel
+        from superset.connectors.sqla.models import (
+            RLSFilterRoles,
+            RLSFilterTables,
+            RowLevelSecurityFilter,
+        )
+
+        return cls(
+            filters=session.query(
+                RowLevelSecurityFilter.id,
+                RowLevelSecurityFilter.filter_type,
+                RowLevelSecurityFilter.group_key,
+                RowLevelSecurityFilter.clause,
+            ).all(),
+            filter_roles=session.query(
+                RLSFilterRoles.c.rls_filter_id,
+                RLSFilterRoles.c.role_id,
+            ).all(),
+            filter_tables=session.query(
+                RLSFilterTables.c.rls_filter_id,
+                RLSFilterTables.c.table_id,
+            ).all(),
+        )
+
+    def get_filters(self, table_id: int, role_ids: Iterable[int]) -> list[RLSFilter]:
+        """
+        Return the filters of a table for a user with the given roles, sorted by ID.
+        """
+        role_ids = set(role_ids)
+        filters = {
+            rule.id: rule
+            for role_id in role_ids
+            if role_id in self.regular
+            for rule in self.regular[role_id].get(table_id, [])
+        }
+        for rule, filter_role_ids in self.base.get(table_id, []):
+            if filter_role_ids.isdisjoint(role_ids):
+                filters[rule.id] = rule
+
+        return sorted(filters.values(), key=lambda rule: rule.id)
+
+
+def is_rls_change(instance: Any, deleted: bool = False) -> bool:
+    """
+    Return whether a change to an instance may change the RLS rules.
+    """
+    # pylint: disable=import-outside-toplevel
+    from superset import security_manager
+    from superset.connectors.sqla.models import RowLevelSecurityFilter, SqlaTable
+
+    if isinstance(instance, RowLevelSecurityFilter):
+        return True
+    if isinstance(instance, (SqlaTable, security_manager.role_model)):
+        return (
+            deleted
+            or inspect(instance).attrs.row_level_security_filters.history.has_changes()
+        )
+    return False
+
+
+def load_rls_rules(
+    session: Session,
+    key: Hashable,
+    version: Optional[str],
+) -> RLSRules:
+    # pylint: disable=unused-argument
+    return RLSRules.load(session)
+
+
+rls_rules_cache: VersionedCache[RLSRules] = VersionedCache(
+    "rls_rules",
+    load=load_rls_rules,
+    is_change=is_rls_change,
+    timeout_config_key="RLS_RULES_MEMO_TIMEOUT",
+)
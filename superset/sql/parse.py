@@ -18,12 +18,16 @@
 from __future__ import annotations
 
 import enum
+import functools
+import hashlib
 import logging
 import re
+import threading
 import urllib.parse
+from collections import OrderedDict
 from collections.abc import Iterable
 from dataclasses import dataclass
-from typing import Any, Generic, TypeVar
+from typing import Any, Callable, Generic, TypeVar
 
 import sqlglot
 import sqlparse
@@ -122,6 +126,78 @@ class Table:
         return str(self) == str(other)
 
 
+# The number of parsed scripts kept in memory by each parser. A statement usually goes
+# through several steps before running (access checks, splitting, DML checks, limit),
+# which can then share the same parse. Parse trees take about 100 bytes per character
+# of SQL, so the cache is small.
+PARSE_CACHE_MAX_SIZE = 32
+
+ParseResult = TypeVar("ParseResult")
+
+
+class ParseCache(Generic[ParseResult]):
+    """
+    A LRU cache for parsers, used as a decorator.
+
+    Unlike `functools.lru_cache` the key is a digest of the SQL, together with the
+    remaining arguments (eg, the dialect), so that long scripts are not kept in memory
+    as keys.
+    """
+
+    def __init__(
+        self,
+        parse: Callable[..., ParseResult],
+        max_size: int = PARSE_CACHE_MAX_SIZE,
+    ):
+        functools.update_wrapper(self, parse)
+        self._parse = parse
+        self._max_size = max_size
+        self._cache: OrderedDict[tuple[Any, ...], ParseResult] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, sql: str, *args: Any) -> ParseResult:
+        key = (hashlib.sha256(sql.encode("utf-8")).digest(), *args)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        result = self._parse(sql, *args)
+        with self._lock:
+            self._cache[key] = result
+            if len(self._cache) > self._max_size:
+                self._cache.popitem(last=False)
+
+        return result
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+@ParseCache
+def parse_with_sqlglot(
+    script: str,
+    dialect: Dialects | None,
+) -> tuple[exp.Expression | None, ...]:
+    """
+    Parse a script with sqlglot.
+
+    The statements are shared between callers and must not be modified, copy them
+    first.
+    """
+    return tuple(sqlglot.parse(script, dialect=dialect))
+
+
+class RLSMethod(enum.Enum):
+    """
+    Methods for applying RLS predicates to a statement.
+    """
+
+    AS_SUBQUERY = enum.auto()
+    AS_PREDICATE = enum.auto()
+
+
 # To avoid unnecessary parsing/formatting of queries, the statement has the concept of
 # an "internal representation", which is the AST of the SQL statement. For most of the
 # engines supported by Superset this is `sqlglot.exp.Expression`, but there is a special
@@ -160,6 +236,13 @@ class BaseSQLStatement(Generic[InternalRepresentation]):
         self.engine = engine
         self.tables = self._extract_tables_from_statement(self._parsed, self.engine)
 
+    @property
+    def sql(self) -> str:
+        """
+        The SQL of the statement, including any changes made to it.
+        """
+        return self._sql
+
     @classmethod
     def split_script(
         cls: type[TBaseSQLStatement],
@@ -227,6 +310,14 @@ class BaseSQLStatement(Generic[InternalRepresentation]):
         """
         raise NotImplementedError()
 
+    def is_select(self) -> bool:
+        """
+        Check if the statement is a query that only reads data.
+
+        :return: True if the statement is a query.
+        """
+        raise NotImplementedError()
+
     def __str__(self) -> str:
         return self.format()
 
@@ -254,7 +345,10 @@ class SQLStatement(BaseSQLStatement[exp.Expression]):
         """
         dialect = SQLGLOT_DIALECTS.get(engine)
         try:
-            return sqlglot.parse(script, dialect=dialect)
+            return [
+                statement.copy() if statement else statement
+                for statement in parse_with_sqlglot(script, dialect)
+            ]
         except sqlglot.errors.ParseError as ex:
             error = ex.errors[0]
             raise SupersetParseError(
@@ -383,6 +477,148 @@ class SQLStatement(BaseSQLStatement[exp.Expression]):
 
         return False
 
+    def is_select(self) -> bool:
+        """
+        Check if the statement is a query that only reads data.
+
+        :return: True if the statement is a query.
+        """
+        return isinstance(self._parsed, exp.Query) and not self.is_mutating()
+
+    def set_limit_value(self, limit: int, force: bool = False) -> None:
+        """
+        Limit the number of rows returned by the statement.
+
+        An existing limit is only replaced when it's higher than the new one, unless
+        `force` is set. When there's no limit it's appended to the SQL, which is
+        otherwise kept as is.
+
+        :param limit: Maximum number of rows to be returned by the statement
+        :param force: Replace the existing limit even if it's lower
+        """
+        current = self._parsed.args.get("limit")
+        if current is None:
+            self._parsed.set("limit", exp.Limit(expression=exp.Literal.number(limit)))
+            sql = self._sql.strip(" \t\r\n;")
+            self._sql = f"{sql}\nLIMIT {limit}"
+        elif (
+            isinstance(current, exp.Limit)
+            and isinstance(current.expression, exp.Literal)
+            and current.expression.is_int
+            and (force or limit < int(current.expression.name))
+        ):
+            current.set("expression", exp.Literal.number(limit))
+            self._sql = self._generate()
+
+    def apply_rls(
+        self,
+        get_predicate: Callable[[Table], str | None],
+        method: RLSMethod,
+    ) -> None:
+        """
+        Apply RLS predicates to the tables referenced in the statement.
+
+        With `RLSMethod.AS_SUBQUERY` the table is replaced by a subquery:
+
+            before: SELECT * FROM some_table WHERE 1=1
+            after:  SELECT * FROM (
+                      SELECT * FROM some_table WHERE some_table.id=42
+                    ) AS some_table
+                    WHERE 1=1
+
+        With `RLSMethod.AS_PREDICATE` the predicate is added to the `WHERE` clause, or
+        to the `ON` clause of a join:
+
+            before: SELECT * FROM some_table WHERE 1=1
+            after:  SELECT * FROM some_table WHERE 1=1 AND some_table.id=42
+
+        The former is safer, but not supported in all databases.
+
+        CTEs are not told apart from tables, so that a CTE can't hide a table with the
+        same name.
+
+        :param get_predicate: Returns the predicate of a table, if any
+        :param method: How the predicates are applied
+        """
+        sources = [
+            source
+            for scope in traverse_scope(self._parsed)
+            for source in scope.sources.values()
+            if isinstance(source, exp.Table)
+        ]
+
+        applied = False
+        for source in sources:
+            table = Table(source.name, source.db or None, source.catalog or None)
+            if predicate := get_predicate(table):
+                if method == RLSMethod.AS_SUBQUERY:
+                    self._apply_rls_as_subquery(source, predicate)
+                else:
+                    self._apply_rls_as_predicate(source, predicate)
+                applied = True
+
+        if applied:
+            self._sql = self._generate()
+
+    def _apply_rls_as_subquery(self, source: exp.Table, predicate: str) -> None:
+        """
+        Replace a table with a subquery applying the RLS predicate.
+        """
+        table = source.copy()
+        table.set("alias", None)
+        subquery = (
+            exp.select("*")
+            .from_(table, copy=False)
+            .where(self._parse_rls_predicate(predicate, source.name), copy=False)
+            .subquery(source.alias_or_name, copy=False)
+        )
+        source.replace(subquery)
+
+    def _apply_rls_as_predicate(self, source: exp.Table, predicate: str) -> None:
+        """
+        Add the RLS predicate of a table to the conditions of the query or join.
+        """
+        condition = self._parse_rls_predicate(predicate, source.alias_or_name)
+        join = source.parent
+        if isinstance(join, exp.Join) and not join.args.get("using"):
+            on = join.args.get("on")
+            join.set("on", exp.and_(condition, on) if on else condition)
+            return
+
+        select = source.parent_select
+        if select is None:
+            raise SupersetParseError(
+                self._sql,
+                self.engine,
+                message=f"Unable to apply RLS to {source.sql()}",
+            )
+        select.where(condition, copy=False)
+
+    def _parse_rls_predicate(self, predicate: str, table: str) -> exp.Expression:
+        """
+        Parse a RLS predicate, qualifying its columns with the table name.
+        """
+        try:
+            condition = sqlglot.condition(predicate, dialect=self._dialect)
+        except sqlglot.errors.SqlglotError as ex:
+            raise SupersetParseError(
+                predicate,
+                self.engine,
+                message="Unable to parse RLS predicate",
+            ) from ex
+
+        for column in condition.find_all(exp.Column):
+            if not column.table:
+                column.set("table", exp.to_identifier(table))
+
+        return condition
+
+    def _generate(self) -> str:
+        """
+        Generate the SQL of the statement after its AST has changed.
+        """
+        return Dialect.get_or_raise(self._dialect).generate(self._parsed, copy=False)
+
     def format(self, comments: bool = True) -> str:
         """
         Pretty-format the SQL statement.
@@ -589,6 +825,14 @@ class KustoKQLStatement(BaseSQLStatement[str]):
         """
         return self._parsed.startswith(".") and not self._parsed.startswith(".show")
 
+    def is_select(self) -> bool:
+        """
+        Check if the statement is a query that only reads data.
+
+        :return: True if the statement is a query.
+        """
+        return not self._parsed.startswith(".")
+
 
 class SQLScript:
     """
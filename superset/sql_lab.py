@@ -21,6 +21,8 @@ import sys
 import uuid
 from contextlib import closing
 from datetime import datetime
+from functools import partial
+from itertools import chain
 from sys import getsizeof
 from typing import Any, cast, Optional, Union
 
@@ -29,6 +31,7 @@ import msgpack
 from celery.exceptions import SoftTimeLimitExceeded
 from flask import current_app
 from flask_babel import gettext as __
+from simplejson import RawJSON
 
 from superset import (
     app,
@@ -40,7 +43,7 @@ from superset import (
 )
 from superset.common.db_query_status import QueryStatus
 from superset.constants import QUERY_CANCEL_KEY, QUERY_EARLY_CANCEL_KEY
-from superset.dataframe import df_to_records
+from superset.dataframe import df_to_json, df_to_records
 from superset.db_engine_specs import BaseEngineSpec
 from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
 from superset.exceptions import (
@@ -53,14 +56,15 @@ from superset.extensions import celery_app, event_logger
 from superset.models.core import Database
 from superset.models.sql_lab import Query
 from superset.result_set import SupersetResultSet
-from superset.sql.parse import SQLStatement, Table
+from superset.sql.parse import RLSMethod, SQLStatement, Table
 from superset.sql_parse import (
+    as_create_table,
     CtasMethod,
-    insert_rls_as_subquery,
-    insert_rls_in_predicate,
+    get_rls_predicate,
     ParsedQuery,
 )
 from superset.sqllab.limiting_factor import LimitingFactor
+from superset.sqllab.results_format import serialize_results
 from superset.sqllab.utils import write_ipc_buffer
 from superset.utils import json
 from superset.utils.core import (
@@ -77,6 +81,7 @@ SQLLAB_TIMEOUT = config["SQLLAB_ASYNC_TIME_LIMIT_SEC"]
 SQLLAB_HARD_TIMEOUT = SQLLAB_TIMEOUT + 60
 SQL_MAX_ROW = config["SQL_MAX_ROW"]
 SQLLAB_CTAS_NO_LIMIT = config["SQLLAB_CTAS_NO_LIMIT"]
+RESULT_SET_FETCH_BATCH_SIZE = config["RESULT_SET_FETCH_BATCH_SIZE"]
 log_query = config["QUERY_LOGGER"]
 logger = logging.getLogger(__name__)
 BYTES_IN_MB = 1024 * 1024
@@ -208,60 +213,80 @@ def execute_sql_statement(  # pylint: disable=too-many-statements, too-many-loca
     database: Database = query.database
     db_engine_spec = database.db_engine_spec
 
-    parsed_query = ParsedQuery(sql_statement, engine=db_engine_spec.engine)
+    # The statement is parsed once, and the parse is shared by the DML and RLS checks,
+    # the SELECT check and the limit.
+    sql = sql_statement.strip(" \t\r\n;")
+    parsed_statement: Optional[SQLStatement] = None
+    parse_errors: list[SupersetError] = []
+    try:
+        parsed_statement = SQLStatement(sql, engine=db_engine_spec.engine)
+    except SupersetParseError as ex:
+        parse_errors.append(ex.error)
+
+    # This is a test to see if the query is being
+    # limited by either the dropdown or the sql.
+    # We are testing to see if more rows exist than the limit.
+    increased_limit = None if query.limit is None else query.limit + 1
+
+    if not database.allow_dml:
+        # if we fail to parse the query, disallow by default
+        if parsed_statement is None or parsed_statement.is_mutating():
+            raise SupersetErrorsException(
+                parse_errors
+                + [
+                    SupersetError(
+                        message=__(
+                            "This database does not allow for DDL/DML, and the query "
+                            "could not be parsed to confirm it is a read-only query. "
+                            "Please contact your administrator for more assistance."
+                        ),
+                        error_type=SupersetErrorType.DML_NOT_ALLOWED_ERROR,
+                        level=ErrorLevel.ERROR,
+                    )
+                ]
+            )
+
     if is_feature_enabled("RLS_IN_SQLLAB"):
+        # RLS can't be enforced in a query that can't be parsed
+        if parsed_statement is None:
+            raise SupersetErrorsException(parse_errors)
+
         # There are two ways to insert RLS: either replacing the table with a subquery
         # that has the RLS, or appending the RLS to the ``WHERE`` clause. The former is
         # safer, but not supported in all databases.
-        insert_rls = (
-            insert_rls_as_subquery
-            if database.db_engine_spec.allows_subqueries
-            and database.db_engine_spec.allows_alias_in_select
-            else insert_rls_in_predicate
+        method = (
+            RLSMethod.AS_SUBQUERY
+            if db_engine_spec.allows_subqueries
+            and db_engine_spec.allows_alias_in_select
+            else RLSMethod.AS_PREDICATE
         )
-
-        # Insert any applicable RLS predicates
-        parsed_query = ParsedQuery(
-            str(
-                insert_rls(
-                    parsed_query._parsed[0],  # pylint: disable=protected-access
-                    database.id,
-                    query.schema,
-                )
+        parsed_statement.apply_rls(
+            partial(
+                get_rls_predicate, database_id=database.id, default_schema=query.schema
             ),
-            engine=db_engine_spec.engine,
+            method,
         )
+        sql = parsed_statement.sql
 
-    sql = parsed_query.stripped()
-
-    # This is a test to see if the query is being
-    # limited by either the dropdown or the sql.
-    # We are testing to see if more rows exist than the limit.
-    increased_limit = None if query.limit is None else query.limit + 1
+    if parsed_statement is not None:
+        is_select = db_engine_spec.is_select_query(parsed_statement)
+    else:
+        # statements that sqlglot can't parse are checked with sqlparse
+        is_select = db_engine_spec.is_select_query(
+            ParsedQuery(sql, engine=db_engine_spec.engine)
+        )
 
-    if not database.allow_dml:
-        errors = []
-        try:
-            parsed_statement = SQLStatement(sql_statement, engine=db_engine_spec.engine)
-            disallowed = parsed_statement.is_mutating()
-        except SupersetParseError as ex:
-            # if we fail to parse the query, disallow by default
-            disallowed = True
-            errors.append(ex.error)
-
-        if disallowed:
-            errors.append(
-                SupersetError(
-                    message=__(
-                        "This database does not allow for DDL/DML, and the query "
-                        "could not be parsed to confirm it is a read-only query. Please "
-                        "contact your administrator for more assistance."
-                    ),
-                    error_type=SupersetErrorType.DML_NOT_ALLOWED_ERROR,
-                    level=ErrorLevel.ERROR,
-                )
-            )
-            raise SupersetErrorsException(errors)
+    # Do not apply limit to the CTA queries when SQLLAB_CTAS_NO_LIMIT is set to true
+    if is_select and not (apply_ctas and SQLLAB_CTAS_NO_LIMIT):
+        if SQL_MAX_ROW and (not query.limit or query.limit > SQL_MAX_ROW):
+            query.limit = SQL_MAX_ROW
+        sql = apply_limit_if_exists(
+            database,
+            increased_limit,
+            query,
+            sql,
+            parsed_statement,
+        )
 
     if apply_ctas:
         if not query.tmp_table_name:
@@ -269,21 +294,14 @@ def execute_sql_statement(  # pylint: disable=too-many-statements, too-many-loca
             query.tmp_table_name = (
                 f'tmp_{query.user_id}_table_{start_dttm.strftime("%Y_%m_%d_%H_%M_%S")}'
             )
-        sql = parsed_query.as_create_table(
+        sql = as_create_table(
+            sql,
             query.tmp_table_name,
             schema_name=query.tmp_schema_name,
             method=query.ctas_method,
         )
         query.select_as_cta_used = True
 
-    # Do not apply limit to the CTA queries when SQLLAB_CTAS_NO_LIMIT is set to true
-    if db_engine_spec.is_select_query(parsed_query) and not (
-        query.select_as_cta_used and SQLLAB_CTAS_NO_LIMIT
-    ):
-        if SQL_MAX_ROW and (not query.limit or query.limit > SQL_MAX_ROW):
-            query.limit = SQL_MAX_ROW
-        sql = apply_limit_if_exists(database, increased_limit, query, sql)
-
     # Hook to allow environment-specific mutation (usually comments) to the SQL
     sql = database.mutate_sql_based_on_config(sql)
     try:
@@ -312,12 +330,25 @@ def execute_sql_statement(  # pylint: disable=too-many-statements, too-many-loca
                     query.id,
                     str(query.to_dict()),
                 )
-                data = db_engine_spec.fetch_data(cursor, increased_limit)
-                if query.limit is None or len(data) <= query.limit:
+                batches = db_engine_spec.fetch_data_batches(
+                    cursor,
+                    RESULT_SET_FETCH_BATCH_SIZE,
+                    increased_limit,
+                )
+                # some drivers only populate the cursor description after the first
+                # fetch
+                first_batch = next(batches, [])
+                logger.debug("Query %d: Fetching cursor description", query.id)
+                result_set = SupersetResultSet.from_batches(
+                    chain([first_batch], batches),
+                    cursor.description,
+                    db_engine_spec,
+                )
+                if query.limit is None or result_set.size <= query.limit:
                     query.limiting_factor = LimitingFactor.NOT_LIMITED
                 else:
                     # return 1 row less than increased_query
-                    data = data[:-1]
+                    result_set.truncate(query.limit)
     except SoftTimeLimitExceeded as ex:
         query.status = QueryStatus.TIMED_OUT
 
@@ -347,13 +378,15 @@ def execute_sql_statement(  # pylint: disable=too-many-statements, too-many-loca
         logger.debug("Query %d: %s", query.id, ex)
         raise SqlLabException(db_engine_spec.extract_error_message(ex)) from ex
 
-    logger.debug("Query %d: Fetching cursor description", query.id)
-    cursor_description = cursor.description
-    return SupersetResultSet(data, cursor_description, db_engine_spec)
+    return result_set
 
 
 def apply_limit_if_exists(
-    database: Database, increased_limit: Optional[int], query: Query, sql: str
+    database: Database,
+    increased_limit: Optional[int],
+    query: Query,
+    sql: str,
+    statement: Optional[SQLStatement] = None,
 ) -> str:
     if query.limit and increased_limit:
         # We are fetching one more than the requested limit in order
@@ -361,7 +394,12 @@ def apply_limit_if_exists(
         # Engine support it will choose top or limit parse
         # Later, the extra row will be dropped before sending
         # the results back to the user.
-        sql = database.apply_limit_to_sql(sql, increased_limit, force=True)
+        sql = database.apply_limit_to_sql(
+            sql,
+            increased_limit,
+            force=True,
+            statement=statement,
+        )
     return sql
 
 
@@ -380,7 +418,8 @@ def _serialize_and_expand_data(
     db_engine_spec: BaseEngineSpec,
     use_msgpack: Optional[bool] = False,
     expand_data: bool = False,
-) -> tuple[Union[bytes, str], list[Any], list[Any], list[Any]]:
+    raw_json: bool = False,
+) -> tuple[Union[bytes, str, RawJSON], list[Any], list[Any], list[Any]]:
     selected_columns = result_set.columns
     all_columns: list[Any]
     expanded_columns: list[Any]
@@ -395,6 +434,12 @@ def _serialize_and_expand_data(
         all_columns, expanded_columns = (selected_columns, [])
     else:
         df = result_set.to_pandas_df()
+        if raw_json and not expand_data:
+            # the data is only serialized, so it's written to JSON from the columns
+            # without building the records
+            data = RawJSON(df_to_json(df))
+            return (data, selected_columns, selected_columns, [])
+
         data = df_to_records(df) or []
 
         if expand_data:
@@ -573,10 +618,27 @@ def execute_sql_statements(
         )
     query.end_time = now_as_float()
 
+    arrow_compression = config["RESULTS_BACKEND_ARROW_COMPRESSION"]
+    use_arrow_file = bool(store_results and results_backend and arrow_compression)
     use_arrow_data = store_results and cast(bool, results_backend_use_msgpack)
-    data, selected_columns, all_columns, expanded_columns = _serialize_and_expand_data(
-        result_set, db_engine_spec, use_arrow_data, expand_data
-    )
+    if use_arrow_file:
+        # the data is written to the results backend directly from the Arrow table
+        data = None
+        selected_columns = all_columns = result_set.columns
+        expanded_columns = []
+    else:
+        (
+            data,
+            selected_columns,
+            all_columns,
+            expanded_columns,
+        ) = _serialize_and_expand_data(
+            result_set,
+            db_engine_spec,
+            use_arrow_data,
+            expand_data,
+            raw_json=bool(store_results and not return_results),
+        )
 
     # TODO: data should be saved separately from metadata (likely in Parquet)
     payload.update(
@@ -601,9 +663,17 @@ def execute_sql_statements(
             with stats_timing(
                 "sqllab.query.results_backend_write_serialization", stats_logger
             ):
-                serialized_payload = _serialize_payload(
-                    payload, cast(bool, results_backend_use_msgpack)
-                )
+                if use_arrow_file:
+                    serialized_payload = serialize_results(
+                        payload,
+                        result_set.pa_table,
+                        arrow_compression,
+                        config["RESULTS_BACKEND_ARROW_BATCH_SIZE"],
+                    )
+                else:
+                    serialized_payload = _serialize_payload(
+                        payload, cast(bool, results_backend_use_msgpack)
+                    )
 
                 # Check the size of the serialized payload
                 if sql_lab_payload_max_mb := config.get("SQLLAB_PAYLOAD_MAX_MB"):
@@ -624,7 +694,11 @@ def execute_sql_statements(
             if cache_timeout is None:
                 cache_timeout = config["CACHE_DEFAULT_TIMEOUT"]
 
-            compressed = zlib_compress(serialized_payload)
+            if use_arrow_file:
+                # record batches are already compressed
+                compressed = serialized_payload
+            else:
+                compressed = zlib_compress(serialized_payload)
             logger.debug(
                 "*** serialized payload size: %i", getsizeof(serialized_payload)
             )
@@ -637,7 +711,7 @@ def execute_sql_statements(
 
     if return_results:
         # since we're returning results we need to create non-arrow data
-        if use_arrow_data:
+        if use_arrow_data or use_arrow_file:
             (
                 data,
                 selected_columns,
@@ -29,6 +29,7 @@ from flask_babel import gettext as __
 from jinja2 import nodes, Template
 from sqlalchemy import and_
 from sqlparse import keywords
+from sqlparse.filters import SerializerUnicode
 from sqlparse.lexer import Lexer
 from sqlparse.sql import (
     Function,
@@ -36,6 +37,7 @@ from sqlparse.sql import (
     IdentifierList,
     Parenthesis,
     remove_quotes,
+    Statement,
     Token,
     TokenList,
     Where,
@@ -62,6 +64,7 @@ from superset.exceptions import (
 )
 from superset.sql.parse import (
     extract_tables_from_statement,
+    ParseCache,
     SQLGLOT_DIALECTS,
     SQLScript,
     SQLStatement,
@@ -93,6 +96,37 @@ sqlparser_sql_regex.insert(25, (r"'(''|\\\\|\\|[^'])*'", sqlparse.tokens.String.
 lex.set_SQL_REGEX(sqlparser_sql_regex)
 
 
+@ParseCache
+def parse_with_sqlparse(sql: str) -> tuple[Statement, ...]:
+    """
+    Parse SQL with sqlparse.
+
+    The statements are shared between callers and must not be modified, call
+    ``sqlparse.parse`` to get statements that can be transformed.
+    """
+    logger.debug("Parsing with sqlparse statement: %s", sql)
+    return tuple(sqlparse.parse(sql))
+
+
+@ParseCache
+def format_without_comments(sql: str) -> str:
+    """
+    Equivalent to ``sqlparse.format(sql, strip_comments=True)``, reusing the parsed
+    statements when there are no comments to strip.
+    """
+    statements = parse_with_sqlparse(sql)
+    if any(
+        token.ttype in Comment
+        for statement in statements
+        for token in statement.flatten()
+    ):
+        return sqlparse.format(sql, strip_comments=True)
+
+    # without comments, formatting only strips trailing whitespace and normalizes
+    # newlines
+    return "".join(SerializerUnicode.process(statement) for statement in statements)
+
+
 class CtasMethod(StrEnum):
     TABLE = "TABLE"
     VIEW = "VIEW"
@@ -209,7 +243,7 @@ class ParsedQuery:
         engine: str = "base",
     ):
         if strip_comments:
-            sql_statement = sqlparse.format(sql_statement, strip_comments=True)
+            sql_statement = format_without_comments(sql_statement)
 
         self.sql: str = sql_statement
         self._engine = engine
@@ -218,8 +252,7 @@ class ParsedQuery:
         self._alias_names: set[str] = set()
         self._limit: int | None = None
 
-        logger.debug("Parsing with sqlparse statement: %s", self.sql)
-        self._parsed = sqlparse.parse(self.stripped())
+        self._parsed = parse_with_sqlparse(self.stripped())
         for statement in self._parsed:
             self._limit = _extract_limit_from_query(statement)
 
@@ -320,7 +353,7 @@ class ParsedQuery:
 
     def is_select(self) -> bool:
         # make sure we strip comments; prevents a bug with comments in the CTE
-        parsed = sqlparse.parse(self.strip_comments())
+        parsed = parse_with_sqlparse(self.strip_comments())
         seen_select = False
 
         for statement in parsed:
@@ -386,35 +419,29 @@ class ParsedQuery:
         return None
 
     def is_valid_ctas(self) -> bool:
-        parsed = sqlparse.parse(self.strip_comments())
+        parsed = parse_with_sqlparse(self.strip_comments())
         return parsed[-1].get_type() == "SELECT"
 
     def is_valid_cvas(self) -> bool:
-        parsed = sqlparse.parse(self.strip_comments())
+        parsed = parse_with_sqlparse(self.strip_comments())
         return len(parsed) == 1 and parsed[0].get_type() == "SELECT"
 
     def is_explain(self) -> bool:
         # Remove comments
-        statements_without_comments = sqlparse.format(
-            self.stripped(), strip_comments=True
-        )
+        statements_without_comments = self.strip_comments()
 
         # Explain statements will only be the first statement
         return statements_without_comments.upper().startswith("EXPLAIN")
 
     def is_show(self) -> bool:
         # Remove comments
-        statements_without_comments = sqlparse.format(
-            self.stripped(), strip_comments=True
-        )
+        statements_without_comments = self.strip_comments()
         # Show statements will only be the first statement
         return statements_without_comments.upper().startswith("SHOW")
 
     def is_set(self) -> bool:
         # Remove comments
-        statements_without_comments = sqlparse.format(
-            self.stripped(), strip_comments=True
-        )
+        statements_without_comments = self.strip_comments()
         # Set statements will only be the first statement
         return statements_without_comments.upper().startswith("SET")
 
@@ -425,7 +452,7 @@ class ParsedQuery:
         return self.sql.strip(" \t\r\n;")
 
     def strip_comments(self) -> str:
-        return sqlparse.format(self.stripped(), strip_comments=True)
+        return format_without_comments(self.stripped())
 
     def get_statements(self) -> list[str]:
         """Returns a list of SQL statements as strings, stripped"""
@@ -488,14 +515,13 @@ class ParsedQuery:
         :param method: method for the CTA query, currently view or table creation
         :return: Create table as query
         """
-        exec_sql = ""
-        sql = self.stripped()
-        # TODO(bkyryliuk): quote full_table_name
-        full_table_name = f"{schema_name}.{table_name}" if schema_name else table_name
-        if overwrite:
-            exec_sql = f"DROP {method} IF EXISTS {full_table_name};\n"
-        exec_sql += f"CREATE {method} {full_table_name} AS \n{sql}"
-        return exec_sql
+        return as_create_table(
+            self.stripped(),
+            table_name,
+            schema_name=schema_name,
+            overwrite=overwrite,
+            method=method,
+        )
 
     def set_or_update_query_limit(self, new_limit: int, force: bool = False) -> str:
         """Returns the query with the specified limit.
@@ -516,19 +542,45 @@ class ParsedQuery:
             if item.ttype in Keyword and item.value.lower() == "limit":
                 limit_pos = pos
                 break
-        _, limit = statement.token_next(idx=limit_pos)
+        limit_pos, limit = statement.token_next(idx=limit_pos)
+
+        # the parsed statement is shared, so the limit is replaced in the output
+        values = [str(token.value) for token in statement.tokens]
         # Override the limit only when it exceeds the configured value.
         if limit.ttype == sqlparse.tokens.Literal.Number.Integer and (
             force or new_limit < int(limit.value)
         ):
-            limit.value = new_limit
+            values[limit_pos] = str(new_limit)
         elif limit.is_group:
-            limit.value = f"{next(limit.get_identifiers())}, {new_limit}"
+            values[limit_pos] = f"{next(limit.get_identifiers())}, {new_limit}"
 
-        str_res = ""
-        for i in statement.tokens:
-            str_res += str(i.value)
-        return str_res
+        return "".join(values)
+
+
+def as_create_table(
+    sql: str,
+    table_name: str,
+    schema_name: str | None = None,
+    overwrite: bool = False,
+    method: CtasMethod = CtasMethod.TABLE,
+) -> str:
+    """
+    Reformats a SELECT statement into a create table as query.
+
+    :param sql: the SELECT statement
+    :param table_name: table that will contain the results of the query execution
+    :param schema_name: schema name for the target table
+    :param overwrite: table_name will be dropped if true
+    :param method: method for the CTA query, currently view or table creation
+    :return: Create table as query
+    """
+    exec_sql = ""
+    # TODO(bkyryliuk): quote full_table_name
+    full_table_name = f"{schema_name}.{table_name}" if schema_name else table_name
+    if overwrite:
+        exec_sql = f"DROP {method} IF EXISTS {full_table_name};\n"
+    exec_sql += f"CREATE {method} {full_table_name} AS \n{sql}"
+    return exec_sql
 
 
 def sanitize_clause(clause: str) -> str:
@@ -624,10 +676,6 @@ def get_rls_for_table(
     """
     Given a table name, return any associated RLS predicates.
     """
-    # pylint: disable=import-outside-toplevel
-    from superset import db
-    from superset.connectors.sqla.models import SqlaTable
-
     if not isinstance(candidate, Identifier):
         candidate = Identifier([Token(Name, candidate.value)])
 
@@ -635,6 +683,28 @@ def get_rls_for_table(
     if not table:
         return None
 
+    predicate = get_rls_predicate(table, database_id, default_schema)
+    if not predicate:
+        return None
+
+    rls = sqlparse.parse(predicate)[0]
+    add_table_name(rls, table.table)
+
+    return rls
+
+
+def get_rls_predicate(
+    table: Table,
+    database_id: int,
+    default_schema: str | None,
+) -> str | None:
+    """
+    Return the RLS predicates associated with a table, if any.
+    """
+    # pylint: disable=import-outside-toplevel
+    from superset import db
+    from superset.connectors.sqla.models import SqlaTable
+
     dataset = (
         db.session.query(SqlaTable)
         .filter(
@@ -649,16 +719,9 @@ def get_rls_for_table(
     if not dataset:
         return None
 
-    predicate = " AND ".join(
+    return " AND ".join(
         str(filter_) for filter_ in dataset.get_sqla_row_level_filters()
     )
-    if not predicate:
-        return None
-
-    rls = sqlparse.parse(predicate)[0]
-    add_table_name(rls, table.table)
-
-    return rls
 
 
 def insert_rls_as_subquery(
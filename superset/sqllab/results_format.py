@@ -0,0 +1,159 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Chunked storage format for SQL Lab results.
+
+A blob has the following layout::
+
+    MAGIC | metadata length (uint32) | metadata (msgpack) | Arrow IPC file
+
+The metadata holds the query payload (everything except the data) and the number of
+rows of each record batch. The data is stored as an Arrow IPC file, where every record
+batch is compressed on its own (LZ4 or ZSTD) and indexed in the file footer. This
+allows reading only the first rows, or only some of the columns, without decoding
+the whole result, and iterating over the data one batch at a time.
+
+Blobs written in the legacy format (a zlib compressed JSON or msgpack payload) don't
+start with the magic prefix, see ``is_arrow_results``.
+"""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import Iterator
+from typing import Any
+
+import msgpack
+import pyarrow as pa
+
+from superset.exceptions import SerializationError
+from superset.utils import json
+
+MAGIC = b"SUPERSET_ARROW_1"
+HEADER = struct.Struct("<I")
+
+
+def is_arrow_results(blob: Any) -> bool:
+    return isinstance(blob, bytes) and blob.startswith(MAGIC)
+
+
+def serialize_results(
+    payload: dict[str, Any],
+    table: pa.Table,
+    compression: str,
+    batch_size: int,
+) -> bytes:
+    """
+    Serialize a query payload and its data into a chunked results blob.
+
+    :param payload: The query payload, its ``data`` key is not stored
+    :param table: The query results
+    :param compression: The Arrow IPC compression codec, ``lz4`` or ``zstd``
+    :param batch_size: The maximum number of rows in each record batch
+    """
+    batches = table.to_batches(max_chunksize=batch_size)
+    metadata = msgpack.dumps(
+        {
+            "payload": {key: value for key, value in payload.items() if key != "data"},
+            "batch_rows": [batch.num_rows for batch in batches],
+        },
+        default=json.json_iso_dttm_ser,
+        use_bin_type=True,
+    )
+
+    # the offsets in the footer are relative to the start of the Arrow file, so it's
+    # written on its own and appended to the header
+    sink = pa.BufferOutputStream()
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+
+    return b"".join([MAGIC, HEADER.pack(len(metadata)), metadata, sink.getvalue()])
+
+
+class ArrowResultsReader:
+    """
+    Lazy reader for blobs written by ``serialize_results``.
+
+    Only the metadata and the Arrow file footer are read upfront, record batches are
+    decompressed when requested.
+    """
+
+    def __init__(self, blob: bytes) -> None:
+        try:
+            offset = len(MAGIC)
+            (length,) = HEADER.unpack_from(blob, offset)
+            offset += HEADER.size
+            metadata = msgpack.loads(blob[offset : offset + length], raw=False)
+            self._buffer = pa.py_buffer(blob)[offset + length :]
+            self.schema = pa.ipc.open_file(self._buffer).schema
+        except (struct.error, ValueError, pa.ArrowException) as ex:
+            raise SerializationError("Unable to deserialize table") from ex
+
+        self.payload: dict[str, Any] = metadata["payload"]
+        self.batch_rows: list[int] = metadata["batch_rows"]
+
+    @property
+    def num_rows(self) -> int:
+        return sum(self.batch_rows)
+
+    def iter_batches(
+        self,
+        columns: list[str] | None = None,
+    ) -> Iterator[pa.RecordBatch]:
+        """
+        Iterate over the record batches, decoding only the requested columns.
+        """
+        options = None
+        if columns is not None:
+            options = pa.ipc.IpcReadOptions(
+                included_fields=[self.schema.get_field_index(name) for name in columns]
+            )
+
+        try:
+            reader = pa.ipc.open_file(self._buffer, options=options)
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i)
+        except pa.ArrowException as ex:
+            raise SerializationError("Unable to deserialize table") from ex
+
+    def read_table(
+        self,
+        max_rows: int | None = None,
+        columns: list[str] | None = None,
+    ) -> pa.Table:
+        """
+        Read the results, decoding only the batches needed for the first ``max_rows``
+        rows and only the requested columns.
+        """
+        batches = []
+        rows = 0
+        for batch in self.iter_batches(columns):
+            batches.append(batch)
+            rows += batch.num_rows
+            if max_rows is not None and rows >= max_rows:
+                break
+
+        schema = batches[0].schema if batches else self._project(columns)
+        table = pa.Table.from_batches(batches, schema=schema)
+        return table if max_rows is None else table.slice(0, max_rows)
+
+    def _project(self, columns: list[str] | None) -> pa.Schema:
+        if columns is None:
+            return self.schema
+        return pa.schema([self.schema.field(name) for name in columns])
@@ -90,6 +90,8 @@ def load_chart_data_into_cache(
     with override_user(_load_user_from_job_metadata(job_metadata), force=False):
         try:
             set_form_data(form_data)
+            # used by long running post-processing operations to report progress
+            g.async_job_metadata = job_metadata
             query_context = _create_query_context_from_form(form_data)
             command = ChartDataCommand(query_context)
             result = command.run(cache=True)
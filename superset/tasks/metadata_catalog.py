@@ -0,0 +1,221 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Crawl the databases into the metadata catalog, see `METADATA_CATALOG_INDEX`.
+
+A database is crawled by a task listing its catalogs and schemas, which then
+schedules a task per schema listing its tables and views, and fetching their metadata
+by batches. The tasks inspecting a database hold one of its
+`METADATA_CATALOG_CONCURRENCY` distributed locks, and are retried later when all of
+them are taken. The tasks are killed after `METADATA_CATALOG_TASK_TIMEOUT`, before
+their locks expire.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+from contextlib import ExitStack
+from datetime import timedelta
+from typing import Any, Optional
+
+from celery import Task
+from celery.exceptions import SoftTimeLimitExceeded
+from flask import current_app
+
+from superset import db
+from superset.daos.database import DatabaseDAO
+from superset.daos.metadata_catalog import MetadataCatalogDAO
+from superset.distributed_lock import KeyValueDistributedLock
+from superset.exceptions import CreateKeyValueDistributedLockFailedException
+from superset.extensions import celery_app
+from superset.models.core import Database
+from superset.models.metadata_catalog import MetadataCatalogEntryType
+from superset.sql_parse import Table
+
+logger = logging.getLogger(__name__)
+
+# delay before retrying a task when the database is busy, in seconds
+RETRY_DELAY = 30
+# delay between the soft and the hard time limits of a task, in seconds
+KILL_DELAY = 30
+
+
+def task_options() -> dict[str, Any]:
+    """
+    Return the options of the tasks inspecting a database, limiting their time.
+    """
+    timeout = current_app.config["METADATA_CATALOG_TASK_TIMEOUT"]
+    return {"soft_time_limit": timeout, "time_limit": timeout + KILL_DELAY}
+
+
+def acquire_slot(stack: ExitStack, database_id: int) -> bool:
+    """
+    Acquire one of the locks of a database, released when the stack is closed.
+
+    The lock expires when the task holding it is killed, see `task_options`.
+
+    :return: Whether a lock was acquired
+    """
+    lock_expiration = timedelta(
+        seconds=current_app.config["METADATA_CATALOG_TASK_TIMEOUT"] + KILL_DELAY
+    )
+    for slot in range(current_app.config["METADATA_CATALOG_CONCURRENCY"]):
+        try:
+            stack.enter_context(
+                KeyValueDistributedLock(
+                    namespace="metadata_catalog",
+                    lock_expiration=lock_expiration,
+                    database_id=database_id,
+                    slot=slot,
+                )
+            )
+            return True
+        except CreateKeyValueDistributedLockFailedException:
+            continue
+    return False
+
+
+def _retry(task: Task) -> None:
+    raise task.retry(countdown=RETRY_DELAY + random.randint(0, RETRY_DELAY))  # noqa: S311
+
+
+@celery_app.task(name="metadata_catalog.crawl")
+def crawl() -> None:
+    """
+    Crawl all the databases.
+    """
+    for (database_id,) in db.session.query(Database.id):
+        crawl_database.apply_async((database_id,), **task_options())
+
+
+@celery_app.task(name="metadata_catalog.crawl_database", bind=True, max_retries=None)
+def crawl_database(self: Task, database_id: int) -> None:
+    """
+    Refresh the catalogs and schemas of a database, and crawl its schemas.
+    """
+    if not (database := DatabaseDAO.find_by_id(database_id)):
+        logger.warning("Database %s not found, skip crawling it", database_id)
+        return
+
+    schemas: list[tuple[Optional[str], str]] = []
+    with ExitStack() as stack:
+        if not acquire_slot(stack, database_id):
+            _retry(self)
+
+        catalogs: list[Optional[str]] = [None]
+        if database.db_engine_spec.supports_catalog:
+            catalogs = sorted(database.get_all_catalog_names(cache=False))
+            MetadataCatalogDAO.sync(
+                database,
+                None,
+                None,
+                [(catalog, MetadataCatalogEntryType.CATALOG) for catalog in catalogs],
+            )
+
+        for catalog in catalogs:
+            names = sorted(database.get_all_schema_names(catalog=catalog, cache=False))
+            MetadataCatalogDAO.sync(
+                database,
+                catalog,
+                None,
+                [(schema, MetadataCatalogEntryType.SCHEMA) for schema in names],
+            )
+            schemas.extend((catalog, schema) for schema in names)
+        db.session.commit()  # pylint: disable=consider-using-transaction
+
+    for catalog, schema in schemas:
+        crawl_schema.apply_async((database_id, catalog, schema), **task_options())
+
+
+@celery_app.task(name="metadata_catalog.crawl_schema", bind=True, max_retries=None)
+def crawl_schema(
+    self: Task,
+    database_id: int,
+    catalog: Optional[str],
+    schema: str,
+    list_tables: bool = True,
+) -> None:
+    """
+    Refresh the tables and views of a schema, and a batch of their metadata.
+
+    The metadata which is missing, or the oldest, is fetched first. The task is
+    scheduled again, without listing the tables, until all of it is fresh, or when
+    it times out.
+    """
+    if not (database := DatabaseDAO.find_by_id(database_id)):
+        logger.warning("Database %s not found, skip crawling it", database_id)
+        return
+
+    batch_size = current_app.config["METADATA_CATALOG_METADATA_BATCH_SIZE"]
+    with ExitStack() as stack:
+        if not acquire_slot(stack, database_id):
+            _retry(self)
+
+        if list_tables:
+            tables = database.get_all_table_names_in_schema(
+                catalog=catalog,
+                schema=schema,
+                cache=False,
+            )
+            views = database.get_all_view_names_in_schema(
+                catalog=catalog,
+                schema=schema,
+                cache=False,
+            )
+            MetadataCatalogDAO.sync(
+                database,
+                catalog,
+                schema,
+                [(table.table, MetadataCatalogEntryType.TABLE) for table in tables]
+                + [(view.table, MetadataCatalogEntryType.VIEW) for view in views],
+            )
+            db.session.commit()  # pylint: disable=consider-using-transaction
+
+        entries = MetadataCatalogDAO.find_stale_tables(
+            database,
+            catalog,
+            schema,
+            batch_size,
+        )
+        refreshed = 0
+        for entry in entries:
+            table = Table(entry.name, schema, catalog)
+            try:
+                table_metadata = database.db_engine_spec.get_table_metadata(
+                    database,
+                    table,
+                )
+            except SoftTimeLimitExceeded:
+                logger.warning("Timed out fetching the metadata of %s", table)
+                break
+            except Exception:  # pylint: disable=broad-except
+                logger.warning(
+                    "Unable to fetch the metadata of %s", table, exc_info=True
+                )
+                continue
+            MetadataCatalogDAO.set_table_metadata(entry, dict(table_metadata))
+            refreshed += 1
+        db.session.commit()  # pylint: disable=consider-using-transaction
+
+    # stop when the metadata of a whole batch can't be fetched
+    if len(entries) == batch_size and refreshed:
+        crawl_schema.apply_async(
+            (database_id, catalog, schema),
+            {"list_tables": False},
+            **task_options(),
+        )
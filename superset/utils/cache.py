@@ -18,6 +18,10 @@ from __future__ import annotations
 
 import inspect
 import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
 from datetime import datetime, timedelta
 from functools import wraps
 from typing import Any, Callable, TYPE_CHECKING
@@ -52,9 +56,12 @@ def set_and_log_cache(
     cache_value: dict[str, Any],
     cache_timeout: int | None = None,
     datasource_uid: str | None = None,
-) -> None:
+) -> dict[str, Any] | None:
+    """
+    Set a value in the cache, returning the value as stored, or ``None`` if it wasn't.
+    """
     if isinstance(cache_instance.cache, NullCache):
-        return
+        return None
 
     timeout = (
         cache_timeout
@@ -79,6 +86,76 @@ def set_and_log_cache(
         # the key is too large or whatever other reasons
         logger.warning("Could not cache key %s", cache_key)
         logger.exception(ex)
+        return None
+
+    return value
+
+
+class LocalCache:
+    """
+    An in-process LRU cache, bounded by the total size of its values.
+
+    The size of each value is given by the caller, and values expire after their
+    timeout. It's meant to sit in front of a shared cache, to serve the hottest values
+    without a round trip to the backend.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._values: OrderedDict[Hashable, tuple[Any, int, float | None]] = (
+            OrderedDict()
+        )
+        self.size = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            if (item := self._values.get(key)) is None:
+                return None
+
+            value, _, expires_at = item
+            if expires_at is not None and time.monotonic() >= expires_at:
+                self._pop(key)
+                return None
+
+            self._values.move_to_end(key)
+            return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        size: int,
+        max_size: int,
+        timeout: float | None = None,
+    ) -> None:
+        """
+        Set a value, evicting the least recently used ones to stay under
+        ``max_size``. Values larger than ``max_size`` are not kept.
+        """
+        expires_at = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._pop(key)
+            if size > max_size:
+                return
+
+            self._values[key] = (value, size, expires_at)
+            self.size += size
+            while self.size > max_size:
+                _, (_, evicted_size, _) = self._values.popitem(last=False)
+                self.size -= evicted_size
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+            self.size = 0
+
+    def _pop(self, key: Hashable) -> None:
+        if (item := self._values.pop(key, None)) is not None:
+            self.size -= item[1]
 
 
 # If a user sets `max_age` to 0, for long the browser should cache the
@@ -167,6 +244,12 @@ def etag_cache(
     def decorator(f: Callable[..., Any]) -> Callable[..., Any]:
         @wraps(f)
         def wrapper(*args: Any, **kwargs: Any) -> Response:
+            # for POST requests we can't set cache headers, use the response
+            # cache nor use conditional requests; this will still use the
+            # dataframe cache in `superset/viz.py`, though.
+            if request.method == "POST" or (skip and skip(*args, **kwargs)):
+                return f(*args, **kwargs)
+
             # Check if the user can access the resource
             if raise_for_access:
                 try:
@@ -176,12 +259,6 @@ def etag_cache(
                     # handle the response.
                     return f(*args, **kwargs)
 
-            # for POST requests we can't set cache headers, use the response
-            # cache nor use conditional requests; this will still use the
-            # dataframe cache in `superset/viz.py`, though.
-            if request.method == "POST" or (skip and skip(*args, **kwargs)):
-                return f(*args, **kwargs)
-
             response = None
             try:
                 # build the cache key from the function arguments and any
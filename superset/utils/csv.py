@@ -17,6 +17,7 @@
 import logging
 import re
 import urllib.request
+from collections.abc import Iterable, Iterator
 from typing import Any, Optional, Union
 from urllib.error import URLError
 
@@ -64,23 +65,65 @@ def escape_value(value: str) -> str:
     return value
 
 
+def escape_values(column: pd.Series) -> pd.Series:
+    """
+    Escapes the string values of a column, see ``escape_value``.
+
+    The regular expressions are applied to the whole column at once, and only the
+    values that need escaping are rewritten.
+    """
+    is_string = np.fromiter(
+        (isinstance(value, str) for value in column.values),
+        dtype=bool,
+        count=len(column),
+    )
+    if not is_string.any():
+        return column
+
+    strings = column[is_string].astype(str)
+    needs_escaping = strings.str.match(problematic_chars_re) & ~strings.str.match(
+        negative_number_re
+    )
+    if not needs_escaping.any():
+        return column
+
+    values = column.values.copy()
+    values[np.flatnonzero(is_string)[needs_escaping.values]] = (
+        "'" + strings[needs_escaping].str.replace("|", "\\|", regex=False)
+    ).values
+    return pd.Series(values, index=column.index, name=column.name)
+
+
 def df_to_escaped_csv(df: pd.DataFrame, **kwargs: Any) -> Any:
-    def escape_values(v: Any) -> Union[str, Any]:
+    def escape_header(v: Any) -> Union[str, Any]:
         return escape_value(v) if isinstance(v, str) else v
 
     # Escape csv headers
-    df = df.rename(columns=escape_values)
+    df = df.rename(columns=escape_header)
 
     # Escape csv values
-    for name, column in df.items():
-        if column.dtype == np.dtype(object):
-            for idx, value in enumerate(column.values):
-                if isinstance(value, str):
-                    df.at[idx, name] = escape_value(value)
+    for i, dtype in enumerate(df.dtypes):
+        if dtype == np.dtype(object):
+            df.isetitem(i, escape_values(df.iloc[:, i]))
 
     return df.to_csv(escapechar="\\", **kwargs)
 
 
+def df_to_escaped_csv_chunks(
+    dfs: Iterable[pd.DataFrame], **kwargs: Any
+) -> Iterator[str]:
+    """
+    Convert a sequence of dataframes with the same columns into CSV chunks, so that a
+    large result can be streamed without holding the whole CSV in memory.
+
+    The header, if any, is only written for the first dataframe.
+    """
+    header = kwargs.pop("header", True)
+    for df in dfs:
+        yield df_to_escaped_csv(df, header=header, **kwargs)
+        header = False
+
+
 def get_chart_csv_data(
     chart_url: str, auth_cookies: Optional[dict[str, str]] = None
 ) -> Optional[bytes]:
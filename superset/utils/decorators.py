@@ -19,12 +19,14 @@ from __future__ import annotations
 import logging
 import time
 from collections.abc import Iterator
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 from functools import wraps
-from typing import Any, Callable, TYPE_CHECKING
+from typing import Any, Callable, TYPE_CHECKING, TypeVar
 from uuid import UUID
 
 from flask import current_app, g, Response
+from flask.globals import _cv_request
+from sqlalchemy import inspect
 from sqlalchemy.exc import SQLAlchemyError
 
 from superset.utils import core as utils
@@ -32,6 +34,8 @@ from superset.utils.dates import now_as_float
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 if TYPE_CHECKING:
     from superset.stats_logger import BaseStatsLogger
 
@@ -188,6 +192,53 @@ def debounce(duration: float | int = 0.1) -> Callable[..., Any]:
     return decorate
 
 
+def copy_current_context(func: Callable[..., T]) -> Callable[..., T]:
+    """
+    Wrap a function so that it can run in another thread with the Flask app context
+    of the caller, including the ``g`` object, and its request context if any.
+
+    Flask contexts are local to the thread handling the request, this must be called
+    in that thread before handing the function to a worker.
+    """
+    app = current_app._get_current_object()  # pylint: disable=protected-access
+    g_copy = g._get_current_object()  # pylint: disable=protected-access
+    request_ctx = _cv_request.get(None)
+    # ORM objects such as the user belong to the session of the caller's thread
+    loaders = {name: load_in_thread(value) for name, value in g_copy.__dict__.items()}
+
+    @wraps(func)
+    def wrapped(*args: Any, **kwargs: Any) -> T:
+        with app.app_context():
+            g.__dict__.update({name: load() for name, load in loaders.items()})
+            with request_ctx.copy() if request_ctx else nullcontext():
+                return func(*args, **kwargs)
+
+    return wrapped
+
+
+def load_in_thread(obj: T) -> Callable[[], T]:
+    """
+    Return a function loading an ORM object again, in the session of the thread
+    calling it. Other objects are returned as is.
+
+    Sessions can't be shared by threads, and ORM objects load their expired
+    attributes and their relationships through the session they belong to. This must
+    be called in the thread owning the object, before handing it to a worker.
+    """
+    model = type(obj)
+    if inspect(model, raiseerr=False) is None or not inspect(obj).has_identity:
+        return lambda: obj
+
+    identity = inspect(obj).identity
+
+    def load() -> T:
+        from superset import db  # pylint: disable=import-outside-toplevel
+
+        return db.session.get(model, identity)
+
+    return load
+
+
 def on_security_exception(self: Any, ex: Exception) -> Response:
     return self.response(403, **{"message": utils.error_msg_from_exception(ex)})
 
@@ -16,17 +16,22 @@
 # under the License.
 from __future__ import annotations
 
+import atexit
 import functools
 import inspect
 import logging
+import os
+import queue
 import textwrap
+import threading
+import time
 from abc import ABC, abstractmethod
 from collections.abc import Iterator
 from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Any, Callable, cast, Literal, TYPE_CHECKING
 
-from flask import g, request
+from flask import current_app, Flask, g, request
 from flask_appbuilder.const import API_URI_RIS_KEY
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -368,7 +373,7 @@ def get_event_logger_from_cfg_value(cfg_value: Any) -> AbstractEventLogger:
 class DBEventLogger(AbstractEventLogger):
     """Event logger that commits logs to Superset DB"""
 
-    def log(  # pylint: disable=too-many-arguments,too-many-locals
+    def log(  # pylint: disable=too-many-arguments
         self,
         user_id: int | None,
         action: str,
@@ -379,11 +384,32 @@ class DBEventLogger(AbstractEventLogger):
         *args: Any,
         **kwargs: Any,
     ) -> None:
-        # pylint: disable=import-outside-toplevel
-        from superset import db
-        from superset.models.core import Log
+        logs = self.get_logs(
+            user_id,
+            action,
+            dashboard_id,
+            duration_ms,
+            slice_id,
+            referrer,
+            records=kwargs.get("records", []),
+        )
+        try:
+            self.write_logs(logs)
+        except SQLAlchemyError as ex:
+            logging.error("DBEventLogger failed to log event(s)")
+            logging.exception(ex)
 
-        records = kwargs.get("records", [])
+    @staticmethod
+    def get_logs(  # pylint: disable=too-many-arguments
+        user_id: int | None,
+        action: str,
+        dashboard_id: int | None,
+        duration_ms: int | None,
+        slice_id: int | None,
+        referrer: str | None,
+        records: list[Any],
+    ) -> list[dict[str, Any]]:
+        """Return the values of the `Log` rows of an event, one per record"""
         logs = []
         for record in records:
             json_string: str | None
@@ -391,22 +417,176 @@ class DBEventLogger(AbstractEventLogger):
                 json_string = json.dumps(record)
             except Exception:  # pylint: disable=broad-except
                 json_string = None
-            log = Log(
-                action=action,
-                json=json_string,
-                dashboard_id=dashboard_id,
-                slice_id=slice_id,
-                duration_ms=duration_ms,
-                referrer=referrer,
-                user_id=user_id,
+            logs.append(
+                {
+                    "action": action,
+                    "json": json_string,
+                    "dashboard_id": dashboard_id,
+                    "slice_id": slice_id,
+                    "duration_ms": duration_ms,
+                    "referrer": referrer,
+                    "user_id": user_id,
+                }
             )
-            logs.append(log)
-        try:
-            db.session.bulk_save_objects(logs)
-            db.session.commit()  # pylint: disable=consider-using-transaction
-        except SQLAlchemyError as ex:
-            logging.error("DBEventLogger failed to log event(s)")
-            logging.exception(ex)
+        return logs
+
+    @staticmethod
+    def write_logs(logs: list[dict[str, Any]]) -> None:
+        """Insert `Log` rows in bulk"""
+        # pylint: disable=import-outside-toplevel
+        from superset import db
+        from superset.models.core import Log
+
+        db.session.bulk_insert_mappings(Log, logs)
+        db.session.commit()  # pylint: disable=consider-using-transaction
+
+
+class BufferedDBEventLogger(DBEventLogger):
+    """
+    Event logger that commits logs to Superset DB from a background thread.
+
+    Logs are queued in memory, and inserted in batches of up to ``batch_size`` rows,
+    at least every ``flush_interval`` seconds. When the queue holds ``max_queue_size``
+    logs, new events wait up to ``block_timeout`` seconds for some room before being
+    dropped. The queue is flushed when the process exits.
+
+    Logs are lost if the process is killed, use ``DBEventLogger`` if every event must
+    be stored.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 500,
+        flush_interval: float = 5.0,
+        max_queue_size: int = 10000,
+        block_timeout: float = 0,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.block_timeout = block_timeout
+        self.queue: queue.Queue[dict[str, Any]] = queue.Queue(maxsize=max_queue_size)
+        # number of logs inserted, dropped because the queue was full, and lost
+        # because they couldn't be inserted
+        self.flushed = 0
+        self.dropped = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        self._app: Flask | None = None
+        self._pid: int | None = None
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def log(  # pylint: disable=too-many-arguments
+        self,
+        user_id: int | None,
+        action: str,
+        dashboard_id: int | None,
+        duration_ms: int | None,
+        slice_id: int | None,
+        referrer: str | None,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        self.start()
+
+        logs = self.get_logs(
+            user_id,
+            action,
+            dashboard_id,
+            duration_ms,
+            slice_id,
+            referrer,
+            records=kwargs.get("records", []),
+        )
+        dttm = datetime.utcnow()
+        for log in logs:
+            log["dttm"] = dttm
+            try:
+                self.queue.put(
+                    log,
+                    block=self.block_timeout > 0,
+                    timeout=self.block_timeout or None,
+                )
+            except queue.Full:
+                with self._lock:
+                    self.dropped += 1
+                stats_logger_manager.instance.incr("event_logger.dropped")
+
+    def start(self) -> None:
+        """Start the background thread, once per process"""
+        if self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+
+            if self._pid is None:
+                atexit.register(self.stop)
+            else:
+                # a forked process inherits the queue, but not the thread
+                self.queue = queue.Queue(maxsize=self.queue.maxsize)
+            self._app = current_app._get_current_object()  # pylint: disable=protected-access
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                name="BufferedDBEventLogger",
+                daemon=True,
+            )
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the background thread, after inserting the queued logs"""
+        self._stopped.set()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join(timeout)
+
+    def flush(self) -> None:
+        """Insert the queued logs"""
+        while batch := self._get_batch(timeout=0):
+            self._write_batch(batch)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            if batch := self._get_batch(timeout=self.flush_interval):
+                self._write_batch(batch)
+        self.flush()
+
+    def _get_batch(self, timeout: float) -> list[dict[str, Any]]:
+        """
+        Return the queued logs, waiting up to ``timeout`` seconds for a full batch.
+        """
+        batch: list[dict[str, Any]] = []
+        deadline = time.monotonic() + timeout
+        while len(batch) < self.batch_size:
+            try:
+                if (remaining := deadline - time.monotonic()) > 0:
+                    batch.append(self.queue.get(timeout=min(remaining, 0.1)))
+                else:
+                    batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                if time.monotonic() >= deadline or self._stopped.is_set():
+                    break
+        return batch
+
+    def _write_batch(self, batch: list[dict[str, Any]]) -> None:
+        assert self._app is not None
+        with self._app.app_context():
+            try:
+                self.write_logs(batch)
+            except SQLAlchemyError as ex:
+                with self._lock:
+                    self.failed += len(batch)
+                logging.error("BufferedDBEventLogger failed to log event(s)")
+                logging.exception(ex)
+                return
+
+        with self._lock:
+            self.flushed += len(batch)
+        stats_logger_manager.instance.gauge(
+            "event_logger.queue_size", self.queue.qsize()
+        )
 
 
 class StdOutEventLogger(AbstractEventLogger):
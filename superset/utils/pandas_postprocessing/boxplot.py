@@ -14,7 +14,7 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
-from typing import Any, Callable, Optional, Union
+from typing import Optional, Union
 
 import numpy as np
 from flask_babel import gettext as _
@@ -22,10 +22,123 @@ from pandas import DataFrame, Series, to_numeric
 
 from superset.exceptions import InvalidPostProcessingError
 from superset.utils.core import PostProcessingBoxplotWhiskerType
-from superset.utils.pandas_postprocessing.aggregate import aggregate
+from superset.utils.pandas_postprocessing.utils import _get_config, _get_groups
 
 
-def boxplot(
+class SortedGroups:  # pylint: disable=too-few-public-methods
+    """
+    The values of each group, sorted once, from which the quantiles are computed.
+
+    Missing values are left out. When ``BOXPLOT_QUANTILE_SAMPLE_SIZE`` is set, groups
+    with more values are sampled down to about that many values.
+
+    :param values: The values of the rows
+    :param codes: The group of each row, see `_get_groups`
+    :param ngroups: The number of groups
+    """
+
+    def __init__(self, values: np.ndarray, codes: np.ndarray, ngroups: int) -> None:
+        keep = (codes >= 0) & ~np.isnan(values)
+        counts = np.bincount(codes[keep], minlength=ngroups)
+
+        sample_size = _get_config("BOXPLOT_QUANTILE_SAMPLE_SIZE", None)
+        if sample_size and (counts > sample_size).any():
+            # keep each value of a group with a probability of sample_size / count,
+            # seeded so that the same data gives the same chart
+            probabilities = np.minimum(sample_size / np.maximum(counts, 1), 1)
+            rng = np.random.default_rng(0)
+            keep[keep] = rng.random(keep.sum()) < probabilities[codes[keep]]
+            counts = np.bincount(codes[keep], minlength=ngroups)
+
+        values, codes = values[keep], codes[keep]
+        self.values = values[np.lexsort((values, codes))]
+        self.counts = counts
+        self.offsets = np.cumsum(counts) - counts
+
+    def quantile(self, q: float, method: str = "linear") -> np.ndarray:
+        """
+        Compute a quantile of each group, as `np.nanpercentile` does.
+
+        :param q: The quantile, between 0 and 1
+        :param method: The `linear` or `midpoint` method of `np.nanpercentile`
+        :return: The quantile of each group, NaN for groups without values
+        """
+        result = np.full(len(self.counts), np.nan)
+        groups = self.counts > 0
+        counts, offsets = self.counts[groups], self.offsets[groups]
+
+        index = (counts - 1) * q
+        if method == "midpoint":
+            index = 0.5 * (np.floor(index) + np.ceil(index))
+        previous = np.floor(index)
+        gamma = index - previous
+        previous = previous.astype(np.int64)
+        following = np.minimum(previous + 1, counts - 1)
+        below = self.values[offsets + previous]
+        above = self.values[offsets + following]
+
+        # the linear interpolation of numpy, which is monotonic
+        diff = above - below
+        result[groups] = np.where(
+            gamma >= 0.5, above - diff * (1 - gamma), below + diff * gamma
+        )
+        return result
+
+    def median(self) -> np.ndarray:
+        """
+        Compute the median of each group, as `Series.median` does.
+        """
+        result = np.full(len(self.counts), np.nan)
+        groups = self.counts > 0
+        counts, offsets = self.counts[groups], self.offsets[groups]
+        below = self.values[offsets + (counts - 1) // 2]
+        above = self.values[offsets + counts // 2]
+        result[groups] = np.where(counts % 2, below, (below + above) / 2)
+        return result
+
+
+def _expand(values: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """
+    Return the value of the group of each row, NaN for rows without a group.
+    """
+    return np.append(values.astype(np.float64), np.nan)[codes]
+
+
+def _group_reduce(
+    series: Series,
+    codes: np.ndarray,
+    mask: np.ndarray,
+    ngroups: int,
+    func: str,
+) -> np.ndarray:
+    """
+    Reduce the values of each group selected by a mask, keeping their type.
+    """
+    mask = mask & (codes >= 0)
+    return (
+        getattr(series[mask].groupby(codes[mask]), func)()
+        .reindex(range(ngroups))
+        .to_numpy()
+    )
+
+
+def _group_lists(
+    series: Series,
+    codes: np.ndarray,
+    mask: np.ndarray,
+    ngroups: int,
+) -> list[list[float]]:
+    """
+    List the values of each group selected by a mask, in the order of the rows.
+    """
+    mask = mask & (codes >= 0)
+    selected_codes = codes[mask]
+    values = series.to_numpy()[mask][np.argsort(selected_codes, kind="stable")]
+    counts = np.bincount(selected_codes, minlength=ngroups)
+    return [group.tolist() for group in np.split(values, np.cumsum(counts)[:-1])]
+
+
+def boxplot(  # pylint: disable=too-many-locals
     df: DataFrame,
     groupby: list[str],
     metrics: list[str],
@@ -49,84 +162,107 @@ def boxplot(
     - `__outliers`: the values that fall outside the minimum/maximum value
                     (see whisker type)
 
+    The values of each group are sorted once, and the quantiles are read from the
+    sorted values. See ``BOXPLOT_QUANTILE_SAMPLE_SIZE`` to estimate them from a
+    sample of the values of large groups.
+
     :param df: DataFrame containing all-numeric data (temporal column ignored)
     :param groupby: The categories to group by (x-axis)
     :param metrics: The metrics for which to calculate the distribution
     :param whisker_type: The confidence level type
     :return: DataFrame with boxplot statistics per groupby
     """
+    if whisker_type == PostProcessingBoxplotWhiskerType.PERCENTILE and (
+        not isinstance(percentiles, (list, tuple))
+        or len(percentiles) != 2
+        or not isinstance(percentiles[0], (int, float))
+        or not isinstance(percentiles[1], (int, float))
+        or percentiles[0] >= percentiles[1]
+    ):
+        raise InvalidPostProcessingError(
+            _(
+                "percentiles must be a list or tuple with two numeric values, "
+                "of which the first is lower than the second value"
+            )
+        )
+    if any(metric not in df.columns for metric in metrics):
+        raise InvalidPostProcessingError(
+            _("Referenced columns not available in DataFrame.")
+        )
 
-    def quartile1(series: Series) -> float:
-        return np.nanpercentile(series, 25, method="midpoint")
+    codes, index = _get_groups(df, groupby)
+    ngroups = len(index)
+    statistics: dict[str, dict[str, Union[np.ndarray, list[list[float]]]]] = {}
+    for metric in metrics:
+        series = df[metric]
+        # the quantiles need numeric values
+        if series.dtype == np.object_:
+            series = to_numeric(series, errors="coerce")
+        series = series.reset_index(drop=True)
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
 
-    def quartile3(series: Series) -> float:
-        return np.nanpercentile(series, 75, method="midpoint")
+        groups = SortedGroups(values, codes, ngroups)
+        q1 = groups.quantile(0.25, method="midpoint")
+        q3 = groups.quantile(0.75, method="midpoint")
+        everything = np.ones(len(values), dtype=bool)
 
-    if whisker_type == PostProcessingBoxplotWhiskerType.TUKEY:
+        with np.errstate(invalid="ignore"):
+            if whisker_type == PostProcessingBoxplotWhiskerType.TUKEY:
+                upper_outer_lim = q3 + 1.5 * (q3 - q1)
+                lower_outer_lim = q1 - 1.5 * (q3 - q1)
+                whisker_high = _group_reduce(
+                    series,
+                    codes,
+                    values <= _expand(upper_outer_lim, codes),
+                    ngroups,
+                    "max",
+                )
+                whisker_low = _group_reduce(
+                    series,
+                    codes,
+                    values >= _expand(lower_outer_lim, codes),
+                    ngroups,
+                    "min",
+                )
+            elif whisker_type == PostProcessingBoxplotWhiskerType.PERCENTILE:
+                whisker_high = groups.quantile(percentiles[1] / 100)  # type: ignore
+                whisker_low = groups.quantile(percentiles[0] / 100)  # type: ignore
+            else:
+                whisker_high = _group_reduce(series, codes, everything, ngroups, "max")
+                whisker_low = _group_reduce(series, codes, everything, ngroups, "min")
 
-        def whisker_high(series: Series) -> float:
-            upper_outer_lim = quartile3(series) + 1.5 * (
-                quartile3(series) - quartile1(series)
+            above = _group_lists(
+                series, codes, values > _expand(whisker_high, codes), ngroups
             )
-            return series[series <= upper_outer_lim].max()
-
-        def whisker_low(series: Series) -> float:
-            lower_outer_lim = quartile1(series) - 1.5 * (
-                quartile3(series) - quartile1(series)
+            below = _group_lists(
+                series, codes, values < _expand(whisker_low, codes), ngroups
             )
-            return series[series >= lower_outer_lim].min()
-
-    elif whisker_type == PostProcessingBoxplotWhiskerType.PERCENTILE:
-        if (
-            not isinstance(percentiles, (list, tuple))
-            or len(percentiles) != 2
-            or not isinstance(percentiles[0], (int, float))
-            or not isinstance(percentiles[1], (int, float))
-            or percentiles[0] >= percentiles[1]
-        ):
-            raise InvalidPostProcessingError(
-                _(
-                    "percentiles must be a list or tuple with two numeric values, "
-                    "of which the first is lower than the second value"
-                )
+
+        statistics[metric] = {
+            "mean": _group_reduce(series, codes, everything, ngroups, "mean"),
+            "median": groups.median(),
+            "max": whisker_high,
+            "min": whisker_low,
+            "q1": q1,
+            "q3": q3,
+            "count": np.bincount(codes[codes >= 0], minlength=ngroups),
+            "outliers": [
+                above_group + below_group
+                for above_group, below_group in zip(above, below)
+            ],
+        }
+
+    operators = ["mean", "median", "max", "min", "q1", "q3", "count", "outliers"]
+    result = DataFrame(
+        {
+            f"{metric}__{operator}": Series(
+                statistics[metric][operator],
+                index=index,
+                dtype=object if operator == "outliers" else None,
             )
-        low, high = percentiles[0], percentiles[1]
-
-        def whisker_high(series: Series) -> float:
-            return np.nanpercentile(series, high)
-
-        def whisker_low(series: Series) -> float:
-            return np.nanpercentile(series, low)
-
-    else:
-        whisker_high = np.max
-        whisker_low = np.min
-
-    def outliers(series: Series) -> set[float]:
-        above = series[series > whisker_high(series)]
-        below = series[series < whisker_low(series)]
-        return above.tolist() + below.tolist()
-
-    operators: dict[str, Callable[[Any], Any]] = {
-        "mean": np.mean,
-        "median": np.median,
-        "max": whisker_high,
-        "min": whisker_low,
-        "q1": quartile1,
-        "q3": quartile3,
-        "count": np.ma.count,
-        "outliers": outliers,
-    }
-    aggregates: dict[str, dict[str, Union[str, Callable[..., Any]]]] = {
-        f"{metric}__{operator_name}": {"column": metric, "operator": operator}
-        for operator_name, operator in operators.items()
-        for metric in metrics
-    }
-
-    # nanpercentile needs numeric values, otherwise the isnan function
-    # that's used in the underlying function will fail
-    for column in metrics:
-        if df.dtypes[column] == np.object_:
-            df[column] = to_numeric(df[column], errors="coerce")
-
-    return aggregate(df, groupby=groupby, aggregates=aggregates)
+            for operator in operators
+            for metric in metrics
+        },
+        index=index,
+    )
+    return result.reset_index(drop=not groupby)
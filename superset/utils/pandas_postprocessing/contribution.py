@@ -54,7 +54,8 @@ def contribution(
     :param orientation: calculate by dividing cell with row/column total
     :return: DataFrame with contributions.
     """
-    contribution_df = df.copy()
+    # the columns are replaced rather than modified: they're not shared with `df`
+    contribution_df = df.copy(deep=False)
     numeric_df = contribution_df.select_dtypes(include=["number", Decimal])
     numeric_df.fillna(0, inplace=True)
     # verify column selections
@@ -88,6 +88,8 @@ def flatten(
     2  2021-01-03        1        1        1        1
     """
     if _is_multi_index_on_columns(df):
+        # relabel a shallow copy rather than `df`, the data is not copied
+        df = df.copy(deep=False)
         df.columns = df.columns.droplevel(drop_levels)
         _columns = []
         for series in df.columns.to_flat_index():
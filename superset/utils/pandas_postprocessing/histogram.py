@@ -17,7 +17,9 @@
 from __future__ import annotations
 
 import numpy as np
-from pandas import DataFrame, Series, to_numeric
+from pandas import DataFrame, to_numeric
+
+from superset.utils.pandas_postprocessing.utils import _get_groups
 
 
 # pylint: disable=too-many-arguments
@@ -49,14 +51,14 @@ def histogram(
         groupby = []
 
     # convert to numeric, coercing errors to NaN
-    df[column] = to_numeric(df[column], errors="coerce")
+    values = to_numeric(df[column], errors="coerce")
 
     # check if the column contains non-numeric values
-    if df[column].isna().any():
+    if values.isna().any():
         raise ValueError(f"Column '{column}' contains non-numeric values")
 
     # calculate the histogram bin edges
-    bin_edges = np.histogram_bin_edges(df[column], bins=bins)
+    bin_edges = np.histogram_bin_edges(values, bins=bins)
 
     # convert the bin edges to strings
     bin_edges_str = [
@@ -64,23 +66,29 @@ def histogram(
         for i in range(len(bin_edges) - 1)
     ]
 
-    def hist_values(series: Series) -> np.ndarray:
-        # we might have NaN values as the result of grouping so we need to drop them
-        result = np.histogram(series.dropna(), bins=bin_edges)[0]
-        return result if not cumulative else np.cumsum(result)
+    # count the values of all groups at once, by bin and group: the bins are closed
+    # on the left, and the last one on the right too, as with `np.histogram`
+    nbins = len(bin_edges) - 1
+    values = values.to_numpy()
+    bin_indexes = np.minimum(
+        np.searchsorted(bin_edges, values, side="right") - 1, nbins - 1
+    )
+    codes, index = _get_groups(df, groupby)
+    # rows with missing values in `groupby` are not counted
+    grouped = codes >= 0
+    counts = np.bincount(
+        codes[grouped] * nbins + bin_indexes[grouped], minlength=len(index) * nbins
+    ).reshape(len(index), nbins)
+    if cumulative:
+        counts = np.cumsum(counts, axis=1)
 
     if len(groupby) == 0:
         # without grouping
-        hist_dict = dict(zip(bin_edges_str, hist_values(df[column])))
+        hist_dict = dict(zip(bin_edges_str, counts.sum(axis=0)))
         histogram_df = DataFrame(hist_dict, index=[0])
     else:
         # with grouping
-        histogram_df = (
-            df.groupby(groupby)[column]
-            .apply(lambda x: Series(hist_values(x)))
-            .unstack(fill_value=0)
-        )
-        histogram_df.columns = bin_edges_str
+        histogram_df = DataFrame(counts, index=index, columns=bin_edges_str)
 
     if normalize:
         histogram_df = histogram_df / histogram_df.values.sum()
@@ -0,0 +1,264 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Execution of the post processing operations of a query object.
+
+The operations are planned before being run: adjacent operations which can be
+computed together are fused into a single step. With
+``POST_PROCESSING_COPY_ON_WRITE``, pandas runs in its copy-on-write mode, enabled when
+the app starts, and the DataFrames created by a step are owned by the pipeline, so
+that the next step modifies them in place instead of copying them.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager, ExitStack, nullcontext
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Optional
+
+from flask_babel import gettext as _
+from pandas import DataFrame
+
+from superset.exceptions import InvalidPostProcessingError
+from superset.utils import pandas_postprocessing
+from superset.utils.pandas_postprocessing.utils import (
+    _append_columns,
+    _get_config,
+    _is_multi_index_on_columns,
+    owned,
+)
+
+logger = logging.getLogger(__name__)
+
+# tracing is global: it's enabled while any thread runs a pipeline
+_tracing_lock = threading.Lock()
+_tracing_count = 0
+_tracing_started = False
+
+
+@dataclass
+class PostProcessingStep:
+    """One or several fused post processing operations"""
+
+    operations: list[str]
+    func: Callable[[DataFrame], DataFrame]
+
+    @property
+    def name(self) -> str:
+        return "+".join(self.operations)
+
+
+def _is_identity(columns: Optional[dict[str, str]]) -> bool:
+    return bool(columns) and all(
+        source == target for source, target in (columns or {}).items()
+    )
+
+
+def _fuse_rolling_cum(
+    rolling_options: dict[str, Any],
+    cum_options: dict[str, Any],
+) -> Optional[Callable[[DataFrame], DataFrame]]:
+    """
+    Compute a rolling window and a cumulative operation replacing the same columns,
+    on these columns only, and append them once to the DataFrame.
+    """
+    rolling_columns = rolling_options.get("columns")
+    cum_columns = cum_options.get("columns")
+    if not _is_identity(rolling_columns) or not _is_identity(cum_columns):
+        return None
+    columns = list(dict.fromkeys([*rolling_columns, *cum_columns]))
+
+    def func(df: DataFrame) -> DataFrame:
+        labels = (
+            df.columns.get_level_values(0)
+            if _is_multi_index_on_columns(df)
+            else df.columns
+        )
+        if not all(column in labels for column in columns):
+            # let the operations report the missing columns
+            return pandas_postprocessing.cum(
+                pandas_postprocessing.rolling(df, **rolling_options), **cum_options
+            )
+
+        df_columns = df.loc[:, columns]
+        with owned(df_columns):
+            df_columns = pandas_postprocessing.rolling(df_columns, **rolling_options)
+        with owned(df_columns):
+            df_columns = pandas_postprocessing.cum(df_columns, **cum_options)
+        if min_periods := rolling_options.get("min_periods"):
+            df = df[min_periods - 1 :]
+        return _append_columns(df, df_columns, dict(zip(columns, columns)))
+
+    return func
+
+
+def _fuse_rename_flatten(
+    rename_options: dict[str, Any],
+    flatten_options: dict[str, Any],
+) -> Optional[Callable[[DataFrame], DataFrame]]:
+    """
+    Rename the columns of a shallow copy of the DataFrame before flattening them,
+    rather than copying the renamed DataFrame.
+    """
+
+    def func(df: DataFrame) -> DataFrame:
+        df = pandas_postprocessing.rename(
+            df.copy(deep=False), **{**rename_options, "inplace": True}
+        )
+        return pandas_postprocessing.flatten(df, **flatten_options)
+
+    return func
+
+
+FUSED_OPERATIONS: dict[
+    tuple[str, str],
+    Callable[
+        [dict[str, Any], dict[str, Any]],
+        Optional[Callable[[DataFrame], DataFrame]],
+    ],
+] = {
+    ("rolling", "cum"): _fuse_rolling_cum,
+    ("rename", "flatten"): _fuse_rename_flatten,
+}
+
+
+@contextmanager
+def trace_memory() -> Iterator[Callable[[], int]]:
+    """
+    Trace the memory allocations, including the data of the DataFrames.
+
+    Tracing is global: the peak memory includes the allocations of the other threads.
+
+    :return: A function returning the peak memory allocated since entering the
+             context, in bytes
+    """
+    global _tracing_count, _tracing_started  # pylint: disable=global-statement
+
+    with _tracing_lock:
+        if _tracing_count == 0:
+            _tracing_started = not tracemalloc.is_tracing()
+            if _tracing_started:
+                tracemalloc.start()
+        _tracing_count += 1
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+    try:
+        yield lambda: max(tracemalloc.get_traced_memory()[1] - start, 0)
+    finally:
+        with _tracing_lock:
+            _tracing_count -= 1
+            if _tracing_count == 0 and _tracing_started:
+                tracemalloc.stop()
+
+
+class PostProcessingPipeline:
+    """
+    Plan and run the post processing operations of a query object.
+
+    :param post_processing: The post processing operations, as found in the
+           `post_processing` of a query object
+    :raises InvalidPostProcessingError: If an operation is undefined or unsupported
+    """
+
+    def __init__(self, post_processing: list[dict[str, Any]]) -> None:
+        self.steps = self.plan(post_processing)
+        self.stats: Optional[dict[str, Any]] = None
+
+    @staticmethod
+    def plan(post_processing: list[dict[str, Any]]) -> list[PostProcessingStep]:
+        steps: list[PostProcessingStep] = []
+        previous: Optional[tuple[str, dict[str, Any]]] = None
+        for post_process in post_processing:
+            operation = post_process.get("operation")
+            if not operation:
+                raise InvalidPostProcessingError(
+                    _("`operation` property of post processing object undefined")
+                )
+            if not hasattr(pandas_postprocessing, operation):
+                raise InvalidPostProcessingError(
+                    _(
+                        "Unsupported post processing operation: %(operation)s",
+                        operation=operation,
+                    )
+                )
+            options = post_process.get("options", {})
+
+            # only fuse pairs of operations
+            if (
+                previous
+                and (fuse := FUSED_OPERATIONS.get((previous[0], operation)))
+                and (func := fuse(previous[1], options))
+            ):
+                steps[-1] = PostProcessingStep([previous[0], operation], func)
+                previous = None
+                continue
+
+            steps.append(
+                PostProcessingStep(
+                    [operation],
+                    partial(getattr(pandas_postprocessing, operation), **options),
+                )
+            )
+            previous = (operation, options)
+        return steps
+
+    def run(self, df: DataFrame) -> DataFrame:
+        """
+        Run the post processing operations on a DataFrame, which is not modified.
+
+        When ``POST_PROCESSING_STATS`` is enabled, the duration of each step and the
+        peak memory allocated are kept in `stats`.
+
+        :param df: DataFrame returned from database model
+        :return: new DataFrame to which all post processing operations have been
+                 applied
+        """
+        collect_stats = _get_config("POST_PROCESSING_STATS", False)
+        with ExitStack() as stack:
+            if collect_stats:
+                get_peak_memory = stack.enter_context(trace_memory())
+
+            source = df
+            steps = []
+            start = time.perf_counter()
+            for step in self.steps:
+                step_start = time.perf_counter()
+                # the DataFrames created by the previous steps are not referenced
+                # anywhere else
+                with owned(df) if df is not source else nullcontext():
+                    df = step.func(df)
+                steps.append(
+                    {
+                        "operation": step.name,
+                        "duration": (time.perf_counter() - step_start) * 1000,
+                    }
+                )
+
+            if collect_stats:
+                self.stats = {
+                    "steps": steps,
+                    "duration": (time.perf_counter() - start) * 1000,
+                    "peak_memory": get_peak_memory(),
+                }
+                logger.debug("post_processing stats: %s", self.stats)
+        return df
@@ -14,17 +14,34 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import hashlib
 import logging
-from typing import Optional, Union
+import multiprocessing
+import threading
+from collections.abc import Iterator
+from concurrent.futures import as_completed, Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Optional, Union
 
 import pandas as pd
+from flask import g, has_app_context
 from flask_babel import gettext as _
 from pandas import DataFrame
 
 from superset.exceptions import InvalidPostProcessingError
+from superset.extensions import async_query_manager, cache_manager
 from superset.utils.core import DTTM_ALIAS
 from superset.utils.decorators import suppress_logging
-from superset.utils.pandas_postprocessing.utils import PROPHET_TIME_GRAIN_MAP
+from superset.utils.hashing import md5_sha_from_dict
+from superset.utils.pandas_postprocessing.utils import (
+    _get_config,
+    PROPHET_TIME_GRAIN_MAP,
+)
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
 
 
 def _prophet_parse_seasonality(
@@ -77,6 +94,88 @@ def _prophet_fit_and_predict(  # pylint: disable=too-many-arguments
     return forecast.join(df.set_index("ds"), on="ds").set_index(["ds"])
 
 
+def _get_executor() -> Optional[Executor]:
+    """
+    Return the process pool fitting the series, shared by the requests of a worker.
+
+    Daemonic processes, like the workers of the Celery prefork pool, can't start
+    processes: the series are then fitted one after the other.
+    """
+    global _executor  # pylint: disable=global-statement
+
+    max_workers = _get_config("PROPHET_MAX_WORKERS", 1)
+    if max_workers <= 1 or multiprocessing.current_process().daemon:
+        return None
+
+    with _executor_lock:
+        if _executor is None:
+            # forking a multithreaded web server is unsafe
+            _executor = ProcessPoolExecutor(
+                max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def _reset_executor() -> None:
+    global _executor  # pylint: disable=global-statement
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def _get_cache_key(df: DataFrame, **kwargs: Any) -> str:
+    """
+    Return the cache key of the forecast of a series, from its data and the
+    parameters of the model.
+    """
+    data_hash = hashlib.md5(
+        pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()
+    ).hexdigest()
+    return "prophet_" + md5_sha_from_dict({"data": data_hash, **kwargs})
+
+
+def _report_progress(fitted: int, total: int) -> None:
+    """
+    Report the number of fitted series, when running in an async chart data job.
+    """
+    if has_app_context() and (job_metadata := g.get("async_job_metadata")):
+        async_query_manager.update_job(
+            job_metadata,
+            async_query_manager.STATUS_RUNNING,
+            progress={"fitted": fitted, "total": total},
+        )
+
+
+def _fit_and_predict_all(
+    series: dict[str, DataFrame],
+    **kwargs: Any,
+) -> Iterator[tuple[str, DataFrame]]:
+    """
+    Fit the series, on the process pool when enabled, yielding each forecast when
+    it's ready.
+    """
+    fitted: set[str] = set()
+    if (executor := _get_executor()) and len(series) > 1:
+        try:
+            futures = {
+                executor.submit(_prophet_fit_and_predict, df=df, **kwargs): column
+                for column, df in series.items()
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+                fitted.add(futures[future])
+        except BrokenProcessPool:
+            logger.warning("The Prophet process pool is broken, fitting in process")
+            _reset_executor()
+
+    for column, df in series.items():
+        if column not in fitted:
+            yield column, _prophet_fit_and_predict(df=df, **kwargs)
+
+
 def prophet(  # pylint: disable=too-many-arguments
     df: DataFrame,
     time_grain: str,
@@ -137,34 +236,57 @@ def prophet(  # pylint: disable=too-many-arguments
     if len(df.columns) < 2:
         raise InvalidPostProcessingError(_("DataFrame include at least one series"))
 
-    target_df = DataFrame()
-
-    for column in [
+    columns = [
         column
         for column in df.columns
         if column != index
         and pd.to_numeric(df[column], errors="coerce").notnull().all()
-    ]:
-        fit_df = _prophet_fit_and_predict(
-            df=df[[index, column]].rename(columns={index: "ds", column: "y"}),
-            confidence_interval=confidence_interval,
-            yearly_seasonality=_prophet_parse_seasonality(yearly_seasonality),
-            weekly_seasonality=_prophet_parse_seasonality(weekly_seasonality),
-            daily_seasonality=_prophet_parse_seasonality(daily_seasonality),
-            periods=periods,
-            freq=freq,
-        )
-        new_columns = [
-            f"{column}__yhat",
-            f"{column}__yhat_lower",
-            f"{column}__yhat_upper",
-            f"{column}",
-        ]
-        fit_df.columns = new_columns
-        if target_df.empty:
-            target_df = fit_df
+    ]
+    params = {
+        "confidence_interval": confidence_interval,
+        "yearly_seasonality": _prophet_parse_seasonality(yearly_seasonality),
+        "weekly_seasonality": _prophet_parse_seasonality(weekly_seasonality),
+        "daily_seasonality": _prophet_parse_seasonality(daily_seasonality),
+        "periods": periods,
+        "freq": freq,
+    }
+    cache = cache_manager.data_cache if has_app_context() else None
+    cache_timeout = _get_config("PROPHET_CACHE_TIMEOUT", None)
+
+    forecasts: dict[str, DataFrame] = {}
+    series: dict[str, DataFrame] = {}
+    cache_keys: dict[str, str] = {}
+    for column in columns:
+        series_df = df[[index, column]].rename(columns={index: "ds", column: "y"})
+        cache_keys[column] = _get_cache_key(series_df, **params)
+        forecast = cache.get(cache_keys[column]) if cache else None
+        if forecast is not None:
+            forecasts[column] = forecast
         else:
-            for new_column in new_columns:
-                target_df = target_df.assign(**{new_column: fit_df[new_column]})
+            series[column] = series_df
+
+    for column, forecast in _fit_and_predict_all(series, **params):
+        if cache:
+            cache.set(cache_keys[column], forecast, timeout=cache_timeout)
+        forecasts[column] = forecast
+        _report_progress(len(forecasts), len(columns))
+
+    target_df = DataFrame()
+    if columns:
+        target_df = pd.concat(
+            [
+                forecasts[column].set_axis(
+                    [
+                        f"{column}__yhat",
+                        f"{column}__yhat_lower",
+                        f"{column}__yhat_upper",
+                        f"{column}",
+                    ],
+                    axis=1,
+                )
+                for column in columns
+            ],
+            axis=1,
+        )
     target_df.reset_index(level=0, inplace=True)
     return target_df.rename(columns={"ds": index})
@@ -14,12 +14,15 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import partial
-from typing import Any, Callable
+from typing import Any, Callable, Optional
 
 import numpy as np
 import pandas as pd
+from flask import current_app, has_app_context
 from flask_babel import gettext as _
 from pandas import DataFrame, NamedAgg
 
@@ -98,6 +101,13 @@ RESAMPLE_METHOD = ("asfreq", "bfill", "ffill", "linear", "median", "mean", "sum"
 
 FLAT_COLUMN_SEPARATOR = ", "
 
+# the id of the DataFrame which may be modified in place, see ``owned``
+_owned_df: ContextVar[Optional[int]] = ContextVar("owned_df", default=None)
+
+
+def _get_config(key: str, default: Any) -> Any:
+    return current_app.config.get(key, default) if has_app_context() else default
+
 
 def _is_multi_index_on_columns(df: DataFrame) -> bool:
     return isinstance(df.columns, pd.MultiIndex)
@@ -181,6 +191,28 @@ def _get_aggregate_funcs(
     return agg_funcs
 
 
+def _get_groups(df: DataFrame, groupby: list[str]) -> tuple[np.ndarray, pd.Index]:
+    """
+    Number the groups of a DataFrame, as sorted by `DataFrame.groupby`.
+
+    :param df: DataFrame to group
+    :param groupby: columns to group by. Without columns, all rows are in a single
+           group, unless the DataFrame is empty.
+    :return: the group of each row, which is -1 for rows with missing values in
+             `groupby`, and the values of `groupby` of each group
+    :raises InvalidPostProcessingError: If a column is not in the DataFrame
+    """
+    if not groupby:
+        return np.zeros(len(df), dtype=np.int64), pd.RangeIndex(min(len(df), 1))
+    if any(column not in df.columns for column in groupby):
+        raise InvalidPostProcessingError(
+            _("Referenced columns not available in DataFrame.")
+        )
+    df_groupby = df.groupby(by=groupby)
+    codes = df_groupby.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+    return codes, df_groupby.size().index
+
+
 def _append_columns(
     base_df: DataFrame, append_df: DataFrame, columns: dict[str, str]
 ) -> DataFrame:
@@ -189,7 +221,8 @@ def _append_columns(
     assign method, which overwrites the original column in `base_df` if the column
     already exists, and appends the column if the name is not defined.
 
-    Note that! this is a memory-intensive operation.
+    Note that! this is a memory-intensive operation, unless `base_df` is owned by
+    the caller, see `owned`.
 
     :param base_df: DataFrame which to use as the base
     :param append_df: DataFrame from which to select data.
@@ -203,13 +236,47 @@ def _append_columns(
     """
     if all(key == value for key, value in columns.items()):
         # make sure to return a new DataFrame instead of changing the `base_df`.
-        _base_df = base_df.copy()
+        _base_df = _copy(base_df)
         _base_df.loc[:, columns.keys()] = append_df
         return _base_df
     append_df = append_df.rename(columns=columns)
     return pd.concat([base_df, append_df], axis="columns")
 
 
+@contextmanager
+def owned(df: DataFrame) -> Iterator[None]:
+    """
+    Allow the post processing operations to modify a DataFrame in place.
+
+    This is only safe with the copy-on-write mode of pandas, where DataFrames don't
+    share data with the DataFrames they were derived from, and for DataFrames which
+    are not referenced anywhere else.
+
+    :param df: DataFrame owned by the caller
+    """
+    token = _owned_df.set(id(df))
+    try:
+        yield
+    finally:
+        _owned_df.reset(token)
+
+
+def _copy(df: DataFrame) -> DataFrame:
+    """
+    Return a DataFrame which can be modified without changing `df`.
+
+    Owned DataFrames are returned as is, and the others are copied lazily in
+    copy-on-write mode.
+
+    :param df: DataFrame to copy
+    :return: `df`, or a copy of `df`
+    """
+    copy_on_write = pd.get_option("mode.copy_on_write")
+    if copy_on_write and _owned_df.get() == id(df):
+        return df
+    return df.copy(deep=not copy_on_write)
+
+
 def escape_separator(plain_str: str, sep: str = FLAT_COLUMN_SEPARATOR) -> str:
     char = sep.strip()
     return plain_str.replace(char, "\\" + char)
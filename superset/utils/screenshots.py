@@ -17,6 +17,7 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Sequence
 from io import BytesIO
 from typing import TYPE_CHECKING
 
@@ -96,6 +97,33 @@ class BaseScreenshot:
             self.screenshot = driver.get_screenshot(self.url, self.element, user)
         return self.screenshot
 
+    @staticmethod
+    def get_screenshots(
+        screenshots: Sequence[BaseScreenshot], user: User
+    ) -> list[bytes | None]:
+        """
+        Take screenshots of the same type and window size. Playwright loads their
+        pages concurrently, in the same browser context.
+        """
+        if not screenshots:
+            return []
+        first = screenshots[0]
+        driver = first.driver()
+        if len(screenshots) == 1 or not isinstance(driver, WebDriverPlaywright):
+            return [screenshot.get_screenshot(user=user) for screenshot in screenshots]
+
+        with event_logger.log_context(
+            "screenshot",
+            screenshot_url=first.url,
+            screenshot_count=len(screenshots),
+        ):
+            images = driver.get_screenshots(
+                [screenshot.url for screenshot in screenshots], first.element, user
+            )
+        for screenshot, image in zip(screenshots, images):
+            screenshot.screenshot = image
+        return images
+
     def get(
         self,
         user: User = None,
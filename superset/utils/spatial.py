@@ -0,0 +1,151 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Vectorized helpers for the positions of the deck.gl charts.
+
+Positions are stored as float arrays of shape ``(n, 2)``, where missing positions are
+NaN.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+# a pair of decimal numbers, as accepted by ``geopy.point.Point``
+COORDINATES_PATTERN = r"^\s*([+-]?\d+(?:\.\d+)?)\s*[,;/\s]\s*([+-]?\d+(?:\.\d+)?)\s*$"
+
+# radius of the Web Mercator sphere
+EARTH_RADIUS = 6378137.0
+
+
+def parse_coordinates(
+    values: pd.Series,
+    parse: Callable[[Any], Optional[tuple[float, float]]],
+) -> np.ndarray:
+    """
+    Parse delimited coordinates, keeping the order of the values.
+
+    Pairs of decimal numbers are parsed for the whole column at once. Other values
+    (degrees, minutes and seconds, cardinal directions, altitudes, out of range
+    latitudes or longitudes) are parsed one by one with ``parse``, which returns
+    ``None`` for missing values.
+
+    :param values: The delimited coordinates
+    :param parse: The function parsing a single value
+    :return: The coordinates, as an array of shape ``(n, 2)``
+    """
+    if values.dtype == object:
+        parts = values.str.extract(COORDINATES_PATTERN)
+        points = parts.astype(float).to_numpy()
+    else:
+        points = np.full((len(values), 2), np.nan)
+
+    # geopy only accepts latitudes in [-90, 90], and normalizes longitudes
+    with np.errstate(invalid="ignore"):
+        fallback = (
+            np.isnan(points).any(axis=1)
+            | (np.abs(points[:, 0]) > 90)
+            | (np.abs(points[:, 1]) > 180)
+        )
+    for i in np.flatnonzero(fallback):
+        point = parse(values.iat[i])
+        points[i] = point if point is not None else np.nan
+
+    # geopy turns negative zeros into zeros
+    return points + 0.0
+
+
+def project(positions: np.ndarray) -> np.ndarray:
+    """
+    Project longitudes and latitudes to Web Mercator coordinates, in meters.
+    """
+    longitudes, latitudes = np.radians(positions).T
+    return np.column_stack(
+        [
+            EARTH_RADIUS * longitudes,
+            EARTH_RADIUS * np.log(np.tan(np.pi / 4 + latitudes / 2)),
+        ]
+    )
+
+
+def unproject(points: np.ndarray) -> np.ndarray:
+    """
+    Project Web Mercator coordinates back to longitudes and latitudes.
+    """
+    x, y = points.T
+    return np.column_stack(
+        [
+            np.degrees(x / EARTH_RADIUS),
+            np.degrees(2 * np.arctan(np.exp(y / EARTH_RADIUS)) - np.pi / 2),
+        ]
+    )
+
+
+def get_bins(
+    positions: np.ndarray,
+    size: float,
+    hexagonal: bool = False,
+) -> np.ndarray:
+    """
+    Return the center of the bin holding each position.
+
+    The bins are squares with sides of ``size`` meters, or pointy-top hexagons with a
+    radius of ``size`` meters, as drawn by the ``GridLayer`` and ``HexagonLayer`` of
+    deck.gl. They're laid out in Web Mercator, and sized at the latitude of the center
+    of the positions.
+
+    :param positions: The longitudes and latitudes
+    :param size: The size of the bins, in meters
+    :param hexagonal: Whether the bins are hexagons
+    :return: The longitudes and latitudes of the centers of the bins
+    """
+    points = project(positions)
+    latitudes = positions[:, 1]
+    if np.isnan(latitudes).all():
+        return np.full_like(positions, np.nan)
+
+    center = (np.nanmin(latitudes) + np.nanmax(latitudes)) / 2
+    size = size / np.cos(np.radians(center))
+
+    if not hexagonal:
+        return unproject((np.floor(points / size) + 0.5) * size)
+
+    # axial coordinates of the hexagons, rounded in cube coordinates
+    x, y = points.T
+    q = (np.sqrt(3) / 3 * x - y / 3) / size
+    r = 2 / 3 * y / size
+    s = -q - r
+    rounded_q, rounded_r, rounded_s = np.round(q), np.round(r), np.round(s)
+    diff_q = np.abs(rounded_q - q)
+    diff_r = np.abs(rounded_r - r)
+    diff_s = np.abs(rounded_s - s)
+    fix_q = (diff_q > diff_r) & (diff_q > diff_s)
+    fix_r = ~fix_q & (diff_r > diff_s)
+    rounded_q = np.where(fix_q, -rounded_r - rounded_s, rounded_q)
+    rounded_r = np.where(fix_r, -rounded_q - rounded_s, rounded_r)
+
+    return unproject(
+        np.column_stack(
+            [
+                size * np.sqrt(3) * (rounded_q + rounded_r / 2),
+                size * 3 / 2 * rounded_r,
+            ]
+        )
+    )
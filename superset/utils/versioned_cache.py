@@ -0,0 +1,188 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+In-process memoization of values derived from the metadata database.
+
+Values are memoized in the current request and in the current process, stamped with
+a version kept in the cache. Changes are detected with SQLAlchemy session events: a
+flush touching the relevant models invalidates the values of the current process,
+and the commit publishes a new version, so that the other processes stop using
+theirs.
+
+The version is only trusted when the cache is shared by all the processes: with a
+per-process backend (``NullCache``, ``SimpleCache``) a version published by one
+worker is never seen by the others, so values are loaded once per request instead.
+Values memoized in the process also expire after a timeout, whatever the cache.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Hashable
+from typing import Any, Callable, Generic, Optional, TYPE_CHECKING, TypeVar
+from uuid import uuid4
+
+from flask import current_app, g, has_app_context
+from flask_caching.backends import NullCache, SimpleCache
+from sqlalchemy.orm import Session
+
+if TYPE_CHECKING:
+    from flask_caching import Cache
+
+    from superset.utils.cache import LocalCache
+
+V = TypeVar("V")
+
+# cache backends which are not shared by the processes of the workers
+LOCAL_CACHE_BACKENDS = (NullCache, SimpleCache)
+
+
+def get_cache() -> Cache:
+    # pylint: disable=import-outside-toplevel
+    # the security manager, which memoizes its values here, is imported by the
+    # extensions
+    from superset.extensions import cache_manager
+
+    return cache_manager.cache
+
+
+def is_shared_cache(cache: Cache) -> bool:
+    """
+    Return whether a cache is shared by the processes of all the workers.
+    """
+    return not isinstance(cache.cache, LOCAL_CACHE_BACKENDS)
+
+
+class VersionedCache(Generic[V]):
+    """
+    Memoize values loaded from the metadata database, until the models they're
+    derived from change.
+
+    :param name: The name of the values, used for their version key in the cache,
+        the ``g`` attribute memoizing them in a request and the session flag
+    :param load: Load the value of a key, given the current version, which is
+        ``None`` when the cache is not shared
+    :param is_change: Return whether a change to an instance, deleted or not, may
+        change the values
+    :param timeout_config_key: The config key of the number of seconds values are
+        memoized in the process
+    :param max_size: The maximum number of values memoized in the process
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        name: str,
+        load: Callable[[Session, Hashable, Optional[str]], V],
+        is_change: Callable[[Any, bool], bool],
+        timeout_config_key: str,
+        max_size: int = 1,
+    ) -> None:
+        self.name = name
+        self.version_key = f"{name}_version"
+        self._load = load
+        self._is_change = is_change
+        self._timeout_config_key = timeout_config_key
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._values: Optional[LocalCache] = None
+        # bumped on every local change, so that values loaded concurrently with a
+        # change are not kept
+        self._generation = 0
+
+    def get(self, session: Session, key: Hashable = None) -> V:
+        # the version is checked once per request
+        memo = g.setdefault(self.name, {}) if has_app_context() else {}
+        if key in memo:
+            return memo[key]
+
+        version = self._get_version()
+        with self._lock:
+            generation = self._generation
+            item = None if version is None else self._get_values().get(key)
+
+        if item is not None and item[1] == version:
+            value = item[0]
+        else:
+            value = self._load(session, key, version)
+            with self._lock:
+                if version is not None and self._generation == generation:
+                    self._get_values().set(
+                        key,
+                        (value, version),
+                        size=1,
+                        max_size=self._max_size,
+                        timeout=current_app.config[self._timeout_config_key],
+                    )
+
+        memo[key] = value
+        return value
+
+    def invalidate(self, publish: bool = False) -> None:
+        """
+        Invalidate the values of the current process, and of the other processes if
+        ``publish`` is set.
+        """
+        with self._lock:
+            self._generation += 1
+            if self._values is not None:
+                self._values.clear()
+
+        if has_app_context():
+            g.pop(self.name, None)
+            if publish and is_shared_cache(cache := get_cache()):
+                cache.set(self.version_key, uuid4().hex, timeout=0)
+
+    def mark_changed(self, session: Session) -> None:
+        """
+        Invalidate the values after a change, published to the other processes when
+        the session is committed.
+        """
+        session.info[self.name] = True
+        self.invalidate()
+
+    def after_flush(self, session: Session, flush_context: Any) -> None:
+        # pylint: disable=unused-argument
+        if any(
+            self._is_change(instance, False)
+            for instance in (*session.new, *session.dirty)
+        ) or any(self._is_change(instance, True) for instance in session.deleted):
+            self.mark_changed(session)
+
+    def after_commit(self, session: Session) -> None:
+        if session.info.pop(self.name, False):
+            self.invalidate(publish=True)
+
+    def after_rollback(self, session: Session) -> None:
+        if session.info.pop(self.name, False):
+            self.invalidate()
+
+    def _get_values(self) -> LocalCache:
+        # pylint: disable=import-outside-toplevel
+        from superset.utils.cache import LocalCache
+
+        if self._values is None:
+            self._values = LocalCache()
+        return self._values
+
+    def _get_version(self) -> Optional[str]:
+        if not has_app_context() or not is_shared_cache(cache := get_cache()):
+            return None
+
+        if (version := cache.get(self.version_key)) is None:
+            cache.add(self.version_key, uuid4().hex, timeout=0)
+            version = cache.get(self.version_key)
+        return version
@@ -17,11 +17,16 @@
 
 from __future__ import annotations
 
+import atexit
 import logging
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
 from enum import Enum
 from time import sleep
-from typing import Any, TYPE_CHECKING
+from typing import Any, Callable, TYPE_CHECKING
 
 from flask import current_app
 from selenium.common.exceptions import (
@@ -37,6 +42,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 
 from superset import feature_flag_manager
 from superset.extensions import machine_auth_provider_factory
+from superset.utils.decorators import stats_timing
 from superset.utils.retries import retry_call
 
 WindowSize = tuple[int, int]
@@ -45,8 +51,11 @@ logger = logging.getLogger(__name__)
 if TYPE_CHECKING:
     from flask_appbuilder.security.sqla.models import User
 
+    from superset.stats_logger import BaseStatsLogger
+
 if feature_flag_manager.is_feature_enabled("PLAYWRIGHT_REPORTS_AND_THUMBNAILS"):
     from playwright.sync_api import (
+        Browser,
         BrowserContext,
         Error as PlaywrightError,
         Locator,
@@ -67,6 +76,139 @@ class ChartStandaloneMode(Enum):
     SHOW_NAV = 0
 
 
+# Record the time of the last DOM mutation of a page
+WATCH_MUTATIONS_SCRIPT = """
+() => {
+  if (window.__lastMutation === undefined) {
+    window.__lastMutation = performance.now();
+    new MutationObserver(() => {
+      window.__lastMutation = performance.now();
+    }).observe(document.body, {
+      attributes: true,
+      characterData: true,
+      childList: true,
+      subtree: true,
+    });
+  }
+}
+"""
+
+# Whether the charts of a page are rendered: nothing is loading anymore, and the DOM
+# has not changed during the quiet period (in milliseconds), i.e. animations are over
+RENDER_COMPLETE_SCRIPT = """
+(quietPeriod) => !document.querySelector(".loading")
+  && performance.now() - window.__lastMutation >= quietPeriod
+"""
+
+PoolKey = tuple[Any, ...]
+
+
+def get_stats_logger() -> BaseStatsLogger:
+    return current_app.config["STATS_LOGGER"]
+
+
+class PlaywrightBrowserPool:
+    """
+    A long-lived headless browser, with the browser contexts of each user kept
+    authenticated between screenshots.
+
+    The Playwright sync API is bound to the thread that started it, so each thread
+    gets its own browser. The browser is relaunched when it disconnects, or after
+    ``SCREENSHOT_PLAYWRIGHT_BROWSER_MAX_USES`` uses to release the memory it holds;
+    contexts are recreated after ``SCREENSHOT_PLAYWRIGHT_CONTEXT_TIMEOUT`` seconds, or
+    when they fail.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+
+    def get_browser(self) -> Browser:
+        local = self._local
+        if (browser := getattr(local, "browser", None)) is not None and (
+            not browser.is_connected()
+            or local.uses
+            >= current_app.config["SCREENSHOT_PLAYWRIGHT_BROWSER_MAX_USES"]
+        ):
+            logger.info("Recycling the headless browser after %i uses", local.uses)
+            get_stats_logger().incr("webdriver.playwright.recycle")
+            self.close()
+
+        if getattr(local, "browser", None) is None:
+            with stats_timing("webdriver.playwright.launch", get_stats_logger()):
+                local.playwright = sync_playwright().start()
+                try:
+                    local.browser = local.playwright.chromium.launch(
+                        args=current_app.config["WEBDRIVER_OPTION_ARGS"]
+                    )
+                except BaseException:
+                    # stop the driver, rather than starting another one next time
+                    self.close()
+                    raise
+            local.uses = 0
+            local.contexts = {}
+        return local.browser
+
+    @contextmanager
+    def context(
+        self,
+        key: PoolKey,
+        new_context: Callable[[Browser], BrowserContext],
+    ) -> Iterator[BrowserContext]:
+        """
+        Borrow the browser context of a key, creating it when needed.
+        """
+        browser = self.get_browser()
+        contexts: dict[PoolKey, tuple[BrowserContext, float]] = self._local.contexts
+        context, created = contexts.pop(key, (None, 0.0))
+        if context is not None and (
+            time.monotonic() - created
+            > current_app.config["SCREENSHOT_PLAYWRIGHT_CONTEXT_TIMEOUT"]
+        ):
+            self._close_context(context)
+            context = None
+
+        if context is None:
+            context, created = new_context(browser), time.monotonic()
+        else:
+            get_stats_logger().incr("webdriver.playwright.context_reused")
+
+        self._local.uses += 1
+        try:
+            yield context
+        except BaseException:
+            # the context may be left in any state, e.g. on a soft time limit
+            self._close_context(context)
+            raise
+        contexts[key] = (context, created)
+
+    def close(self) -> None:
+        """
+        Close the browser of the current thread.
+        """
+        local = self._local
+        for context, _ in getattr(local, "contexts", {}).values():
+            self._close_context(context)
+        try:
+            if (browser := getattr(local, "browser", None)) is not None:
+                browser.close()
+            if (playwright := getattr(local, "playwright", None)) is not None:
+                playwright.stop()
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Failed to close the headless browser", exc_info=True)
+        local.__dict__.clear()
+
+    @staticmethod
+    def _close_context(context: BrowserContext) -> None:
+        try:
+            context.close()
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Failed to close a browser context", exc_info=True)
+
+
+browser_pool = PlaywrightBrowserPool()
+atexit.register(browser_pool.close)
+
+
 # pylint: disable=too-few-public-methods
 class WebDriverProxy(ABC):
     def __init__(self, driver_type: str, window: WindowSize | None = None):
@@ -133,46 +275,117 @@ class WebDriverPlaywright(WebDriverProxy):
 
         return error_messages
 
-    def get_screenshot(  # pylint: disable=too-many-locals, too-many-statements
-        self, url: str, element_name: str, user: User
-    ) -> bytes | None:
-        with sync_playwright() as playwright:
-            browser_args = current_app.config["WEBDRIVER_OPTION_ARGS"]
-            browser = playwright.chromium.launch(args=browser_args)
+    def new_context(self, browser: Browser, user: User) -> BrowserContext:
+        pixel_density = current_app.config["WEBDRIVER_WINDOW"].get("pixel_density", 1)
+        context = browser.new_context(
+            bypass_csp=True,
+            viewport={
+                "height": self._window[1],
+                "width": self._window[0],
+            },
+            device_scale_factor=pixel_density,
+        )
+        context.set_default_timeout(
+            current_app.config["SCREENSHOT_PLAYWRIGHT_DEFAULT_TIMEOUT"]
+        )
+        return self.auth(user, context)
+
+    def get_screenshot(self, url: str, element_name: str, user: User) -> bytes | None:
+        return self.get_screenshots([url], element_name, user)[0]
+
+    def get_screenshots(
+        self, urls: list[str], element_name: str, user: User
+    ) -> list[bytes | None]:
+        if current_app.config["SCREENSHOT_PLAYWRIGHT_BROWSER_POOL"]:
             pixel_density = current_app.config["WEBDRIVER_WINDOW"].get(
                 "pixel_density", 1
             )
-            context = browser.new_context(
-                bypass_csp=True,
-                viewport={
-                    "height": self._window[1],
-                    "width": self._window[0],
-                },
-                device_scale_factor=pixel_density,
-            )
-            context.set_default_timeout(
-                current_app.config["SCREENSHOT_PLAYWRIGHT_DEFAULT_TIMEOUT"]
-            )
-            self.auth(user, context)
-            page = context.new_page()
+            with browser_pool.context(
+                (user.id, self._window, pixel_density),
+                lambda browser: self.new_context(browser, user),
+            ) as context:
+                return self._take_screenshots(context, urls, element_name, user)
+
+        with sync_playwright() as playwright:
+            with stats_timing("webdriver.playwright.launch", get_stats_logger()):
+                browser = playwright.chromium.launch(
+                    args=current_app.config["WEBDRIVER_OPTION_ARGS"]
+                )
+            context = self.new_context(browser, user)
+            return self._take_screenshots(context, urls, element_name, user)
+
+    def _take_screenshots(
+        self,
+        context: BrowserContext,
+        urls: list[str],
+        element_name: str,
+        user: User,
+    ) -> list[bytes | None]:
+        max_pages = current_app.config["SCREENSHOT_PLAYWRIGHT_MAX_PAGES"]
+        images: list[bytes | None] = []
+        for i in range(0, len(urls), max_pages):
+            batch = urls[i : i + max_pages]
+            # the browser keeps rendering the pages already loaded while the next
+            # ones load, so the pages of a batch render concurrently
+            pages = [self._load_page(context, url) for url in batch]
             try:
+                if not current_app.config["SCREENSHOT_PLAYWRIGHT_WAIT_FOR_RENDER"]:
+                    selenium_headstart = current_app.config[
+                        "SCREENSHOT_SELENIUM_HEADSTART"
+                    ]
+                    logger.debug("Sleeping for %i seconds", selenium_headstart)
+                    pages[0].wait_for_timeout(selenium_headstart * 1000)
+                images.extend(
+                    self._capture_page(page, url, element_name, user)
+                    for page, url in zip(pages, batch)
+                )
+            finally:
+                for page in pages:
+                    try:
+                        page.close()
+                    except PlaywrightError:
+                        logger.warning("Failed to close the page of url %s", page.url)
+        return images
+
+    @staticmethod
+    def _load_page(context: BrowserContext, url: str) -> Page:
+        page = context.new_page()
+        try:
+            with stats_timing("webdriver.playwright.load", get_stats_logger()):
                 page.goto(
                     url,
                     wait_until=current_app.config["SCREENSHOT_PLAYWRIGHT_WAIT_EVENT"],
                 )
-            except PlaywrightTimeout:
-                logger.exception(
-                    "Web event %s not detected. Page %s might not have been fully loaded",
-                    current_app.config["SCREENSHOT_PLAYWRIGHT_WAIT_EVENT"],
-                    url,
-                )
+        except PlaywrightTimeout:
+            logger.exception(
+                "Web event %s not detected. Page %s might not have been fully loaded",
+                current_app.config["SCREENSHOT_PLAYWRIGHT_WAIT_EVENT"],
+                url,
+            )
+        return page
 
-            img: bytes | None = None
-            selenium_headstart = current_app.config["SCREENSHOT_SELENIUM_HEADSTART"]
-            logger.debug("Sleeping for %i seconds", selenium_headstart)
-            page.wait_for_timeout(selenium_headstart * 1000)
-            element: Locator
-            try:
+    @staticmethod
+    def wait_for_render(page: Page) -> None:
+        """
+        Wait until the page is quiet: no chart is loading, and the DOM has not changed
+        for ``SCREENSHOT_PLAYWRIGHT_RENDER_QUIET_PERIOD`` milliseconds.
+        """
+        page.evaluate(WATCH_MUTATIONS_SCRIPT)
+        page.wait_for_function(
+            RENDER_COMPLETE_SCRIPT,
+            arg=current_app.config["SCREENSHOT_PLAYWRIGHT_RENDER_QUIET_PERIOD"],
+            polling=100,
+            timeout=current_app.config["SCREENSHOT_LOAD_WAIT"] * 1000,
+        )
+
+    def _capture_page(
+        self, page: Page, url: str, element_name: str, user: User
+    ) -> bytes | None:
+        img: bytes | None = None
+        element: Locator
+        stats_logger = get_stats_logger()
+        try:
+            with stats_timing("webdriver.playwright.render", stats_logger):
                 try:
                     # page didn't load
                     logger.debug(
@@ -210,36 +423,48 @@ class WebDriverPlaywright(WebDriverProxy):
                     )
                     raise
 
-                selenium_animation_wait = current_app.config[
-                    "SCREENSHOT_SELENIUM_ANIMATION_WAIT"
-                ]
-                logger.debug(
-                    "Wait %i seconds for chart animation", selenium_animation_wait
-                )
-                page.wait_for_timeout(selenium_animation_wait * 1000)
-                logger.debug(
-                    "Taking a PNG screenshot of url %s as user %s",
-                    url,
-                    user.username,
-                )
-                if current_app.config["SCREENSHOT_REPLACE_UNEXPECTED_ERRORS"]:
-                    unexpected_errors = WebDriverPlaywright.find_unexpected_errors(page)
-                    if unexpected_errors:
-                        logger.warning(
-                            "%i errors found in the screenshot. URL: %s. Errors are: %s",
-                            len(unexpected_errors),
-                            url,
-                            unexpected_errors,
+                if current_app.config["SCREENSHOT_PLAYWRIGHT_WAIT_FOR_RENDER"]:
+                    try:
+                        logger.debug("Wait for charts to render at url: %s", url)
+                        self.wait_for_render(page)
+                    except PlaywrightTimeout:
+                        logger.exception(
+                            "Timed out waiting for charts to render at url %s", url
                         )
+                        raise
+                else:
+                    selenium_animation_wait = current_app.config[
+                        "SCREENSHOT_SELENIUM_ANIMATION_WAIT"
+                    ]
+                    logger.debug(
+                        "Wait %i seconds for chart animation", selenium_animation_wait
+                    )
+                    page.wait_for_timeout(selenium_animation_wait * 1000)
+
+            logger.debug(
+                "Taking a PNG screenshot of url %s as user %s",
+                url,
+                user.username,
+            )
+            if current_app.config["SCREENSHOT_REPLACE_UNEXPECTED_ERRORS"]:
+                unexpected_errors = WebDriverPlaywright.find_unexpected_errors(page)
+                if unexpected_errors:
+                    logger.warning(
+                        "%i errors found in the screenshot. URL: %s. Errors are: %s",
+                        len(unexpected_errors),
+                        url,
+                        unexpected_errors,
+                    )
+            with stats_timing("webdriver.playwright.capture", stats_logger):
                 img = element.screenshot()
-            except PlaywrightTimeout:
-                # raise again for the finally block, but handled above
-                pass
-            except PlaywrightError:
-                logger.exception(
-                    "Encountered an unexpected error when requesting url %s", url
-                )
-            return img
+        except PlaywrightTimeout:
+            # raise again for the finally block, but handled above
+            pass
+        except PlaywrightError:
+            logger.exception(
+                "Encountered an unexpected error when requesting url %s", url
+            )
+        return img
 
 
 class WebDriverSelenium(WebDriverProxy):
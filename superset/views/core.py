@@ -101,7 +101,7 @@ from superset.views.utils import (
     redirect_with_flash,
     sanitize_datasource_data,
 )
-from superset.viz import BaseViz
+from superset.viz import BaseDeckGLViz, BaseViz
 
 config = app.config
 SQLLAB_QUERY_COST_ESTIMATE_TIMEOUT = config["SQLLAB_QUERY_COST_ESTIMATE_TIMEOUT"]
@@ -176,6 +176,16 @@ class Superset(BaseSupersetView):
     def send_data_payload_response(viz_obj: BaseViz, payload: Any) -> FlaskResponse:
         return data_payload_response(*viz_obj.payload_json_and_has_error(payload))
 
+    def get_arrow_response(self, viz_obj: BaseDeckGLViz) -> FlaskResponse:
+        viz_obj.arrow = True
+        payload = viz_obj.get_payload()
+        if viz_obj.has_error(payload) or not payload.get("data"):
+            return self.send_data_payload_response(viz_obj, payload)
+        return Response(
+            viz_obj.serialize_arrow_payload(payload),
+            mimetype="application/vnd.apache.arrow.stream",
+        )
+
     def generate_json(
         self, viz_obj: BaseViz, response_type: str | None = None
     ) -> FlaskResponse:
@@ -193,6 +203,15 @@ class Superset(BaseSupersetView):
         if response_type == ChartDataResultType.SAMPLES:
             return self.get_samples(viz_obj)
 
+        # the features of the deck.gl layers drawing points can be served as Arrow,
+        # other layers always return JSON
+        if (
+            request.args.get("arrow") == "true"
+            and isinstance(viz_obj, BaseDeckGLViz)
+            and viz_obj.columnar
+        ):
+            return self.get_arrow_response(viz_obj)
+
         payload = viz_obj.get_payload()
         return self.send_data_payload_response(viz_obj, payload)
 
@@ -45,6 +45,7 @@ from superset.models.core import Database
 from superset.models.dashboard import Dashboard
 from superset.models.slice import Slice
 from superset.models.sql_lab import Query
+from superset.sqllab.results_format import ArrowResultsReader
 from superset.superset_typing import FormData
 from superset.utils import json
 from superset.utils.core import DatasourceType
@@ -515,25 +516,44 @@ def _deserialize_results_payload(
             except pa.ArrowSerializationError as ex:
                 raise SerializationError("Unable to deserialize table") from ex
 
-        df = result_set.SupersetResultSet.convert_table_to_df(pa_table)
-        ds_payload["data"] = dataframe.df_to_records(df) or []
+        return _expand_results_payload(ds_payload, pa_table, query)
 
-        for column in ds_payload["selected_columns"]:
-            if "name" in column:
-                column["column_name"] = column.get("name")
+    with stats_timing("sqllab.query.results_backend_json_deserialize", stats_logger):
+        return json.loads(payload)
 
-        db_engine_spec = query.database.db_engine_spec
-        all_columns, data, expanded_columns = db_engine_spec.expand_data(
-            ds_payload["selected_columns"], ds_payload["data"]
-        )
-        ds_payload.update(
-            {"data": data, "columns": all_columns, "expanded_columns": expanded_columns}
-        )
 
-        return ds_payload
+def _deserialize_arrow_results(
+    reader: ArrowResultsReader, query: Query, max_rows: Optional[int] = None
+) -> dict[str, Any]:
+    """
+    Deserialize a results blob in the chunked Arrow format, decoding only the record
+    batches needed for the first ``max_rows`` rows.
+    """
+    with stats_timing("sqllab.query.results_backend_pa_deserialize", stats_logger):
+        pa_table = reader.read_table(max_rows)
 
-    with stats_timing("sqllab.query.results_backend_json_deserialize", stats_logger):
-        return json.loads(payload)
+    return _expand_results_payload(reader.payload, pa_table, query)
+
+
+def _expand_results_payload(
+    ds_payload: dict[str, Any], pa_table: pa.Table, query: Query
+) -> dict[str, Any]:
+    df = result_set.SupersetResultSet.convert_table_to_df(pa_table)
+    ds_payload["data"] = dataframe.df_to_records(df) or []
+
+    for column in ds_payload["selected_columns"]:
+        if "name" in column:
+            column["column_name"] = column.get("name")
+
+    db_engine_spec = query.database.db_engine_spec
+    all_columns, data, expanded_columns = db_engine_spec.expand_data(
+        ds_payload["selected_columns"], ds_payload["data"]
+    )
+    ds_payload.update(
+        {"data": data, "columns": all_columns, "expanded_columns": expanded_columns}
+    )
+
+    return ds_payload
 
 
 def get_cta_schema_name(
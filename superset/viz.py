@@ -37,11 +37,13 @@ import geohash
 import numpy as np
 import pandas as pd
 import polyline
+import pyarrow as pa
 from dateutil import relativedelta as rdelta
 from deprecation import deprecated
 from flask import request
 from flask_babel import lazy_gettext as _
 from geopy.point import Point
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
 from pandas.tseries.frequencies import to_offset
 
 from superset import app
@@ -81,6 +83,7 @@ from superset.utils.core import (
 )
 from superset.utils.date_parser import get_since_until, parse_past_timedelta
 from superset.utils.hashing import md5_sha_from_str
+from superset.utils.spatial import get_bins, parse_coordinates
 
 if TYPE_CHECKING:
     from superset.connectors.sqla.models import BaseDatasource
@@ -1835,11 +1838,23 @@ class DeckGLMultiLayer(BaseViz):
 
 
 class BaseDeckGLViz(BaseViz):
-    """Base class for deck.gl visualizations"""
+    """Base class for deck.gl visualizations
+
+    The layers drawing points build their features by column (see ``get_columns``),
+    which allows serving them as Arrow, with positions and weights as float32 arrays.
+    The aggregation layers can also bin their points on the server, when a
+    ``bin_size`` in meters is set in the form data.
+    """
 
     is_timeseries = False
     credits = '<a href="https://uber.github.io/deck.gl/">deck.gl</a>'
     spatial_control_keys: list[str] = []
+    # whether the layer implements ``get_columns``
+    columnar = False
+    # the shape of the bins of the points, ``grid`` or ``hexagon``
+    bins: str | None = None
+    # whether the features are returned as an Arrow table
+    arrow = False
 
     @deprecated(deprecated_in="3.0")
     def get_metrics(self) -> list[str]:
@@ -1892,36 +1907,56 @@ class BaseDeckGLViz(BaseViz):
         df[key] = [tuple(reversed(o)) for o in df[key] if isinstance(o, (list, tuple))]
 
     @deprecated(deprecated_in="3.0")
-    def process_spatial_data_obj(self, key: str, df: pd.DataFrame) -> pd.DataFrame:
+    def get_positions(self, key: str, df: pd.DataFrame) -> np.ndarray:
+        """
+        Return the positions of a spatial control as an array of shape ``(n, 2)``,
+        where missing positions are NaN.
+        """
         spatial = self.form_data.get(key)
         if spatial is None:
             raise ValueError(_("Bad spatial key"))
 
         if spatial.get("type") == "latlong":
-            df[key] = list(
-                zip(
+            positions = np.column_stack(
+                [
                     pd.to_numeric(df[spatial.get("lonCol")], errors="coerce"),
                     pd.to_numeric(df[spatial.get("latCol")], errors="coerce"),
-                )
-            )
+                ]
+            ).astype(float)
         elif spatial.get("type") == "delimited":
-            lon_lat_col = spatial.get("lonlatCol")
-            df[key] = df[lon_lat_col].apply(self.parse_coordinates)
-            del df[lon_lat_col]
+            positions = parse_coordinates(
+                df[spatial.get("lonlatCol")], self.parse_coordinates
+            )
         elif spatial.get("type") == "geohash":
-            df[key] = df[spatial.get("geohashCol")].map(self.reverse_geohash_decode)
-            del df[spatial.get("geohashCol")]
-
-        if spatial.get("reverseCheckbox"):
-            self.reverse_latlong(df, key)
-
-        if df.get(key) is None:
+            positions = np.array(
+                df[spatial.get("geohashCol")].map(self.reverse_geohash_decode).tolist(),
+                dtype=float,
+            ).reshape(-1, 2)
+        else:
             raise NullValueException(
                 _(
                     "Encountered invalid NULL spatial entry, \
                                        please consider filtering those out"
                 )
             )
+
+        if spatial.get("reverseCheckbox"):
+            positions = positions[:, ::-1]
+        return positions
+
+    @deprecated(deprecated_in="3.0")
+    def process_spatial_data_obj(self, key: str, df: pd.DataFrame) -> pd.DataFrame:
+        positions = self.get_positions(key, df)
+        df[key] = [
+            None if np.isnan(lon) and np.isnan(lat) else (lon, lat)
+            for lon, lat in positions.tolist()
+        ]
+
+        spatial = self.form_data[key]
+        if spatial.get("type") == "delimited":
+            del df[spatial.get("lonlatCol")]
+        elif spatial.get("type") == "geohash":
+            del df[spatial.get("geohashCol")]
         return df
 
     @deprecated(deprecated_in="3.0")
@@ -1987,17 +2022,20 @@ class BaseDeckGLViz(BaseViz):
         if df.empty:
             return None
 
-        # Processing spatial info
-        for key in self.spatial_control_keys:
-            df = self.process_spatial_data_obj(key, df)
-
-        features = []
-        for data in df.to_dict(orient="records"):
-            feature = self.get_properties(data)
-            extra_props = self.get_js_columns(data)
-            if extra_props:
-                feature["extraProps"] = extra_props
-            features.append(feature)
+        if self.columnar:
+            features = self.get_features(df)
+        else:
+            # Processing spatial info
+            for key in self.spatial_control_keys:
+                df = self.process_spatial_data_obj(key, df)
+
+            features = []
+            for data in df.to_dict(orient="records"):
+                feature = self.get_properties(data)
+                extra_props = self.get_js_columns(data)
+                if extra_props:
+                    feature["extraProps"] = extra_props
+                features.append(feature)
 
         return {
             "features": features,
@@ -2009,6 +2047,181 @@ class BaseDeckGLViz(BaseViz):
     def get_properties(self, data: dict[str, Any]) -> dict[str, Any]:
         raise NotImplementedError()
 
+    @deprecated(deprecated_in="3.0")
+    def get_columns(self, df: pd.DataFrame) -> dict[str, Any]:
+        """
+        Return the properties of the features by column, as returned by
+        ``get_properties`` for each row: positions are arrays of shape ``(n, 2)``,
+        other properties are series.
+        """
+        raise NotImplementedError()
+
+    @staticmethod
+    @deprecated(deprecated_in="3.0")
+    def get_column(df: pd.DataFrame, name: str | None) -> pd.Series:
+        if name and name in df.columns:
+            return df[name]
+        return pd.Series([None] * len(df), index=df.index, dtype=object)
+
+    @deprecated(deprecated_in="3.0")
+    def get_weights(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Return the weights of the points: the metric, where missing or zero values are
+        replaced by 1.
+        """
+        weights = self.get_column(df, self.metric_label)
+        if is_numeric_dtype(weights) and not is_bool_dtype(weights):
+            return weights.mask(weights == 0, 1)
+        return weights.map(lambda weight: weight or 1)
+
+    @deprecated(deprecated_in="3.0")
+    def get_features(self, df: pd.DataFrame) -> list[dict[str, Any]] | pa.Table:
+        """
+        Return the features of a columnar layer, as a list of properties or as an
+        Arrow table.
+        """
+        columns = self.get_columns(df)
+        extra_props = {
+            col: self.get_column(df, col)
+            for col in self.form_data.get("js_columns") or []
+        }
+
+        if bin_size := self.get_bin_size():
+            columns = self.bin_points(columns, bin_size)
+            extra_props = {}
+
+        if self.arrow:
+            return self.get_arrow_table(columns, extra_props)
+
+        names = list(columns)
+        features = [
+            dict(zip(names, row))
+            for row in zip(*(self.to_list(column) for column in columns.values()))
+        ]
+        if extra_props:
+            for feature, row in zip(
+                features,
+                zip(*(column.tolist() for column in extra_props.values())),
+            ):
+                feature["extraProps"] = dict(zip(extra_props, row))
+        return features
+
+    @staticmethod
+    @deprecated(deprecated_in="3.0")
+    def to_list(column: Any) -> list[Any]:
+        values = column.tolist()
+        if isinstance(column, np.ndarray):
+            for i in np.flatnonzero(np.isnan(column).all(axis=1)):
+                values[i] = None
+        return values
+
+    @deprecated(deprecated_in="3.0")
+    def get_bin_size(self) -> float | None:
+        """
+        Return the size of the bins in meters, when the points are binned on the
+        server.
+
+        Bins sum the weights of their points, so the points are only binned when the
+        layer sums them, and when the points have no extra properties.
+        """
+        if not self.bins or not self.form_data.get("bin_size"):
+            return None
+        if (self.form_data.get("js_agg_function") or "sum") != "sum":
+            return None
+        if (self.form_data.get("aggregation") or "sum").lower() != "sum":
+            return None
+        if self.form_data.get("js_columns"):
+            return None
+        return float(self.form_data["bin_size"])
+
+    @deprecated(deprecated_in="3.0")
+    def bin_points(self, columns: dict[str, Any], bin_size: float) -> dict[str, Any]:
+        """
+        Aggregate the points in bins, summing their weights, per timestamp for
+        the layers playing over time.
+        """
+        bins = get_bins(columns["position"], bin_size, hexagonal=self.bins == "hexagon")
+        df = pd.DataFrame(
+            {
+                "longitude": bins[:, 0],
+                "latitude": bins[:, 1],
+                "weight": columns["weight"].to_numpy(),
+            }
+        )
+        keys = ["longitude", "latitude"]
+        if DTTM_ALIAS in columns:
+            df[DTTM_ALIAS] = columns[DTTM_ALIAS].to_numpy()
+            keys.append(DTTM_ALIAS)
+
+        binned = (
+            df.dropna(subset=["longitude", "latitude"])
+            .groupby(keys, sort=False, dropna=False)
+            .agg(weight=("weight", "sum"), count=("weight", "size"))
+            .reset_index()
+        )
+        columns = {
+            "position": binned[["longitude", "latitude"]].to_numpy(),
+            "weight": binned["weight"],
+            "count": binned["count"],
+        }
+        if DTTM_ALIAS in binned.columns:
+            columns[DTTM_ALIAS] = binned[DTTM_ALIAS]
+        return columns
+
+    @staticmethod
+    @deprecated(deprecated_in="3.0")
+    def get_arrow_table(
+        columns: dict[str, Any],
+        extra_props: dict[str, pd.Series],
+    ) -> pa.Table:
+        """
+        Convert the features to Arrow: positions are fixed size lists of 2 float32,
+        numeric properties are float32, ready to be used as binary attributes.
+        """
+
+        def to_arrow(column: Any) -> pa.Array:
+            if isinstance(column, np.ndarray):
+                values = pa.array(column.astype(np.float32).ravel())
+                return pa.FixedSizeListArray.from_arrays(values, 2)
+            if is_numeric_dtype(column) and not is_bool_dtype(column):
+                return pa.array(column.astype(np.float32), from_pandas=True)
+            try:
+                return pa.array(column, from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                return pa.array(
+                    column.map(lambda value: value if value is None else str(value))
+                )
+
+        arrays = {name: to_arrow(column) for name, column in columns.items()}
+        if extra_props:
+            arrays["extraProps"] = pa.StructArray.from_arrays(
+                [to_arrow(column) for column in extra_props.values()],
+                names=list(extra_props),
+            )
+        return pa.table(arrays)
+
+    @staticmethod
+    @deprecated(deprecated_in="3.0")
+    def serialize_arrow_payload(payload: VizPayload) -> bytes:
+        """
+        Serialize a payload holding an Arrow table of features as an Arrow IPC stream.
+
+        The rest of the payload is stored as JSON under the ``payload`` key of the
+        schema metadata.
+        """
+        data = payload["data"]
+        table = data["features"]
+        metadata = {
+            **payload,
+            "data": {key: value for key, value in data.items() if key != "features"},
+        }
+        table = table.replace_schema_metadata({"payload": BaseViz.json_dumps(metadata)})
+
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
 
 class DeckScatterViz(BaseDeckGLViz):
     """deck.gl's ScatterLayer"""
@@ -2017,6 +2230,7 @@ class DeckScatterViz(BaseDeckGLViz):
     verbose_name = _("Deck.gl - Scatter plot")
     spatial_control_keys = ["spatial"]
     is_timeseries = True
+    columnar = True
 
     @deprecated(deprecated_in="3.0")
     def query_obj(self) -> QueryObjectDict:
@@ -2051,6 +2265,19 @@ class DeckScatterViz(BaseDeckGLViz):
             DTTM_ALIAS: data.get(DTTM_ALIAS),
         }
 
+    @deprecated(deprecated_in="3.0")
+    def get_columns(self, df: pd.DataFrame) -> dict[str, Any]:
+        metric = self.get_column(df, self.metric_label)
+        return {
+            "metric": metric,
+            "radius": pd.Series(self.fixed_value, index=df.index)
+            if self.fixed_value
+            else metric,
+            "cat_color": self.get_column(df, self.dim),
+            "position": self.get_positions("spatial", df),
+            DTTM_ALIAS: self.get_column(df, DTTM_ALIAS),
+        }
+
     @deprecated(deprecated_in="3.0")
     def get_data(self, df: pd.DataFrame) -> VizData:
         # pylint: disable=attribute-defined-outside-init
@@ -2070,6 +2297,8 @@ class DeckScreengrid(BaseDeckGLViz):
     verbose_name = _("Deck.gl - Screen Grid")
     spatial_control_keys = ["spatial"]
     is_timeseries = True
+    columnar = True
+    bins = "grid"
 
     @deprecated(deprecated_in="3.0")
     def query_obj(self) -> QueryObjectDict:
@@ -2084,6 +2313,24 @@ class DeckScreengrid(BaseDeckGLViz):
             "__timestamp": data.get(DTTM_ALIAS) or data.get("__time"),
         }
 
+    @deprecated(deprecated_in="3.0")
+    def get_columns(self, df: pd.DataFrame) -> dict[str, Any]:
+        timestamps = self.get_column(df, DTTM_ALIAS)
+        if "__time" in df.columns:
+            timestamps = pd.Series(
+                [
+                    timestamp or time
+                    for timestamp, time in zip(timestamps.tolist(), df["__time"])
+                ],
+                index=df.index,
+                dtype=object,
+            )
+        return {
+            "position": self.get_positions("spatial", df),
+            "weight": self.get_weights(df),
+            "__timestamp": timestamps,
+        }
+
     @deprecated(deprecated_in="3.0")
     def get_data(self, df: pd.DataFrame) -> VizData:
         self.metric_label = (  # pylint: disable=attribute-defined-outside-init
@@ -2098,6 +2345,8 @@ class DeckGrid(BaseDeckGLViz):
     viz_type = "deck_grid"
     verbose_name = _("Deck.gl - 3D Grid")
     spatial_control_keys = ["spatial"]
+    columnar = True
+    bins = "grid"
 
     @deprecated(deprecated_in="3.0")
     def get_properties(self, data: dict[str, Any]) -> dict[str, Any]:
@@ -2106,6 +2355,13 @@ class DeckGrid(BaseDeckGLViz):
             "weight": (data.get(self.metric_label) if self.metric_label else None) or 1,
         }
 
+    @deprecated(deprecated_in="3.0")
+    def get_columns(self, df: pd.DataFrame) -> dict[str, Any]:
+        return {
+            "position": self.get_positions("spatial", df),
+            "weight": self.get_weights(df),
+        }
+
     @deprecated(deprecated_in="3.0")
     def get_data(self, df: pd.DataFrame) -> VizData:
         self.metric_label = (  # pylint: disable=attribute-defined-outside-init
@@ -2218,6 +2474,8 @@ class DeckHex(BaseDeckGLViz):
     viz_type = "deck_hex"
     verbose_name = _("Deck.gl - 3D HEX")
     spatial_control_keys = ["spatial"]
+    columnar = True
+    bins = "hexagon"
 
     @deprecated(deprecated_in="3.0")
     def get_properties(self, data: dict[str, Any]) -> dict[str, Any]:
@@ -2226,6 +2484,13 @@ class DeckHex(BaseDeckGLViz):
             "weight": (data.get(self.metric_label) if self.metric_label else None) or 1,
         }
 
+    @deprecated(deprecated_in="3.0")
+    def get_columns(self, df: pd.DataFrame) -> dict[str, Any]:
+        return {
+            "position": self.get_positions("spatial", df),
+            "weight": self.get_weights(df),
+        }
+
     @deprecated(deprecated_in="3.0")
     def get_data(self, df: pd.DataFrame) -> VizData:
         self.metric_label = (  # pylint: disable=attribute-defined-outside-init
@@ -2240,6 +2505,8 @@ class DeckHeatmap(BaseDeckGLViz):
     viz_type = "deck_heatmap"
     verbose_name = _("Deck.gl - Heatmap")
     spatial_control_keys = ["spatial"]
+    columnar = True
+    bins = "grid"
 
     def get_properties(self, data: dict[str, Any]) -> dict[str, Any]:
         return {
@@ -2247,6 +2514,13 @@ class DeckHeatmap(BaseDeckGLViz):
             "weight": (data.get(self.metric_label) if self.metric_label else None) or 1,
         }
 
+    @deprecated(deprecated_in="3.0")
+    def get_columns(self, df: pd.DataFrame) -> dict[str, Any]:
+        return {
+            "position": self.get_positions("spatial", df),
+            "weight": self.get_weights(df),
+        }
+
     def get_data(self, df: pd.DataFrame) -> VizData:
         self.metric_label = (  # pylint: disable=attribute-defined-outside-init
             utils.get_metric_name(self.metric) if self.metric else None
@@ -2260,6 +2534,7 @@ class DeckContour(BaseDeckGLViz):
     viz_type = "deck_contour"
     verbose_name = _("Deck.gl - Contour")
     spatial_control_keys = ["spatial"]
+    columnar = True
 
     def get_properties(self, data: dict[str, Any]) -> dict[str, Any]:
         return {
@@ -2267,6 +2542,13 @@ class DeckContour(BaseDeckGLViz):
             "weight": (data.get(self.metric_label) if self.metric_label else None) or 1,
         }
 
+    @deprecated(deprecated_in="3.0")
+    def get_columns(self, df: pd.DataFrame) -> dict[str, Any]:
+        return {
+            "position": self.get_positions("spatial", df),
+            "weight": self.get_weights(df),
+        }
+
     def get_data(self, df: pd.DataFrame) -> VizData:
         self.metric_label = (  # pylint: disable=attribute-defined-outside-init
             utils.get_metric_name(self.metric) if self.metric else None
@@ -2301,6 +2583,7 @@ class DeckArc(BaseDeckGLViz):
     verbose_name = _("Deck.gl - Arc")
     spatial_control_keys = ["start_spatial", "end_spatial"]
     is_timeseries = True
+    columnar = True
 
     @deprecated(deprecated_in="3.0")
     def query_obj(self) -> QueryObjectDict:
@@ -2317,6 +2600,15 @@ class DeckArc(BaseDeckGLViz):
             DTTM_ALIAS: data.get(DTTM_ALIAS),
         }
 
+    @deprecated(deprecated_in="3.0")
+    def get_columns(self, df: pd.DataFrame) -> dict[str, Any]:
+        return {
+            "sourcePosition": self.get_positions("start_spatial", df),
+            "targetPosition": self.get_positions("end_spatial", df),
+            "cat_color": self.get_column(df, self.form_data.get("dimension")),
+            DTTM_ALIAS: self.get_column(df, DTTM_ALIAS),
+        }
+
     @deprecated(deprecated_in="3.0")
     def get_data(self, df: pd.DataFrame) -> VizData:
         if df.empty:
@@ -74,6 +74,7 @@ from tests.integration_tests.test_app import app  # noqa: F811
 
 
 CHART_DATA_URI = "api/v1/chart/data"
+CHART_DATA_BATCH_URI = "api/v1/chart/data/batch"
 CHARTS_FIXTURE_COUNT = 10
 ADHOC_COLUMN_FIXTURE: AdhocColumn = {
     "hasCustomLabel": True,
@@ -985,6 +986,72 @@ class TestPostChartDataApi(BaseTestChartDataApi):
         assert list(result["data"][0].keys()) == ["name", "num divide by 10"]
 
 
+@pytest.mark.chart_data_flow
+class TestPostChartDataBatchApi(BaseTestChartDataApi):
+    def post_batch(self, query_contexts: list[Any]) -> dict[int, dict[str, Any]]:
+        rv = self.client.post(
+            CHART_DATA_BATCH_URI, json={"query_contexts": query_contexts}
+        )
+        assert rv.status_code == 200
+        assert rv.mimetype == "application/x-ndjson"
+        lines = [json.loads(line) for line in rv.data.decode().splitlines()]
+        return {line["index"]: line for line in lines}
+
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_data_batch(self):
+        """
+        Chart data API: Test batch of query contexts, identical queries run once
+        """
+        invalid_payload = copy.deepcopy(self.query_context_payload)
+        invalid_payload["datasource"] = "abc"
+
+        with mock.patch.object(
+            SqlaTable, "query", autospec=True, side_effect=SqlaTable.query
+        ) as query:
+            lines = self.post_batch(
+                [
+                    self.query_context_payload,
+                    invalid_payload,
+                    self.query_context_payload,
+                ]
+            )
+
+        assert query.call_count == 1
+        assert sorted(lines) == [0, 1, 2]
+        assert lines[0]["status"] == 200
+        assert lines[1]["status"] == 400
+        assert lines[2]["status"] == 200
+        assert lines[0]["result"][0]["rowcount"] > 0
+        assert lines[0]["result"] == lines[2]["result"]
+
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_data_batch_unsupported_result_format(self):
+        """
+        Chart data API: Test batch of query contexts only returns JSON
+        """
+        self.query_context_payload["result_format"] = ChartDataResultFormat.CSV
+
+        lines = self.post_batch([self.query_context_payload])
+
+        assert lines[0]["status"] == 400
+
+    def test_data_batch_not_permitted_actor(self):
+        """
+        Chart data API: Test batch of query contexts not allowed
+        """
+        self.logout()
+        self.login(GAMMA_USERNAME)
+
+        lines = self.post_batch([self.query_context_payload])
+
+        assert lines[0]["status"] == 403
+
+    def test_data_batch_invalid_payload(self):
+        rv = self.client.post(CHART_DATA_BATCH_URI, json=self.query_context_payload)
+
+        assert rv.status_code == 400
+
+
 @pytest.mark.chart_data_flow
 class TestGetChartDataApi(BaseTestChartDataApi):
     @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
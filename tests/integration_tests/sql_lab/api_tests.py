@@ -425,8 +425,8 @@ class TestSqlLabApi(SupersetTestCase):
         app.config["RESULTS_BACKEND_USE_MSGPACK"] = use_msgpack
 
     @mock.patch("superset.models.sql_lab.Query.raise_for_access", lambda _: None)
-    @mock.patch("superset.models.core.Database.get_df")
-    def test_export_results(self, get_df_mock: mock.Mock) -> None:
+    @mock.patch("superset.models.core.Database.iter_df")
+    def test_export_results(self, iter_df_mock: mock.Mock) -> None:
         self.login(ADMIN_USERNAME)
 
         database = get_example_database()
@@ -448,7 +448,9 @@ class TestSqlLabApi(SupersetTestCase):
         db.session.add(query_obj)
         db.session.commit()
 
-        get_df_mock.return_value = pd.DataFrame({"foo": [1, 2, 3]})
+        iter_df_mock.side_effect = lambda sql, catalog, schema, limit: iter(
+            [pd.DataFrame({"foo": [1, 2, 3]})[:limit]]
+        )
 
         resp = self.get_resp("/api/v1/sqllab/export/test/")
         data = csv.reader(io.StringIO(resp))
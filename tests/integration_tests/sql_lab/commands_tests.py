@@ -14,10 +14,13 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+from collections.abc import Iterator
+from contextlib import contextmanager, ExitStack
+from typing import Any
 from unittest import mock
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 
-import pandas as pd
+import pyarrow as pa
 import pytest
 from flask_babel import gettext as __
 
@@ -31,15 +34,39 @@ from superset.exceptions import (
     SupersetSecurityException,
     SupersetTimeoutException,
 )
-from superset.models.core import Database  # noqa: F401
+from superset.models.core import Database
 from superset.models.sql_lab import Query
 from superset.sqllab.limiting_factor import LimitingFactor
+from superset.sqllab.results_format import serialize_results
 from superset.sqllab.schemas import EstimateQueryCostSchema
 from superset.utils import core as utils
 from superset.utils.database import get_example_database
 from tests.integration_tests.base_tests import SupersetTestCase
 
 
+@contextmanager
+def mock_query_results(rows: list[tuple[Any, ...]]) -> Iterator[None]:
+    """
+    Mock the example database returning all the rows of a query, whatever the limit,
+    like the engines which don't fetch data in batches.
+    """
+    db_engine_spec = get_example_database().db_engine_spec
+    with ExitStack() as stack:
+        get_raw_connection = stack.enter_context(
+            patch.object(Database, "get_raw_connection")
+        )
+        stack.enter_context(patch.object(Database, "_execute_statements"))
+        stack.enter_context(
+            patch.object(db_engine_spec, "allows_fetch_data_batches", False)
+        )
+        stack.enter_context(
+            patch.object(db_engine_spec, "fetch_data", return_value=rows)
+        )
+        cursor = get_raw_connection.return_value.__enter__.return_value.cursor()
+        cursor.description = [("foo", None, None, None, None, None, None)]
+        yield
+
+
 class TestQueryEstimationCommand(SupersetTestCase):
     def test_validation_no_database(self) -> None:
         params = {"database_id": 1, "sql": "SELECT 1"}
@@ -170,12 +197,11 @@ class TestSqlResultExportCommand(SupersetTestCase):
 
     @pytest.mark.usefixtures("create_database_and_query")
     @patch("superset.models.sql_lab.Query.raise_for_access", lambda _: None)
-    @patch("superset.models.core.Database.get_df")
-    def test_run_no_results_backend_select_sql(self, get_df_mock: Mock) -> None:
+    def test_run_no_results_backend_select_sql(self) -> None:
         command = export.SqlResultExportCommand("test")
 
-        get_df_mock.return_value = pd.DataFrame({"foo": [1, 2, 3]})
-        result = command.run()
+        with mock_query_results([(1,), (2,), (3,)]):
+            result = command.run()
 
         assert result["data"] == "foo\n1\n2\n3\n"
         assert result["count"] == 3
@@ -183,8 +209,7 @@ class TestSqlResultExportCommand(SupersetTestCase):
 
     @pytest.mark.usefixtures("create_database_and_query")
     @patch("superset.models.sql_lab.Query.raise_for_access", lambda _: None)
-    @patch("superset.models.core.Database.get_df")
-    def test_run_no_results_backend_executed_sql(self, get_df_mock: Mock) -> None:
+    def test_run_no_results_backend_executed_sql(self) -> None:
         query_obj = db.session.query(Query).filter_by(client_id="test").one()
         query_obj.executed_sql = "select * from bar limit 2"
         query_obj.select_sql = None
@@ -192,8 +217,8 @@ class TestSqlResultExportCommand(SupersetTestCase):
 
         command = export.SqlResultExportCommand("test")
 
-        get_df_mock.return_value = pd.DataFrame({"foo": [1, 2, 3]})
-        result = command.run()
+        with mock_query_results([(1,), (2,), (3,)]):
+            result = command.run()
 
         assert result["data"] == "foo\n1\n2\n"
         assert result["count"] == 2
@@ -201,10 +226,7 @@ class TestSqlResultExportCommand(SupersetTestCase):
 
     @pytest.mark.usefixtures("create_database_and_query")
     @patch("superset.models.sql_lab.Query.raise_for_access", lambda _: None)
-    @patch("superset.models.core.Database.get_df")
-    def test_run_no_results_backend_executed_sql_limiting_factor(
-        self, get_df_mock: Mock
-    ) -> None:
+    def test_run_no_results_backend_executed_sql_limiting_factor(self) -> None:
         query_obj = db.session.query(Query).filter_by(results_key="abc_query").one()
         query_obj.executed_sql = "select * from bar limit 2"
         query_obj.select_sql = None
@@ -213,9 +235,8 @@ class TestSqlResultExportCommand(SupersetTestCase):
 
         command = export.SqlResultExportCommand("test")
 
-        get_df_mock.return_value = pd.DataFrame({"foo": [1, 2, 3]})
-
-        result = command.run()
+        with mock_query_results([(1,), (2,), (3,)]):
+            result = command.run()
 
         assert result["data"] == "foo\n1\n"
         assert result["count"] == 1
@@ -244,6 +265,45 @@ class TestSqlResultExportCommand(SupersetTestCase):
         assert result["count"] == 5
         assert result["query"].client_id == "test"
 
+    @pytest.mark.usefixtures("create_database_and_query")
+    @patch("superset.models.sql_lab.Query.raise_for_access", lambda _: None)
+    @patch.dict(
+        "superset.commands.sql_lab.export.config", {"SQLLAB_CSV_EXPORT_MAX_ROWS": 3}
+    )
+    def test_stream_result_max_rows(self) -> None:
+        command = export.SqlResultExportCommand("test")
+
+        payload = {"columns": [{"name": "foo"}], "data": None}
+        table = pa.table({"foo": list(range(5))})
+        blob = serialize_results(payload, table, "lz4", 2)
+
+        export.results_backend = mock.Mock()
+        export.results_backend.get.return_value = blob
+
+        result = command.stream_result()
+
+        assert list(result["data"]) == ["foo\n0\n1\n", "2\n"]
+        assert command.count == 3
+        assert result["query"].client_id == "test"
+
+    @pytest.mark.usefixtures("create_database_and_query")
+    @patch("superset.models.sql_lab.Query.raise_for_access", lambda _: None)
+    def test_run_with_arrow_results_backend(self) -> None:
+        command = export.SqlResultExportCommand("test")
+
+        payload = {"columns": [{"name": "foo"}], "data": None}
+        table = pa.table({"foo": list(range(5))})
+        blob = serialize_results(payload, table, "lz4", 2)
+
+        export.results_backend = mock.Mock()
+        export.results_backend.get.return_value = blob
+
+        result = command.run()
+
+        assert result["data"] == "foo\n0\n1\n2\n3\n4\n"
+        assert result["count"] == 5
+        assert result["query"].client_id == "test"
+
 
 class TestSqlExecutionResultsCommand(SupersetTestCase):
     @pytest.fixture()
@@ -364,3 +424,25 @@ class TestSqlExecutionResultsCommand(SupersetTestCase):
         assert result.get("status") == "success"
         assert result["query"].get("rows") == 104
         assert result.get("data") == data
+
+    @pytest.mark.usefixtures("create_database_and_query")
+    def test_run_arrow_results(self) -> None:
+        payload = {
+            "status": QueryStatus.SUCCESS,
+            "query": {"rows": 104},
+            "selected_columns": [{"name": "col_0"}],
+            "data": None,
+        }
+        table = pa.table({"col_0": list(range(104))})
+        blob = serialize_results(payload, table, "zstd", 10)
+
+        results.results_backend = mock.Mock()
+        results.results_backend.get.return_value = blob
+
+        command = results.SqlExecutionResultsCommand("abc_query", 25)
+        result = command.run()
+
+        assert result.get("status") == "success"
+        assert result["query"].get("rows") == 104
+        assert result.get("data") == [{"col_0": i} for i in range(25)]
+        assert result.get("displayLimitReached") is True
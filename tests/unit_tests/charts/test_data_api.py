@@ -0,0 +1,78 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture
+
+from superset.charts.data.api import _should_run_async
+from superset.common.chart_data import ChartDataResultFormat, ChartDataResultType
+from tests.unit_tests.conftest import with_feature_flags
+
+PROPHET = {"operation": "prophet", "options": {"periods": 10}}
+PIVOT = {"operation": "pivot", "options": {"index": ["ds"], "columns": ["country"]}}
+
+
+def get_query_context(mocker: MockerFixture, **query: Any) -> Any:
+    return mocker.MagicMock(
+        result_format=ChartDataResultFormat.JSON,
+        result_type=ChartDataResultType.FULL,
+        queries=[
+            mocker.MagicMock(
+                **{"metrics": ["count"], "series_limit": 0, **query},
+            )
+        ],
+    )
+
+
+@with_feature_flags(GLOBAL_ASYNC_QUERIES=True)
+def test_should_run_async(mocker: MockerFixture) -> None:
+    """
+    Test that all chart data requests run async by default.
+    """
+    assert _should_run_async(get_query_context(mocker, post_processing=[]))
+
+
+@with_feature_flags(GLOBAL_ASYNC_QUERIES=False)
+def test_should_run_async_disabled(mocker: MockerFixture) -> None:
+    assert not _should_run_async(get_query_context(mocker, post_processing=[PROPHET]))
+
+
+@with_feature_flags(GLOBAL_ASYNC_QUERIES=True)
+@pytest.mark.parametrize("app", [{"PROPHET_ASYNC_MIN_SERIES": 5}], indirect=True)
+@pytest.mark.parametrize(
+    "query, run_async",
+    [
+        ({"post_processing": []}, True),
+        ({"post_processing": [PIVOT]}, True),
+        ({"post_processing": [PIVOT, PROPHET]}, True),
+        ({"post_processing": [PIVOT, PROPHET], "series_limit": 2}, False),
+        ({"post_processing": [PIVOT, PROPHET], "series_limit": 5}, True),
+        ({"post_processing": [PROPHET], "metrics": ["a", "b", "c", "d"]}, False),
+        ({"post_processing": [PROPHET], "metrics": ["a", "b", "c", "d", "e"]}, True),
+    ],
+)
+def test_should_run_async_forecasts(
+    mocker: MockerFixture,
+    query: dict[str, Any],
+    run_async: bool,
+) -> None:
+    """
+    Test that small forecasts don't run async when PROPHET_ASYNC_MIN_SERIES is set.
+    """
+    assert _should_run_async(get_query_context(mocker, **query)) is run_async
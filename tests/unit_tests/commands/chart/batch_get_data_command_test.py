@@ -0,0 +1,251 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import threading
+import time
+from typing import Any, Optional
+
+import pytest
+from flask import g
+from pytest_mock import MockerFixture
+
+from superset.commands.chart.data.batch_get_data_command import (
+    ChartDataBatchCommand,
+    copy_query,
+)
+from superset.common.chart_data import ChartDataResultType
+
+
+def make_query_context(
+    mocker: MockerFixture,
+    *keys: str,
+    database_id: int = 1,
+    calls: Optional[list[tuple[str, Any]]] = None,
+) -> Any:
+    """
+    Build a query context with a query object for each cache key.
+    """
+    calls = [] if calls is None else calls
+
+    def get_df_payload(query_obj: Any, query_cache: Any = None) -> dict[str, Any]:
+        calls.append((query_obj.key, query_cache))
+        if query_obj.key.startswith("error"):
+            raise Exception(f"Error in {query_obj.key}")
+        payload = {"cache_key": query_obj.key, "form_data": g.form_data}
+        query_context.df_payloads[query_obj.key] = payload
+        return payload
+
+    query_context = mocker.MagicMock(
+        force=False,
+        result_type=ChartDataResultType.FULL,
+        form_data={"keys": keys},
+        cache_values={},
+        queries=[mocker.MagicMock(key=key, result_type=None) for key in keys],
+    )
+    query_context.datasource.database_id = database_id
+    query_context.get_cache_timeout.return_value = None
+    query_context.query_cache_key.side_effect = lambda query_obj: query_obj.key
+    query_context.get_df_payload.side_effect = get_df_payload
+    return query_context
+
+
+@pytest.fixture
+def chart_data_command(mocker: MockerFixture) -> Any:
+    """
+    Return the payloads shared by the query context instead of running its queries.
+    """
+    command = mocker.patch(
+        "superset.commands.chart.data.batch_get_data_command.ChartDataCommand"
+    )
+
+    def run(query_context: Any) -> Any:
+        return {
+            "queries": [
+                query_context.df_payloads[query_obj.key]
+                for query_obj in query_context.queries
+            ]
+        }
+
+    command.side_effect = lambda query_context: mocker.MagicMock(
+        run=lambda: run(query_context)
+    )
+    # the mocked query contexts are used by the workers as is
+    mocker.patch(
+        "superset.commands.chart.data.batch_get_data_command.copy_query",
+        side_effect=lambda query_context, query_obj: lambda: (query_context, query_obj),
+    )
+    return command
+
+
+def test_run(
+    mocker: MockerFixture,
+    app_context: None,
+    chart_data_command: Any,
+) -> None:
+    """
+    Test that identical queries run once, and that cached queries are read at once.
+    """
+    calls: list[tuple[str, Any]] = []
+    query_contexts = [
+        make_query_context(mocker, "a", "b", calls=calls),
+        make_query_context(mocker, "c", calls=calls),
+        make_query_context(mocker, "a", calls=calls),
+    ]
+    cached = mocker.MagicMock()
+    get_many = mocker.patch(
+        "superset.commands.chart.data.batch_get_data_command.QueryCacheManager.get_many",
+        return_value={"c": cached},
+    )
+
+    results = dict(ChartDataBatchCommand(query_contexts).run())
+
+    get_many.assert_called_once()
+    assert sorted(get_many.call_args[0][0]) == ["a", "b", "c"]
+    assert sorted(calls, key=lambda call: call[0]) == [
+        ("a", None),
+        ("b", None),
+        ("c", cached),
+    ]
+    assert sorted(results) == [0, 1, 2]
+    assert [query["cache_key"] for query in results[0]["queries"]] == ["a", "b"]
+    assert results[0]["queries"][0] is results[2]["queries"][0]
+    assert results[1]["queries"][0]["form_data"]["form_data"] == {"keys": ("c",)}
+    assert "form_data" not in g
+
+
+def test_run_cached_first(
+    mocker: MockerFixture,
+    app_context: None,
+    chart_data_command: Any,
+) -> None:
+    """
+    Test that query contexts are yielded as soon as their queries are done.
+    """
+    query_contexts = [
+        make_query_context(mocker, "a"),
+        make_query_context(mocker, "b"),
+    ]
+    mocker.patch(
+        "superset.commands.chart.data.batch_get_data_command.QueryCacheManager.get_many",
+        return_value={"b": mocker.MagicMock()},
+    )
+
+    assert [index for index, _ in ChartDataBatchCommand(query_contexts).run()] == [
+        1,
+        0,
+    ]
+
+
+def test_run_failure(
+    mocker: MockerFixture,
+    app_context: None,
+    chart_data_command: Any,
+) -> None:
+    """
+    Test that a failing query only fails the query contexts using it.
+    """
+    query_contexts = [
+        make_query_context(mocker, "a", "error"),
+        make_query_context(mocker, "a"),
+        make_query_context(mocker, "error"),
+    ]
+    mocker.patch(
+        "superset.commands.chart.data.batch_get_data_command.QueryCacheManager.get_many",
+        return_value={},
+    )
+
+    results = dict(ChartDataBatchCommand(query_contexts).run())
+
+    assert str(results[0]) == "Error in error"
+    assert results[1]["queries"][0]["cache_key"] == "a"
+    assert results[2] is results[0]
+
+
+@pytest.mark.parametrize(
+    "app",
+    [{"CHART_DATA_BATCH_MAX_QUERIES_PER_DATABASE": 2}],
+    indirect=True,
+)
+def test_run_max_queries_per_database(
+    mocker: MockerFixture,
+    app_context: None,
+    chart_data_command: Any,
+) -> None:
+    """
+    Test the limit of queries running concurrently against the same database.
+    """
+    lock = threading.Lock()
+    running: dict[int, int] = {1: 0, 2: 0}
+    max_running: dict[int, int] = {1: 0, 2: 0}
+
+    def make_slow_query_context(key: str, database_id: int) -> Any:
+        query_context = make_query_context(mocker, key, database_id=database_id)
+        get_df_payload = query_context.get_df_payload.side_effect
+
+        def slow_get_df_payload(query_obj: Any) -> dict[str, Any]:
+            with lock:
+                running[database_id] += 1
+                max_running[database_id] = max(
+                    max_running[database_id], running[database_id]
+                )
+            time.sleep(0.05)
+            with lock:
+                running[database_id] -= 1
+            return get_df_payload(query_obj)
+
+        query_context.get_df_payload.side_effect = slow_get_df_payload
+        return query_context
+
+    query_contexts = [
+        make_slow_query_context(f"{database_id}-{i}", database_id)
+        for database_id in (1, 2)
+        for i in range(5)
+    ]
+    mocker.patch(
+        "superset.commands.chart.data.batch_get_data_command.QueryCacheManager.get_many",
+        return_value={},
+    )
+
+    results = dict(ChartDataBatchCommand(query_contexts).run())
+
+    assert len(results) == 10
+    assert max_running == {1: 2, 2: 2}
+
+
+def test_copy_query(mocker: MockerFixture) -> None:
+    """
+    Test that the workers use copies of the query context and query object, with
+    their ORM objects loaded again.
+    """
+    load_in_thread = mocker.patch(
+        "superset.commands.chart.data.batch_get_data_command.load_in_thread",
+        side_effect=lambda obj: lambda: mocker.MagicMock(loaded=obj),
+    )
+    query_context = make_query_context(mocker, "a")
+    query_context.df_payloads = {}
+    query_obj = query_context.queries[0]
+
+    query_context_copy, query_obj_copy = copy_query(query_context, query_obj)()
+
+    assert load_in_thread.call_count == 2
+    assert query_context_copy.datasource.loaded is query_context.datasource
+    assert query_context_copy.slice_.loaded is query_context.slice_
+    assert query_context_copy.df_payloads is query_context.df_payloads
+    assert query_context_copy.form_data == {"keys": ("a",)}
+    assert query_obj_copy is not query_obj
+    assert query_obj_copy.key == "a"
+    assert query_obj_copy.datasource is query_context_copy.datasource
@@ -201,3 +201,68 @@ def test_tables_without_catalog(
         cache=database_without_catalog.table_cache_enabled,
         cache_timeout=database_without_catalog.table_cache_timeout,
     )
+
+
+@pytest.mark.parametrize("app", [{"METADATA_CATALOG_INDEX": True}], indirect=True)
+def test_tables_from_index(
+    mocker: MockerFixture,
+    database_without_catalog: MockerFixture,
+) -> None:
+    """
+    Test that the tables are read from the metadata catalog when they're indexed.
+    """
+    MetadataCatalogDAO = mocker.patch(
+        "superset.commands.database.tables.MetadataCatalogDAO"
+    )
+    MetadataCatalogDAO.find_tables.return_value = (
+        3,
+        [
+            mocker.MagicMock(type="table"),
+            mocker.MagicMock(type="view"),
+        ],
+    )
+    table, view = MetadataCatalogDAO.find_tables.return_value[1]
+    table.name = "table2"
+    view.name = "view1"
+
+    db = mocker.patch("superset.commands.database.tables.db")
+    dataset = mocker.MagicMock()
+    dataset.name = "table2"
+    dataset.extra_dict = {"foo": "bar"}
+    db.session.query().filter().options().all.return_value = [dataset]
+
+    payload = TablesDatabaseCommand(
+        1, None, "schema1", False, search="t", page=1, page_size=2
+    ).run()
+    assert payload == {
+        "count": 3,
+        "result": [
+            {"value": "table2", "type": "table", "extra": {"foo": "bar"}},
+            {"value": "view1", "type": "view"},
+        ],
+    }
+    MetadataCatalogDAO.find_tables.assert_called_with(
+        database_without_catalog,
+        None,
+        "schema1",
+        search="t",
+        search_mode="prefix",
+        page=1,
+        page_size=2,
+    )
+    database_without_catalog.get_all_table_names_in_schema.assert_not_called()
+
+    # the database is inspected when the schema isn't indexed
+    MetadataCatalogDAO.find_tables.return_value = None
+    mocker.patch.object(
+        security_manager,
+        "get_datasources_accessible_by_user",
+        side_effect=lambda datasource_names, **kwargs: datasource_names,
+    )
+    payload = TablesDatabaseCommand(
+        1, None, "schema1", False, search="T", page=1, page_size=1
+    ).run()
+    assert payload == {
+        "count": 2,
+        "result": [{"value": "table2", "type": "table", "extra": {"foo": "bar"}}],
+    }
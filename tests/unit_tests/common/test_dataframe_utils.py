@@ -48,3 +48,29 @@ def test_is_datetime_series():
             datetime.datetime(2018, 1, 1), datetime.datetime(2018, 2, 1)
         ).to_series()
     )
+
+
+def test_dataframe_to_arrow():
+    df = pd.DataFrame(
+        {
+            "a": [1.0, None],
+            "b": ["x", None],
+            "__timestamp": pd.to_datetime(["2018-01-01", None]),
+            "c": pd.array([1, None], dtype="Int64"),
+            "d": [datetime.date(2018, 1, 1), None],
+        },
+        index=pd.Index([3, 4], name="i"),
+    )
+    blob = dataframe_utils.dataframe_to_arrow(df, "zstd")
+    assert isinstance(blob, bytes)
+    pd.testing.assert_frame_equal(dataframe_utils.dataframe_from_arrow(blob), df)
+
+
+def test_dataframe_to_arrow_unsupported():
+    assert dataframe_utils.dataframe_to_arrow(pd.DataFrame({0: [1]}), "lz4") is None
+    assert (
+        dataframe_utils.dataframe_to_arrow(pd.DataFrame({"a": [[1, 2]]}), "lz4") is None
+    )
+    assert (
+        dataframe_utils.dataframe_to_arrow(pd.DataFrame({"a": [1, "a"]}), "lz4") is None
+    )
@@ -0,0 +1,268 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=redefined-outer-name
+
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from flask_caching import Cache
+from freezegun import freeze_time
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+from pytest_mock import MockerFixture
+
+from superset.app import SupersetApp
+from superset.common.db_query_status import QueryStatus
+from superset.common.utils.query_cache_manager import QueryCacheManager
+from superset.constants import CacheRegion
+from superset.distributed_lock import KeyValueDistributedLock
+from superset.exceptions import CreateKeyValueDistributedLockFailedException
+from superset.utils.cache import LocalCache
+
+ARROW_CONFIG = {
+    "QUERY_CACHE_ARROW_COMPRESSION": "zstd",
+    "QUERY_CACHE_LOCAL_MAX_SIZE": 1024 * 1024,
+}
+SINGLE_FLIGHT_CONFIG = {
+    "QUERY_CACHE_SINGLE_FLIGHT": True,
+    "QUERY_CACHE_SINGLE_FLIGHT_TIMEOUT": 60,
+    "QUERY_CACHE_STALE_TIMEOUT": 600,
+}
+
+
+@pytest.fixture
+def data_cache(mocker: MockerFixture, app: SupersetApp) -> Cache:
+    cache = Cache(app, config={"CACHE_TYPE": "SimpleCache"})
+    mocker.patch.dict(
+        "superset.common.utils.query_cache_manager._cache",
+        {CacheRegion.DATA: cache},
+    )
+    return cache
+
+
+@pytest.fixture
+def local_cache(mocker: MockerFixture) -> LocalCache:
+    local_cache = LocalCache()
+    mocker.patch(
+        "superset.common.utils.query_cache_manager._local_cache",
+        local_cache,
+    )
+    return local_cache
+
+
+@pytest.fixture
+def lock_taken(mocker: MockerFixture) -> Any:
+    return mocker.patch(
+        "superset.common.utils.query_cache_manager.KeyValueDistributedLock",
+        side_effect=CreateKeyValueDistributedLockFailedException("Lock already taken"),
+    )
+
+
+def set_value(key: str = "key", timeout: int = 60) -> None:
+    QueryCacheManager.set(
+        key,
+        {"df": DataFrame({"a": [1]}), "query": "SELECT 1"},
+        timeout=timeout,
+        region=CacheRegion.DATA,
+    )
+
+
+@pytest.mark.parametrize("app", [SINGLE_FLIGHT_CONFIG], indirect=True)
+def test_stale_value(mocker: MockerFixture, data_cache: Cache) -> None:
+    """
+    Test that values are kept in the cache after their timeout, and marked as stale.
+    """
+    with freeze_time("2024-01-01 00:00:00"):
+        set_value(timeout=60)
+
+    with freeze_time("2024-01-01 00:00:59"):
+        query_cache = QueryCacheManager.get("key", CacheRegion.DATA)
+        assert query_cache.is_loaded
+        assert not query_cache.is_stale
+
+    with freeze_time("2024-01-01 00:01:01"):
+        query_cache = QueryCacheManager.get("key", CacheRegion.DATA)
+        assert query_cache.is_loaded
+        assert query_cache.is_stale
+
+        # refreshing the value clears the stale value
+        query_result = mocker.MagicMock(
+            status=QueryStatus.SUCCESS,
+            df=DataFrame({"a": [2]}),
+            query="SELECT 2",
+        )
+        query_cache.set_query_result("key", query_result, region=CacheRegion.DATA)
+        assert not query_cache.is_stale
+        assert not query_cache.is_cached
+
+
+@pytest.mark.parametrize("app", [SINGLE_FLIGHT_CONFIG], indirect=True)
+def test_single_flight_lock(data_cache: Cache) -> None:
+    """
+    Test that the first worker missing a key holds the lock while running the query.
+    """
+    query_cache = QueryCacheManager.get("key", CacheRegion.DATA)
+    with query_cache.single_flight("key", CacheRegion.DATA):
+        assert not query_cache.is_loaded
+        with pytest.raises(CreateKeyValueDistributedLockFailedException):
+            with KeyValueDistributedLock("query_cache", key="key"):
+                pass
+
+    # the lock is released
+    with KeyValueDistributedLock("query_cache", key="key"):
+        pass
+
+
+@pytest.mark.parametrize("app", [SINGLE_FLIGHT_CONFIG], indirect=True)
+def test_single_flight_lock_expiration(data_cache: Cache) -> None:
+    """
+    Test that the lock is held for the single flight timeout, while the other
+    workers wait for the query.
+    """
+    query_cache = QueryCacheManager.get("key", CacheRegion.DATA)
+    with freeze_time("2024-01-01 00:00:00") as frozen_time:
+        with query_cache.single_flight("key", CacheRegion.DATA):
+            frozen_time.tick(timedelta(seconds=59))
+            with pytest.raises(CreateKeyValueDistributedLockFailedException):
+                with KeyValueDistributedLock("query_cache", key="key"):
+                    pass
+
+            frozen_time.tick(timedelta(seconds=2))
+            with KeyValueDistributedLock("query_cache", key="key"):
+                pass
+
+
+@pytest.mark.parametrize("app", [SINGLE_FLIGHT_CONFIG], indirect=True)
+def test_single_flight_wait(
+    mocker: MockerFixture,
+    data_cache: Cache,
+    lock_taken: Any,
+) -> None:
+    """
+    Test that the other workers wait for the query to be cached.
+    """
+    sleep = mocker.patch(
+        "superset.common.utils.query_cache_manager.time.sleep",
+        side_effect=lambda _: set_value() if sleep.call_count == 3 else None,
+    )
+
+    query_cache = QueryCacheManager.get("key", CacheRegion.DATA)
+    with query_cache.single_flight("key", CacheRegion.DATA):
+        assert query_cache.is_loaded
+        assert query_cache.query == "SELECT 1"
+
+    assert sleep.call_count == 3
+
+
+@pytest.mark.parametrize(
+    "app",
+    [{**SINGLE_FLIGHT_CONFIG, "QUERY_CACHE_SINGLE_FLIGHT_TIMEOUT": 0}],
+    indirect=True,
+)
+def test_single_flight_timeout(data_cache: Cache, lock_taken: Any) -> None:
+    """
+    Test that the other workers run the query themselves after the timeout.
+    """
+    query_cache = QueryCacheManager.get("key", CacheRegion.DATA)
+    with query_cache.single_flight("key", CacheRegion.DATA):
+        assert not query_cache.is_loaded
+
+
+@pytest.mark.parametrize("app", [SINGLE_FLIGHT_CONFIG], indirect=True)
+def test_single_flight_stale(data_cache: Cache, lock_taken: Any) -> None:
+    """
+    Test that the other workers serve the stale value while it's being refreshed.
+    """
+    with freeze_time("2024-01-01 00:00:00"):
+        set_value(timeout=60)
+
+    with freeze_time("2024-01-01 00:05:00"):
+        query_cache = QueryCacheManager.get("key", CacheRegion.DATA)
+        assert query_cache.is_stale
+        with query_cache.single_flight("key", CacheRegion.DATA):
+            assert query_cache.is_loaded
+            assert not query_cache.is_stale
+
+
+@pytest.mark.parametrize("app", [SINGLE_FLIGHT_CONFIG], indirect=True)
+def test_single_flight_force_query(data_cache: Cache, lock_taken: Any) -> None:
+    """
+    Test that forced queries don't wait for other workers.
+    """
+    query_cache = QueryCacheManager.get("key", CacheRegion.DATA, force_query=True)
+    with query_cache.single_flight("key", CacheRegion.DATA, force_query=True):
+        assert not query_cache.is_loaded
+
+    lock_taken.assert_not_called()
+
+
+@pytest.mark.parametrize("app", [ARROW_CONFIG], indirect=True)
+def test_arrow_value(data_cache: Cache, local_cache: LocalCache) -> None:
+    """
+    Test that dataframes are cached as Arrow.
+    """
+    set_value()
+    assert isinstance(data_cache.get("key")["df"], bytes)
+
+    query_cache = QueryCacheManager.get("key", CacheRegion.DATA)
+    assert query_cache.is_loaded
+    assert_frame_equal(query_cache.df, DataFrame({"a": [1]}))
+
+
+def test_pickled_value(data_cache: Cache, local_cache: LocalCache) -> None:
+    """
+    Test that dataframes are cached as is by default, and not kept in process.
+    """
+    set_value()
+    assert isinstance(data_cache.get("key")["df"], DataFrame)
+
+    query_cache = QueryCacheManager.get("key", CacheRegion.DATA)
+    assert_frame_equal(query_cache.df, DataFrame({"a": [1]}))
+    assert local_cache.size == 0
+
+
+@pytest.mark.parametrize("app", [ARROW_CONFIG], indirect=True)
+def test_local_cache(
+    mocker: MockerFixture,
+    data_cache: Cache,
+    local_cache: LocalCache,
+) -> None:
+    """
+    Test that values are read from the in-process cache first.
+    """
+    set_value()
+    get = mocker.spy(data_cache, "get")
+    get_many = mocker.spy(data_cache, "get_many")
+
+    first = QueryCacheManager.get("key", CacheRegion.DATA)
+    second = QueryCacheManager.get("key", CacheRegion.DATA)
+    assert QueryCacheManager.get_many(["key"], CacheRegion.DATA)["key"].is_loaded
+    get.assert_not_called()
+    get_many.assert_not_called()
+    # the dataframe is decoded on each read
+    assert first.df is not second.df
+
+    # values read from the backend are kept in process
+    local_cache.clear()
+    QueryCacheManager.get("key", CacheRegion.DATA)
+    QueryCacheManager.get("key", CacheRegion.DATA)
+    get.assert_called_once()
+
+    QueryCacheManager.delete("key", CacheRegion.DATA)
+    assert not QueryCacheManager.has("key", CacheRegion.DATA)
+    assert local_cache.size == 0
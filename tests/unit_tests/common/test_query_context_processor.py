@@ -0,0 +1,153 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=redefined-outer-name
+
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from flask_caching import Cache
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+from pytest_mock import MockerFixture
+
+from superset.app import SupersetApp
+from superset.common.db_query_status import QueryStatus
+from superset.common.query_context_processor import QueryContextProcessor
+from superset.common.query_object import QueryObject
+from superset.constants import CacheRegion
+from superset.models.helpers import QueryResult
+
+RAW_RESULTS_CONFIG = {"QUERY_CACHE_RAW_RESULTS": True}
+RENAME = {"operation": "rename", "options": {"columns": {"a": "b"}}}
+
+
+@pytest.fixture
+def data_cache(mocker: MockerFixture, app: SupersetApp) -> Cache:
+    cache = Cache(app, config={"CACHE_TYPE": "SimpleCache"})
+    mocker.patch.dict(
+        "superset.common.utils.query_cache_manager._cache",
+        {CacheRegion.DATA: cache},
+    )
+    return cache
+
+
+@pytest.fixture
+def datasource(mocker: MockerFixture) -> Any:
+    mocker.patch(
+        "superset.common.query_context_processor.security_manager.get_rls_cache_key",
+        return_value=[],
+    )
+    datasource = mocker.MagicMock(uid="1__table", changed_on=None, offset=0)
+    datasource.get_extra_cache_keys.return_value = []
+    datasource.get_column.return_value = None
+    datasource.query.side_effect = lambda query_obj: QueryResult(
+        df=DataFrame({"a": [1, 2]}),
+        query="SELECT a FROM t",
+        duration=timedelta(0),
+    )
+    return datasource
+
+
+def make_processor(mocker: MockerFixture, datasource: Any) -> QueryContextProcessor:
+    query_context = mocker.MagicMock(force=False, datasource=datasource)
+    query_context.get_cache_timeout.return_value = 60
+    return QueryContextProcessor(query_context)
+
+
+def test_raw_result_cache_key(datasource: Any) -> None:
+    """
+    Test that the raw result cache key doesn't depend on the post-processing.
+    """
+    query_object = QueryObject(datasource=datasource, columns=["a"])
+    post_processed = QueryObject(
+        datasource=datasource,
+        columns=["a"],
+        post_processing=[RENAME],
+    )
+    other = QueryObject(datasource=datasource, columns=["a"], row_limit=10)
+
+    assert query_object.cache_key() != post_processed.cache_key()
+    assert query_object.raw_result_cache_key() == post_processed.raw_result_cache_key()
+    assert query_object.raw_result_cache_key() != other.raw_result_cache_key()
+    assert query_object.raw_result_cache_key() != query_object.cache_key()
+
+
+@pytest.mark.parametrize("app", [RAW_RESULTS_CONFIG], indirect=True)
+def test_get_query_result_raw_results(
+    mocker: MockerFixture,
+    data_cache: Cache,
+    datasource: Any,
+) -> None:
+    """
+    Test that query objects differing only in their post-processing run one query.
+    """
+    processor = make_processor(mocker, datasource)
+
+    result = processor.get_query_result(
+        QueryObject(datasource=datasource, columns=["a"])
+    )
+    assert_frame_equal(result.df, DataFrame({"a": [1, 2]}))
+
+    result = processor.get_query_result(
+        QueryObject(datasource=datasource, columns=["a"], post_processing=[RENAME])
+    )
+    assert_frame_equal(result.df, DataFrame({"b": [1, 2]}))
+    assert result.query == "SELECT a FROM t;\n\n"
+    datasource.query.assert_called_once()
+
+    # forcing the query skips the cache
+    processor._query_context.force = True  # pylint: disable=protected-access
+    processor.get_query_result(QueryObject(datasource=datasource, columns=["a"]))
+    assert datasource.query.call_count == 2
+
+
+@pytest.mark.parametrize("app", [RAW_RESULTS_CONFIG], indirect=True)
+def test_get_query_result_raw_results_failed(
+    mocker: MockerFixture,
+    data_cache: Cache,
+    datasource: Any,
+) -> None:
+    """
+    Test that failed queries are not cached.
+    """
+    datasource.query.side_effect = lambda query_obj: QueryResult(
+        df=DataFrame(),
+        query="SELECT a FROM t",
+        duration=timedelta(0),
+        status=QueryStatus.FAILED,
+    )
+    processor = make_processor(mocker, datasource)
+
+    for _ in range(2):
+        processor.get_query_result(QueryObject(datasource=datasource, columns=["a"]))
+    assert datasource.query.call_count == 2
+
+
+def test_get_query_result_no_raw_results(
+    mocker: MockerFixture,
+    data_cache: Cache,
+    datasource: Any,
+) -> None:
+    """
+    Test that raw results are not cached by default.
+    """
+    processor = make_processor(mocker, datasource)
+
+    for _ in range(2):
+        processor.get_query_result(QueryObject(datasource=datasource, columns=["a"]))
+    assert datasource.query.call_count == 2
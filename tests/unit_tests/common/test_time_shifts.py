@@ -14,9 +14,12 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+from typing import Any
+
 from pandas import DataFrame, Series, Timestamp
 from pandas.testing import assert_frame_equal
-from pytest import fixture, mark
+from pytest import fixture, mark, raises
+from pytest_mock import MockerFixture
 
 from superset.common.chart_data import ChartDataResultFormat, ChartDataResultType
 from superset.common.query_context import QueryContext
@@ -185,3 +188,152 @@ def test_join_offset_dfs_with_month_granularity():
     )
 
     assert_frame_equal(expected, result)
+
+
+class TimeOffsetQueryObject:
+    """
+    A minimal query object for testing `processing_time_offsets`.
+    """
+
+    def __init__(self, time_offsets: list[str]) -> None:
+        self.time_offsets = time_offsets
+        self.time_range = "2020-01-01 : 2021-01-01"
+        self.time_shift = None
+        self.extras: dict[str, str] = {}
+        self.filter: list[dict[str, str]] = []
+        self.columns = ["country"]
+        self.metrics = ["sum__num"]
+        self.granularity = "ds"
+        self.row_limit = None
+        self.row_offset = 0
+        self.post_processing: list[dict[str, str]] = []
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"from_dttm": self.from_dttm}
+
+
+def test_processing_time_offsets(mocker: MockerFixture, app_context: None) -> None:
+    """
+    Test that cache misses are queried concurrently, and that the results are joined
+    in the order of the offsets.
+    """
+    datasource = mocker.MagicMock()
+    datasource.query.side_effect = lambda query_obj: mocker.MagicMock(
+        df=DataFrame({"country": ["US"], "sum__num": [query_obj["from_dttm"].year]}),
+        query=f"SELECT {query_obj['from_dttm'].year}",
+    )
+    processor = QueryContextProcessor(mocker.MagicMock(datasource=datasource))
+    mocker.patch.object(
+        processor,
+        "query_cache_key",
+        side_effect=lambda query_obj, time_offset, time_grain: time_offset,
+    )
+    mocker.patch.object(processor, "get_cache_timeout", return_value=100)
+    mocker.patch.object(processor, "normalize_df", side_effect=lambda df, _: df)
+    join_offset_dfs = mocker.patch.object(processor, "join_offset_dfs")
+
+    cached = mocker.MagicMock(
+        is_loaded=True,
+        is_stale=False,
+        df=DataFrame({"country": ["US"], "sum__num__1 year ago": [0]}),
+        query="SELECT cached",
+    )
+    missing = mocker.MagicMock(is_loaded=False)
+    mocker.patch(
+        "superset.common.query_context_processor.QueryCacheManager.get",
+        side_effect=lambda key, region, force: (
+            cached if key == "1 year ago" else missing
+        ),
+    )
+
+    df = DataFrame({"country": ["US"], "sum__num": [1]})
+    query_object = TimeOffsetQueryObject(["2 years ago", "1 year ago", "3 years ago"])
+    result = processor.processing_time_offsets(df, query_object)
+
+    assert result["queries"] == ["SELECT 2018", "SELECT cached", "SELECT 2017"]
+    assert result["cache_keys"] == [None, "1 year ago", None]
+    assert datasource.query.call_count == 2
+    assert [call.kwargs["key"] for call in missing.set.call_args_list] == [
+        "2 years ago",
+        "3 years ago",
+    ]
+
+    offset_dfs = join_offset_dfs.call_args[0][1]
+    assert list(offset_dfs) == ["2 years ago", "1 year ago", "3 years ago"]
+    assert offset_dfs["3 years ago"].to_dict(orient="records") == [
+        {"country": "US", "sum__num__3 years ago": 2017}
+    ]
+
+
+def test_processing_time_offsets_failure(
+    mocker: MockerFixture, app_context: None
+) -> None:
+    """
+    Test that the offsets that succeed are cached when another one fails.
+    """
+
+    def query(query_obj: dict[str, Any]) -> Any:
+        if query_obj["from_dttm"].year == 2018:
+            raise Exception("Error")
+        return mocker.MagicMock(df=DataFrame(), query="SELECT 1")
+
+    datasource = mocker.MagicMock()
+    datasource.query.side_effect = query
+    processor = QueryContextProcessor(mocker.MagicMock(datasource=datasource))
+    mocker.patch.object(
+        processor,
+        "query_cache_key",
+        side_effect=lambda query_obj, time_offset, time_grain: time_offset,
+    )
+    mocker.patch.object(processor, "get_cache_timeout", return_value=100)
+    cache = mocker.MagicMock(is_loaded=False)
+    mocker.patch(
+        "superset.common.query_context_processor.QueryCacheManager.get",
+        return_value=cache,
+    )
+
+    df = DataFrame({"country": ["US"], "sum__num": [1]})
+    query_object = TimeOffsetQueryObject(["1 year ago", "2 years ago"])
+    with raises(Exception, match="Error"):
+        processor.processing_time_offsets(df, query_object)
+
+    cache.set.assert_called_once()
+    assert cache.set.call_args.kwargs["key"] == "1 year ago"
+
+
+def test_processing_time_offsets_datasource(
+    mocker: MockerFixture, app_context: None
+) -> None:
+    """
+    Test that the workers don't use the datasource of the request, which belongs to
+    its session.
+    """
+    datasource = mocker.MagicMock()
+    worker_datasource = mocker.MagicMock()
+    worker_datasource.query.return_value = mocker.MagicMock(
+        df=DataFrame(), query="SELECT 1"
+    )
+    load_in_thread = mocker.patch(
+        "superset.common.query_context_processor.load_in_thread",
+        return_value=lambda: worker_datasource,
+    )
+    processor = QueryContextProcessor(mocker.MagicMock(datasource=datasource))
+    mocker.patch.object(
+        processor,
+        "query_cache_key",
+        side_effect=lambda query_obj, time_offset, time_grain: time_offset,
+    )
+    mocker.patch.object(processor, "get_cache_timeout", return_value=100)
+    mocker.patch.object(processor, "join_offset_dfs")
+    mocker.patch(
+        "superset.common.query_context_processor.QueryCacheManager.get",
+        return_value=mocker.MagicMock(is_loaded=False),
+    )
+
+    df = DataFrame({"country": ["US"], "sum__num": [1]})
+    query_object = TimeOffsetQueryObject(["1 year ago", "2 years ago"])
+    processor.processing_time_offsets(df, query_object)
+
+    load_in_thread.assert_called_once_with(datasource)
+    datasource.query.assert_not_called()
+    assert worker_datasource.query.call_count == 2
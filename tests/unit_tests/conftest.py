@@ -20,11 +20,13 @@ import importlib
 import os
 import unittest.mock
 from collections.abc import Iterator
+from pathlib import Path
 from typing import Any, Callable
 from unittest.mock import patch
 
 import pytest
 from _pytest.fixtures import SubRequest
+from flask_caching import Cache
 from pytest_mock import MockerFixture
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -34,7 +36,7 @@ from superset import security_manager
 from superset.app import SupersetApp
 from superset.common.chart_data import ChartDataResultType
 from superset.common.query_object_factory import QueryObjectFactory
-from superset.extensions import appbuilder, feature_flag_manager
+from superset.extensions import appbuilder, cache_manager, feature_flag_manager
 from superset.initialization import SupersetAppInitializer
 
 
@@ -140,6 +142,19 @@ def app_context(app: SupersetApp) -> Iterator[None]:
         yield
 
 
+@pytest.fixture
+def shared_cache(mocker: MockerFixture, app: SupersetApp, tmp_path: Path) -> Cache:
+    """
+    Use a cache shared by all the processes.
+    """
+    cache = Cache(
+        app,
+        config={"CACHE_TYPE": "FileSystemCache", "CACHE_DIR": str(tmp_path)},
+    )
+    mocker.patch.object(cache_manager, "_cache", cache)
+    return cache
+
+
 @pytest.fixture
 def full_api_access(mocker: MockerFixture) -> Iterator[None]:
     """
@@ -0,0 +1,176 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=import-outside-toplevel, redefined-outer-name, unused-argument
+
+from datetime import datetime, timedelta
+from typing import Any
+
+import pytest
+from freezegun import freeze_time
+from pytest_mock import MockerFixture
+from sqlalchemy.orm.session import Session
+
+from superset.daos.metadata_catalog import MetadataCatalogDAO
+from superset.models.metadata_catalog import MetadataCatalogEntryType as EntryType
+
+
+@pytest.fixture
+def database(mocker: MockerFixture, session: Session) -> Any:
+    """
+    Mock a database whose schemas and tables are indexed, accessible by the user.
+    """
+    from superset import db, security_manager
+    from superset.connectors.sqla.models import SqlaTable
+    from superset.models.core import Database
+    from superset.models.metadata_catalog import MetadataCatalogEntry
+
+    SqlaTable.metadata.create_all(session.get_bind())
+    MetadataCatalogEntry.metadata.create_all(session.get_bind())
+
+    mocker.patch.object(security_manager, "can_access_database", return_value=True)
+
+    database = Database(database_name="my_db", sqlalchemy_uri="sqlite://")
+    db.session.add(database)
+    db.session.flush()
+
+    MetadataCatalogDAO.sync(
+        database, None, None, [("main", EntryType.SCHEMA), ("dev", EntryType.SCHEMA)]
+    )
+    MetadataCatalogDAO.sync(
+        database,
+        None,
+        "main",
+        [
+            ("orders", EntryType.TABLE),
+            ("order_items", EntryType.TABLE),
+            ("customers", EntryType.TABLE),
+            ("Orders_2024", EntryType.VIEW),
+        ],
+    )
+    db.session.flush()
+    return database
+
+
+def names(indexed: Any) -> tuple[int, list[str]]:
+    count, entries = indexed
+    return count, [entry.name for entry in entries]
+
+
+def test_find(database: Any) -> None:
+    """
+    Test reading the schemas and tables, with searches and pages.
+    """
+    assert MetadataCatalogDAO.find_schemas(database, None) == {"main", "dev"}
+    assert names(MetadataCatalogDAO.find_tables(database, None, "main")) == (
+        4,
+        ["Orders_2024", "customers", "order_items", "orders"],
+    )
+    assert names(
+        MetadataCatalogDAO.find_tables(database, None, "main", search="ORDER")
+    ) == (3, ["Orders_2024", "order_items", "orders"])
+    assert names(
+        MetadataCatalogDAO.find_tables(database, None, "main", search="order_")
+    ) == (1, ["order_items"])
+    assert names(
+        MetadataCatalogDAO.find_tables(
+            database, None, "main", search="item", search_mode="contains"
+        )
+    ) == (1, ["order_items"])
+    assert names(
+        MetadataCatalogDAO.find_tables(database, None, "main", page=1, page_size=3)
+    ) == (4, ["orders"])
+
+    # the tables of the other schema weren't crawled
+    assert MetadataCatalogDAO.find_tables(database, None, "dev") is None
+
+
+def test_find_stale(database: Any) -> None:
+    """
+    Test that old entries aren't served.
+    """
+    with freeze_time(datetime.now() + timedelta(days=2)):
+        assert MetadataCatalogDAO.find_schemas(database, None) is None
+        assert MetadataCatalogDAO.find_tables(database, None, "main") is None
+
+
+def test_sync(database: Any) -> None:
+    """
+    Test that the entries are refreshed incrementally.
+    """
+    entries = MetadataCatalogDAO.find_stale_tables(database, None, "main", 10)
+    assert {entry.name for entry in entries} == {
+        "orders",
+        "order_items",
+        "customers",
+        "Orders_2024",
+    }
+    orders = next(entry for entry in entries if entry.name == "orders")
+    MetadataCatalogDAO.set_table_metadata(orders, {"name": "orders", "columns": []})
+
+    MetadataCatalogDAO.sync(
+        database,
+        None,
+        "main",
+        [
+            ("orders", EntryType.TABLE),
+            ("customers", EntryType.VIEW),
+            ("products", EntryType.TABLE),
+        ],
+    )
+    assert [
+        (entry.name, entry.type)
+        for entry in MetadataCatalogDAO.find_tables(database, None, "main")[1]
+    ] == [("customers", "view"), ("orders", "table"), ("products", "table")]
+    assert MetadataCatalogDAO.get_table_metadata(database, None, "main", "orders") == {
+        "name": "orders",
+        "columns": [],
+    }
+    assert (
+        MetadataCatalogDAO.get_table_metadata(database, None, "main", "products")
+        is None
+    )
+
+
+def test_find_tables_permissions(mocker: MockerFixture, database: Any) -> None:
+    """
+    Test that the tables are filtered by the permissions of their datasets.
+    """
+    from superset import db, security_manager
+    from superset.connectors.sqla.models import SqlaTable
+
+    dataset = SqlaTable(table_name="orders", schema="main", database=database)
+    other = SqlaTable(table_name="customers", schema="dev", database=database)
+    db.session.add_all([dataset, other])
+    db.session.flush()
+
+    mocker.patch.object(security_manager, "can_access_database", return_value=False)
+    mocker.patch.object(security_manager, "can_access", return_value=False)
+    user_view_menu_names = mocker.patch.object(
+        security_manager,
+        "user_view_menu_names",
+        side_effect=lambda permission: (
+            {dataset.perm, other.perm} if permission == "datasource_access" else set()
+        ),
+    )
+
+    assert names(MetadataCatalogDAO.find_tables(database, None, "main")) == (
+        1,
+        ["orders"],
+    )
+
+    user_view_menu_names.side_effect = lambda permission: set()
+    assert names(MetadataCatalogDAO.find_tables(database, None, "main")) == (0, [])
@@ -0,0 +1,158 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=redefined-outer-name, unused-argument
+
+from typing import Any
+
+import pytest
+from cachelib import SimpleCache
+from pytest_mock import MockerFixture
+from sqlalchemy.orm.session import Session
+
+from superset.app import SupersetApp
+from superset.connectors.sqla.models import SqlaTable, TableColumn
+from superset.daos.dashboard import DashboardDAO
+from superset.dashboards.cache import CHANGED_ON_CACHE_KEY
+from superset.extensions import cache_manager
+from superset.models.core import Database
+from superset.models.dashboard import Dashboard
+from superset.models.slice import Slice
+
+PAYLOAD_CACHE_CONFIG = {"DASHBOARD_PAYLOAD_CACHE": True}
+
+
+@pytest.fixture
+def cache(mocker: MockerFixture, app: SupersetApp) -> SimpleCache:
+    """
+    Back the default cache with an in-memory cache.
+    """
+    cache = SimpleCache()
+    mocker.patch.dict(app.extensions["cache"], {cache_manager.cache: cache})
+    return cache
+
+
+@pytest.fixture
+def dashboard(mocker: MockerFixture, session: Session) -> Dashboard:
+    """
+    Create a dashboard with a chart, bypassing the access checks.
+    """
+    engine = session.get_bind()
+    Dashboard.metadata.create_all(engine)  # pylint: disable=no-member
+
+    database = Database(database_name="my_database", sqlalchemy_uri="sqlite://")
+    dataset = SqlaTable(
+        table_name="t",
+        database=database,
+        columns=[TableColumn(column_name="a", type="INTEGER")],
+    )
+    session.add(dataset)
+    session.flush()
+    chart = Slice(
+        slice_name="my_chart",
+        datasource_type="table",
+        datasource_id=dataset.id,
+        viz_type="table",
+        params="{}",
+    )
+    dashboard = Dashboard(dashboard_title="my_dashboard", slices=[chart])
+    session.add(dashboard)
+    session.commit()
+
+    mocker.patch.object(DashboardDAO, "get_by_id_or_slug", return_value=dashboard)
+    return dashboard
+
+
+@pytest.mark.parametrize("app", [PAYLOAD_CACHE_CONFIG], indirect=True)
+def test_get_charts_cached(
+    mocker: MockerFixture,
+    client: Any,
+    full_api_access: None,
+    cache: SimpleCache,
+    dashboard: Dashboard,
+) -> None:
+    """
+    Test that the charts of a dashboard are cached and served with an ETag.
+    """
+    get_charts = mocker.spy(DashboardDAO, "get_charts_for_dashboard")
+    url = f"/api/v1/dashboard/{dashboard.id}/charts"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert [chart["slice_name"] for chart in response.json["result"]] == ["my_chart"]
+    etag = response.headers["ETag"]
+
+    response = client.get(url)
+    assert response.status_code == 200
+    get_charts.assert_called_once()
+
+    # the browser revalidates its copy
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    get_charts.assert_called_once()
+
+
+@pytest.mark.parametrize("app", [PAYLOAD_CACHE_CONFIG], indirect=True)
+def test_get_datasets_invalidated(
+    mocker: MockerFixture,
+    client: Any,
+    full_api_access: None,
+    cache: SimpleCache,
+    dashboard: Dashboard,
+    session: Session,
+) -> None:
+    """
+    Test that the cached datasets are refreshed when their columns change.
+    """
+    get_datasets = mocker.spy(DashboardDAO, "get_datasets_for_dashboard")
+    url = f"/api/v1/dashboard/{dashboard.id}/datasets"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    client.get(url)
+    get_datasets.assert_called_once()
+
+    # adding a column doesn't change the dataset itself
+    dataset = session.query(SqlaTable).one()
+    changed_on = dataset.changed_on
+    dataset.columns.append(TableColumn(column_name="b", type="INTEGER"))
+    session.commit()
+    assert dataset.changed_on == changed_on
+    assert cache.get(CHANGED_ON_CACHE_KEY) > changed_on
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert get_datasets.call_count == 2
+
+
+def test_get_charts_not_cached(
+    mocker: MockerFixture,
+    client: Any,
+    full_api_access: None,
+    cache: SimpleCache,
+    dashboard: Dashboard,
+) -> None:
+    """
+    Test that the payloads are not cached by default.
+    """
+    get_charts = mocker.spy(DashboardDAO, "get_charts_for_dashboard")
+    url = f"/api/v1/dashboard/{dashboard.id}/charts"
+
+    client.get(url)
+    response = client.get(url)
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+    assert get_charts.call_count == 2
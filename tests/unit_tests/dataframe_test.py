@@ -17,12 +17,30 @@
 # pylint: disable=unused-argument, import-outside-toplevel
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
 import pytest
 from pandas import Timestamp
 from pandas._libs.tslibs import NaT
 
-from superset.dataframe import df_to_records
+from superset.dataframe import df_to_json, df_to_records
 from superset.superset_typing import DbapiDescription
+from superset.utils import json
+
+MIXED_DF = pd.DataFrame(
+    {
+        "int": [1, 1239162456494753670, -3],
+        "float": [0.1, np.nan, np.inf],
+        "float32": np.array([0.1, 1, 2], dtype=np.float32),
+        "bool": [True, False, True],
+        "string": ["a", "émoji 😍", None],
+        "object": [b"bytes", {"key": 1}, 1239162456494753671],
+        "datetime": pd.to_datetime(
+            ["2020-01-01", "2021-01-01 12:00:00.5", None], format="ISO8601"
+        ),
+        "nullable": pd.array([1, None, 3], dtype="Int64"),
+    }
+)
 
 
 def test_df_to_records() -> None:
@@ -203,3 +221,61 @@ def test_max_pandas_timestamp(input_, expected) -> None:
     df = results.to_pandas_df()
 
     assert df_to_records(df) == expected
+
+
+def test_df_to_records_dtypes() -> None:
+    """
+    Test that the records hold the same values as ``DataFrame.to_dict``.
+    """
+    records = df_to_records(MIXED_DF)
+
+    assert records[0] == {
+        "int": 1,
+        "float": 0.1,
+        "float32": 0.10000000149011612,
+        "bool": True,
+        "string": "a",
+        "object": b"bytes",
+        "datetime": Timestamp("2020-01-01"),
+        "nullable": 1,
+    }
+    assert records[1]["int"] == "1239162456494753670"
+    assert np.isnan(records[1]["float"])
+    assert records[1]["nullable"] is None
+    assert records[2]["object"] == "1239162456494753671"
+    assert records[2]["datetime"] is NaT
+    assert [type(record["int"]) for record in records] == [int, str, int]
+
+
+def test_df_to_records_duplicate_columns() -> None:
+    df = pd.DataFrame([[1, 2, 3]], columns=["a", "b", "a"])
+    assert df_to_records(df) == [{"a": 3, "b": 2}]
+    assert df_to_records(pd.DataFrame(index=[0, 1])) == [{}, {}]
+
+
+@pytest.mark.parametrize(
+    "df",
+    [
+        MIXED_DF,
+        MIXED_DF.head(0),
+        pd.DataFrame([[1, 2, 3]], columns=["a", "b", "a"]),
+        pd.DataFrame({1: ["a"], 2: [2.5]}),
+        pd.DataFrame(index=[0, 1]),
+    ],
+)
+def test_df_to_json(df: pd.DataFrame) -> None:
+    """
+    Test that the JSON is the same as the one of the records.
+    """
+    records = df_to_records(df)
+
+    assert df_to_json(df) == json.dumps(
+        records, default=json.json_iso_dttm_ser, ignore_nan=True
+    )
+    assert df_to_json(df, default=json.json_int_dttm_ser) == json.dumps(
+        records, default=json.json_int_dttm_ser, ignore_nan=True
+    )
+    assert json.loads(df_to_json(df, orient="columns")) == {
+        str(column): [json.loads(json.dumps(record[column])) for record in records]
+        for column in dict.fromkeys(df.columns)
+    }
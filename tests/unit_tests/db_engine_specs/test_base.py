@@ -380,3 +380,70 @@ def test_unmask_encrypted_extra() -> None:
             },
         }
     )
+
+
+def test_fetch_data_batches(mocker: MockerFixture) -> None:
+    """
+    Test that `fetch_data_batches` fetches rows in batches, honoring the limit.
+    """
+    from superset.db_engine_specs.base import BaseEngineSpec
+
+    rows = [(i,) for i in range(10)]
+    cursor = mocker.MagicMock()
+    cursor.description = [("a", "INT")]
+    cursor.fetchmany.side_effect = lambda size: [rows.pop(0) for _ in rows[:size]]
+
+    batches = list(BaseEngineSpec.fetch_data_batches(cursor, 4, limit=7))
+
+    assert batches == [[(0,), (1,), (2,), (3,)], [(4,), (5,), (6,)]]
+    assert [call.args for call in cursor.fetchmany.call_args_list] == [(4,), (3,)]
+
+
+def test_fetch_data_batches_no_description(mocker: MockerFixture) -> None:
+    """
+    Test that `fetch_data_batches` returns nothing when the cursor has no results.
+    """
+    from superset.db_engine_specs.base import BaseEngineSpec
+
+    cursor = mocker.MagicMock()
+    cursor.description = None
+    cursor.fetchmany.side_effect = Exception("no results to fetch")
+
+    assert list(BaseEngineSpec.fetch_data_batches(cursor, 4)) == []
+    cursor.fetchmany.assert_called_once_with(4)
+
+
+def test_fetch_data_batches_late_description(mocker: MockerFixture) -> None:
+    """
+    Test that `fetch_data_batches` fetches rows when the driver only populates the
+    cursor description after the first fetch.
+    """
+    from superset.db_engine_specs.base import BaseEngineSpec
+
+    rows = [(1,), (2,)]
+    cursor = mocker.MagicMock()
+    cursor.description = None
+
+    def fetchmany(size: int) -> list[tuple[int]]:
+        cursor.description = [("a", "INT")]
+        return [rows.pop(0) for _ in rows[:size]]
+
+    cursor.fetchmany.side_effect = fetchmany
+
+    assert list(BaseEngineSpec.fetch_data_batches(cursor, 4)) == [[(1,), (2,)]]
+
+
+def test_fetch_data_batches_not_allowed(mocker: MockerFixture) -> None:
+    """
+    Test that specs that don't allow batches fetch everything through `fetch_data`.
+    """
+    from superset.db_engine_specs.base import BaseEngineSpec
+
+    class NoBatchesEngineSpec(BaseEngineSpec):
+        allows_fetch_data_batches = False
+
+    mocker.patch.object(NoBatchesEngineSpec, "fetch_data", return_value=[(1,), (2,)])
+
+    assert list(NoBatchesEngineSpec.fetch_data_batches(mocker.MagicMock(), 1)) == [
+        [(1,), (2,)]
+    ]
@@ -17,7 +17,9 @@
 
 # pylint: disable=invalid-name
 
+from datetime import timedelta
 from typing import Any
+from unittest.mock import ANY
 from uuid import UUID
 
 import pytest
@@ -31,7 +33,7 @@ from superset.distributed_lock.utils import get_key
 from superset.exceptions import CreateKeyValueDistributedLockFailedException
 from superset.key_value.types import JsonKeyValueCodec
 
-LOCK_VALUE: LockValue = {"value": True}
+LOCK_VALUE: LockValue = {"value": True, "owner": ANY}
 MAIN_KEY = get_key("ns", a=1, b=2)
 OTHER_KEY = get_key("ns2", a=1, b=2)
 
@@ -99,3 +101,26 @@ def test_key_value_distributed_lock_expired() -> None:
                 assert _get_lock(MAIN_KEY, session) is None
 
         assert _get_lock(MAIN_KEY, session) is None
+
+
+def test_key_value_distributed_lock_expired_taken() -> None:
+    """
+    Test that a lock is not released by its previous owner once expired, and taken
+    by someone else.
+    """
+    session = _get_other_session()
+    key = get_key("ns", a=1)
+
+    with freeze_time("2021-01-01") as frozen_time:
+        first = KeyValueDistributedLock("ns", lock_expiration=timedelta(hours=1), a=1)
+        first.__enter__()
+        frozen_time.tick(timedelta(minutes=30))
+        assert _get_lock(key, session) == LOCK_VALUE
+
+        frozen_time.tick(timedelta(hours=1))
+        with KeyValueDistributedLock("ns", a=1):
+            owner = _get_lock(key, session)["owner"]
+            first.__exit__(None, None, None)
+            assert _get_lock(key, session)["owner"] == owner
+
+        assert _get_lock(key, session) is None
@@ -0,0 +1,97 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from unittest.mock import Mock
+
+from sqlalchemy import create_engine
+
+from superset.extensions.engine_manager import EngineKey, EngineManager
+from superset.stats_logger import DummyStatsLogger
+
+
+def get_engine_manager(max_engines: int = 100) -> EngineManager:
+    app = Mock()
+    app.config = {
+        "DB_ENGINE_POOL_ENABLED": True,
+        "DB_ENGINE_POOL_MAX_ENGINES": max_engines,
+        "DB_ENGINE_POOL_SIZE": 2,
+        "DB_ENGINE_POOL_MAX_OVERFLOW": 3,
+        "DB_ENGINE_POOL_RECYCLE": 60,
+        "DB_ENGINE_POOL_TIMEOUT": 5,
+        "STATS_LOGGER": DummyStatsLogger(),
+    }
+    engine_manager = EngineManager()
+    engine_manager.init_app(app)
+    return engine_manager
+
+
+def test_get_engine_reuses_engines() -> None:
+    engine_manager = get_engine_manager()
+    key = EngineKey(1, None, "public", "alice", "hash")
+    factory = Mock(side_effect=lambda: create_engine("sqlite://"))
+
+    engine = engine_manager.get_engine(key, factory)
+    assert engine_manager.get_engine(key, factory) is engine
+    assert engine_manager.get_engine(key._replace(schema="other"), factory) is not (
+        engine
+    )
+    assert factory.call_count == 2
+
+
+def test_get_engine_evicts_least_recently_used() -> None:
+    engine_manager = get_engine_manager(max_engines=2)
+    first = EngineKey(1, None, None, None, "a")
+    second = EngineKey(1, None, None, None, "b")
+    third = EngineKey(1, None, None, None, "c")
+
+    engine = engine_manager.get_engine(first, lambda: create_engine("sqlite://"))
+    engine_manager.get_engine(second, lambda: create_engine("sqlite://"))
+    engine_manager.get_engine(first, lambda: create_engine("sqlite://"))
+    engine_manager.get_engine(third, lambda: create_engine("sqlite://"))
+
+    assert set(engine_manager._engines) == {first, third}
+    assert engine_manager._engines[first] is engine
+
+
+def test_invalidate() -> None:
+    engine_manager = get_engine_manager()
+    engine_manager.get_engine(
+        EngineKey(1, None, None, None, "a"),
+        lambda: create_engine("sqlite://"),
+    )
+    engine_manager.get_engine(
+        EngineKey(2, None, None, None, "a"),
+        lambda: create_engine("sqlite://"),
+    )
+
+    engine_manager.invalidate(1)
+
+    assert [key.database_id for key in engine_manager._engines] == [2]
+
+
+def test_apply_pool_defaults() -> None:
+    engine_manager = get_engine_manager()
+    params = {"pool_size": 20}
+
+    engine_manager.apply_pool_defaults(params)
+
+    assert params == {
+        "pool_size": 20,
+        "max_overflow": 3,
+        "pool_recycle": 60,
+        "pool_timeout": 5,
+        "pool_pre_ping": True,
+    }
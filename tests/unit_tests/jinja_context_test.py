@@ -21,6 +21,7 @@ from typing import Any
 
 import pytest
 from freezegun import freeze_time
+from jinja2 import Environment
 from pytest_mock import MockerFixture
 from sqlalchemy.dialects import mysql
 from sqlalchemy.dialects.postgresql import dialect
@@ -32,8 +33,11 @@ from superset.exceptions import SupersetTemplateException
 from superset.jinja_context import (
     dataset_macro,
     ExtraCache,
+    JinjaTemplateProcessor,
     metric_macro,
+    render_plain_text,
     safe_proxy,
+    template_cache,
     TimeFilter,
     WhereInMacro,
 )
@@ -413,6 +417,61 @@ def test_where_in() -> None:
     assert where_in(["O'Malley's"]) == "('O''Malley''s')"
 
 
+def test_process_template_cache(mocker: MockerFixture, app_context: None) -> None:
+    """
+    Test that templates are compiled once, and rendered with the context of each
+    processor.
+    """
+    template_cache.clear()
+    database = Database(database_name="my_database", sqlalchemy_uri="sqlite://")
+    processors = [
+        JinjaTemplateProcessor(database=database, foo="bar"),
+        JinjaTemplateProcessor(database=database, foo="baz"),
+    ]
+    assert processors[0].env is processors[1].env
+    from_string = mocker.spy(processors[0].env, "from_string")
+
+    assert [
+        processor.process_template("SELECT '{{ foo }}'") for processor in processors
+    ] == ["SELECT 'bar'", "SELECT 'baz'"]
+    from_string.assert_called_once()
+
+
+def test_process_template_where_in(app_context: None) -> None:
+    """
+    Test that the ``where_in`` filter uses the dialect of each processor.
+    """
+    template = "{{ values | where_in }}"
+    values = ["a\\b"]
+
+    mysql_processor = JinjaTemplateProcessor(
+        database=Database(database_name="mysql", sqlalchemy_uri="mysql://"),
+    )
+    sqlite_processor = JinjaTemplateProcessor(
+        database=Database(database_name="sqlite", sqlalchemy_uri="sqlite://"),
+    )
+    assert mysql_processor.process_template(template, values=values) == "('a\\\\b')"
+    assert sqlite_processor.process_template(template, values=values) == "('a\\b')"
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "SELECT 1",
+        "SELECT 1\n",
+        "SELECT 1\n\n",
+        "SELECT\r\n1\r\n",
+        "SELECT\r1 -- {",
+        "",
+    ],
+)
+def test_render_plain_text(sql: str) -> None:
+    """
+    Test that templates without Jinja delimiters are rendered as Jinja would.
+    """
+    assert render_plain_text(sql) == Environment().from_string(sql).render()
+
+
 def test_dataset_macro(mocker: MockerFixture) -> None:
     """
     Test the ``dataset_macro`` macro.
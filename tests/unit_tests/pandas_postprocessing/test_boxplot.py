@@ -14,7 +14,11 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+from typing import Any
+
+import numpy as np
 import pytest
+from pandas import DataFrame
 
 from superset.exceptions import InvalidPostProcessingError
 from superset.utils.core import PostProcessingBoxplotWhiskerType
@@ -149,3 +153,95 @@ def test_boxplot_type_coercion():
         "region",
     }
     assert len(df) == 4
+
+
+def test_boxplot_statistics():
+    """
+    Test that the statistics of each group match the numpy functions.
+    """
+    rng = np.random.default_rng(0)
+    df = DataFrame(
+        {
+            "category": rng.choice(["a", "b", "c"], 1000),
+            "value": np.where(rng.random(1000) < 0.1, np.nan, rng.normal(size=1000)),
+        }
+    )
+    result = boxplot(
+        df=df,
+        groupby=["category"],
+        whisker_type=PostProcessingBoxplotWhiskerType.PERCENTILE,
+        metrics=["value"],
+        percentiles=[5, 95],
+    ).set_index("category")
+
+    for category, series in df.groupby("category")["value"]:
+        row = result.loc[category]
+        assert row["value__median"] == series.median()
+        assert row["value__mean"] == pytest.approx(series.mean())
+        assert row["value__q1"] == np.nanpercentile(series, 25, method="midpoint")
+        assert row["value__q3"] == np.nanpercentile(series, 75, method="midpoint")
+        assert row["value__min"] == np.nanpercentile(series, 5)
+        assert row["value__max"] == np.nanpercentile(series, 95)
+        assert row["value__count"] == len(series)
+        assert sorted(row["value__outliers"]) == sorted(
+            series[(series < row["value__min"]) | (series > row["value__max"])]
+        )
+
+
+def test_boxplot_tukey_outliers():
+    """
+    Test that the outliers above the whiskers are listed first, in the row order.
+    """
+    df = DataFrame(
+        {
+            "region": ["EU"] * 14 + ["Asia"] * 3,
+            "cars": [100, 1, 2, -50, 3, 4, 90, 5, 6, 7, 8, 9, 10, 11, 7, 8, 9],
+        }
+    )
+    result = boxplot(
+        df=df,
+        groupby=["region"],
+        whisker_type=PostProcessingBoxplotWhiskerType.TUKEY,
+        metrics=["cars"],
+    )
+    assert result.to_dict(orient="list") == {
+        "region": ["Asia", "EU"],
+        "cars__mean": [8.0, 206 / 14],
+        "cars__median": [8.0, 6.5],
+        "cars__max": [9, 11],
+        "cars__min": [7, 1],
+        "cars__q1": [7.5, 3.5],
+        "cars__q3": [8.5, 9.5],
+        "cars__count": [3, 14],
+        "cars__outliers": [[], [100, 90, -50]],
+    }
+
+
+@pytest.mark.parametrize("app", [{"BOXPLOT_QUANTILE_SAMPLE_SIZE": 1000}], indirect=True)
+def test_boxplot_sampled_quantiles(app: Any):
+    """
+    Test that the quantiles of large groups are estimated from a sample.
+    """
+    rng = np.random.default_rng(42)
+    df = DataFrame(
+        {
+            "category": ["small"] * 100 + ["large"] * 100000,
+            "value": rng.random(100100),
+        }
+    )
+    result = boxplot(
+        df=df,
+        groupby=["category"],
+        whisker_type=PostProcessingBoxplotWhiskerType.MINMAX,
+        metrics=["value"],
+    ).set_index("category")
+
+    small = df["value"][:100]
+    assert result.loc["small", "value__median"] == small.median()
+    large = df["value"][100:]
+    assert result.loc["large", "value__median"] != large.median()
+    assert result.loc["large", "value__median"] == pytest.approx(0.5, abs=0.05)
+    assert result.loc["large", "value__q1"] == pytest.approx(0.25, abs=0.05)
+    # the other statistics use all the values
+    assert result.loc["large", "value__count"] == 100000
+    assert result.loc["large", "value__max"] == large.max()
@@ -134,3 +134,16 @@ def test_histogram_with_some_non_numeric_values():
         histogram(data_with_non_numeric, "a", ["group"], bins)
     except ValueError as e:
         assert str(e) == "Column 'group' contains non-numeric values"
+
+
+def test_histogram_with_missing_groups():
+    data_with_missing_groups = DataFrame(
+        {
+            "group": ["A", None, "B", "B", "A", None],
+            "a": [1, 2, 3, 4, 5, 10],
+        }
+    )
+    result = histogram(data_with_missing_groups, "a", ["group"], bins)
+    assert result.values.tolist() == [["A", 1, 0, 1, 0, 0], ["B", 0, 2, 0, 0, 0]]
+    # the DataFrame is not modified
+    assert data_with_missing_groups["a"].tolist() == [1, 2, 3, 4, 5, 10]
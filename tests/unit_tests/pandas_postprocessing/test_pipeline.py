@@ -0,0 +1,160 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+from pytest_mock import MockerFixture
+
+from superset.exceptions import InvalidPostProcessingError
+from superset.initialization import SupersetAppInitializer
+from superset.utils import pandas_postprocessing as pp
+from superset.utils.pandas_postprocessing.pipeline import PostProcessingPipeline
+
+rng = np.random.default_rng(0)
+timeseries_df = pd.DataFrame(
+    {
+        "dttm": np.repeat(pd.date_range("2019-01-01", periods=30), 3),
+        "country": ["UK", "US", "FR"] * 30,
+        "sum_metric": rng.integers(0, 100, 90),
+        "count_metric": np.where(rng.random(90) < 0.1, np.nan, rng.random(90)),
+    }
+)
+
+POST_PROCESSING: list[dict[str, Any]] = [
+    {
+        "operation": "pivot",
+        "options": {
+            "index": ["dttm"],
+            "columns": ["country"],
+            "aggregates": {
+                "sum_metric": {"operator": "sum"},
+                "count_metric": {"operator": "sum"},
+            },
+            "drop_missing_columns": False,
+        },
+    },
+    {
+        "operation": "rolling",
+        "options": {
+            "rolling_type": "mean",
+            "window": 3,
+            "min_periods": 2,
+            "columns": {"sum_metric": "sum_metric", "count_metric": "count_metric"},
+        },
+    },
+    {
+        "operation": "cum",
+        "options": {"operator": "sum", "columns": {"sum_metric": "sum_metric"}},
+    },
+    {"operation": "contribution", "options": {"orientation": "row"}},
+    {"operation": "rename", "options": {"columns": {"sum_metric": "Sum"}, "level": 0}},
+    {"operation": "flatten"},
+]
+
+
+def run_sequentially(df: pd.DataFrame) -> pd.DataFrame:
+    for post_process in POST_PROCESSING:
+        operation = getattr(pp, post_process["operation"])
+        df = operation(df, **post_process.get("options", {}))
+    return df
+
+
+def test_plan():
+    """
+    Test that adjacent operations are fused.
+    """
+    steps = PostProcessingPipeline(POST_PROCESSING).steps
+    assert [step.name for step in steps] == [
+        "pivot",
+        "rolling+cum",
+        "contribution",
+        "rename+flatten",
+    ]
+
+    # the columns of the rolling window are not replaced
+    rolling = {**POST_PROCESSING[1], "options": {**POST_PROCESSING[1]["options"]}}
+    rolling["options"]["columns"] = {"sum_metric": "sum_metric_rolling"}
+    steps = PostProcessingPipeline([rolling, POST_PROCESSING[2]]).steps
+    assert [step.name for step in steps] == ["rolling", "cum"]
+
+
+@pytest.mark.parametrize("copy_on_write", [False, True])
+def test_run(copy_on_write: bool):
+    """
+    Test that the pipeline returns the same results as the operations, without
+    modifying the DataFrame.
+    """
+    df = timeseries_df.copy()
+    expected = run_sequentially(timeseries_df.copy())
+
+    pipeline = PostProcessingPipeline(POST_PROCESSING)
+    with pd.option_context("mode.copy_on_write", copy_on_write):
+        assert_frame_equal(pipeline.run(df), expected)
+    assert_frame_equal(df, timeseries_df)
+    assert pipeline.stats is None
+
+
+@pytest.mark.parametrize("enabled", [False, True])
+def test_copy_on_write(mocker: MockerFixture, enabled: bool):
+    """
+    Test that the copy-on-write mode of pandas is enabled when the app starts.
+    """
+    app = mocker.MagicMock(config={"POST_PROCESSING_COPY_ON_WRITE": enabled})
+    with pd.option_context("mode.copy_on_write", False):
+        SupersetAppInitializer(app).configure_pandas()
+        assert pd.get_option("mode.copy_on_write") is enabled
+
+
+def test_run_missing_columns():
+    """
+    Test that the fused operations report missing columns.
+    """
+    pipeline = PostProcessingPipeline(POST_PROCESSING[1:3])
+    with pytest.raises(InvalidPostProcessingError):
+        pipeline.run(timeseries_df[["dttm", "count_metric"]])
+
+
+@pytest.mark.parametrize("app", [{"POST_PROCESSING_STATS": True}], indirect=True)
+def test_run_stats(app: Any):
+    """
+    Test that the duration of the steps and the peak memory are reported.
+    """
+    pipeline = PostProcessingPipeline(POST_PROCESSING)
+    pipeline.run(timeseries_df)
+
+    assert [step["operation"] for step in pipeline.stats["steps"]] == [
+        "pivot",
+        "rolling+cum",
+        "contribution",
+        "rename+flatten",
+    ]
+    assert pipeline.stats["duration"] >= sum(
+        step["duration"] for step in pipeline.stats["steps"]
+    )
+    assert pipeline.stats["peak_memory"] > 0
+
+
+@pytest.mark.parametrize(
+    "post_processing",
+    [[{"options": {}}], [{"operation": "foo"}]],
+)
+def test_invalid_operation(post_processing: list[dict[str, Any]]):
+    with pytest.raises(InvalidPostProcessingError):
+        PostProcessingPipeline(post_processing)
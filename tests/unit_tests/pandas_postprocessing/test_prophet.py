@@ -14,18 +14,54 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from importlib.util import find_spec
+from typing import Any
 
 import pandas as pd
 import pytest
+from flask import g
+from flask_caching import Cache
+from pytest_mock import MockerFixture
 
+from superset.app import SupersetApp
 from superset.exceptions import InvalidPostProcessingError
 from superset.utils.core import DTTM_ALIAS
 from superset.utils.pandas_postprocessing import prophet
 from tests.unit_tests.fixtures.dataframes import prophet_df
 
 
+def fit_and_predict(df: pd.DataFrame, periods: int, freq: str, **kwargs: Any) -> Any:
+    """
+    Forecast the last value of a series, without `prophet`.
+    """
+    future = pd.date_range(df["ds"].iloc[0], periods=len(df) + periods, freq=freq)
+    last = df["y"].iloc[-1]
+    forecast = pd.DataFrame(
+        {"ds": future, "yhat": last, "yhat_lower": last - 1, "yhat_upper": last + 1}
+    )
+    return forecast.join(df.set_index("ds"), on="ds").set_index(["ds"])
+
+
+@pytest.fixture
+def fit(mocker: MockerFixture) -> Any:
+    return mocker.patch(
+        "superset.utils.pandas_postprocessing.prophet._prophet_fit_and_predict",
+        side_effect=fit_and_predict,
+    )
+
+
+@pytest.fixture
+def data_cache(mocker: MockerFixture, app: SupersetApp) -> Cache:
+    cache = Cache(app, config={"CACHE_TYPE": "SimpleCache"})
+    mocker.patch(
+        "superset.utils.pandas_postprocessing.prophet.cache_manager",
+        data_cache=cache,
+    )
+    return cache
+
+
 def test_prophet_valid():
     df = prophet(df=prophet_df, time_grain="P1M", periods=3, confidence_interval=0.9)
     columns = {column for column in df.columns}
@@ -184,3 +220,72 @@ def test_prophet_incorrect_time_grain():
             periods=10,
             confidence_interval=0.8,
         )
+
+
+def test_prophet_cached(fit: Any, data_cache: Cache) -> None:
+    """
+    Test that forecasts are cached by series, data and parameters.
+    """
+    df = prophet(df=prophet_df, time_grain="P1Y", periods=2, confidence_interval=0.9)
+    assert list(df.columns) == [
+        DTTM_ALIAS,
+        "a__yhat",
+        "a__yhat_lower",
+        "a__yhat_upper",
+        "a",
+        "b__yhat",
+        "b__yhat_lower",
+        "b__yhat_upper",
+        "b",
+    ]
+    assert len(df) == 6
+    assert df["b__yhat"].tolist() == [3.95] * 6
+    assert fit.call_count == 2
+
+    # the series are not fitted again
+    cached_df = prophet(
+        df=prophet_df, time_grain="P1Y", periods=2, confidence_interval=0.9
+    )
+    pd.testing.assert_frame_equal(cached_df, df)
+    assert fit.call_count == 2
+
+    # only the changed series is fitted again
+    changed_df = prophet_df.assign(b=[4, 3, 4.1, 5])
+    prophet(df=changed_df, time_grain="P1Y", periods=2, confidence_interval=0.9)
+    assert fit.call_count == 3
+
+    # as is every series when the parameters change
+    prophet(df=prophet_df, time_grain="P1Y", periods=3, confidence_interval=0.9)
+    assert fit.call_count == 5
+
+
+def test_prophet_concurrent(mocker: MockerFixture, fit: Any) -> None:
+    """
+    Test that series are fitted on the pool, reporting progress to async jobs.
+    """
+    executor = ThreadPoolExecutor(2)
+    mocker.patch(
+        "superset.utils.pandas_postprocessing.prophet._get_executor",
+        return_value=executor,
+    )
+    submit = mocker.spy(executor, "submit")
+    async_query_manager = mocker.patch(
+        "superset.utils.pandas_postprocessing.prophet.async_query_manager"
+    )
+    g.async_job_metadata = {"channel_id": "channel", "job_id": "job"}
+
+    df = prophet(
+        df=prophet_df.assign(c=[1, 2, 3, 4]),
+        time_grain="P1Y",
+        periods=1,
+        confidence_interval=0.9,
+    )
+    assert submit.call_count == 3
+    assert df["c__yhat"].tolist() == [4] * 5
+    assert [
+        call.kwargs["progress"] for call in async_query_manager.update_job.mock_calls
+    ] == [
+        {"fitted": 1, "total": 3},
+        {"fitted": 2, "total": 3},
+        {"fitted": 3, "total": 3},
+    ]
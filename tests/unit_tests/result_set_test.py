@@ -164,3 +164,117 @@ def test_timezone_series(mocker: MockerFixture) -> None:
         [pd.Timestamp("2023-01-01 00:00:00+0000", tz="UTC")]
     ]
     logger.exception.assert_not_called()
+
+
+def test_from_batches() -> None:
+    """
+    Test that building a result set from batches matches building it at once.
+    """
+    data = [
+        (1, None, "a", [1, 2]),
+        (2, None, "b", [3]),
+        (3.5, 10, 42, None),
+        (4, 20, "d", [4, 5]),
+    ]
+    description = [
+        ("int_then_float", None, None, None, None, None, None),
+        ("null_then_int", None, None, None, None, None, None),
+        ("mixed", None, None, None, None, None, None),
+        ("nested", None, None, None, None, None, None),
+    ]
+
+    result_set = SupersetResultSet.from_batches(
+        [data[:2], [], data[2:3], data[3:]],
+        description,  # type: ignore
+        BaseEngineSpec,
+    )
+    expected = SupersetResultSet(data, description, BaseEngineSpec)  # type: ignore
+
+    assert result_set.pa_table.schema == expected.pa_table.schema
+    assert result_set.pa_table.to_pylist() == expected.pa_table.to_pylist()
+    assert result_set.to_pandas_df().to_dict() == {
+        "int_then_float": {0: 1.0, 1: 2.0, 2: 3.5, 3: 4.0},
+        "null_then_int": {0: None, 1: None, 2: 10, 3: 20},
+        "mixed": {0: "a", 1: "b", 2: "42", 3: "d"},
+        "nested": {0: "[1, 2]", 1: "[3]", 2: None, 3: "[4, 5]"},
+    }
+
+
+def test_from_batches_empty() -> None:
+    """
+    Test that a result set built from no batches has no columns.
+    """
+    result_set = SupersetResultSet.from_batches(
+        iter([]),
+        [("a", None, None, None, None, None, None)],  # type: ignore
+        BaseEngineSpec,
+    )
+
+    assert result_set.size == 0
+    assert result_set.columns == []
+
+
+def test_truncate() -> None:
+    """
+    Test that `truncate` keeps only the first rows.
+    """
+    result_set = SupersetResultSet(
+        [(1,), (2,), (3,)],
+        [("a", None, None, None, None, None, None)],  # type: ignore
+        BaseEngineSpec,
+    )
+    result_set.truncate(2)
+
+    assert result_set.size == 2
+    assert result_set.to_pandas_df()["a"].tolist() == [1, 2]
+
+
+def test_stringify_values_mixed_types() -> None:
+    """
+    Test that values of different types are stringified like individual values.
+    """
+    import uuid
+    from decimal import Decimal
+
+    from superset.result_set import stringify_value, to_object_array
+
+    values = [
+        None,
+        "foo",
+        1,
+        1.5,
+        float("nan"),
+        Decimal("1.10"),
+        uuid.UUID(int=1),
+        datetime(2020, 1, 1, tzinfo=timezone.utc),
+        {"a": 1},
+        [1, None, {"b": [2]}],
+        (1, 2),
+        b"bar",
+        b"\xff",
+        np.int64(3),
+        pd.NA,
+    ]
+
+    result = stringify_values(to_object_array(values))
+
+    assert list(result) == [
+        None,
+        "foo",
+        "1",
+        "1.5",
+        None,
+        "1.10",
+        "00000000-0000-0000-0000-000000000001",
+        "2020-01-01 00:00:00+00:00",
+        "{'a': 1}",
+        '[1, null, {"b": [2]}]',
+        "[1, 2]",
+        "bar",
+        '"[bytes]"',
+        "3",
+        None,
+    ]
+    assert list(result) == [
+        None if pd.isna(value) is True else stringify_value(value) for value in values
+    ]
@@ -0,0 +1,189 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name, unused-argument, redefined-outer-name
+
+from typing import Any
+
+import pytest
+from flask_appbuilder.security.sqla.models import (
+    Permission,
+    PermissionView,
+    Role,
+    User,
+    ViewMenu,
+)
+from flask_caching import Cache
+from pytest_mock import MockerFixture
+from sqlalchemy.orm.session import Session
+
+from superset.extensions import security_manager
+from superset.security.permissions import permission_snapshots, PermissionSnapshot
+from superset.utils.core import override_user
+
+
+def permission_view(permission_name: str, view_menu_name: str) -> PermissionView:
+    return PermissionView(
+        permission=Permission(name=permission_name),
+        view_menu=ViewMenu(name=view_menu_name),
+    )
+
+
+@pytest.fixture
+def permissions_session(session: Session) -> Session:
+    """
+    Create an Alpha user with access to a database, and a Gamma user with access to
+    a dataset.
+    """
+    security_manager.role_model.metadata.create_all(session.get_bind())
+    permission_snapshots.invalidate()
+
+    alpha = Role(
+        name="Alpha",
+        permissions=[permission_view("database_access", "[db1].(id:1)")],
+    )
+    gamma = Role(
+        name="Gamma",
+        permissions=[permission_view("datasource_access", "[db1].[t](id:1)")],
+    )
+    session.add_all(
+        [
+            User(
+                first_name="Alice",
+                last_name="Doe",
+                email="adoe@example.org",
+                username="alpha",
+                roles=[alpha],
+            ),
+            User(
+                first_name="Gary",
+                last_name="Doe",
+                email="gdoe@example.org",
+                username="gamma",
+                roles=[gamma],
+            ),
+        ]
+    )
+    session.commit()
+    return session
+
+
+@pytest.fixture
+def load(mocker: MockerFixture) -> Any:
+    return mocker.patch.object(
+        PermissionSnapshot, "load", wraps=PermissionSnapshot.load
+    )
+
+
+def get_user(session: Session, username: str) -> User:
+    return session.query(User).filter_by(username=username).one()
+
+
+def test_permission_snapshot() -> None:
+    """
+    Test the lookups of a snapshot.
+    """
+    snapshot = PermissionSnapshot(
+        [
+            ("database_access", "[db1].(id:1)"),
+            ("schema_access", "[db2].[main]"),
+            ("schema_access", "[db2].[dev]"),
+        ]
+    )
+
+    assert snapshot.can_access("database_access", "[db1].(id:1)")
+    assert not snapshot.can_access("database_access", "[db2].(id:2)")
+    assert snapshot.view_menu_names("schema_access") == {"[db2].[main]", "[db2].[dev]"}
+    assert snapshot.view_menu_names("datasource_access") == set()
+
+
+def test_can_access(permissions_session: Session, load: Any) -> None:
+    """
+    Test that the permissions of a user are loaded once per request.
+    """
+    with override_user(get_user(permissions_session, "alpha")):
+        assert security_manager.can_access("database_access", "[db1].(id:1)")
+        assert not security_manager.can_access("datasource_access", "[db1].[t](id:1)")
+        assert security_manager.user_view_menu_names("database_access") == {
+            "[db1].(id:1)"
+        }
+        assert security_manager.get_accessible_databases() == [1]
+
+    with override_user(get_user(permissions_session, "gamma")):
+        assert not security_manager.can_access("database_access", "[db1].(id:1)")
+        assert security_manager.user_view_menu_names("datasource_access") == {
+            "[db1].[t](id:1)"
+        }
+
+    assert load.call_count == 2
+
+
+def test_can_access_invalidate(permissions_session: Session, load: Any) -> None:
+    """
+    Test that the permissions are reloaded when the roles change.
+    """
+    gamma = get_user(permissions_session, "gamma")
+    with override_user(gamma):
+        assert not security_manager.can_access("database_access", "[db1].(id:1)")
+
+        gamma.roles[0].permissions.append(
+            permissions_session.query(PermissionView)
+            .join(ViewMenu)
+            .filter(ViewMenu.name == "[db1].(id:1)")
+            .one()
+        )
+        permissions_session.flush()
+        assert security_manager.can_access("database_access", "[db1].(id:1)")
+
+        permissions_session.rollback()
+        assert not security_manager.can_access("database_access", "[db1].(id:1)")
+
+    assert load.call_count == 3
+
+
+def test_can_access_hooks(permissions_session: Session, load: Any) -> None:
+    """
+    Test that the hooks of the security manager invalidate the permissions.
+    """
+    with override_user(get_user(permissions_session, "alpha")):
+        assert security_manager.can_access("database_access", "[db1].(id:1)")
+        security_manager.on_permission_view_after_delete(None, None, None)
+        assert security_manager.can_access("database_access", "[db1].(id:1)")
+
+    assert load.call_count == 2
+
+
+def test_can_access_shared_cache(
+    shared_cache: Cache,
+    permissions_session: Session,
+    load: Any,
+) -> None:
+    """
+    Test that the snapshots are shared with the other processes through the cache,
+    until the permissions change.
+    """
+    with override_user(get_user(permissions_session, "alpha")):
+        assert security_manager.can_access("database_access", "[db1].(id:1)")
+
+        # another process reads the snapshot from the cache
+        permission_snapshots.invalidate()
+        assert security_manager.can_access("database_access", "[db1].(id:1)")
+        load.assert_called_once()
+
+        permissions_session.query(Role).filter_by(name="Alpha").one().permissions = []
+        permissions_session.commit()
+        assert not security_manager.can_access("database_access", "[db1].(id:1)")
+        assert load.call_count == 2
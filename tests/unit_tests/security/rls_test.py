@@ -0,0 +1,191 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name, unused-argument, redefined-outer-name
+
+from typing import Any
+
+import pytest
+from flask import g
+from flask_appbuilder.security.sqla.models import Role, User
+from flask_caching import Cache
+from pytest_mock import MockerFixture
+from sqlalchemy.orm.session import Session
+
+from superset.connectors.sqla.models import (
+    Database,
+    RowLevelSecurityFilter,
+    SqlaTable,
+)
+from superset.extensions import security_manager
+from superset.security.rls import rls_rules_cache, RLSFilter, RLSRules
+from superset.utils.core import override_user
+
+
+@pytest.fixture
+def rls_session(session: Session) -> Session:
+    """
+    Create a dataset, with a regular and a base RLS filter.
+    """
+    engine = session.get_bind()
+    SqlaTable.metadata.create_all(engine)  # pylint: disable=no-member
+    rls_rules_cache.invalidate()
+
+    database = Database(database_name="my_database", sqlalchemy_uri="sqlite://")
+    dataset = SqlaTable(table_name="t", database=database)
+    other_dataset = SqlaTable(table_name="u", database=database)
+    alpha = Role(name="Alpha")
+    gamma = Role(name="Gamma")
+    session.add_all(
+        [
+            RowLevelSecurityFilter(
+                name="regular",
+                filter_type="Regular",
+                clause="a = 1",
+                group_key="a",
+                tables=[dataset],
+                roles=[gamma],
+            ),
+            RowLevelSecurityFilter(
+                name="base",
+                filter_type="Base",
+                clause="b = 1",
+                tables=[dataset, other_dataset],
+                roles=[alpha],
+            ),
+            User(
+                first_name="Alice",
+                last_name="Doe",
+                email="adoe@example.org",
+                username="alpha",
+                roles=[alpha],
+            ),
+            User(
+                first_name="Gary",
+                last_name="Doe",
+                email="gdoe@example.org",
+                username="gamma",
+                roles=[gamma],
+            ),
+        ]
+    )
+    session.commit()
+    return session
+
+
+@pytest.fixture
+def load(mocker: MockerFixture) -> Any:
+    return mocker.patch.object(RLSRules, "load", wraps=RLSRules.load)
+
+
+def get_clauses(session: Session, username: str, table_name: str) -> list[str]:
+    user = session.query(User).filter_by(username=username).one()
+    table = session.query(SqlaTable).filter_by(table_name=table_name).one()
+    with override_user(user):
+        return [rule.clause for rule in security_manager.get_rls_filters(table)]
+
+
+def test_rls_rules() -> None:
+    """
+    Test that regular filters apply to their roles, and base filters to the others.
+    """
+    rules = RLSRules(
+        filters=[
+            (1, "Regular", "a", "a = 1"),
+            (2, "Regular", "a", "a = 2"),
+            (3, "Base", None, "b = 1"),
+            (4, None, None, "c = 1"),
+        ],
+        filter_roles=[(1, 10), (1, 11), (2, 11), (3, 12), (4, 10)],
+        filter_tables=[(1, 100), (2, 100), (2, 101), (3, 100), (4, 100)],
+    )
+
+    assert rules.get_filters(100, [10, 11]) == [
+        RLSFilter(1, "a", "a = 1"),
+        RLSFilter(2, "a", "a = 2"),
+        RLSFilter(3, None, "b = 1"),
+    ]
+    assert rules.get_filters(100, [12]) == []
+    assert rules.get_filters(101, [11, 12]) == [RLSFilter(2, "a", "a = 2")]
+    assert rules.get_filters(102, [10, 11]) == []
+
+
+def test_get_rls_filters(rls_session: Session, load: Any) -> None:
+    """
+    Test that the rules are loaded once.
+    """
+    assert get_clauses(rls_session, "alpha", "t") == []
+    assert get_clauses(rls_session, "gamma", "t") == ["a = 1", "b = 1"]
+    assert get_clauses(rls_session, "gamma", "u") == ["b = 1"]
+    load.assert_called_once()
+
+
+def test_get_rls_filters_no_user(app_context: None) -> None:
+    """
+    Test that no filters are returned without a user.
+    """
+    g.user = None
+    assert security_manager.get_rls_filters(SqlaTable(id=1)) == []
+
+
+def test_get_rls_filters_invalidate(rls_session: Session, load: Any) -> None:
+    """
+    Test that the rules are reloaded when they change.
+    """
+    assert get_clauses(rls_session, "gamma", "t") == ["a = 1", "b = 1"]
+
+    rule = rls_session.query(RowLevelSecurityFilter).filter_by(name="regular").one()
+    rule.clause = "a = 2"
+    rls_session.flush()
+    assert get_clauses(rls_session, "gamma", "t") == ["a = 2", "b = 1"]
+
+    rls_session.rollback()
+    assert get_clauses(rls_session, "gamma", "t") == ["a = 1", "b = 1"]
+
+    # changing the filters of a table
+    table = rls_session.query(SqlaTable).filter_by(table_name="u").one()
+    table.row_level_security_filters = []
+    rls_session.commit()
+    assert get_clauses(rls_session, "gamma", "u") == []
+
+    assert load.call_count == 4
+
+
+def test_get_rls_filters_unrelated_change(rls_session: Session, load: Any) -> None:
+    """
+    Test that changes to other models don't invalidate the rules.
+    """
+    assert get_clauses(rls_session, "gamma", "t") == ["a = 1", "b = 1"]
+
+    table = rls_session.query(SqlaTable).filter_by(table_name="u").one()
+    table.description = "Updated"
+    rls_session.commit()
+    assert get_clauses(rls_session, "gamma", "t") == ["a = 1", "b = 1"]
+
+    load.assert_called_once()
+
+
+def test_get_rls_filters_publish(shared_cache: Cache, rls_session: Session) -> None:
+    """
+    Test that the changes to the rules are published to the other processes.
+    """
+    assert get_clauses(rls_session, "gamma", "t") == ["a = 1", "b = 1"]
+    version = shared_cache.get("rls_rules_version")
+
+    rule = rls_session.query(RowLevelSecurityFilter).filter_by(name="regular").one()
+    rule.clause = "a = 2"
+    rls_session.commit()
+    assert shared_cache.get("rls_rules_version") != version
@@ -18,12 +18,16 @@
 
 
 import pytest
+import sqlglot
+from pytest_mock import MockerFixture
 from sqlglot import Dialects
 
 from superset.exceptions import SupersetParseError
 from superset.sql.parse import (
     extract_tables_from_statement,
     KustoKQLStatement,
+    parse_with_sqlglot,
+    RLSMethod,
     split_kql,
     SQLGLOT_DIALECTS,
     SQLScript,
@@ -764,6 +768,19 @@ def test_sqlstatement() -> None:
     assert statement.get_settings() == {"a": "1"}
 
 
+def test_sqlstatement_shared_parse() -> None:
+    """
+    Test that statements with the same SQL don't share their AST.
+    """
+    sql = "SELECT * FROM table1"
+    statement = SQLStatement(sql, "sqlite")
+    statement._parsed.set(
+        "limit", sqlglot.exp.Limit(expression=sqlglot.exp.Literal.number(1))
+    )
+
+    assert SQLStatement(sql, "sqlite").format() == "SELECT\n  *\nFROM table1"
+
+
 def test_kustokqlstatement_split_script() -> None:
     """
     Test the `KustoKQLStatement` split method.
@@ -1070,3 +1087,138 @@ def test_is_mutating(engine: str) -> None:
         "with source as ( select 1 as one ) select * from source",
         engine=engine,
     ).is_mutating()
+
+
+def test_parse_with_sqlglot_cache(mocker: MockerFixture) -> None:
+    """
+    Test that parses are cached by dialect and SQL.
+    """
+    parse = mocker.spy(sqlglot, "parse")
+    parse_with_sqlglot.cache_clear()
+
+    assert parse_with_sqlglot("SELECT 1", Dialects.POSTGRES) is parse_with_sqlglot(
+        "SELECT 1",
+        Dialects.POSTGRES,
+    )
+    parse_with_sqlglot("SELECT 1", Dialects.MYSQL)
+    parse_with_sqlglot("SELECT 2", Dialects.POSTGRES)
+
+    assert parse.call_count == 3
+
+
+@pytest.mark.parametrize(
+    "sql, expected",
+    [
+        ("SELECT 1", True),
+        ("SELECT * FROM t1 UNION ALL SELECT * FROM t2", True),
+        ("WITH bla AS (SELECT 1) SELECT * FROM bla", True),
+        ("WITH bla AS (DELETE FROM t RETURNING *) SELECT * FROM bla", False),
+        ("INSERT INTO t SELECT 1", False),
+        ("EXPLAIN SELECT 1", False),
+        ("SET search_path = foo", False),
+    ],
+)
+def test_sqlstatement_is_select(sql: str, expected: bool) -> None:
+    """
+    Test the `is_select` method.
+    """
+    assert SQLStatement(sql, "postgresql").is_select() == expected
+
+
+@pytest.mark.parametrize(
+    "sql, limit, force, expected",
+    [
+        (
+            "SELECT * FROM t -- comment",
+            100,
+            False,
+            "SELECT * FROM t -- comment\nLIMIT 100",
+        ),
+        ("SELECT * FROM t;", 100, False, "SELECT * FROM t\nLIMIT 100"),
+        ("SELECT * FROM t LIMIT 1000", 100, False, "SELECT * FROM t LIMIT 100"),
+        ("SELECT * FROM t LIMIT 10", 100, False, "SELECT * FROM t LIMIT 10"),
+        ("SELECT * FROM t LIMIT 10", 100, True, "SELECT * FROM t LIMIT 100"),
+        (
+            "SELECT * FROM t LIMIT 10, 1000",
+            100,
+            False,
+            "SELECT * FROM t LIMIT 100 OFFSET 10",
+        ),
+    ],
+)
+def test_sqlstatement_set_limit_value(
+    sql: str,
+    limit: int,
+    force: bool,
+    expected: str,
+) -> None:
+    """
+    Test the `set_limit_value` method.
+    """
+    statement = SQLStatement(sql, "mysql")
+    statement.set_limit_value(limit, force)
+
+    assert statement.sql == expected
+
+
+@pytest.mark.parametrize(
+    "sql, method, expected",
+    [
+        (
+            "SELECT * FROM some_table WHERE 1=1",
+            RLSMethod.AS_SUBQUERY,
+            (
+                "SELECT * FROM (SELECT * FROM some_table WHERE some_table.id = 42) "
+                "AS some_table WHERE 1 = 1"
+            ),
+        ),
+        (
+            "SELECT * FROM some_table WHERE 1=1",
+            RLSMethod.AS_PREDICATE,
+            "SELECT * FROM some_table WHERE 1 = 1 AND some_table.id = 42",
+        ),
+        (
+            "SELECT * FROM some_table AS t WHERE a = 1 OR b = 2",
+            RLSMethod.AS_PREDICATE,
+            "SELECT * FROM some_table AS t WHERE (a = 1 OR b = 2) AND t.id = 42",
+        ),
+        (
+            "SELECT * FROM other JOIN schema1.some_table AS t ON other.id = t.id",
+            RLSMethod.AS_SUBQUERY,
+            (
+                "SELECT * FROM other JOIN (SELECT * FROM schema1.some_table "
+                "WHERE some_table.id = 42) AS t ON other.id = t.id"
+            ),
+        ),
+        (
+            "SELECT * FROM other JOIN schema1.some_table AS t ON other.id = t.id",
+            RLSMethod.AS_PREDICATE,
+            "SELECT * FROM other JOIN schema1.some_table AS t ON t.id = 42 AND other.id = t.id",
+        ),
+        (
+            "WITH some_table AS (SELECT * FROM some_table) SELECT * FROM some_table",
+            RLSMethod.AS_SUBQUERY,
+            (
+                "WITH some_table AS (SELECT * FROM (SELECT * FROM some_table WHERE "
+                "some_table.id = 42) AS some_table) SELECT * FROM some_table"
+            ),
+        ),
+        (
+            "SELECT * FROM other -- comment",
+            RLSMethod.AS_SUBQUERY,
+            "SELECT * FROM other -- comment",
+        ),
+    ],
+)
+def test_sqlstatement_apply_rls(sql: str, method: RLSMethod, expected: str) -> None:
+    """
+    Test the `apply_rls` method.
+    """
+    predicates = {
+        Table("some_table"): "id = 42",
+        Table("some_table", "schema1"): "id = 42",
+    }
+    statement = SQLStatement(sql, "postgresql")
+    statement.apply_rls(predicates.get, method)
+
+    assert statement.sql == expected
@@ -21,16 +21,21 @@ from unittest import mock
 from uuid import UUID
 
 import pytest
-import sqlparse
+import sqlglot
 from freezegun import freeze_time
 from pytest_mock import MockerFixture
 from sqlalchemy.orm.session import Session
 
-from superset import db
+from superset import db, sql_lab
 from superset.common.db_query_status import QueryStatus
 from superset.errors import ErrorLevel, SupersetErrorType
-from superset.exceptions import OAuth2Error, SupersetErrorException
+from superset.exceptions import (
+    OAuth2Error,
+    SupersetErrorException,
+    SupersetErrorsException,
+)
 from superset.models.core import Database
+from superset.sql.parse import parse_with_sqlglot, Table
 from superset.sql_lab import execute_sql_statements, get_sql_results
 from superset.utils.core import override_user
 from tests.unit_tests.models.core_test import oauth2_client_info
@@ -53,10 +58,11 @@ def test_execute_sql_statement(mocker: MockerFixture, app: None) -> None:
     database.mutate_sql_based_on_config.return_value = "SELECT 42 AS answer LIMIT 2"
     db_engine_spec = database.db_engine_spec
     db_engine_spec.is_select_query.return_value = True
-    db_engine_spec.fetch_data.return_value = [(42,)]
+    db_engine_spec.fetch_data_batches.return_value = iter([[(42,)]])
 
     cursor = mocker.MagicMock()
     SupersetResultSet = mocker.patch("superset.sql_lab.SupersetResultSet")
+    SupersetResultSet.from_batches.return_value.size = 1
 
     execute_sql_statement(
         sql_statement,
@@ -66,13 +72,21 @@ def test_execute_sql_statement(mocker: MockerFixture, app: None) -> None:
         apply_ctas=False,
     )
 
-    database.apply_limit_to_sql.assert_called_with("SELECT 42 AS answer", 2, force=True)
+    database.apply_limit_to_sql.assert_called_with(
+        "SELECT 42 AS answer",
+        2,
+        force=True,
+        statement=mocker.ANY,
+    )
     db_engine_spec.execute_with_cursor.assert_called_with(
         cursor,
         "SELECT 42 AS answer LIMIT 2",
         query,
     )
-    SupersetResultSet.assert_called_with([(42,)], cursor.description, db_engine_spec)
+    batches, cursor_description, spec = SupersetResultSet.from_batches.call_args[0]
+    assert list(batches) == [[(42,)]]
+    assert cursor_description == cursor.description
+    assert spec == db_engine_spec
 
 
 def test_execute_sql_statement_with_rls(
@@ -84,8 +98,10 @@ def test_execute_sql_statement_with_rls(
     from superset.sql_lab import execute_sql_statement
 
     sql_statement = "SELECT * FROM sales"
-    sql_statement_with_rls = f"{sql_statement} WHERE organization_id=42"
-    sql_statement_with_rls_and_limit = f"{sql_statement_with_rls} LIMIT 101"
+    sql_statement_with_rls = (
+        "SELECT * FROM (SELECT * FROM sales WHERE sales.organization_id = 42) AS sales"
+    )
+    sql_statement_with_rls_and_limit = f"{sql_statement_with_rls}\nLIMIT 101"
 
     query = mocker.MagicMock()
     query.limit = 100
@@ -95,16 +111,20 @@ def test_execute_sql_statement_with_rls(
     database.apply_limit_to_sql.return_value = sql_statement_with_rls_and_limit
     database.mutate_sql_based_on_config.return_value = sql_statement_with_rls_and_limit
     db_engine_spec = database.db_engine_spec
+    db_engine_spec.engine = "postgresql"
     db_engine_spec.is_select_query.return_value = True
-    db_engine_spec.fetch_data.return_value = [(42,)]
+    db_engine_spec.fetch_data_batches.return_value = iter([[(42,)]])
 
     cursor = mocker.MagicMock()
     SupersetResultSet = mocker.patch("superset.sql_lab.SupersetResultSet")
-    mocker.patch(
-        "superset.sql_lab.insert_rls_as_subquery",
-        return_value=sqlparse.parse("SELECT * FROM sales WHERE organization_id=42")[0],
+    SupersetResultSet.from_batches.return_value.size = 1
+    get_rls_predicate = mocker.patch(
+        "superset.sql_lab.get_rls_predicate",
+        return_value="organization_id=42",
     )
     mocker.patch("superset.sql_lab.is_feature_enabled", return_value=True)
+    parse_with_sqlglot.cache_clear()
+    parse = mocker.spy(sqlglot, "parse")
 
     execute_sql_statement(
         sql_statement,
@@ -114,17 +134,56 @@ def test_execute_sql_statement_with_rls(
         apply_ctas=False,
     )
 
-    database.apply_limit_to_sql.assert_called_with(
-        "SELECT * FROM sales WHERE organization_id=42",
-        101,
-        force=True,
+    # the statement is parsed once, for the DML and RLS checks, and the limit
+    assert [call.args[0] for call in parse.call_args_list] == [sql_statement]
+    get_rls_predicate.assert_called_once_with(
+        Table("sales"),
+        database_id=database.id,
+        default_schema=query.schema,
     )
+    args, kwargs = database.apply_limit_to_sql.call_args
+    assert args == (sql_statement_with_rls, 101)
+    assert kwargs["force"]
+    assert kwargs["statement"].sql == sql_statement_with_rls
+    db_engine_spec.is_select_query.assert_called_with(kwargs["statement"])
     db_engine_spec.execute_with_cursor.assert_called_with(
         cursor,
-        "SELECT * FROM sales WHERE organization_id=42 LIMIT 101",
+        sql_statement_with_rls_and_limit,
         query,
     )
-    SupersetResultSet.assert_called_with([(42,)], cursor.description, db_engine_spec)
+    batches, cursor_description, spec = SupersetResultSet.from_batches.call_args[0]
+    assert list(batches) == [[(42,)]]
+    assert cursor_description == cursor.description
+    assert spec == db_engine_spec
+
+
+@pytest.mark.parametrize("allow_dml", [True, False])
+def test_execute_sql_statement_with_rls_parse_error(
+    mocker: MockerFixture,
+    allow_dml: bool,
+) -> None:
+    """
+    Test that a statement that can't be parsed is not run when RLS is enabled.
+    """
+    from superset.sql_lab import execute_sql_statement
+
+    query = mocker.MagicMock()
+    query.database.allow_dml = allow_dml
+    query.database.db_engine_spec.engine = "postgresql"
+    cursor = mocker.MagicMock()
+    mocker.patch("superset.sql_lab.is_feature_enabled", return_value=True)
+
+    with pytest.raises(SupersetErrorsException) as excinfo:
+        execute_sql_statement(
+            "SELECT * FROM (sales",
+            query,
+            cursor=cursor,
+            log_params={},
+            apply_ctas=False,
+        )
+
+    assert excinfo.value.errors[0].error_type == SupersetErrorType.INVALID_SQL_ERROR
+    cursor.execute.assert_not_called()
 
 
 @mock.patch.dict(
@@ -236,6 +295,103 @@ def test_execute_sql_statement_within_payload_limit(mocker: MockerFixture) -> No
         )
 
 
+@mock.patch.dict(
+    "superset.sql_lab.config",
+    {
+        "RESULTS_BACKEND_ARROW_COMPRESSION": "zstd",
+        "RESULTS_BACKEND_ARROW_BATCH_SIZE": 2,
+    },
+)
+def test_execute_sql_statements_arrow_results(mocker: MockerFixture) -> None:
+    """
+    Test that results are stored in the chunked Arrow format when it's enabled.
+    """
+    from superset.db_engine_specs.base import BaseEngineSpec
+    from superset.result_set import SupersetResultSet
+    from superset.sqllab.results_format import ArrowResultsReader
+
+    query = mocker.MagicMock()
+    query.limit = 10
+    query.database.db_engine_spec = BaseEngineSpec
+    query.database.cache_timeout = 100
+    query.select_as_cta = False
+    query.to_dict.return_value = {"rows": 5}
+    mocker.patch("superset.sql_lab.get_query", return_value=query)
+    mocker.patch("superset.sql_lab.db")
+    mocker.patch(
+        "superset.sql_lab.execute_sql_statement",
+        return_value=SupersetResultSet(
+            [(i,) for i in range(5)], [("answer", "INT")], BaseEngineSpec
+        ),
+    )
+    results_backend = mocker.patch("superset.sql_lab.results_backend")
+
+    payload = execute_sql_statements(
+        query_id=1,
+        rendered_query="SELECT answer FROM t",
+        return_results=True,
+        store_results=True,
+        start_time=None,
+        expand_data=False,
+        log_params={},
+    )
+
+    _, blob, _ = results_backend.set.call_args[0]
+    reader = ArrowResultsReader(blob)
+    assert reader.batch_rows == [2, 2, 1]
+    assert reader.read_table().column("answer").to_pylist() == [0, 1, 2, 3, 4]
+    assert reader.payload["columns"] == payload["columns"]
+    assert payload["data"] == [{"answer": i} for i in range(5)]
+
+
+def test_execute_sql_statements_json_results(mocker: MockerFixture, app: None) -> None:
+    """
+    Test that stored JSON results are written from the columns of the dataframe.
+    """
+    from superset.db_engine_specs.base import BaseEngineSpec
+    from superset.result_set import SupersetResultSet
+    from superset.utils.core import zlib_decompress
+
+    query = mocker.MagicMock()
+    query.limit = 10
+    query.database.db_engine_spec = BaseEngineSpec
+    query.database.cache_timeout = 100
+    query.select_as_cta = False
+    query.to_dict.return_value = {"rows": 3}
+    mocker.patch("superset.sql_lab.get_query", return_value=query)
+    mocker.patch("superset.sql_lab.db")
+    mocker.patch("superset.sql_lab.results_backend_use_msgpack", False)
+    mocker.patch(
+        "superset.sql_lab.execute_sql_statement",
+        return_value=SupersetResultSet(
+            [(1, "a", 0.5), (2, None, float("nan")), (3, 'c"d', 2.0)],
+            [("id", "INT"), ("name", "STRING"), ("value", "FLOAT")],
+            BaseEngineSpec,
+        ),
+    )
+    df_to_records = mocker.spy(sql_lab, "df_to_records")
+    results_backend = mocker.patch("superset.sql_lab.results_backend")
+
+    execute_sql_statements(
+        query_id=1,
+        rendered_query="SELECT id, name, value FROM t",
+        return_results=False,
+        store_results=True,
+        start_time=None,
+        expand_data=False,
+        log_params={},
+    )
+
+    df_to_records.assert_not_called()
+    _, blob, _ = results_backend.set.call_args[0]
+    payload = json.loads(zlib_decompress(blob))
+    assert payload["data"] == [
+        {"id": 1, "name": "a", "value": 0.5},
+        {"id": 2, "name": None, "value": None},
+        {"id": 3, "name": 'c"d', "value": 2.0},
+    ]
+
+
 def test_sql_lab_insert_rls_as_subquery(
     mocker: MockerFixture,
     session: Session,
@@ -36,10 +36,12 @@ from superset.sql_parse import (
     check_sql_functions_exist,
     extract_table_references,
     extract_tables_from_jinja_sql,
+    format_without_comments,
     get_rls_for_table,
     has_table_query,
     insert_rls_as_subquery,
     insert_rls_in_predicate,
+    parse_with_sqlparse,
     ParsedQuery,
     sanitize_clause,
     strip_comments_from_sql,
@@ -1144,6 +1146,52 @@ def test_get_query_with_new_limit_upper() -> None:
     )
 
 
+def test_get_query_with_new_limit_shared_parse() -> None:
+    """
+    Test that the limit is replaced without modifying the shared parsed statement.
+    """
+    sql = "SELECT * FROM birth_names LIMIT 2000"
+    assert ParsedQuery(sql).set_or_update_query_limit(1000) == (
+        "SELECT * FROM birth_names LIMIT 1000"
+    )
+    assert ParsedQuery(sql).set_or_update_query_limit(1500) == (
+        "SELECT * FROM birth_names LIMIT 1500"
+    )
+    assert str(parse_with_sqlparse(sql)[0]) == sql
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "SELECT 1",
+        "SELECT 1;  \r\nSELECT 2  \n",
+        "SELECT * FROM t -- comment\nWHERE a = 1",
+        "/* comment */ SELECT 'a -- not a comment'",
+    ],
+)
+def test_format_without_comments(sql: str) -> None:
+    """
+    Test that comments are removed as with ``sqlparse.format``.
+    """
+    assert format_without_comments(sql) == sqlparse.format(sql, strip_comments=True)
+
+
+def test_parsed_query_parse_once(mocker: MockerFixture) -> None:
+    """
+    Test that the steps run on a statement share its parse.
+    """
+    parse = mocker.patch("superset.sql_parse.sqlparse.parse", wraps=sqlparse.parse)
+    sql = "SELECT * FROM parse_once LIMIT 10"
+
+    parsed_query = ParsedQuery(sql)
+    assert parsed_query.is_select()
+    assert not parsed_query.is_explain()
+    assert ParsedQuery(sql).set_or_update_query_limit(5) == (
+        "SELECT * FROM parse_once LIMIT 5"
+    )
+    parse.assert_called_once_with(sql)
+
+
 def test_basic_breakdown_statements() -> None:
     """
     Test that multiple statements are parsed correctly.
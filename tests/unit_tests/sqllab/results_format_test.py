@@ -0,0 +1,94 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=import-outside-toplevel
+
+import pyarrow as pa
+import pytest
+
+from superset.exceptions import SerializationError
+from superset.sqllab.results_format import (
+    ArrowResultsReader,
+    is_arrow_results,
+    serialize_results,
+)
+from superset.utils.core import zlib_compress
+
+TABLE = pa.table({"a": list(range(25)), "b": [str(i) for i in range(25)]})
+PAYLOAD = {
+    "status": "success",
+    "data": [],
+    "columns": [{"name": "a"}, {"name": "b"}],
+    "query": {"rows": 25},
+}
+
+
+@pytest.mark.parametrize("compression", ["lz4", "zstd"])
+def test_roundtrip(compression: str) -> None:
+    """
+    Test that the payload and the data are stored, in batches.
+    """
+    blob = serialize_results(PAYLOAD, TABLE, compression, 10)
+    assert is_arrow_results(blob)
+
+    reader = ArrowResultsReader(blob)
+    assert reader.payload == {
+        "status": "success",
+        "columns": [{"name": "a"}, {"name": "b"}],
+        "query": {"rows": 25},
+    }
+    assert reader.batch_rows == [10, 10, 5]
+    assert reader.num_rows == 25
+    assert reader.schema == TABLE.schema
+    assert reader.read_table() == TABLE
+    assert [batch.num_rows for batch in reader.iter_batches()] == [10, 10, 5]
+
+
+def test_read_table_partial() -> None:
+    """
+    Test reading the first rows of a subset of the columns.
+    """
+    reader = ArrowResultsReader(serialize_results(PAYLOAD, TABLE, "zstd", 10))
+
+    table = reader.read_table(max_rows=12, columns=["b"])
+    assert table.column_names == ["b"]
+    assert table.column("b").to_pylist() == [str(i) for i in range(12)]
+    assert reader.read_table(max_rows=100).num_rows == 25
+
+
+def test_read_table_empty() -> None:
+    """
+    Test that empty results keep their schema.
+    """
+    reader = ArrowResultsReader(
+        serialize_results(PAYLOAD, TABLE.slice(0, 0), "lz4", 10)
+    )
+
+    assert reader.num_rows == 0
+    assert reader.read_table(max_rows=10).schema == TABLE.schema
+    assert reader.read_table(columns=["a"]).column_names == ["a"]
+
+
+def test_legacy_and_invalid_blobs() -> None:
+    """
+    Test that legacy blobs are not detected, and that corrupted blobs raise.
+    """
+    assert not is_arrow_results(zlib_compress('{"data": []}'))
+    assert not is_arrow_results(None)
+
+    blob = serialize_results(PAYLOAD, TABLE, "lz4", 10)
+    with pytest.raises(SerializationError):
+        ArrowResultsReader(blob[:-20])
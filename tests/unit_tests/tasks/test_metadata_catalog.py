@@ -0,0 +1,167 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=redefined-outer-name, unused-argument
+from collections.abc import Iterator
+from contextlib import contextmanager, ExitStack
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from celery.exceptions import SoftTimeLimitExceeded
+from pytest_mock import MockerFixture
+
+from superset.exceptions import CreateKeyValueDistributedLockFailedException
+from superset.tasks.metadata_catalog import acquire_slot, crawl_schema, task_options
+from superset.utils.core import DatasourceName
+
+
+@pytest.fixture
+def locks(mocker: MockerFixture) -> set[Any]:
+    """
+    Mock the distributed locks, keeping the ones which are taken.
+    """
+    taken: set[Any] = set()
+
+    @contextmanager
+    def lock(
+        namespace: str,
+        lock_expiration: timedelta,
+        **kwargs: Any,
+    ) -> Iterator[None]:
+        key = (namespace, lock_expiration, *sorted(kwargs.items()))
+        if key in taken:
+            raise CreateKeyValueDistributedLockFailedException("Lock already taken")
+        taken.add(key)
+        try:
+            yield
+        finally:
+            taken.remove(key)
+
+    mocker.patch("superset.tasks.metadata_catalog.KeyValueDistributedLock", lock)
+    return taken
+
+
+@pytest.mark.parametrize(
+    "app",
+    [{"METADATA_CATALOG_CONCURRENCY": 2, "METADATA_CATALOG_TASK_TIMEOUT": 600}],
+    indirect=True,
+)
+def test_acquire_slot(locks: set[Any]) -> None:
+    """
+    Test that a database is inspected by a limited number of tasks, and that their
+    locks expire after they're killed.
+    """
+    with ExitStack() as first, ExitStack() as second, ExitStack() as third:
+        assert acquire_slot(first, 1)
+        assert acquire_slot(second, 1)
+        assert not acquire_slot(third, 1)
+        assert acquire_slot(third, 2)
+        assert len(locks) == 3
+        assert {key[1] for key in locks} == {timedelta(seconds=630)}
+    assert not locks
+
+    assert task_options() == {"soft_time_limit": 600, "time_limit": 630}
+
+
+@pytest.mark.parametrize(
+    "app", [{"METADATA_CATALOG_METADATA_BATCH_SIZE": 2}], indirect=True
+)
+def test_crawl_schema(mocker: MockerFixture, locks: set[Any]) -> None:
+    """
+    Test that the tables are listed, and their metadata fetched by batches.
+    """
+    mocker.patch("superset.tasks.metadata_catalog.db")
+    database = mocker.MagicMock()
+    database.get_all_table_names_in_schema.return_value = {
+        DatasourceName("table1", "schema1"),
+    }
+    database.get_all_view_names_in_schema.return_value = {
+        DatasourceName("view1", "schema1"),
+    }
+    database.db_engine_spec.get_table_metadata.side_effect = lambda database, table: {
+        "name": table.table
+    }
+    DatabaseDAO = mocker.patch("superset.tasks.metadata_catalog.DatabaseDAO")
+    DatabaseDAO.find_by_id.return_value = database
+    MetadataCatalogDAO = mocker.patch(
+        "superset.tasks.metadata_catalog.MetadataCatalogDAO"
+    )
+    entries = [mocker.MagicMock(), mocker.MagicMock()]
+    entries[0].name = "table1"
+    entries[1].name = "view1"
+    MetadataCatalogDAO.find_stale_tables.return_value = entries
+    # the task schedules itself through the module
+    scheduled = mocker.patch("superset.tasks.metadata_catalog.crawl_schema")
+
+    crawl_schema.run(1, None, "schema1")
+
+    MetadataCatalogDAO.sync.assert_called_once_with(
+        database,
+        None,
+        "schema1",
+        [("table1", "table"), ("view1", "view")],
+    )
+    MetadataCatalogDAO.set_table_metadata.assert_has_calls(
+        [
+            mocker.call(entries[0], {"name": "table1"}),
+            mocker.call(entries[1], {"name": "view1"}),
+        ]
+    )
+    # the batch is full, the next one is fetched by another task
+    scheduled.apply_async.assert_called_once_with(
+        (1, None, "schema1"),
+        {"list_tables": False},
+        soft_time_limit=1800,
+        time_limit=1830,
+    )
+    assert not locks
+
+
+@pytest.mark.parametrize(
+    "app", [{"METADATA_CATALOG_METADATA_BATCH_SIZE": 2}], indirect=True
+)
+def test_crawl_schema_timeout(mocker: MockerFixture, locks: set[Any]) -> None:
+    """
+    Test that the metadata fetched before the task times out is kept, and the rest
+    fetched by another task.
+    """
+    db = mocker.patch("superset.tasks.metadata_catalog.db")
+    database = mocker.MagicMock()
+    database.db_engine_spec.get_table_metadata.side_effect = [
+        {"name": "table1"},
+        SoftTimeLimitExceeded(),
+    ]
+    DatabaseDAO = mocker.patch("superset.tasks.metadata_catalog.DatabaseDAO")
+    DatabaseDAO.find_by_id.return_value = database
+    MetadataCatalogDAO = mocker.patch(
+        "superset.tasks.metadata_catalog.MetadataCatalogDAO"
+    )
+    entries = [mocker.MagicMock(), mocker.MagicMock()]
+    entries[0].name = "table1"
+    entries[1].name = "table2"
+    MetadataCatalogDAO.find_stale_tables.return_value = entries
+    scheduled = mocker.patch("superset.tasks.metadata_catalog.crawl_schema")
+
+    crawl_schema.run(1, None, "schema1", list_tables=False)
+
+    MetadataCatalogDAO.set_table_metadata.assert_called_once_with(
+        entries[0],
+        {"name": "table1"},
+    )
+    db.session.commit.assert_called_once()
+    scheduled.apply_async.assert_called_once()
+    assert not locks
@@ -49,3 +49,47 @@ def test_memoized_func(mocker: MockerFixture) -> None:
     cache.get.return_value = 43
     result = decorated(self, "public", cache=True)
     assert result == 43
+
+
+def test_local_cache(mocker: MockerFixture) -> None:
+    """
+    Test that the ``LocalCache`` evicts the least recently used values.
+    """
+    from superset.utils.cache import LocalCache
+
+    cache = LocalCache()
+    cache.set("a", 1, size=4, max_size=10)
+    cache.set("b", 2, size=4, max_size=10)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3, size=4, max_size=10)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.size == 8
+
+    # values larger than the cache are not kept
+    cache.set("a", 4, size=11, max_size=10)
+    assert cache.get("a") is None
+    assert cache.size == 4
+
+    cache.delete("c")
+    assert cache.get("c") is None
+    assert cache.size == 0
+
+
+def test_local_cache_timeout(mocker: MockerFixture) -> None:
+    """
+    Test that values of the ``LocalCache`` expire.
+    """
+    from superset.utils.cache import LocalCache
+
+    monotonic = mocker.patch("superset.utils.cache.time.monotonic", return_value=0)
+    cache = LocalCache()
+    cache.set("a", 1, size=1, max_size=10, timeout=60)
+    cache.set("b", 2, size=1, max_size=10)
+
+    monotonic.return_value = 60
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.size == 1
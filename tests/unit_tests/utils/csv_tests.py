@@ -95,3 +95,15 @@ def test_df_to_escaped_csv():
 
     df = pa.array([1, None]).to_pandas(integer_object_nulls=True).to_frame()
     assert csv.df_to_escaped_csv(df, encoding="utf8", index=False) == '0\n1\n""\n'
+
+
+def test_df_to_escaped_csv_chunks():
+    dfs = [
+        pd.DataFrame({"=value": ["=a", "b"]}),
+        pd.DataFrame({"=value": ["-10", "|c"]}),
+    ]
+
+    assert list(csv.df_to_escaped_csv_chunks(dfs, index=False)) == [
+        "'=value\n'=a\nb\n",
+        "-10\n'\\\\|c\n",
+    ]
@@ -16,7 +16,18 @@
 # under the License.
 
 
-from superset.utils.log import get_logger_from_status
+import threading
+from typing import Any
+from unittest import mock
+
+from pytest_mock import MockerFixture
+from sqlalchemy.orm.session import Session
+
+from superset.utils.log import (
+    BufferedDBEventLogger,
+    DBEventLogger,
+    get_logger_from_status,
+)
 
 
 def test_log_from_status_exception() -> None:
@@ -35,3 +46,78 @@ def test_log_from_status_info() -> None:
     (func, log_level) = get_logger_from_status(300)
     assert func.__name__ == "info"
     assert log_level == "info"
+
+
+def log_event(event_logger: DBEventLogger, *records: Any) -> None:
+    event_logger.log(
+        1,
+        "test",
+        dashboard_id=2,
+        duration_ms=3,
+        slice_id=4,
+        referrer=None,
+        records=list(records),
+    )
+
+
+def test_db_event_logger(session: Session) -> None:
+    from superset.models.core import Log
+
+    Log.metadata.create_all(session.get_bind())
+
+    log_event(DBEventLogger(), {"a": 1}, {"b": 2})
+
+    assert [(log.action, log.json, log.slice_id) for log in session.query(Log)] == [
+        ("test", '{"a": 1}', 4),
+        ("test", '{"b": 2}', 4),
+    ]
+
+
+def test_buffered_db_event_logger(mocker: MockerFixture, app_context: None) -> None:
+    """
+    Test that the logs are inserted in batches from the background thread.
+    """
+    batches: list[list[dict[str, Any]]] = []
+    written = threading.Event()
+
+    def write_logs(logs: list[dict[str, Any]]) -> None:
+        batches.append(logs)
+        if sum(len(batch) for batch in batches) == 5:
+            written.set()
+
+    mocker.patch.object(BufferedDBEventLogger, "write_logs", side_effect=write_logs)
+    event_logger = BufferedDBEventLogger(batch_size=2, flush_interval=0.1)
+
+    log_event(event_logger, *[{"i": i} for i in range(5)])
+
+    assert written.wait(timeout=5)
+    assert [[log["json"] for log in batch] for batch in batches] == [
+        ['{"i": 0}', '{"i": 1}'],
+        ['{"i": 2}', '{"i": 3}'],
+        ['{"i": 4}'],
+    ]
+    assert all(log["dttm"] for batch in batches for log in batch)
+    assert event_logger.flushed == 5
+    event_logger.stop()
+
+
+def test_buffered_db_event_logger_full(
+    mocker: MockerFixture,
+    app_context: None,
+) -> None:
+    """
+    Test that events are dropped when the queue is full, and flushed on stop.
+    """
+    write_logs = mocker.patch.object(BufferedDBEventLogger, "write_logs")
+    event_logger = BufferedDBEventLogger(flush_interval=60, max_queue_size=2)
+
+    # queue the events before the background thread starts
+    with mock.patch.object(event_logger, "start"):
+        log_event(event_logger, {"i": 0}, {"i": 1}, {"i": 2})
+    assert event_logger.dropped == 1
+
+    event_logger.start()
+    event_logger.stop()
+    write_logs.assert_called_once()
+    assert len(write_logs.call_args[0][0]) == 2
+    assert event_logger.flushed == 2
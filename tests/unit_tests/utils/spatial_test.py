@@ -0,0 +1,102 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pytest
+from geopy.point import Point
+
+from superset.utils.spatial import get_bins, parse_coordinates, project, unproject
+
+
+def parse(value: str) -> Optional[tuple[float, float]]:
+    if not value:
+        return None
+    point = Point(value)
+    return (point.latitude, point.longitude)
+
+
+def test_parse_coordinates() -> None:
+    """
+    Test that coordinates are parsed as geopy does.
+    """
+    values = pd.Series(
+        [
+            "1.23, 3.21",
+            "1.23 3.21",
+            "-45;170.5",
+            " 12/-0 ",
+            "41 24.2028m, 2 10.4418m",
+            "N 40.7, W 74.0",
+            "10, 200",
+            None,
+            "",
+        ]
+    )
+    expected = np.array(
+        [parse(value) or (np.nan, np.nan) for value in values],
+        dtype=float,
+    )
+
+    np.testing.assert_array_equal(parse_coordinates(values, parse), expected)
+    assert parse_coordinates(values, parse)[3, 1] == 0.0
+
+
+def test_parse_coordinates_invalid() -> None:
+    """
+    Test that invalid coordinates are parsed one by one, and raise.
+    """
+    with pytest.raises(ValueError):
+        parse_coordinates(pd.Series(["1.5, 2", "100, 10"]), parse)
+
+
+def test_project() -> None:
+    positions = np.array([[-122.4, 37.8], [2.35, 48.85], [0.0, 0.0]])
+    np.testing.assert_allclose(unproject(project(positions)), positions)
+
+
+@pytest.mark.parametrize("hexagonal, count", [(False, 396), (True, 152)])
+def test_get_bins(hexagonal: bool, count: int) -> None:
+    """
+    Test that points are binned with the closest bin center.
+    """
+    rng = np.random.default_rng(42)
+    positions = np.column_stack(
+        [rng.uniform(-122.5, -122.4, 5000), rng.uniform(37.7, 37.8, 5000)]
+    )
+    positions[0] = np.nan
+
+    bins = get_bins(positions, 500, hexagonal=hexagonal)
+    assert np.isnan(bins[0]).all()
+
+    centers = np.unique(bins[1:], axis=0)
+    # 500m bins over roughly 9km x 11km, with partial bins on the edges
+    assert count <= len(centers) < count * 1.25
+
+    # each point is in the bin with the closest center
+    points = project(positions[1:])
+    distances = np.linalg.norm(
+        points[:, None, :] - project(centers)[None, :, :],
+        axis=2,
+    )
+    closest = centers[distances.argmin(axis=1)]
+    if hexagonal:
+        np.testing.assert_allclose(bins[1:], closest)
+    else:
+        assert (np.abs(points - project(bins[1:])) <= 500 / np.cos(0.66)).all()
@@ -24,8 +24,11 @@ from typing import Any, Optional
 from unittest.mock import call, Mock, patch
 
 import pytest
+from pytest_mock import MockerFixture
+from sqlalchemy.orm.session import Session
 
 from superset import app
+from superset.app import SupersetApp
 from superset.utils import decorators
 from superset.utils.backports import StrEnum
 
@@ -294,3 +297,63 @@ def test_suppress_logging() -> None:
     decorated = decorators.suppress_logging("test-logger", logging.CRITICAL + 1)(func)
     decorated()
     assert len(handler.log_records) == 0
+
+
+def test_copy_current_context(app: SupersetApp) -> None:
+    """
+    Test that `copy_current_context` runs functions with the caller contexts.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from flask import g, request
+
+    def func() -> tuple[str, str]:
+        return g.user, request.args["foo"]
+
+    with app.test_request_context("/?foo=bar"):
+        g.user = "admin"
+        wrapped = decorators.copy_current_context(func)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert executor.submit(wrapped).result() == ("admin", "bar")
+
+
+def test_copy_current_context_orm_objects(
+    mocker: MockerFixture,
+    app: SupersetApp,
+    session: Session,
+) -> None:
+    """
+    Test that `copy_current_context` loads the ORM objects of `g` again in the
+    session of the worker.
+    """
+    from flask import g
+    from flask_appbuilder.security.sqla.models import User
+    from sqlalchemy import inspect
+    from sqlalchemy.orm import sessionmaker
+
+    User.metadata.create_all(session.get_bind())
+    user = User(
+        first_name="Alice",
+        last_name="Doe",
+        email="adoe@example.org",
+        username="admin",
+    )
+    session.add(user)
+    session.commit()
+
+    with app.test_request_context():
+        g.user = user
+        g.foo = "bar"
+        wrapped = decorators.copy_current_context(lambda: (g.user, g.foo))
+
+    # the in-memory database is only available to the current thread
+    worker_session = sessionmaker(bind=session.get_bind())()
+    worker_session.remove = lambda: None
+    mocker.patch("superset.db.session", worker_session)
+    worker_user, foo = wrapped()
+
+    assert worker_user is not user
+    assert worker_user.username == "admin"
+    assert inspect(worker_user).session is worker_session
+    assert foo == "bar"
@@ -0,0 +1,201 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=redefined-outer-name, unused-argument
+
+from typing import Any
+
+import pytest
+from flask import g
+from flask_caching import Cache
+from pytest_mock import MockerFixture
+
+from superset.app import SupersetApp
+from superset.extensions import cache_manager
+from superset.utils.versioned_cache import VersionedCache
+
+
+class Change:
+    """
+    An instance changing the values.
+    """
+
+
+@pytest.fixture
+def load(mocker: MockerFixture) -> Any:
+    return mocker.MagicMock(
+        side_effect=lambda session, key, version: f"{key}@{version}"
+    )
+
+
+@pytest.fixture
+def values(app: SupersetApp, load: Any) -> VersionedCache[str]:
+    app.config["VALUES_MEMO_TIMEOUT"] = 60
+    return VersionedCache(
+        "values",
+        load=load,
+        is_change=lambda instance, deleted: isinstance(instance, Change),
+        timeout_config_key="VALUES_MEMO_TIMEOUT",
+        max_size=2,
+    )
+
+
+@pytest.fixture
+def orm_session(mocker: MockerFixture) -> Any:
+    return mocker.MagicMock(info={}, new=[], dirty=[], deleted=[])
+
+
+def test_get(values: VersionedCache[str], orm_session: Any, load: Any) -> None:
+    """
+    Test that the values are loaded once per request, and once per key.
+    """
+    assert values.get(orm_session, "a") == "a@None"
+    assert values.get(orm_session, "a") == "a@None"
+    assert values.get(orm_session, "b") == "b@None"
+    assert load.call_count == 2
+
+
+def test_get_shared_cache(
+    shared_cache: Cache,
+    values: VersionedCache[str],
+    orm_session: Any,
+    load: Any,
+) -> None:
+    """
+    Test that the values are memoized in the process with a shared cache, until
+    another process changes them.
+    """
+    version = values.get(orm_session, "a").split("@")[1]
+    del g.values
+    assert values.get(orm_session, "a") == f"a@{version}"
+    load.assert_called_once()
+
+    # a change made by another process
+    shared_cache.set("values_version", "other")
+    assert values.get(orm_session, "a") == f"a@{version}"
+    del g.values
+    assert values.get(orm_session, "a") == "a@other"
+    assert load.call_count == 2
+
+
+def test_get_local_cache(
+    mocker: MockerFixture,
+    app: SupersetApp,
+    values: VersionedCache[str],
+    orm_session: Any,
+    load: Any,
+) -> None:
+    """
+    Test that the values are loaded once per request when the cache is local to the
+    process, since the changes made by the other processes can't be seen.
+    """
+    cache = Cache(app, config={"CACHE_TYPE": "SimpleCache"})
+    mocker.patch.object(cache_manager, "_cache", cache)
+
+    assert values.get(orm_session, "a") == "a@None"
+    del g.values
+    assert values.get(orm_session, "a") == "a@None"
+    assert load.call_count == 2
+    assert cache.get("values_version") is None
+
+
+def test_get_timeout(
+    mocker: MockerFixture,
+    shared_cache: Cache,
+    values: VersionedCache[str],
+    orm_session: Any,
+    load: Any,
+) -> None:
+    """
+    Test that the values memoized in the process expire.
+    """
+    time = mocker.patch("superset.utils.cache.time")
+    time.monotonic.return_value = 0
+
+    values.get(orm_session, "a")
+    del g.values
+    time.monotonic.return_value = 59
+    values.get(orm_session, "a")
+    load.assert_called_once()
+
+    del g.values
+    time.monotonic.return_value = 61
+    values.get(orm_session, "a")
+    assert load.call_count == 2
+
+
+def test_get_max_size(
+    shared_cache: Cache,
+    values: VersionedCache[str],
+    orm_session: Any,
+    load: Any,
+) -> None:
+    """
+    Test that the least recently used values are evicted.
+    """
+    for key in ("a", "b", "c"):
+        values.get(orm_session, key)
+    del g.values
+    values.get(orm_session, "c")
+    assert load.call_count == 3
+    values.get(orm_session, "a")
+    assert load.call_count == 4
+
+
+def test_after_flush(
+    shared_cache: Cache,
+    values: VersionedCache[str],
+    orm_session: Any,
+    load: Any,
+) -> None:
+    """
+    Test that a flush changing the values invalidates them, and that the commit
+    publishes a new version.
+    """
+    version = values.get(orm_session, "a").split("@")[1]
+
+    orm_session.dirty = [object()]
+    values.after_flush(orm_session, None)
+    assert values.get(orm_session, "a") == f"a@{version}"
+    load.assert_called_once()
+
+    orm_session.dirty = [Change()]
+    values.after_flush(orm_session, None)
+    assert values.get(orm_session, "a") == f"a@{version}"
+    assert load.call_count == 2
+
+    values.after_commit(orm_session)
+    assert shared_cache.get("values_version") != version
+    assert values.get(orm_session, "a") != f"a@{version}"
+    assert load.call_count == 3
+
+
+def test_after_rollback(
+    shared_cache: Cache,
+    values: VersionedCache[str],
+    orm_session: Any,
+    load: Any,
+) -> None:
+    """
+    Test that the values are invalidated after a rollback, without publishing a new
+    version.
+    """
+    version = values.get(orm_session, "a").split("@")[1]
+    values.mark_changed(orm_session)
+    values.after_rollback(orm_session)
+    assert shared_cache.get("values_version") == version
+    assert values.get(orm_session, "a") == f"a@{version}"
+    assert load.call_count == 2
@@ -0,0 +1,157 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=redefined-outer-name, unused-argument
+
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture
+
+from superset.utils.webdriver import PlaywrightBrowserPool, WebDriverPlaywright
+
+POOL_CONFIG = {
+    "SCREENSHOT_PLAYWRIGHT_BROWSER_POOL": True,
+    "SCREENSHOT_PLAYWRIGHT_BROWSER_MAX_USES": 2,
+    "SCREENSHOT_PLAYWRIGHT_CONTEXT_TIMEOUT": 60,
+    "SCREENSHOT_PLAYWRIGHT_MAX_PAGES": 2,
+    "SCREENSHOT_PLAYWRIGHT_WAIT_FOR_RENDER": True,
+}
+
+
+class PlaywrightError(Exception):
+    pass
+
+
+@pytest.fixture
+def playwright(mocker: MockerFixture) -> Any:
+    """
+    Mock the Playwright API, which is only imported with the feature flag.
+    """
+    sync_playwright = mocker.patch(
+        "superset.utils.webdriver.sync_playwright", create=True
+    )
+    mocker.patch(
+        "superset.utils.webdriver.PlaywrightError", PlaywrightError, create=True
+    )
+    mocker.patch(
+        "superset.utils.webdriver.PlaywrightTimeout",
+        type("PlaywrightTimeout", (PlaywrightError,), {}),
+        create=True,
+    )
+    playwright = sync_playwright.return_value.start.return_value
+    playwright.chromium.launch.side_effect = lambda **kwargs: mocker.MagicMock()
+    return playwright
+
+
+@pytest.mark.parametrize("app", [POOL_CONFIG], indirect=True)
+def test_browser_pool(mocker: MockerFixture, playwright: Any) -> None:
+    """
+    Test that the browser and its contexts are reused, and recycled.
+    """
+    pool = PlaywrightBrowserPool()
+    new_context = mocker.MagicMock(side_effect=lambda browser: mocker.MagicMock())
+
+    with pool.context(("alice",), new_context) as first:
+        pass
+    with pool.context(("alice",), new_context) as second:
+        pass
+    assert first is second
+    assert playwright.chromium.launch.call_count == 1
+
+    # the browser is relaunched after 2 uses
+    with pool.context(("alice",), new_context) as third:
+        pass
+    assert third is not first
+    first.close.assert_called_once()
+    assert playwright.chromium.launch.call_count == 2
+
+    # failed contexts are not reused
+    with pytest.raises(PlaywrightError):
+        with pool.context(("alice",), new_context) as fourth:
+            raise PlaywrightError("Target closed")
+    fourth.close.assert_called_once()
+    with pool.context(("alice",), new_context) as fifth:
+        pass
+    assert fifth is not fourth
+    assert new_context.call_count == 3
+
+    pool.close()
+    fifth.close.assert_called_once()
+
+
+@pytest.mark.parametrize("app", [POOL_CONFIG], indirect=True)
+def test_browser_pool_launch_error(playwright: Any) -> None:
+    """
+    Test that the driver is stopped when the browser fails to launch.
+    """
+    pool = PlaywrightBrowserPool()
+    playwright.chromium.launch.side_effect = PlaywrightError("Launch failed")
+
+    with pytest.raises(PlaywrightError):
+        pool.get_browser()
+    playwright.stop.assert_called_once()
+
+    with pytest.raises(PlaywrightError):
+        pool.get_browser()
+    assert playwright.stop.call_count == 2
+
+
+@pytest.mark.parametrize("app", [POOL_CONFIG], indirect=True)
+def test_get_screenshots(mocker: MockerFixture, playwright: Any) -> None:
+    """
+    Test that pages are loaded before being captured, by batches.
+    """
+    mocker.patch.object(WebDriverPlaywright, "auth", side_effect=lambda _, ctx: ctx)
+    mocker.patch("superset.utils.webdriver.browser_pool", PlaywrightBrowserPool())
+    calls: list[tuple[str, str]] = []
+    pages: list[Any] = []
+
+    def new_page() -> Any:
+        page = mocker.MagicMock()
+        page.goto.side_effect = lambda url, **kwargs: calls.append(("load", url))
+
+        def screenshot() -> bytes:
+            url = page.goto.call_args[0][0]
+            calls.append(("capture", url))
+            return url.encode()
+
+        page.locator.return_value.screenshot.side_effect = screenshot
+        pages.append(page)
+        return page
+
+    playwright.chromium.launch.side_effect = None
+    browser = playwright.chromium.launch.return_value
+    browser.new_context.return_value.new_page.side_effect = new_page
+
+    driver = WebDriverPlaywright("chrome", (800, 600))
+    user = mocker.MagicMock(id=1, username="alice")
+    images = driver.get_screenshots(["a", "b", "c"], "standalone", user)
+
+    assert images == [b"a", b"b", b"c"]
+    assert calls == [
+        ("load", "a"),
+        ("load", "b"),
+        ("capture", "a"),
+        ("capture", "b"),
+        ("load", "c"),
+        ("capture", "c"),
+    ]
+    for page in pages:
+        # the fixed sleeps are replaced by waiting for the charts to render
+        page.wait_for_timeout.assert_not_called()
+        page.wait_for_function.assert_called_once()
+        page.close.assert_called_once()
@@ -0,0 +1,142 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=import-outside-toplevel, unused-argument
+
+from typing import Any
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+from pytest_mock import MockerFixture
+
+from superset.utils import json
+
+LATLONG = {"type": "latlong", "lonCol": "lon", "latCol": "lat"}
+DELIMITED = {"type": "delimited", "lonlatCol": "lonlat", "reverseCheckbox": True}
+
+
+def get_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "lon": [-122.41, -122.42, -122.43, -122.41],
+            "lat": [37.77, 37.78, 37.79, 37.77],
+            "lonlat": ["37.77, -122.41", "37.78 -122.42", "37.79;-122.43", None],
+            "count": [3, 0, 5, 2],
+            "dim": ["a", "b", None, "a"],
+            "color": ["red", "green", "blue", None],
+            "__timestamp": pd.to_datetime(
+                ["2024-01-01", "2024-01-02", None, "2024-01-01"]
+            ),
+        }
+    )
+
+
+def get_viz(mocker: MockerFixture, viz_type: str, **form_data: Any) -> Any:
+    from superset.viz import viz_types
+
+    viz_obj = viz_types[viz_type](
+        mocker.MagicMock(),
+        {"viz_type": viz_type, "spatial": LATLONG, **form_data},
+    )
+    viz_obj.metric = form_data.get("size")
+    viz_obj.point_radius_fixed = form_data.get("point_radius_fixed") or {}
+    return viz_obj
+
+
+@pytest.mark.parametrize(
+    "viz_type, form_data",
+    [
+        ("deck_scatter", {"point_radius_fixed": {"type": "fix", "value": 100}}),
+        (
+            "deck_scatter",
+            {"point_radius_fixed": {"type": "metric", "value": "count"}},
+        ),
+        ("deck_screengrid", {"size": "count"}),
+        ("deck_grid", {"size": "count", "spatial": DELIMITED}),
+        ("deck_hex", {"size": "count", "js_columns": ["color", "dim"]}),
+        ("deck_heatmap", {}),
+        ("deck_contour", {"size": "count"}),
+        ("deck_arc", {"start_spatial": LATLONG, "end_spatial": DELIMITED}),
+    ],
+)
+def test_deckgl_columnar_features(
+    mocker: MockerFixture,
+    app_context: None,
+    viz_type: str,
+    form_data: dict[str, Any],
+) -> None:
+    """
+    Test that the features built by column match the features built by row.
+    """
+    viz_obj = get_viz(mocker, viz_type, dimension="dim", **form_data)
+    if form_data.get("point_radius_fixed", {}).get("type") == "metric":
+        viz_obj.metric = "count"
+    assert viz_obj.columnar
+
+    data = viz_obj.get_data(get_df())
+    viz_obj.columnar = False
+    expected = viz_obj.get_data(get_df())
+
+    assert json.dumps(data, default=json.json_int_dttm_ser, ignore_nan=True) == (
+        json.dumps(expected, default=json.json_int_dttm_ser, ignore_nan=True)
+    )
+
+
+def test_deckgl_arrow(mocker: MockerFixture, app_context: None) -> None:
+    """
+    Test that the features are serialized as Arrow, positions and weights as float32.
+    """
+    viz_obj = get_viz(mocker, "deck_hex", size="count", js_columns=["color"])
+    viz_obj.arrow = True
+    data = viz_obj.get_data(get_df())
+    blob = viz_obj.serialize_arrow_payload({"data": data, "status": "success"})
+
+    table = pa.ipc.open_stream(blob).read_all()
+    assert table.schema.field("position").type == pa.list_(pa.float32(), 2)
+    assert table.schema.field("weight").type == pa.float32()
+    assert table.column("weight").to_pylist() == [3, 1, 5, 2]
+    assert table.column("extraProps").to_pylist()[0] == {"color": "red"}
+    assert table.column("position").to_pylist()[0] == pytest.approx([-122.41, 37.77])
+
+    payload = json.loads(table.schema.metadata[b"payload"])
+    assert payload["status"] == "success"
+    assert "features" not in payload["data"]
+    assert "mapboxApiKey" in payload["data"]
+
+
+@pytest.mark.parametrize("viz_type", ["deck_hex", "deck_grid", "deck_screengrid"])
+def test_deckgl_bins(mocker: MockerFixture, app_context: None, viz_type: str) -> None:
+    """
+    Test that points are binned on the server when a bin size is requested.
+    """
+    df = get_df()
+    viz_obj = get_viz(mocker, viz_type, size="count", bin_size=2000)
+    features = viz_obj.get_data(df)["features"]
+
+    assert len(features) < len(df)
+    assert sum(feature["weight"] for feature in features) == 11
+    assert sum(feature["count"] for feature in features) == 4
+
+
+def test_deckgl_bins_not_additive(mocker: MockerFixture, app_context: None) -> None:
+    """
+    Test that points are not binned when the layer doesn't sum their weights.
+    """
+    viz_obj = get_viz(
+        mocker, "deck_hex", size="count", bin_size=2000, js_agg_function="mean"
+    )
+    assert len(viz_obj.get_data(get_df())["features"]) == 4